@@ -29,6 +29,30 @@ celery_app.conf.update(
     task_soft_time_limit=240,
 )
 
+# --- 주기적 데이터 수집 (Celery Beat) ---
+# BACKFILL_SCHEDULE="binance:BTC/USDT:1m,binance:ETH/USDT:1m" 형식으로 지정한 시리즈의 최근 구간 결측을 주기적으로 채웁니다.
+BACKFILL_SCHEDULE = [
+    tuple(item.strip().rsplit(":", 2))
+    for item in os.getenv("BACKFILL_SCHEDULE", "").split(",") if item.strip().count(":") >= 2
+]
+BACKFILL_INTERVAL_S = int(os.getenv("BACKFILL_INTERVAL_S", "300"))
+BACKFILL_LOOKBACK_MS = int(os.getenv("BACKFILL_LOOKBACK_S", "86400")) * 1000
+
+# 참조가 끊긴 시세 스냅샷/세그먼트 정리 주기 (engine/snapshots.py)
+SNAPSHOT_GC_INTERVAL_S = int(os.getenv("SNAPSHOT_GC_INTERVAL_S", "21600"))
+
+celery_app.conf.beat_schedule = {
+    'collect-data-snapshots': {
+        'task': 'backend.app.tasks.collect_data_snapshots_task',
+        'schedule': float(SNAPSHOT_GC_INTERVAL_S),
+    },
+}
+if BACKFILL_SCHEDULE:
+    celery_app.conf.beat_schedule['backfill-recent-candles'] = {
+        'task': 'backend.app.tasks.backfill_recent_candles_task',
+        'schedule': float(BACKFILL_INTERVAL_S),
+    }
+
 # 👈 eventlet.monkey_patch()의 조건부 실행 (sys.argv를 사용하여 워커 여부 판단)
 # sys.argv에 'worker' 또는 'celery'와 'worker'가 함께 있는 경우에만 eventlet을 적용합니다.
 # 이는 이 모듈이 celery worker 명령에 의해 로드될 때만 monkey_patch가 실행되도록 합니다.
@@ -0,0 +1,190 @@
+# file: backend/app/engine/backfill.py
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .data import OHLCV, Gap, ceil_to_bar, find_gaps, timeframe_ms
+from .candle_store import AGGREGATE_VIEWS, CandleStore
+from .disk_cache import DiskCandleCache
+from .exchanges import ExchangeClient
+from .validation import validate_candles
+
+logger = logging.getLogger(__name__)
+
+# --- 과거 시세 백필 ---
+# 1. 저장소의 봉 시각을 한 번에 읽어 np.diff로 결측 구간을 찾고
+# 2. 거래소 요청 한도(max_limit 봉)에 맞춰 요청 수가 최소가 되도록 구간을 병합/분할한 뒤
+# 3. 거래소별 토큰 버킷 속도 제한 아래에서 동시에 가져와 검증(validation.py)을 거친 뒤 COPY로 적재합니다.
+BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", "4")) # 거래소 하나에 동시에 보내는 요청 수
+BACKFILL_RATE_SHARE = float(os.getenv("BACKFILL_RATE_SHARE", "0.8")) # 거래소 허용 속도 중 백필이 사용할 비율 (실시간 수집 몫을 남김)
+BACKFILL_RETRIES = int(os.getenv("BACKFILL_RETRIES", "3"))
+
+class TokenBucket:
+    """
+    비동기 토큰 버킷. 초당 rate개씩 채워지고 최대 capacity개까지 쌓이며, 요청마다 토큰 하나를 소비합니다.
+    같은 프로세스의 같은 거래소 요청은 get_token_bucket()으로 하나의 버킷을 공유합니다.
+    """
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+_token_buckets: Dict[Tuple[str, int], TokenBucket] = {}
+
+
+def get_token_bucket(client: ExchangeClient) -> TokenBucket:
+    # asyncio.Lock은 이벤트 루프에 묶이므로 루프마다 별도 버킷을 둡니다 (태스크마다 asyncio.run을 새로 호출).
+    key = (client.name, id(asyncio.get_running_loop()))
+    bucket = _token_buckets.get(key)
+    if bucket is None:
+        for stale in [k for k in _token_buckets if k[0] == client.name]:
+            _token_buckets.pop(stale)
+        bucket = _token_buckets[key] = TokenBucket(client.rate_per_second * BACKFILL_RATE_SHARE, client.burst)
+    return bucket
+
+
+def plan_requests(gaps: List[Gap], timeframe: str, max_limit: int) -> List[Tuple[int, int]]:
+    """
+    결측 구간을 (since_ms, limit) 요청 목록으로 바꿉니다.
+    가까운 결측 구간은 사이의 기존 봉을 다시 받더라도 요청 수가 줄어들 때만 하나로 합칩니다.
+    """
+    step = timeframe_ms(timeframe)
+    requests_for = lambda gap: -(-(gap[1] - gap[0]) // (step * max_limit))
+    merged: List[Gap] = []
+    for gap in gaps:
+        if merged:
+            joined = (merged[-1][0], gap[1])
+            if requests_for(joined) < requests_for(merged[-1]) + requests_for(gap):
+                merged[-1] = joined
+                continue
+        merged.append(gap)
+    plan: List[Tuple[int, int]] = []
+    for start, end in merged:
+        for since in range(start, end, step * max_limit):
+            plan.append((since, int(min(max_limit, (end - since) // step))))
+    return plan
+
+
+async def _fetch(client: ExchangeClient, bucket: TokenBucket, semaphore: asyncio.Semaphore,
+                 symbol: str, timeframe: str, since_ms: int, limit: int) -> List[List[float]]:
+    step = timeframe_ms(timeframe)
+    async with semaphore:
+        for attempt in range(BACKFILL_RETRIES + 1):
+            await bucket.acquire()
+            try:
+                rows = await client.fetch_ohlcv(symbol, timeframe, since_ms, limit)
+                return [row for row in rows if since_ms <= row[0] < since_ms + limit * step]
+            except Exception as e:
+                if attempt == BACKFILL_RETRIES:
+                    raise
+                logger.warning(f"Backfill request {client.name}:{symbol} {timeframe} since {since_ms} failed ({e}); retrying.")
+                await asyncio.sleep(2 ** attempt)
+    return []
+
+
+async def fetch_requests(client: ExchangeClient, symbol: str, timeframe: str, plan: List[Tuple[int, int]],
+                         concurrency: int = BACKFILL_CONCURRENCY) -> OHLCV:
+    """계획된 요청을 토큰 버킷/동시성 제한 아래에서 동시에 보내고 시각순으로 중복 없이 합칩니다."""
+    if not plan:
+        return OHLCV.empty()
+    bucket = get_token_bucket(client)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    batches = await asyncio.gather(*(
+        _fetch(client, bucket, semaphore, symbol, timeframe, since, limit) for since, limit in plan
+    ))
+    rows = [row for batch in batches for row in batch]
+    if not rows:
+        return OHLCV.empty()
+    bars = OHLCV.from_rows(rows)
+    _, unique = np.unique(bars.ts, return_index=True)
+    return OHLCV(*(getattr(bars, name)[unique] for name in ("ts", "open", "high", "low", "close", "volume")))
+
+
+def _gap_mask(ts: np.ndarray, gaps: List[Gap]) -> np.ndarray:
+    # 병합 요청으로 다시 받은 기존 봉은 제외하고 결측 구간의 봉만 남기기 위한 마스크
+    if not gaps:
+        return np.zeros(ts.shape[0], dtype=bool)
+    gap_starts, gap_ends = np.array(gaps, dtype=np.int64).T
+    idx = np.searchsorted(gap_starts, ts, side="right") - 1
+    return (idx >= 0) & (ts < gap_ends[np.maximum(idx, 0)])
+
+
+def _within(bars: OHLCV, mask: np.ndarray) -> OHLCV:
+    return OHLCV(*(getattr(bars, name)[mask] for name in ("ts", "open", "high", "low", "close", "volume")))
+
+
+def backfill(
+    client: ExchangeClient,
+    store: CandleStore,
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: int,
+    disk_cache: Optional[DiskCandleCache] = None,
+) -> Dict[str, Any]:
+    """
+    [start_ms, end_ms) 구간의 결측 봉을 거래소에서 가져와 candles에 적재하고 요약을 반환합니다.
+    아직 마감되지 않은 봉은 가져오지 않으며, 거래소에도 없거나 검증에서 격리된 봉은 unfilled_bars로 집계됩니다
+    (격리된 봉은 candle_quarantine에 기록되고 quarantined_bars로도 집계).
+    1분봉을 적재하면 집계 뷰를 다시 계산하고, disk_cache가 주어지면 적재한 구간의 로컬 캐시를 무효화합니다
+    (다른 워커의 캐시는 해당 워커에서 invalidate할 때까지 기존 결측을 유지합니다).
+    """
+    started = time.perf_counter()
+    step = timeframe_ms(timeframe)
+    end_ms = min(end_ms, ceil_to_bar(int(time.time() * 1000) - step + 1, timeframe))
+    gaps = find_gaps(store.load_timestamps(client.name, symbol, timeframe, start_ms, end_ms), start_ms, end_ms, timeframe)
+    plan = plan_requests(gaps, timeframe, client.max_limit)
+
+    async def run() -> OHLCV:
+        try:
+            return await fetch_requests(client, symbol, timeframe, plan)
+        finally:
+            await client.close()
+
+    bars = asyncio.run(run()) if plan else OHLCV.empty()
+    # 스파이크 판정에 앞뒤 봉이 필요하므로 결측 구간으로 거르기 전에 받은 봉 전체를 검증
+    report = validate_candles(bars)
+    bars = _within(report.bars, _gap_mask(report.bars.ts, gaps))
+    quarantined = _gap_mask(report.quarantined.ts, gaps)
+    report.quarantined, report.reasons = _within(report.quarantined, quarantined), report.reasons[quarantined]
+    if len(report.quarantined):
+        store.quarantine(client.name, symbol, timeframe, report)
+    stored = store.ingest(client.name, symbol, timeframe, bars) if len(bars) else 0
+    if stored:
+        first_ms, last_ms = int(bars.ts[0]), int(bars.ts[-1]) + step
+        if timeframe == "1m":
+            store.refresh_aggregates(first_ms, last_ms)
+        if disk_cache is not None:
+            for cached_tf in [timeframe] + (list(AGGREGATE_VIEWS) if timeframe == "1m" else []):
+                disk_cache.invalidate(client.name, symbol, cached_tf, first_ms, last_ms)
+
+    missing_bars = sum((end - start) // step for start, end in gaps)
+    summary = {
+        "exchange": client.name, "symbol": symbol, "timeframe": timeframe,
+        "start_ms": int(start_ms), "end_ms": int(end_ms),
+        "gaps": len(gaps), "missing_bars": int(missing_bars), "requests": len(plan),
+        "stored_bars": int(stored), "quarantined_bars": len(report.quarantined),
+        "repaired_bars": report.counts.get("ohlc_repaired", 0), "unfilled_bars": int(missing_bars - stored),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+    logger.info(f"Backfill {client.name}:{symbol} {timeframe}: {summary}")
+    return summary
@@ -0,0 +1,174 @@
+# file: backend/app/engine/backtester.py
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data import OHLCV, TIMEFRAME_ORDER, get_precision, to_epoch_ms
+from .compiler import CompiledStrategy
+from .fills import LIMIT_TTL_MAX_BARS
+from .evaluator import MarketFrame, RuleEvaluator, SubtreeCache
+from .simulator import SimulationConfig, SimulationResult, simulate
+from .metrics import ROLLING_WINDOW_DAYS, summarize, trade_log_rows
+from .regimes import evaluate_regime_report
+from .replay import data_digest
+from .snapshots import get_snapshot_store, load_ohlcv_at
+from .warm_pool import plan_cache, series_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCHANGE = "binance"
+DEFAULT_TIMEFRAME = "1h"
+
+
+@dataclass(frozen=True)
+class BacktestSpec:
+    """Backtest.parameters(JSON)를 엔진 입력 형태로 정리한 값."""
+    exchange: str
+    ticker: str
+    timeframe: str
+    start_ms: int
+    end_ms: int
+    simulation: SimulationConfig
+    precision: str = "float64"  # "float64" | "float32" (대규모 스윕용 압축 모드)
+    rolling_window_days: Tuple[int, ...] = ROLLING_WINDOW_DAYS  # 롤링 지표 창 길이(일)
+    data_version: Optional[str] = None  # 고정된 시세 스냅샷 버전 (snapshots.py). None이면 현재 데이터 소스에서 로드
+
+    def data_key(self, bars: OHLCV) -> str:
+        """
+        실제로 로드한 봉 기준의 지표 캐시 key. 같은 구간이라도 전략마다 워밍업 길이가 달라 배열 길이가 다르므로
+        요청 구간이 아니라 첫 봉 시각과 봉 수(warm_pool.SeriesStore와 같은 방식)로 만듭니다.
+        """
+        first = int(bars.ts[0]) if len(bars) else self.start_ms
+        key = f"{self.exchange}:{self.ticker}:{self.timeframe}:{first}:{len(bars)}"
+        return key if self.data_version is None else f"{key}:{self.data_version}"
+
+    @classmethod
+    def from_parameters(cls, parameters: Dict[str, Any], compiled: CompiledStrategy) -> "BacktestSpec":
+        extra = parameters.get("additional_parameters") or {}
+        # 실행 타임프레임: 명시값이 없으면 규칙에서 사용하는 가장 낮은 타임프레임
+        timeframe = extra.get("timeframe") or compiled.lowest_timeframe() or DEFAULT_TIMEFRAME
+        if timeframe not in TIMEFRAME_ORDER:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        limit_ttl_bars = int(extra.get("limit_ttl_bars", SimulationConfig.limit_ttl_bars))
+        if not 1 <= limit_ttl_bars <= LIMIT_TTL_MAX_BARS:
+            raise ValueError(f"limit_ttl_bars must be between 1 and {LIMIT_TTL_MAX_BARS}.")
+        return cls(
+            exchange=extra.get("exchange", DEFAULT_EXCHANGE),
+            ticker=parameters["ticker"],
+            timeframe=timeframe,
+            start_ms=to_epoch_ms(_parse_datetime(parameters["start_date"])),
+            end_ms=to_epoch_ms(_parse_datetime(parameters["end_date"])),
+            simulation=SimulationConfig(
+                initial_capital=float(parameters.get("initial_capital", 10000.0)),
+                commission_rate=float(extra.get("commission_rate", SimulationConfig.commission_rate)),
+                slippage_rate=float(extra.get("slippage_rate", SimulationConfig.slippage_rate)),
+                trailing_stop_rate=float(extra.get("trailing_stop_rate", SimulationConfig.trailing_stop_rate)),
+                order_type=extra.get("order_type", SimulationConfig.order_type),
+                limit_offset_rate=float(extra.get("limit_offset_rate", SimulationConfig.limit_offset_rate)),
+                limit_ttl_bars=limit_ttl_bars,
+                touch_fill_probability=float(extra.get("touch_fill_probability", SimulationConfig.touch_fill_probability)),
+                touch_band_rate=float(extra.get("touch_band_rate", SimulationConfig.touch_band_rate)),
+                volume_participation_rate=float(extra.get("volume_participation_rate", SimulationConfig.volume_participation_rate)),
+                fill_seed=int(extra.get("fill_seed", SimulationConfig.fill_seed)),
+            ),
+            precision=get_precision(extra.get("precision")).name,
+            rolling_window_days=tuple(int(d) for d in extra.get("rolling_window_days", ROLLING_WINDOW_DAYS)),
+            data_version=extra.get("data_version"),
+        )
+
+
+def _parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+@dataclass
+class BacktestRun:
+    timeframe: str
+    ts: np.ndarray
+    entries: np.ndarray
+    exits: np.ndarray
+    start_index: int
+    simulation: SimulationResult
+    summary: Dict[str, Any]
+    nodes_computed: int
+    rules_key: str = ""  # CompiledStrategy.key (재현 지문용)
+    data_digest: str = ""  # 시뮬레이션 구간 봉의 해시 (replay.DataDigest)
+
+    def trade_logs(self) -> List[Dict[str, Any]]:
+        return trade_log_rows(self.ts, self.simulation)
+
+
+def load_market(spec: BacktestSpec, compiled: CompiledStrategy) -> Tuple[MarketFrame, int, int]:
+    """
+    지표 워밍업 구간을 포함하여 실행 타임프레임 데이터를 로드합니다.
+    웜 워커에 미리 로드된 시계열이 요청 구간을 포함하면 로드 단계를 건너뛰고 전체 시계열을 그대로 사용합니다.
+    스냅샷이 고정된 실행(spec.data_version)은 미리 로드된 시계열의 내용이 스냅샷 세그먼트와 같을 때만 그대로 쓰고,
+    다르면 스냅샷을 읽되 내용이 같은 세그먼트는 미리 로드된 시계열(공유 메모리 포함)에서 가져옵니다.
+    반환되는 (start_index, end_index)는 실제 백테스트 구간의 봉 위치입니다.
+    """
+    load_start_ms = spec.start_ms - compiled.warmup_ms
+    preloaded = series_store.lookup(spec.exchange, spec.ticker, spec.timeframe, load_start_ms, spec.end_ms)
+    hot = None
+    if preloaded is not None and spec.data_version is not None:
+        store = get_snapshot_store()
+        if store is None or not store.matches(spec.data_version, preloaded[1], load_start_ms, spec.end_ms):
+            hot, preloaded = preloaded[1], None
+    if preloaded is not None:
+        data_key, bars = preloaded
+        logger.info(f"Using preloaded {spec.timeframe} series for {spec.exchange}:{spec.ticker}; load phase skipped.")
+    else:
+        bars = load_ohlcv_at(spec.data_version, spec.exchange, spec.ticker, spec.timeframe, load_start_ms, spec.end_ms, hot)
+        data_key = spec.data_key(bars)
+    start_index = int(np.searchsorted(bars.ts, spec.start_ms, side="left"))
+    end_index = int(np.searchsorted(bars.ts, spec.end_ms, side="left"))
+    return MarketFrame(data_key, spec.timeframe, bars, precision=get_precision(spec.precision)), start_index, end_index
+
+
+def run_compiled(
+    compiled: CompiledStrategy,
+    market: MarketFrame,
+    simulation: SimulationConfig,
+    start_index: int = 0,
+    cache: Optional[SubtreeCache] = None,
+    end_index: Optional[int] = None,
+    rolling_window_days: Sequence[int] = ROLLING_WINDOW_DAYS,
+) -> BacktestRun:
+    """
+    규칙 마스크는 market 전체 길이로 평가하여 캐시하고, 시뮬레이션은 [start_index, end_index) 구간만 수행합니다.
+    마스크는 미래 봉을 참조하지 않으므로 잘라서 사용해도 결과가 같습니다.
+    """
+    end = len(market) if end_index is None else end_index
+    evaluator = RuleEvaluator(market, cache)
+    entries = evaluator.evaluate(compiled.buy)[:end]
+    exits = evaluator.evaluate(compiled.sell)[:end]
+    ts = market.bars.ts[:end]
+    close = market.bars.close[:end]
+    sim = simulate(
+        close, entries, exits, simulation, start=start_index, index_dtype=market.precision.index_dtype,
+        high=market.bars.high[:end], low=market.bars.low[:end], volume=market.bars.volume[:end],
+    )
+    summary = summarize(ts, sim, market.timeframe, start_index, simulation.initial_capital, close, rolling_window_days)
+    summary["regime_report_json"] = evaluate_regime_report(evaluator, sim, start_index, end)
+    logger.info(
+        f"Strategy {compiled.key[:10]} evaluated on {market.data_key}: "
+        f"{evaluator.computed} subtree(s) recomputed, {sim.trade_count} trade(s)."
+    )
+    return BacktestRun(
+        timeframe=market.timeframe, ts=ts, entries=entries, exits=exits,
+        start_index=start_index, simulation=sim, summary=summary, nodes_computed=evaluator.computed,
+        rules_key=compiled.key, data_digest=data_digest(market.bars.slice(start_index, end)),
+    )
+
+
+def run_backtest(rules: Any, parameters: Dict[str, Any], cache: Optional[SubtreeCache] = None) -> BacktestRun:
+    """전략 규칙과 Backtest.parameters로 전체 백테스트를 실행합니다 (Celery 태스크 진입점)."""
+    compiled = rules if isinstance(rules, CompiledStrategy) else plan_cache.get_or_compile(rules)
+    spec = BacktestSpec.from_parameters(parameters, compiled)
+    market, start_index, end_index = load_market(spec, compiled)
+    return run_compiled(compiled, market, spec.simulation, start_index, cache, end_index, spec.rolling_window_days)
@@ -0,0 +1,296 @@
+# file: backend/app/engine/candle_store.py
+
+import io
+import os
+import time
+import logging
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from .data import CCXT_FETCH_LIMIT, OHLCV, OHLCV_COLUMNS, DataSource, Gap, ceil_to_bar, find_gaps, resample, timeframe_ms
+from .validation import ValidationReport
+
+logger = logging.getLogger(__name__)
+
+# --- TimescaleDB 봉 저장소 ---
+# candles 하이퍼테이블에 대한 적재/조회는 ORM을 거치지 않고 PostgreSQL 바이너리 COPY 스트림으로 처리합니다.
+# 봉 배열을 NumPy 구조체 배열 하나로 직렬화하므로 행 단위 파이썬 루프가 없고, 조회도 같은 형식을 np.frombuffer로 바로 읽습니다.
+CANDLE_STORE_ENABLED = os.getenv("ENGINE_DATA_SOURCE", "store") == "store" # "exchange"이면 저장소 없이 거래소 직접 조회
+COPY_BATCH_ROWS = int(os.getenv("CANDLE_COPY_BATCH_ROWS", "500000")) # COPY 한 번에 보내는 최대 행 수 (메모리 상한)
+
+CANDLE_COLUMNS = ("exchange", "symbol", "timeframe", "ts") + OHLCV_COLUMNS
+
+# 1분봉에서 계층적으로 집계되는 TimescaleDB 연속 집계 뷰 (마이그레이션 a3c8f15e7d92). 갱신 순서대로 나열합니다.
+# 월봉(1M)은 고정 길이 버킷이 아니므로 일봉 뷰를 읽어 엔진에서 달력 기준으로 집계합니다.
+AGGREGATE_VIEWS: Dict[str, str] = {
+    "5m": "candles_5m", "15m": "candles_15m", "30m": "candles_30m",
+    "1h": "candles_1h", "4h": "candles_4h", "1d": "candles_1d", "1w": "candles_1w",
+}
+RESAMPLED_TIMEFRAMES: Dict[str, str] = {"1M": "1d"}
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_COPY_HEADER = _COPY_SIGNATURE + np.array([0, 0], dtype=">i4").tobytes() # flags, 헤더 확장 길이
+_COPY_TRAILER = np.array([-1], dtype=">i2").tobytes()
+# timestamptz 바이너리 값은 2000-01-01 UTC 기준 마이크로초입니다.
+_PG_EPOCH_MS = 946_684_800_000
+
+# 조회 결과 한 행: 필드 수(int16) + [길이(int32), 값] x (ts_ms bigint, OHLCV float8 x 5)
+_READ_ROW = np.dtype(
+    [("fields", ">i2"), ("ts_len", ">i4"), ("ts", ">i8")]
+    + [item for name in OHLCV_COLUMNS for item in ((f"{name}_len", ">i4"), (name, ">f8"))]
+)
+_TS_ROW = np.dtype([("fields", ">i2"), ("ts_len", ">i4"), ("ts", ">i8")])
+
+
+def _text(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    if not encoded:
+        raise ValueError("Candle key columns must not be empty.")
+    return encoded
+
+
+def encode_copy_binary(exchange: str, symbol: str, timeframe: str, bars: OHLCV) -> bytes:
+    """
+    봉 배열을 `COPY candles (...) FROM STDIN (FORMAT binary)` 스트림으로 직렬화합니다.
+    (거래소, 심볼, 타임프레임)은 배치 내에서 고정이므로 모든 행이 같은 길이가 되어 구조체 배열 하나로 표현됩니다.
+    """
+    keys = [_text(exchange), _text(symbol), _text(timeframe)]
+    fields = [("fields", ">i2")]
+    for name, key in zip(("exchange", "symbol", "timeframe"), keys):
+        fields += [(f"{name}_len", ">i4"), (name, f"S{len(key)}")]
+    fields += [("ts_len", ">i4"), ("ts", ">i8")]
+    fields += [item for name in OHLCV_COLUMNS for item in ((f"{name}_len", ">i4"), (name, ">f8"))]
+
+    rows = np.empty(len(bars), dtype=np.dtype(fields))
+    rows["fields"] = len(CANDLE_COLUMNS)
+    for name, key in zip(("exchange", "symbol", "timeframe"), keys):
+        rows[f"{name}_len"] = len(key)
+        rows[name] = key
+    rows["ts_len"] = 8
+    rows["ts"] = (bars.ts.astype(np.int64) - _PG_EPOCH_MS) * 1000
+    for name in OHLCV_COLUMNS:
+        rows[f"{name}_len"] = 8
+        rows[name] = bars.column(name)
+    return _COPY_HEADER + rows.tobytes() + _COPY_TRAILER
+
+
+def _decode_rows(payload: bytes, row: np.dtype) -> np.ndarray:
+    """NULL이 없는 고정 길이 열만 조회한 바이너리 COPY 결과를 구조체 배열로 읽습니다."""
+    if not payload.startswith(_COPY_SIGNATURE):
+        raise ValueError("Not a PostgreSQL binary COPY stream.")
+    extension = int(np.frombuffer(payload, dtype=">i4", count=1, offset=len(_COPY_SIGNATURE) + 4)[0])
+    offset = len(_COPY_HEADER) + extension
+    count = max(0, (len(payload) - offset - len(_COPY_TRAILER)) // row.itemsize)
+    return np.frombuffer(payload, dtype=row, count=count, offset=offset)
+
+
+def decode_copy_binary(payload: bytes) -> OHLCV:
+    """`COPY (SELECT ts_ms, open, high, low, close, volume ...) TO STDOUT (FORMAT binary)` 결과를 OHLCV로 변환합니다."""
+    rows = _decode_rows(payload, _READ_ROW)
+    if rows.shape[0] == 0:
+        return OHLCV.empty()
+    return OHLCV(rows["ts"].astype(np.int64), *(rows[name].astype(np.float64) for name in OHLCV_COLUMNS))
+
+
+def _concat(parts: List[OHLCV]) -> OHLCV:
+    if len(parts) == 1:
+        return parts[0]
+    return OHLCV(*(np.concatenate([getattr(p, name) for p in parts]) for name in ("ts",) + OHLCV_COLUMNS))
+
+
+def _take(bars: OHLCV, index: np.ndarray) -> OHLCV:
+    return OHLCV(*(getattr(bars, name)[index] for name in ("ts",) + OHLCV_COLUMNS))
+
+
+def _merge_gaps(gaps: List[Gap], max_span_ms: int) -> List[Gap]:
+    """사이의 저장된 봉까지 포함해도 거래소 요청 한 번 분량(max_span_ms)을 넘지 않는 인접 결측 구간을 합칩니다."""
+    merged: List[Gap] = []
+    for gap in gaps:
+        if merged and gap[1] - merged[-1][0] <= max_span_ms:
+            merged[-1] = (merged[-1][0], gap[1])
+        else:
+            merged.append(gap)
+    return merged
+
+
+class CandleStore:
+    """
+    candles 하이퍼테이블 적재/조회.
+    connect는 DBAPI(psycopg2) 연결을 반환하는 함수이며 (예: engine_celery.raw_connection) 호출마다 새 연결을 열고 닫습니다.
+    """
+    def __init__(self, connect: Callable[[], Any], batch_rows: int = COPY_BATCH_ROWS):
+        self.connect = connect
+        self.batch_rows = max(1, batch_rows)
+
+    def ingest(self, exchange: str, symbol: str, timeframe: str, bars: OHLCV, upsert: bool = True) -> int:
+        """
+        봉을 COPY로 적재하고 적재한 행 수를 반환합니다. 전체가 하나의 트랜잭션입니다.
+        upsert=True이면 임시 테이블로 COPY한 뒤 기존 봉을 덮어쓰고 (마감 전 봉 재수집/수정 대응),
+        False이면 candles에 바로 COPY합니다 (빈 구간 초기 적재용, 중복 키가 있으면 실패).
+        """
+        if len(bars) == 0:
+            return 0
+        timeframe_ms(timeframe) # 지원하지 않는 타임프레임이면 ValueError
+        started = time.perf_counter()
+        columns = ", ".join(CANDLE_COLUMNS)
+        target = "candles_staging" if upsert else "candles"
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            if upsert:
+                cursor.execute("CREATE TEMP TABLE candles_staging (LIKE candles INCLUDING DEFAULTS) ON COMMIT DROP")
+            for start in range(0, len(bars), self.batch_rows):
+                chunk = bars.slice(start, start + self.batch_rows)
+                stream = io.BytesIO(encode_copy_binary(exchange, symbol, timeframe, chunk))
+                cursor.copy_expert(f"COPY {target} ({columns}) FROM STDIN (FORMAT binary)", stream)
+                if upsert:
+                    updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in OHLCV_COLUMNS)
+                    cursor.execute(
+                        f"INSERT INTO candles ({columns}) SELECT {columns} FROM candles_staging "
+                        f"ON CONFLICT (exchange, symbol, timeframe, ts) DO UPDATE SET {updates}"
+                    )
+                    cursor.execute("TRUNCATE candles_staging")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Ingested {len(bars)} {timeframe} candles for {exchange}:{symbol} in {elapsed:.2f}s "
+            f"({len(bars) / max(elapsed, 1e-9) * 60:,.0f} rows/min)."
+        )
+        return len(bars)
+
+    def quarantine(self, exchange: str, symbol: str, timeframe: str, report: ValidationReport) -> int:
+        """
+        검증에서 격리된 봉을 candle_quarantine에 사유 비트와 함께 기록하고 기록한 행 수를 반환합니다.
+        같은 봉이 다시 격리되면 값과 사유, 감지 시각을 갱신합니다. 격리 봉은 수가 적으므로 COPY 대신 executemany를 씁니다.
+        """
+        bars = report.quarantined
+        if len(bars) == 0:
+            return 0
+        columns = ", ".join(CANDLE_COLUMNS + ("reasons",))
+        updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in OHLCV_COLUMNS + ("reasons",))
+        rows = [
+            (exchange, symbol, timeframe, int(ts), *values, int(reasons))
+            for ts, *values, reasons in zip(bars.ts.tolist(), *(bars.column(name).tolist() for name in OHLCV_COLUMNS), report.reasons.tolist())
+        ]
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"INSERT INTO candle_quarantine ({columns}) "
+                f"VALUES (%s, %s, %s, to_timestamp(%s / 1000.0), %s, %s, %s, %s, %s, %s) "
+                f"ON CONFLICT (exchange, symbol, timeframe, ts) DO UPDATE SET {updates}, detected_at = now()",
+                rows,
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        logger.warning(f"Quarantined {len(rows)} {timeframe} candles for {exchange}:{symbol}.")
+        return len(rows)
+
+    def load(self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> OHLCV:
+        """
+        [start_ms, end_ms) 구간의 봉을 바이너리 COPY로 조회합니다.
+        집계 타임프레임은 연속 집계 뷰(월봉은 일봉 뷰)를 바로 읽고, 비어 있으면 candles에 직접 저장된 해당 타임프레임 봉을 읽습니다.
+        """
+        if timeframe in RESAMPLED_TIMEFRAMES:
+            bars = resample(self.load(exchange, symbol, RESAMPLED_TIMEFRAMES[timeframe], start_ms, end_ms), timeframe)
+            # 구간 시작이 달 중간이면 첫 월봉은 일부 일봉만 집계된 것이므로 제외합니다 (거래소 조회와 같은 경계)
+            bars = bars.slice(int(np.searchsorted(bars.ts, start_ms, side="left")))
+            if len(bars):
+                return bars
+        elif timeframe in AGGREGATE_VIEWS:
+            bars = self._copy_out(AGGREGATE_VIEWS[timeframe], "exchange = %s AND symbol = %s", (exchange, symbol), start_ms, end_ms)
+            if len(bars):
+                return bars
+        return self._copy_out(
+            "candles", "exchange = %s AND symbol = %s AND timeframe = %s", (exchange, symbol, timeframe), start_ms, end_ms,
+        )
+
+    def load_timestamps(self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> np.ndarray:
+        """candles에 직접 저장된 해당 타임프레임 봉의 시작 시각(epoch ms, 정렬됨)만 조회합니다 (결측 구간 탐지용)."""
+        payload = self._copy_payload(
+            "(extract(epoch FROM ts) * 1000)::bigint", "candles", "exchange = %s AND symbol = %s AND timeframe = %s",
+            (exchange, symbol, timeframe), start_ms, end_ms,
+        )
+        return _decode_rows(payload, _TS_ROW)["ts"].astype(np.int64)
+
+    def _copy_out(self, relation: str, condition: str, params: tuple, start_ms: int, end_ms: int) -> OHLCV:
+        columns = "(extract(epoch FROM ts) * 1000)::bigint, open, high, low, close, volume"
+        return decode_copy_binary(self._copy_payload(columns, relation, condition, params, start_ms, end_ms))
+
+    def _copy_payload(self, columns: str, relation: str, condition: str, params: tuple, start_ms: int, end_ms: int) -> bytes:
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            query = cursor.mogrify(
+                f"SELECT {columns} FROM {relation} "
+                f"WHERE {condition} AND ts >= to_timestamp(%s / 1000.0) AND ts < to_timestamp(%s / 1000.0) ORDER BY ts",
+                params + (int(start_ms), int(end_ms)),
+            ).decode("utf-8")
+            stream = io.BytesIO()
+            cursor.copy_expert(f"COPY ({query}) TO STDOUT (FORMAT binary)", stream)
+            conn.commit()
+        finally:
+            conn.close()
+        return stream.getvalue()
+
+    def refresh_aggregates(self, start_ms: int, end_ms: int) -> None:
+        """
+        갱신 정책의 오프셋 범위 밖(과거 구간)에 1분봉을 적재한 뒤 호출하여 집계 뷰를 하위 뷰부터 다시 계산합니다.
+        refresh_continuous_aggregate는 구간에 완전히 포함된 버킷만 갱신하므로 구간을 가장 큰 버킷(1w)만큼 넓혀 전달합니다.
+        """
+        pad_ms = timeframe_ms("1w")
+        conn = self.connect()
+        try:
+            conn.driver_connection.autocommit = True # 트랜잭션 블록 안에서는 실행할 수 없음
+            cursor = conn.cursor()
+            for view in AGGREGATE_VIEWS.values():
+                cursor.execute(
+                    "CALL refresh_continuous_aggregate(%s, to_timestamp(%s / 1000.0), to_timestamp(%s / 1000.0))",
+                    (view, int(start_ms - pad_ms), int(end_ms + pad_ms)),
+                )
+        finally:
+            conn.close()
+        logger.info(f"Refreshed {len(AGGREGATE_VIEWS)} candle aggregates for [{start_ms}, {end_ms}).")
+
+    def read_through(self, fallback: DataSource) -> DataSource:
+        """
+        저장소를 먼저 조회하고, 저장된 봉에서 빠진 구간(find_gaps)만 fallback(거래소 조회)으로 가져와 합친 뒤 저장소에 적재하는 데이터 소스.
+        결측 검사는 마감된 봉까지만 하며 (현재 봉은 저장된 값을 그대로 사용), 가까운 결측 구간은 거래소 요청 한 번(CCXT_FETCH_LIMIT 봉) 안에 들어오면 합쳐서 가져옵니다.
+        월봉은 고정 격자가 없으므로 구간에 봉이 하나도 없을 때만 fallback을 사용합니다.
+        """
+        def source(exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> OHLCV:
+            data = self.load(exchange, ticker, timeframe, start_ms, end_ms)
+            if timeframe == "1M":
+                gaps = [] if len(data) else [(start_ms, end_ms)]
+            else:
+                step = timeframe_ms(timeframe)
+                closed_until = min(end_ms, ceil_to_bar(int(time.time() * 1000) - step + 1, timeframe))
+                gaps = _merge_gaps(find_gaps(data.ts, start_ms, closed_until, timeframe), step * CCXT_FETCH_LIMIT)
+                if not len(data) and closed_until < end_ms:
+                    gaps.append((closed_until, end_ms))  # 저장된 봉이 없으면 마감 전 현재 봉까지 거래소에서 (기존 동작)
+            if not gaps:
+                return data
+            fetched = [fallback(exchange, ticker, timeframe, lo, hi) for lo, hi in gaps]
+            combined = _concat([data, *(bars for bars in fetched if len(bars))])
+            combined = _take(combined, np.flatnonzero((combined.ts >= start_ms) & (combined.ts < end_ms)))
+            _, first = np.unique(combined.ts, return_index=True)  # 같은 시각이면 앞에 둔 저장된 봉을 사용 (결과는 시각순)
+            merged = _take(combined, first)
+            added = _take(merged, np.flatnonzero(~np.isin(merged.ts, data.ts)))
+            if len(added):
+                try:
+                    self.ingest(exchange, ticker, timeframe, added)
+                except Exception as e:
+                    logger.error(f"Failed to store fetched candles for {exchange}:{ticker} {timeframe}: {e}", exc_info=True)
+                logger.info(f"Filled {len(gaps)} gap(s) with {len(added)} fetched {timeframe} candles for {exchange}:{ticker}.")
+            return merged
+        return source
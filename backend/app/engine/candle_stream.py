@@ -0,0 +1,367 @@
+# file: backend/app/engine/candle_stream.py
+
+import os
+import time
+import asyncio
+import logging
+import argparse
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data import TIMEFRAME_ORDER, MarketDataUnavailableError, bar_close_ms, bar_start_ms, timeframe_ms
+
+logger = logging.getLogger(__name__)
+
+# --- 체결 스트림 -> 봉 집계 ---
+# 거래소 체결(또는 테스트용 재생 체결)을 받아 1분봉을 체결 단위 O(1)로 갱신하고, 1분봉이 마감될 때마다 상위 타임프레임 봉에
+# O(1)로 합칩니다. 봉은 다음 체결을 기다리지 않고 마감 시각 + CLOSE_GRACE_MS(늦게 도착하는 체결 허용)에 정확히 마감되며,
+# 마감된 봉은 Redis 스트림 candles:{거래소}:{심볼}:{타임프레임}에 마감 시각을 ID로 하여 추가됩니다.
+# 라이브 봇/모의 매매는 CandleSubscriber로 이 스트림을 구독합니다.
+CANDLE_STREAM_TIMEFRAMES = tuple(
+    tf for tf in os.getenv("CANDLE_STREAM_TIMEFRAMES", "1m,5m,15m,30m,1h,4h,1d").split(",") if tf in TIMEFRAME_ORDER
+)
+CANDLE_STREAM_MAXLEN = int(os.getenv("CANDLE_STREAM_MAXLEN", "10000")) # 스트림별 보관 봉 수 (근사 상한)
+CLOSE_GRACE_MS = int(os.getenv("CANDLE_STREAM_CLOSE_GRACE_MS", "500"))
+TRADE_POLL_INTERVAL_S = float(os.getenv("CANDLE_STREAM_POLL_INTERVAL_S", "1.0")) # 웹소켓(ccxt.pro)이 없을 때 REST 폴링 주기
+STREAM_KEY_PREFIX = "candles:"
+
+BASE_TIMEFRAME = "1m"
+_BASE_MS = timeframe_ms(BASE_TIMEFRAME)
+
+Trade = Tuple[int, float, float]  # (체결 시각 ms, 가격, 수량)
+
+
+def stream_key(exchange: str, symbol: str, timeframe: str) -> str:
+    return f"{STREAM_KEY_PREFIX}{exchange}:{symbol}:{timeframe}"
+
+
+class Bar:
+    """집계 중이거나 마감된 봉 하나. [ts, end) 구간이며 갱신은 필드 대입만 합니다."""
+    __slots__ = ("ts", "end", "open", "high", "low", "close", "volume", "trades")
+
+    def __init__(self, ts: int, end: int, open_: float, high: float, low: float, close: float, volume: float, trades: int):
+        self.ts, self.end = ts, end
+        self.open, self.high, self.low, self.close = open_, high, low, close
+        self.volume, self.trades = volume, trades
+
+    def to_fields(self) -> Dict[str, Any]:
+        return {
+            "ts": self.ts, "end": self.end, "open": repr(self.open), "high": repr(self.high), "low": repr(self.low),
+            "close": repr(self.close), "volume": repr(self.volume), "trades": self.trades,
+        }
+
+    @classmethod
+    def from_fields(cls, fields: Dict[Any, Any]) -> "Bar":
+        f = {(k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v) for k, v in fields.items()}
+        return cls(
+            int(f["ts"]), int(f["end"]), float(f["open"]), float(f["high"]), float(f["low"]),
+            float(f["close"]), float(f["volume"]), int(f["trades"]),
+        )
+
+
+CloseHandler = Callable[[str, str, str, Bar], None]  # (거래소, 심볼, 타임프레임, 마감된 봉)
+
+
+class CandleAggregator:
+    """
+    (거래소, 심볼) 하나의 체결을 봉으로 집계합니다.
+    - add_trade: 진행 중인 1분봉 갱신. 체결 시각이 다음 분이면 현재 1분봉을 먼저 마감합니다.
+    - advance(now_ms): 마감 시각 + grace_ms가 지난 봉을 체결 없이도 마감합니다 (next_deadline_ms까지 대기 후 호출).
+    이미 마감된 1분봉 구간의 늦은 체결은 버리고 late_trades로 집계합니다 (저장소는 백필이 보정).
+    체결이 없던 분에는 봉을 만들지 않습니다.
+    """
+    def __init__(self, exchange: str, symbol: str, timeframes: Sequence[str] = CANDLE_STREAM_TIMEFRAMES,
+                 on_close: Optional[CloseHandler] = None, grace_ms: int = CLOSE_GRACE_MS):
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAME_ORDER]
+        if unknown:
+            raise ValueError(f"Unsupported timeframe(s): {', '.join(unknown)}")
+        self.exchange = exchange
+        self.symbol = symbol
+        self.emit_base = BASE_TIMEFRAME in timeframes
+        self.higher = [tf for tf in TIMEFRAME_ORDER if tf in timeframes and tf != BASE_TIMEFRAME]
+        self.on_close = on_close
+        self.grace_ms = grace_ms
+        self._minute: Optional[Bar] = None
+        self._partials: Dict[str, Optional[Bar]] = {tf: None for tf in self.higher}
+        self._closed_until = 0  # 마지막으로 마감한 1분봉의 종료 시각
+        self.trades = 0
+        self.late_trades = 0
+        self.bars_closed = 0
+
+    def add_trade(self, ts: int, price: float, amount: float) -> None:
+        if ts < self._closed_until:
+            self.late_trades += 1
+            return
+        bar = self._minute
+        if bar is not None and ts >= bar.end:
+            self._close_minute()
+            bar = None
+        if bar is None:
+            start = ts - ts % _BASE_MS
+            self._minute = Bar(start, start + _BASE_MS, price, price, price, price, amount, 1)
+        else:
+            if price > bar.high:
+                bar.high = price
+            elif price < bar.low:
+                bar.low = price
+            bar.close = price
+            bar.volume += amount
+            bar.trades += 1
+        self.trades += 1
+
+    def advance(self, now_ms: int) -> None:
+        cutoff = now_ms - self.grace_ms
+        if self._minute is not None and self._minute.end <= cutoff:
+            self._close_minute()
+        for tf in self.higher:
+            partial = self._partials[tf]
+            if partial is not None and partial.end <= cutoff and (self._minute is None or self._minute.ts >= partial.end):
+                self._partials[tf] = None
+                self._emit(tf, partial)
+
+    def next_deadline_ms(self) -> Optional[int]:
+        """다음으로 마감될 봉의 마감 처리 시각 (진행 중인 봉이 없으면 None)."""
+        ends = [bar.end for bar in [self._minute, *self._partials.values()] if bar is not None]
+        return min(ends) + self.grace_ms if ends else None
+
+    def _close_minute(self) -> None:
+        minute = self._minute
+        self._minute = None
+        self._closed_until = minute.end
+        if self.emit_base:
+            self._emit(BASE_TIMEFRAME, minute)
+        for tf in self.higher:
+            self._fold(tf, minute)
+
+    def _fold(self, timeframe: str, minute: Bar) -> None:
+        partial = self._partials[timeframe]
+        if partial is not None and minute.ts >= partial.end:
+            # 체결이 없어 마지막 분이 비었던 상위 봉은 다음 분봉이 올 때 마감
+            self._emit(timeframe, partial)
+            partial = None
+        if partial is None:
+            start_arr = bar_start_ms(np.array([minute.ts], dtype=np.int64), timeframe)
+            start, end = int(start_arr[0]), int(bar_close_ms(start_arr, timeframe)[0])
+            partial = Bar(start, end, minute.open, minute.high, minute.low, minute.close, minute.volume, minute.trades)
+        else:
+            partial.high = max(partial.high, minute.high)
+            partial.low = min(partial.low, minute.low)
+            partial.close = minute.close
+            partial.volume += minute.volume
+            partial.trades += minute.trades
+        if minute.end >= partial.end:
+            self._emit(timeframe, partial)
+            partial = None
+        self._partials[timeframe] = partial
+
+    def _emit(self, timeframe: str, bar: Bar) -> None:
+        self.bars_closed += 1
+        if self.on_close is not None:
+            try:
+                self.on_close(self.exchange, self.symbol, timeframe, bar)
+            except Exception as e:
+                logger.error(f"Failed to publish {timeframe} bar {bar.ts} for {self.exchange}:{self.symbol}: {e}", exc_info=True)
+
+
+# --- 체결 피드 ---
+
+class TradeFeed(ABC):
+    """체결 묶음을 차례로 내보내는 비동기 피드. now_ms()는 봉 마감 판정에 쓰는 시계입니다."""
+    realtime = True  # False이면 체결 시각이 곧 시계 (재생 피드)
+
+    @abstractmethod
+    def batches(self) -> AsyncIterator[List[Trade]]:
+        """체결 [(ts, price, amount), ...] 묶음을 시각순으로 내보냅니다."""
+
+    def now_ms(self) -> int:
+        return int(time.time() * 1000)
+
+    async def close(self) -> None:
+        pass
+
+
+def open_trade_client(exchange: str) -> Tuple[Any, bool]:
+    """
+    체결 수신용 ccxt 클라이언트와 웹소켓 여부를 반환합니다. ccxt.pro가 있으면 웹소켓 클라이언트(심볼 여러 개를 연결 하나로 구독),
+    없으면 ccxt.async_support REST 클라이언트입니다.
+    """
+    try:
+        import ccxt.pro as ccxt_ws  # 선택 의존성
+        streaming = True
+    except ImportError:
+        try:
+            import ccxt.async_support as ccxt_ws  # 선택 의존성: 워커 환경에만 설치됨
+        except ImportError:
+            raise MarketDataUnavailableError("ccxt is not installed; no trade feed is available.")
+        streaming = False
+    exchange_cls = getattr(ccxt_ws, exchange, None)
+    if exchange_cls is None:
+        raise MarketDataUnavailableError(f"Unknown exchange: {exchange}")
+    return exchange_cls({"enableRateLimit": True}), streaming
+
+
+class CcxtTradeFeed(TradeFeed):
+    """
+    ccxt.pro가 있으면 웹소켓 watch_trades, 없으면 ccxt.async_support fetch_trades 폴링으로 체결을 받습니다.
+    client를 넘기면 그 연결을 공유하며 close()에서 닫지 않습니다 (연결 소유자가 닫음).
+    """
+    def __init__(self, exchange: str, symbol: str, poll_interval_s: float = TRADE_POLL_INTERVAL_S,
+                 client: Optional[Tuple[Any, bool]] = None):
+        self._owns_client = client is None
+        self._client, self.streaming = client or open_trade_client(exchange)
+        self.exchange = exchange
+        self.symbol = symbol
+        self.poll_interval_s = poll_interval_s
+
+    async def batches(self) -> AsyncIterator[List[Trade]]:
+        since: Optional[int] = None
+        seen_at_since: set = set()
+        while True:
+            if self.streaming:
+                raw = await self._client.watch_trades(self.symbol)
+            else:
+                raw = await self._client.fetch_trades(self.symbol, since=since)
+            batch: List[Trade] = []
+            for trade in raw:
+                ts, trade_id = int(trade["timestamp"]), trade.get("id")
+                # 폴링은 since 시각의 체결을 다시 받으므로 같은 시각의 체결 id로 중복 제거
+                if since is not None and (ts < since or (ts == since and trade_id in seen_at_since)):
+                    continue
+                if since is None or ts > since:
+                    since, seen_at_since = ts, set()
+                seen_at_since.add(trade_id)
+                batch.append((ts, float(trade["price"]), float(trade["amount"])))
+            if batch:
+                yield batch
+            if not self.streaming:
+                await asyncio.sleep(self.poll_interval_s)
+
+    async def close(self) -> None:
+        if self._owns_client:
+            await self._client.close()
+
+
+class ReplayTradeFeed(TradeFeed):
+    """
+    테스트/모의 매매용 재생 피드. trades는 (ts, price, amount) 배열이며 시계는 재생한 마지막 체결 시각입니다.
+    speed > 0이면 체결 간격을 speed배 빠르게 실제로 기다리고, 0이면 즉시 재생합니다. 끝나면 시계를 end_ms로 옮깁니다.
+    """
+    realtime = False
+
+    def __init__(self, trades: Any, batch_size: int = 1000, speed: float = 0.0, end_ms: Optional[int] = None):
+        self.trades = np.asarray(trades, dtype=np.float64).reshape(-1, 3)
+        self.batch_size = max(1, batch_size)
+        self.speed = speed
+        self.end_ms = end_ms
+        self._now = int(self.trades[0, 0]) if len(self.trades) else 0
+
+    async def batches(self) -> AsyncIterator[List[Trade]]:
+        for start in range(0, len(self.trades), self.batch_size):
+            chunk = self.trades[start:start + self.batch_size]
+            if self.speed > 0:
+                await asyncio.sleep(max(0.0, (chunk[-1, 0] - self._now) / 1000.0 / self.speed))
+            self._now = int(chunk[-1, 0])
+            yield [(int(ts), float(price), float(amount)) for ts, price, amount in chunk]
+        if self.end_ms is not None:
+            self._now = max(self._now, self.end_ms)
+
+    def now_ms(self) -> int:
+        return self._now
+
+
+async def run_aggregator(feed: TradeFeed, aggregator: CandleAggregator) -> None:
+    """
+    피드가 끝날 때까지 체결을 집계합니다. 실시간 피드는 별도 타이머가 다음 마감 시각까지 기다렸다가 advance를 호출하므로
+    체결이 뜸한 심볼도 봉이 제시간에 마감됩니다. 재생 피드는 체결 시각 기준으로 묶음마다 마감을 판정합니다.
+    """
+    async def clock() -> None:
+        while True:
+            deadline = aggregator.next_deadline_ms()
+            delay = 1.0 if deadline is None else (deadline - feed.now_ms()) / 1000.0
+            await asyncio.sleep(min(max(delay, 0.0), 1.0))
+            aggregator.advance(feed.now_ms())
+
+    timer = asyncio.create_task(clock()) if feed.realtime else None
+    try:
+        async for batch in feed.batches():
+            for ts, price, amount in batch:
+                aggregator.add_trade(ts, price, amount)
+            aggregator.advance(feed.now_ms())
+        aggregator.advance(feed.now_ms())
+    finally:
+        if timer is not None:
+            timer.cancel()
+        await feed.close()
+
+
+# --- Redis 스트림 발행/구독 ---
+
+def _redis_client():
+    import redis  # celery[redis] 의존성으로 설치됨
+    return redis.Redis.from_url(os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"))
+
+
+class RedisCandlePublisher:
+    """마감된 봉을 Redis 스트림에 추가합니다. 항목 ID는 봉 마감 시각이므로 재시작 후 같은 봉을 다시 보내면 무시됩니다."""
+    def __init__(self, client: Any = None, maxlen: int = CANDLE_STREAM_MAXLEN):
+        self.client = client or _redis_client()
+        self.maxlen = maxlen
+
+    def __call__(self, exchange: str, symbol: str, timeframe: str, bar: Bar) -> None:
+        import redis
+        try:
+            self.client.xadd(stream_key(exchange, symbol, timeframe), bar.to_fields(), id=f"{bar.end}-0",
+                             maxlen=self.maxlen, approximate=True)
+        except redis.ResponseError as e:
+            if "equal or smaller" not in str(e):
+                raise
+            logger.info(f"Skipped already published {timeframe} bar {bar.ts} for {exchange}:{symbol}.")
+
+
+class CandleSubscriber:
+    """
+    봉 마감 스트림 구독자. wait()는 새 마감 봉이 올 때까지(최대 timeout_ms) 기다렸다가 마감된 봉 목록을 반환합니다.
+    last_id 기본값 "$"는 구독 시작 이후 마감된 봉만 받습니다.
+    """
+    def __init__(self, exchange: str, symbol: str, timeframe: str, client: Any = None, last_id: str = "$"):
+        self.key = stream_key(exchange, symbol, timeframe)
+        self.client = client or _redis_client()
+        self.last_id = last_id
+
+    def wait(self, timeout_ms: int) -> List[Bar]:
+        response = self.client.xread({self.key: self.last_id}, block=max(1, int(timeout_ms)))
+        bars: List[Bar] = []
+        for _, entries in response or []:
+            for entry_id, fields in entries:
+                self.last_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+                bars.append(Bar.from_fields(fields))
+        return bars
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    집계 프로세스 실행: python -m backend.app.engine.candle_stream --exchange binance --symbol BTC/USDT --symbol ETH/USDT
+    심볼마다 체결 피드 하나와 집계기 하나를 같은 이벤트 루프에서 실행합니다.
+    """
+    parser = argparse.ArgumentParser(description="Aggregate exchange trades into candles on Redis streams.")
+    parser.add_argument("--exchange", required=True)
+    parser.add_argument("--symbol", action="append", required=True)
+    parser.add_argument("--timeframes", default=",".join(CANDLE_STREAM_TIMEFRAMES))
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    publisher = RedisCandlePublisher()
+    timeframes = [tf for tf in args.timeframes.split(",") if tf]
+
+    async def run_all() -> None:
+        await asyncio.gather(*(
+            run_aggregator(CcxtTradeFeed(args.exchange, symbol), CandleAggregator(args.exchange, symbol, timeframes, publisher))
+            for symbol in args.symbol
+        ))
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# file: backend/app/engine/compiler.py
+
+import json
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from pydantic import BaseModel
+
+from .data import TIMEFRAME_ORDER, TIMEFRAME_MS
+from .indicators import is_supported, indicator_lookback
+
+logger = logging.getLogger(__name__)
+
+# 전략 빌더(RuleBlock.tsx)는 교차 연산자를 번역된 라벨 그대로 저장하므로, 모든 표기를 내부 연산자로 정규화합니다.
+OPERATOR_ALIASES: Dict[str, str] = {
+    ">": ">", "<": "<", "=": "=", "==": "=", ">=": ">=", "<=": "<=",
+    "crossesAbove": "crosses_above", "crosses_above": "crosses_above",
+    "Crosses Above": "crosses_above", "상향 돌파": "crosses_above",
+    "crossesBelow": "crosses_below", "crosses_below": "crosses_below",
+    "Crosses Below": "crosses_below", "하향 돌파": "crosses_below",
+}
+
+
+class StrategyCompileError(ValueError):
+    """전략 규칙을 실행 가능한 형태로 변환할 수 없을 때 발생하는 예외."""
+
+
+def _digest(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# --- 컴파일된 규칙 트리 노드 ---
+# 모든 노드는 자신의 내용과 자식 노드 key로부터 계산한 해시(key)를 가집니다 (Merkle 트리).
+# 블록 id(nanoid)는 해시에서 제외하므로, 내용이 같은 서브트리는 어디에 있든 같은 key를 갖습니다.
+# 따라서 규칙 일부를 수정하면 수정된 노드와 그 조상 노드의 key만 바뀌고, 나머지 서브트리는 캐시를 그대로 재사용합니다.
+
+@dataclass(frozen=True)
+class OperandNode:
+    key: str
+    kind: str  # "indicator" | "value"
+    indicator_key: Optional[str] = None
+    params: Tuple[Tuple[str, Any], ...] = ()
+    timeframe: Optional[str] = None
+    constant: Optional[float] = None
+
+    @property
+    def params_dict(self) -> Dict[str, Any]:
+        return dict(self.params)
+
+    def children(self) -> Tuple["Node", ...]:
+        return ()
+
+
+@dataclass(frozen=True)
+class ConditionNode:
+    key: str
+    operator: str
+    left: OperandNode
+    right: OperandNode
+
+    def children(self) -> Tuple["Node", ...]:
+        return (self.left, self.right)
+
+
+@dataclass(frozen=True)
+class BlockNode:
+    key: str
+    condition: Optional[ConditionNode]
+    children_any: Optional["AnyNode"]
+    logic: str  # 자기 조건과 자식 그룹을 결합하는 연산자 ("AND" | "OR")
+
+    def children(self) -> Tuple["Node", ...]:
+        return tuple(node for node in (self.condition, self.children_any) if node is not None)
+
+
+@dataclass(frozen=True)
+class AnyNode:
+    """형제 블록 목록. 전략 빌더에서 같은 레벨의 블록은 OR로 연결됩니다."""
+    key: str
+    blocks: Tuple[BlockNode, ...]
+
+    def children(self) -> Tuple["Node", ...]:
+        return self.blocks
+
+
+Node = Union[OperandNode, ConditionNode, BlockNode, AnyNode]
+
+
+@dataclass(frozen=True)
+class CompiledStrategy:
+    key: str
+    buy: AnyNode
+    sell: AnyNode
+    timeframes: Tuple[str, ...]
+    max_lookback: int  # 지표별 자체 타임프레임 기준 최대 lookback 봉 수
+    warmup_ms: int  # 모든 지표가 유효해지기까지 필요한 과거 구간 길이
+
+    def iter_nodes(self) -> Iterator[Node]:
+        stack: List[Node] = [self.buy, self.sell]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children())
+
+    def lowest_timeframe(self) -> Optional[str]:
+        return self.timeframes[0] if self.timeframes else None
+
+
+def _as_dict(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
+
+def compile_operand(condition: Dict[str, Any]) -> OperandNode:
+    ctype = condition.get("type")
+    value = _as_dict(condition.get("value"))
+    if ctype == "value":
+        try:
+            constant = float(value)
+        except (TypeError, ValueError):
+            raise StrategyCompileError(f"Invalid constant value in condition: {value!r}")
+        return OperandNode(key=_digest("value", constant), kind="value", constant=constant)
+    if ctype == "indicator" and isinstance(value, dict):
+        indicator_key = value.get("indicatorKey")
+        if not is_supported(indicator_key):
+            raise StrategyCompileError(f"Unsupported indicator: {indicator_key}")
+        timeframe = value.get("timeframe")
+        if timeframe not in TIMEFRAME_ORDER:
+            raise StrategyCompileError(f"Unsupported timeframe: {timeframe}")
+        params = tuple(sorted((value.get("values") or {}).items()))
+        return OperandNode(
+            key=_digest("indicator", indicator_key, params, timeframe),
+            kind="indicator", indicator_key=indicator_key, params=params, timeframe=timeframe,
+        )
+    raise StrategyCompileError(f"Invalid condition: {condition!r}")
+
+
+def _compile_block(block: Dict[str, Any]) -> BlockNode:
+    condition_a = _as_dict(block.get("conditionA"))
+    condition_b = _as_dict(block.get("conditionB"))
+    condition: Optional[ConditionNode] = None
+    if condition_a and condition_b:
+        operator = OPERATOR_ALIASES.get(str(block.get("operator", "")).strip())
+        if operator is None:
+            raise StrategyCompileError(f"Unsupported operator: {block.get('operator')!r}")
+        left, right = compile_operand(condition_a), compile_operand(condition_b)
+        condition = ConditionNode(key=_digest("cond", operator, left.key, right.key), operator=operator, left=left, right=right)
+
+    children = [_as_dict(child) for child in block.get("children") or []]
+    children_any = _compile_any(children) if children else None
+    logic = block.get("logicOperator", "AND")
+    if logic not in ("AND", "OR"):
+        raise StrategyCompileError(f"Unsupported logic operator: {logic!r}")
+    key = _digest(
+        "block", logic,
+        condition.key if condition else None,
+        children_any.key if children_any else None,
+    )
+    return BlockNode(key=key, condition=condition, children_any=children_any, logic=logic)
+
+
+def _compile_any(blocks: List[Dict[str, Any]]) -> AnyNode:
+    compiled = tuple(_compile_block(_as_dict(block)) for block in blocks)
+    return AnyNode(key=_digest("any", [block.key for block in compiled]), blocks=compiled)
+
+
+def _normalize_rules(rules: Any) -> Dict[str, List[Dict[str, Any]]]:
+    # strategies.rules 컬럼에는 dict 또는 JSON 문자열이 저장되어 있을 수 있습니다.
+    if isinstance(rules, (str, bytes)):
+        rules = json.loads(rules)
+    if not isinstance(rules, dict):
+        raise StrategyCompileError("Strategy rules must be an object with 'buy' and 'sell' lists.")
+    return {side: [_as_dict(block) for block in rules.get(side) or []] for side in ("buy", "sell")}
+
+
+def compile_strategy(rules: Any) -> CompiledStrategy:
+    """전략 규칙(dict / JSON 문자열 / SignalBlockData 목록)을 해시 키를 가진 실행 트리로 컴파일합니다."""
+    normalized = _normalize_rules(rules)
+    if not normalized["buy"]:
+        # 매수 블록이 없으면 거래 없이 "성공"으로 끝나므로, 빈 규칙은 실행 전에 거부합니다.
+        raise StrategyCompileError("Strategy rules have no buy blocks.")
+    buy = _compile_any(normalized["buy"])
+    sell = _compile_any(normalized["sell"])
+
+    timeframes: Set[str] = set()
+    max_lookback = 0
+    warmup_ms = 0
+    strategy = CompiledStrategy(key=_digest("strategy", buy.key, sell.key), buy=buy, sell=sell, timeframes=(), max_lookback=0, warmup_ms=0)
+    for node in strategy.iter_nodes():
+        if isinstance(node, OperandNode) and node.kind == "indicator":
+            lookback = indicator_lookback(node.indicator_key, node.params_dict)
+            timeframes.add(node.timeframe)
+            max_lookback = max(max_lookback, lookback)
+            warmup_ms = max(warmup_ms, (lookback + 1) * TIMEFRAME_MS[node.timeframe])
+    ordered = tuple(tf for tf in TIMEFRAME_ORDER if tf in timeframes)
+    return CompiledStrategy(
+        key=strategy.key, buy=buy, sell=sell, timeframes=ordered,
+        max_lookback=max_lookback, warmup_ms=warmup_ms,
+    )
+
+
+def changed_subtrees(previous: CompiledStrategy, current: CompiledStrategy) -> Set[str]:
+    """이전 컴파일 결과에 없던(= 다시 계산해야 하는) 서브트리 key 집합을 반환합니다."""
+    previous_keys = {node.key for node in previous.iter_nodes()}
+    return {node.key for node in current.iter_nodes() if node.key not in previous_keys}
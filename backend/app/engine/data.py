@@ -0,0 +1,317 @@
+# file: backend/app/engine/data.py
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# --- 타임프레임 정의 ---
+# 플랜 설정(config.py)에서 사용하는 타임프레임 문자열과 동일한 키를 사용합니다.
+# "1M"(월봉)은 고정 길이가 아니므로 밀리초 값은 근사치이며, 리샘플링 시에는 달력 기준으로 처리합니다.
+TIMEFRAME_MS: Dict[str, int] = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+    "1w": 7 * 24 * 60 * 60_000,
+    "1M": 30 * 24 * 60 * 60_000,
+}
+TIMEFRAME_ORDER: List[str] = ["1m", "5m", "15m", "30m", "1h", "4h", "1d", "1w", "1M"]
+
+# 1970-01-01은 목요일이므로, 주봉을 월요일 00:00(UTC) 기준으로 맞추기 위한 오프셋
+_WEEK_OFFSET_MS = 4 * 24 * 60 * 60_000
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class MarketDataUnavailableError(RuntimeError):
+    """요청한 구간의 시세 데이터를 가져올 수 없을 때 발생하는 예외."""
+
+
+class InvalidMarketError(MarketDataUnavailableError):
+    """거래소가 요청 자체(없는 심볼 등)를 거부했을 때 발생하는 예외. 다시 시도해도 같은 결과입니다."""
+
+
+def timeframe_ms(timeframe: str) -> int:
+    if timeframe not in TIMEFRAME_MS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return TIMEFRAME_MS[timeframe]
+
+
+def to_epoch_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+@dataclass(frozen=True)
+class OHLCV:
+    """
+    단일 (거래소, 티커, 타임프레임) 시계열을 열(column) 단위 NumPy 배열로 보관합니다.
+    ts는 봉 시작 시각(epoch ms, int64)이며 모든 배열의 길이는 같습니다.
+    """
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    def column(self, name: str) -> np.ndarray:
+        return getattr(self, name)
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "OHLCV":
+        return OHLCV(*(getattr(self, name)[start:stop] for name in ("ts",) + OHLCV_COLUMNS))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[float]]) -> "OHLCV":
+        """CCXT fetch_ohlcv 형식([ts, o, h, l, c, v] 목록)의 데이터를 변환합니다."""
+        if len(rows) == 0:
+            return cls.empty()
+        arr = np.asarray(rows, dtype=np.float64)
+        return cls(
+            ts=arr[:, 0].astype(np.int64),
+            open=arr[:, 1].copy(), high=arr[:, 2].copy(), low=arr[:, 3].copy(),
+            close=arr[:, 4].copy(), volume=arr[:, 5].copy(),
+        )
+
+    def astype(self, dtype) -> "OHLCV":
+        """가격/거래량 열의 dtype을 바꾼 사본 (ts는 항상 int64). 이미 같은 dtype이면 그대로 반환합니다."""
+        if self.close.dtype == dtype:
+            return self
+        return OHLCV(self.ts, *(getattr(self, name).astype(dtype) for name in OHLCV_COLUMNS))
+
+    @classmethod
+    def empty(cls) -> "OHLCV":
+        empty = np.empty(0, dtype=np.float64)
+        return cls(np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty)
+
+
+# --- 정밀도 모드 ---
+# float32 모드는 대규모 파라미터 스윕에서 메모리와 대역폭을 절반으로 줄이기 위한 옵션입니다.
+# 시세/지표 배열은 float32, 거래 봉 인덱스는 int32로 보관하고 캐시되는 조건 마스크는 비트 단위로 압축합니다.
+# 누적 오차가 큰 계산(누적합, 평가 자산, 손익)은 항상 float64로 수행합니다.
+
+@dataclass(frozen=True)
+class Precision:
+    name: str
+    value_dtype: type  # 시세/지표 배열
+    index_dtype: type  # 거래 진입/청산 봉 인덱스
+    pack_masks: bool  # 서브트리 캐시에 조건 마스크를 np.packbits로 저장
+
+
+PRECISIONS: Dict[str, Precision] = {
+    "float64": Precision("float64", np.float64, np.int64, False),
+    "float32": Precision("float32", np.float32, np.int32, True),
+}
+DEFAULT_PRECISION = os.getenv("ENGINE_PRECISION", "float64")
+
+
+def get_precision(name: Optional[str] = None) -> Precision:
+    name = name or DEFAULT_PRECISION
+    if name not in PRECISIONS:
+        raise ValueError(f"Unsupported precision: {name}")
+    return PRECISIONS[name]
+
+
+def _bucket_ids(ts: np.ndarray, timeframe: str) -> np.ndarray:
+    if timeframe == "1M":
+        return ts.astype("datetime64[ms]").astype("datetime64[M]").astype(np.int64)
+    if timeframe == "1w":
+        return (ts - _WEEK_OFFSET_MS) // TIMEFRAME_MS["1w"]
+    return ts // timeframe_ms(timeframe)
+
+
+def _bucket_start_ms(bucket: np.ndarray, timeframe: str) -> np.ndarray:
+    if timeframe == "1M":
+        return bucket.astype("datetime64[M]").astype("datetime64[ms]").astype(np.int64)
+    if timeframe == "1w":
+        return bucket * TIMEFRAME_MS["1w"] + _WEEK_OFFSET_MS
+    return bucket * timeframe_ms(timeframe)
+
+
+def ceil_to_bar(ms: int, timeframe: str) -> int:
+    """ms 이후(포함) 첫 봉 시작 시각. 고정 길이 타임프레임 전용이며 주봉은 월요일 00:00(UTC) 기준입니다."""
+    if timeframe == "1M":
+        raise ValueError("1M has no fixed bar grid.")
+    step = timeframe_ms(timeframe)
+    origin = _WEEK_OFFSET_MS if timeframe == "1w" else 0
+    return origin + -((origin - ms) // step) * step
+
+
+def bar_start_ms(ts: np.ndarray, timeframe: str) -> np.ndarray:
+    """각 시각이 속한 봉의 시작 시각을 반환합니다."""
+    return _bucket_start_ms(_bucket_ids(ts, timeframe), timeframe)
+
+
+def bar_close_ms(ts: np.ndarray, timeframe: str) -> np.ndarray:
+    """각 봉이 마감되는 시각(= 다음 봉 시작 시각)을 반환합니다."""
+    if timeframe == "1M":
+        return _bucket_start_ms(_bucket_ids(ts, "1M") + 1, "1M")
+    return ts + timeframe_ms(timeframe)
+
+
+Gap = Tuple[int, int]  # [start_ms, end_ms)
+
+
+def find_gaps(ts: np.ndarray, start_ms: int, end_ms: int, timeframe: str) -> List[Gap]:
+    """
+    [start_ms, end_ms) 안에서 봉이 빠진 구간 목록. ts는 정렬된 봉 시작 시각이며 구간 밖 값은 무시합니다.
+    앞뒤에 구간 경계를 센티넬로 붙여 np.diff 한 번으로 앞/중간/뒤 결측을 함께 찾습니다.
+    """
+    step = timeframe_ms(timeframe)
+    first, stop = ceil_to_bar(start_ms, timeframe), ceil_to_bar(end_ms, timeframe)
+    if first >= stop:
+        return []
+    ts = np.asarray(ts, dtype=np.int64)
+    ts = ts[(ts >= first) & (ts < stop)]
+    edges = np.concatenate(([first - step], ts, [stop]))
+    holes = np.flatnonzero(np.diff(edges) > step)
+    return [(int(edges[i] + step), int(edges[i + 1])) for i in holes]
+
+
+def resample(data: OHLCV, timeframe: str) -> OHLCV:
+    """
+    하위 타임프레임 봉을 상위 타임프레임으로 집계합니다.
+    봉 경계는 벡터화된 bucket id 비교로 찾고, 각 열은 reduceat으로 한 번에 집계합니다.
+    """
+    if len(data) == 0:
+        return data
+    bucket = _bucket_ids(data.ts, timeframe)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    ends = np.concatenate((starts[1:], [len(data)])) - 1
+    return OHLCV(
+        ts=_bucket_start_ms(bucket[starts], timeframe),
+        open=data.open[starts],
+        high=np.maximum.reduceat(data.high, starts),
+        low=np.minimum.reduceat(data.low, starts),
+        close=data.close[ends],
+        volume=np.add.reduceat(data.volume, starts),
+    )
+
+
+def align_to(values: np.ndarray, source_ts: np.ndarray, source_tf: str, target_ts: np.ndarray, target_tf: str) -> np.ndarray:
+    """
+    상위 타임프레임 값을 실행 타임프레임 봉에 맞춰 펼칩니다.
+    각 실행 봉의 마감 시점에 이미 마감된 가장 최근 상위 봉의 값만 사용하므로 미래 참조가 발생하지 않습니다.
+    """
+    if source_tf == target_tf:
+        return values
+    source_close = bar_close_ms(source_ts, source_tf)
+    target_close = bar_close_ms(target_ts, target_tf)
+    idx = np.searchsorted(source_close, target_close, side="right") - 1
+    out = np.full(target_ts.shape[0], np.nan, dtype=values.dtype)
+    valid = idx >= 0
+    out[valid] = values[idx[valid]]
+    return out
+
+
+# --- 데이터 소스 ---
+# 시세 데이터는 교체 가능한 데이터 소스 함수를 통해 로드합니다.
+# 기본값은 CCXT를 통한 거래소 직접 조회이며, 저장소가 준비되면 set_data_source()로 교체합니다.
+DataSource = Callable[[str, str, str, int, int], OHLCV]
+
+CCXT_FETCH_LIMIT = int(os.getenv("ENGINE_CCXT_FETCH_LIMIT", "1000"))
+
+
+def _fetch_from_exchange(exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> OHLCV:
+    try:
+        import ccxt  # 선택 의존성: 워커 환경에만 설치됨
+    except ImportError:
+        raise MarketDataUnavailableError("ccxt is not installed; no market data source is available.")
+
+    exchange_cls = getattr(ccxt, exchange, None)
+    if exchange_cls is None:
+        raise MarketDataUnavailableError(f"Unknown exchange: {exchange}")
+    client = exchange_cls({"enableRateLimit": True})
+
+    rows: List[List[float]] = []
+    since = start_ms
+    step = timeframe_ms(timeframe)
+    while since < end_ms:
+        # ccxt 예외는 호출 측이 ccxt 없이도 처리할 수 있도록 엔진 예외로 바꿉니다.
+        try:
+            batch = client.fetch_ohlcv(ticker, timeframe=timeframe, since=since, limit=CCXT_FETCH_LIMIT)
+        except ccxt.BadRequest as e:
+            raise InvalidMarketError(f"{exchange} rejected {ticker} {timeframe}: {e}") from e
+        except ccxt.BaseError as e:
+            raise MarketDataUnavailableError(f"{exchange} request for {ticker} {timeframe} failed: {e}") from e
+        if not batch:
+            break
+        rows.extend(row for row in batch if row[0] < end_ms)
+        next_since = int(batch[-1][0]) + step
+        if next_since <= since:
+            break
+        since = next_since
+    logger.info(f"Fetched {len(rows)} {timeframe} candles for {exchange}:{ticker} from exchange.")
+    return OHLCV.from_rows(rows)
+
+
+_data_source: DataSource = _fetch_from_exchange
+
+
+def set_data_source(source: DataSource) -> None:
+    global _data_source
+    _data_source = source
+
+
+def get_data_source() -> DataSource:
+    return _data_source
+
+
+def load_ohlcv(exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> OHLCV:
+    """[start_ms, end_ms) 구간의 봉을 현재 데이터 소스에서 로드합니다."""
+    data = _data_source(exchange, ticker, timeframe, start_ms, end_ms)
+    if len(data) == 0:
+        raise MarketDataUnavailableError(
+            f"No {timeframe} candles for {exchange}:{ticker} in [{start_ms}, {end_ms})."
+        )
+    return data
+
+
+class RecentBarsCache:
+    """
+    (거래소, 티커, 타임프레임)별 최근 N개 봉을 프로세스 메모리에 보관하는 캐시.
+    미리보기처럼 짧은 지연 시간이 필요한 경로에서 매 요청마다 데이터를 다시 로드하지 않도록 합니다.
+    봉 하나가 새로 마감될 시간이 지나면(최소 ttl_floor_s) 다시 로드합니다.
+    """
+    def __init__(self, max_series: int = 64, ttl_floor_s: float = 60.0):
+        self.max_series = max_series
+        self.ttl_floor_ms = int(ttl_floor_s * 1000)
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, exchange: str, ticker: str, timeframe: str, bars: int) -> OHLCV:
+        key = (exchange, ticker, timeframe)
+        now_ms = int(time.time() * 1000)
+        ttl_ms = max(self.ttl_floor_ms, timeframe_ms(timeframe))
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            loaded_at, data = entry
+            if now_ms - loaded_at < ttl_ms and len(data) >= bars:
+                return data.slice(len(data) - bars)
+
+        data = load_ohlcv(exchange, ticker, timeframe, now_ms - bars * timeframe_ms(timeframe), now_ms)
+        with self._lock:
+            if len(self._entries) >= self.max_series and key not in self._entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                self._entries.pop(oldest)
+            self._entries[key] = (now_ms, data)
+        return data.slice(max(0, len(data) - bars))
+
+
+recent_bars_cache = RecentBarsCache()
@@ -0,0 +1,279 @@
+# file: backend/app/engine/disk_cache.py
+
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .data import OHLCV, OHLCV_COLUMNS, TIMEFRAME_MS, DataSource, ceil_to_bar, timeframe_ms
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl  # 워커(리눅스)에서 프로세스 간 파일 잠금
+except ImportError:  # pragma: no cover - Windows 개발 환경
+    fcntl = None
+
+# --- 워커 로컬 디스크 열 단위 시세 캐시 ---
+# (거래소, 심볼, 타임프레임, 연도)마다 .npy 파일 하나에 OHLCV 5개 열을 (5, 슬롯 수) 배열로 저장합니다.
+# 슬롯은 해당 연도의 봉 시작 시각 격자이므로 ts는 저장하지 않고 슬롯 번호로 계산하며, 봉이 없는 슬롯은 NaN입니다.
+# 각 열이 연속된 메모리이므로 구간 조회는 np.load(mmap_mode="r")의 슬라이스(복사 없음)로 처리합니다.
+# 기록은 파일을 복사한 임시 파일에 한 뒤 os.replace로 교체하므로, 이미 반환된 memmap 슬라이스(실행 중인 백테스트,
+# 웜 워커 시계열, 스냅샷 해시 계산)는 이전 inode를 계속 보며 실행 도중 값이 바뀌지 않습니다.
+# 파일 옆의 .json 매니페스트에는 DB에서 이미 가져온 구간(covered)과 파일 SHA-256을 기록하며, 없는 구간만 DB에서 가져옵니다.
+DISK_CACHE_ENABLED = os.getenv("ENGINE_DISK_CACHE", "1") == "1"
+DISK_CACHE_DIR = os.getenv("ENGINE_DISK_CACHE_DIR", os.path.join(os.getcwd(), "market_cache"))
+# 이보다 최근 구간은 DB 적재가 늦을 수 있으므로 마지막으로 받은 봉까지만 covered로 기록합니다.
+DISK_CACHE_SETTLE_MS = int(float(os.getenv("ENGINE_DISK_CACHE_SETTLE_S", "3600")) * 1000)
+
+_GAP = np.nan
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _year_bounds(year: int) -> Tuple[int, int]:
+    start = datetime(year, 1, 1, tzinfo=timezone.utc)
+    end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+
+def _year_of(ms: int) -> int:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).year
+
+
+def _merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _missing_ranges(covered: List[List[int]], start: int, end: int) -> List[Tuple[int, int]]:
+    missing, cursor = [], start
+    for c_start, c_end in covered:
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            missing.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class YearFile:
+    """연도 파일 하나의 경로/슬롯 격자. 슬롯 i의 봉 시작 시각은 first_ts + i * step입니다."""
+    def __init__(self, directory: str, exchange: str, symbol: str, timeframe: str, year: int):
+        self.timeframe = timeframe
+        self.step = timeframe_ms(timeframe)
+        year_start, year_end = _year_bounds(year)
+        self.first_ts = ceil_to_bar(year_start, timeframe)
+        self.end_ts = ceil_to_bar(year_end, timeframe)
+        self.slots = (self.end_ts - self.first_ts) // self.step
+        name = _SAFE_NAME.sub("-", f"{exchange}_{symbol}_{timeframe}_{year}")
+        self.path = os.path.join(directory, f"{name}.npy")
+        self.manifest_path = os.path.join(directory, f"{name}.json")
+        self.header = {"exchange": exchange, "symbol": symbol, "timeframe": timeframe, "year": year}
+
+    def slot(self, ms: int) -> int:
+        """ms 이후(포함) 첫 슬롯 번호 (파일 범위로 잘라냄)."""
+        return int(min(max((ceil_to_bar(ms, self.timeframe) - self.first_ts) // self.step, 0), self.slots))
+
+
+class DiskCandleCache:
+    """
+    DB 데이터 소스 앞단의 디스크 캐시. wrap(source)이 반환하는 데이터 소스는 다음 순서로 동작합니다.
+    1. 요청 구간을 연도 파일 단위로 나누고, 매니페스트의 covered에 없는 구간만 source로 가져와 파일에 기록
+    2. 파일을 읽기 전용 memmap으로 열어 슬라이스를 반환 (봉이 빠진 슬롯이 없고 연도를 넘지 않으면 복사 없음)
+    아직 마감되지 않은 봉(현재 봉)은 캐시하지 않고 매번 source에서 가져옵니다.
+    """
+    def __init__(self, directory: str = DISK_CACHE_DIR):
+        self.directory = directory
+        self._verified: Dict[str, Tuple[int, int]] = {}  # 경로 -> 체크섬을 검증한 (mtime_ns, 크기)
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+
+    def wrap(self, source: DataSource) -> DataSource:
+        def cached_source(exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> OHLCV:
+            if timeframe not in TIMEFRAME_MS or timeframe == "1M":  # 월봉은 고정 격자가 아니므로 캐시하지 않음
+                return source(exchange, ticker, timeframe, start_ms, end_ms)
+            return self.load(source, exchange, ticker, timeframe, start_ms, end_ms)
+        return cached_source
+
+    def load(self, source: DataSource, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> OHLCV:
+        step = timeframe_ms(timeframe)
+        open_bar_ms = ceil_to_bar(int(time.time() * 1000) - step + 1, timeframe)  # 현재 진행 중인 봉의 시작 시각
+        cache_end = min(end_ms, open_bar_ms)
+        parts: List[OHLCV] = []
+        if start_ms < cache_end:
+            for year in range(_year_of(start_ms), _year_of(cache_end - 1) + 1):
+                year_file = YearFile(self.directory, exchange, symbol, timeframe, year)
+                lo, hi = max(start_ms, year_file.first_ts), min(cache_end, year_file.end_ts)
+                if lo < hi:
+                    part = self._read_year(source, year_file, lo, hi)
+                    if len(part):
+                        parts.append(part)
+        if end_ms > cache_end:
+            live = source(exchange, symbol, timeframe, max(start_ms, cache_end), end_ms)
+            if len(live):
+                parts.append(live)
+        if not parts:
+            return OHLCV.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return OHLCV(*(np.concatenate([p.column(name) for p in parts]) for name in ("ts",) + OHLCV_COLUMNS))
+
+    def invalidate(self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> None:
+        """[start_ms, end_ms) 구간을 covered에서 제거하여 다음 조회 때 DB에서 다시 가져오게 합니다 (백필/수정 후 호출)."""
+        if timeframe not in TIMEFRAME_MS or timeframe == "1M":
+            return
+        for year in range(_year_of(start_ms), _year_of(max(start_ms, end_ms - 1)) + 1):
+            year_file = YearFile(self.directory, exchange, symbol, timeframe, year)
+            with self._file_lock(year_file):
+                manifest = self._read_manifest(year_file)
+                if manifest is None:
+                    continue
+                covered: List[List[int]] = []
+                for c_start, c_end in manifest["covered"]:
+                    covered += [[s, e] for s, e in ((c_start, min(c_end, start_ms)), (max(c_start, end_ms), c_end)) if s < e]
+                manifest["covered"] = covered
+                self._write_manifest(year_file, manifest)
+
+    # --- 내부 구현 ---
+
+    def _read_year(self, source: DataSource, year_file: YearFile, start_ms: int, end_ms: int) -> OHLCV:
+        manifest = self._read_manifest(year_file)
+        self._fetch_missing(source, year_file, manifest, start_ms, end_ms)
+        columns = self._open(year_file)
+        if columns is None and manifest is not None:
+            # 체크섬 불일치로 파일이 폐기된 경우 구간 전체를 다시 가져옵니다.
+            self._fetch_missing(source, year_file, None, start_ms, end_ms)
+            columns = self._open(year_file)
+        if columns is None:
+            return OHLCV.empty()
+        lo, hi = year_file.slot(start_ms), year_file.slot(end_ms)
+        view = columns[:, lo:hi]
+        present = ~np.isnan(view[OHLCV_COLUMNS.index("close")])
+        ts = year_file.first_ts + np.arange(lo, hi, dtype=np.int64) * year_file.step
+        if present.all():
+            return OHLCV(ts, *view)
+        return OHLCV(ts[present], *(row[present] for row in view))
+
+    def _fetch_missing(self, source: DataSource, year_file: YearFile, manifest: Optional[Dict[str, Any]], start_ms: int, end_ms: int) -> None:
+        missing = _missing_ranges(manifest["covered"] if manifest else [], start_ms, end_ms)
+        if missing:
+            header = year_file.header
+            self._store(year_file, [(lo, hi, source(header["exchange"], header["symbol"], year_file.timeframe, lo, hi)) for lo, hi in missing])
+
+    def _store(self, year_file: YearFile, fetched: List[Tuple[int, int, OHLCV]]) -> None:
+        """가져온 봉을 슬롯에 기록하고 covered/체크섬을 갱신합니다. 빈 결과는 covered에 넣지 않습니다 (아직 적재 전일 수 있음)."""
+        fetched = [(lo, hi, bars) for lo, hi, bars in fetched if len(bars)]
+        if not fetched:
+            return
+        settled_ms = int(time.time() * 1000) - DISK_CACHE_SETTLE_MS
+        os.makedirs(self.directory, exist_ok=True)
+        with self._file_lock(year_file):
+            manifest = self._read_manifest(year_file)
+            tmp_path = f"{year_file.path}.tmp"
+            if manifest is None or not os.path.exists(year_file.path):
+                columns = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float64, shape=(len(OHLCV_COLUMNS), year_file.slots))
+                columns[:] = _GAP
+                manifest = {**year_file.header, "first_ts": year_file.first_ts, "step_ms": year_file.step, "slots": year_file.slots, "covered": []}
+            else:
+                shutil.copyfile(year_file.path, tmp_path)  # 열려 있는 memmap이 보는 원본은 수정하지 않음
+                columns = np.load(tmp_path, mmap_mode="r+")
+            for lo, hi, bars in fetched:
+                columns[:, year_file.slot(lo):year_file.slot(hi)] = _GAP  # 무효화 후 다시 가져온 구간의 이전 값 제거
+                on_grid = (bars.ts - year_file.first_ts) % year_file.step == 0
+                idx = (bars.ts - year_file.first_ts) // year_file.step
+                keep = on_grid & (idx >= 0) & (idx < year_file.slots)
+                for row, name in enumerate(OHLCV_COLUMNS):
+                    columns[row, idx[keep]] = bars.column(name)[keep]
+                manifest["covered"].append([lo, hi if hi <= settled_ms else min(hi, int(bars.ts[-1]) + year_file.step)])
+            columns.flush()
+            del columns
+            manifest["covered"] = _merge_ranges(manifest["covered"])
+            manifest["sha256"] = _file_sha256(tmp_path)
+            os.replace(tmp_path, year_file.path)
+            self._write_manifest(year_file, manifest)
+            stat = os.stat(year_file.path)
+            with self._lock:
+                self._verified[year_file.path] = (stat.st_mtime_ns, stat.st_size)
+        logger.info(f"Disk cache {os.path.basename(year_file.path)}: stored {sum(len(b) for _, _, b in fetched)} bars.")
+
+    def _open(self, year_file: YearFile) -> Optional[np.ndarray]:
+        """파일을 읽기 전용 memmap으로 엽니다. 프로세스에서 처음 여는 파일(또는 변경된 파일)은 체크섬을 검증하고, 불일치하면 삭제합니다."""
+        try:
+            stat = os.stat(year_file.path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            verified = self._verified.get(year_file.path) == (stat.st_mtime_ns, stat.st_size)
+        if not verified:
+            # 다른 프로세스가 기록 중인 파일을 불일치로 오인하지 않도록 쓰기 잠금 안에서 검증합니다.
+            with self._file_lock(year_file):
+                if not os.path.exists(year_file.path):
+                    return None
+                stat = os.stat(year_file.path)
+                manifest = self._read_manifest(year_file)
+                if manifest is None or manifest.get("sha256") != _file_sha256(year_file.path):
+                    logger.warning(f"Disk cache checksum mismatch for {year_file.path}; discarding.")
+                    for path in (year_file.path, year_file.manifest_path):
+                        if os.path.exists(path):
+                            os.remove(path)
+                    return None
+            with self._lock:
+                self._verified[year_file.path] = (stat.st_mtime_ns, stat.st_size)
+        return np.load(year_file.path, mmap_mode="r")
+
+    def _read_manifest(self, year_file: YearFile) -> Optional[Dict[str, Any]]:
+        try:
+            with open(year_file.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_manifest(self, year_file: YearFile, manifest: Dict[str, Any]) -> None:
+        tmp_path = f"{year_file.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, year_file.manifest_path)
+
+    @contextmanager
+    def _file_lock(self, year_file: YearFile) -> Iterator[None]:
+        """같은 연도 파일에 대한 쓰기를 스레드/프로세스 간에 직렬화합니다."""
+        with self._write_lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{year_file.path}.lock", "a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+disk_candle_cache = DiskCandleCache()
@@ -0,0 +1,85 @@
+# file: backend/app/engine/downsample.py
+
+import struct
+import logging
+
+import numpy as np
+
+from .data import OHLCV, OHLCV_COLUMNS
+from .jit import jit_enabled, kernel
+
+logger = logging.getLogger(__name__)
+
+# --- 차트용 다운샘플링 ---
+# Largest-Triangle-Three-Buckets: 첫/마지막 점을 고정하고 나머지를 n_out-2개 버킷으로 나눈 뒤, 버킷마다
+# (직전에 고른 점, 다음 버킷 평균점)과 만드는 삼각형 넓이가 가장 큰 점을 고릅니다. 급등/급락 같은 시각적 특징이 보존됩니다.
+# 직전 선택에 의존하는 순차 알고리즘이므로 버킷 단위 루프이며, 버킷 내부 계산과 버킷 평균은 NumPy로 한 번에 처리합니다.
+
+CANDLE_BINARY_MAGIC = b"CXC1"
+
+
+def _bucket_edges(n: int, n_out: int) -> np.ndarray:
+    # 가운데 점(1 .. n-2)을 n_out-2개 버킷으로 나눈 경계 (버킷 b = [edges[b], edges[b+1]))
+    return np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+
+
+@kernel
+def _lttb_loop(x, y, edges, avg_x, avg_y, out):
+    """lttb_indices와 같은 선택을 하는 점 단위 루프 (Numba 컴파일 대상)."""
+    buckets = edges.shape[0] - 1
+    a = 0
+    out[0] = 0
+    for b in range(buckets):
+        best = edges[b]
+        best_area = -1.0
+        for i in range(edges[b], edges[b + 1]):
+            area = abs((x[a] - avg_x[b]) * (y[i] - y[a]) - (x[a] - x[i]) * (avg_y[b] - y[a]))
+            if area > best_area:
+                best_area = area
+                best = i
+        out[b + 1] = best
+        a = best
+    out[buckets + 1] = x.shape[0] - 1
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB로 고른 점의 인덱스 (오름차순, 첫/마지막 점 포함). n_out이 점 수 이상이면 전체를 반환합니다."""
+    n = x.shape[0]
+    if n_out >= n or n <= 2:
+        return np.arange(n, dtype=np.int64)
+    n_out = max(3, int(n_out))
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    edges = _bucket_edges(n, n_out)
+    # 버킷 b의 비교 기준점 = 다음 버킷의 평균점 (마지막 버킷은 마지막 점)
+    # 마지막 버킷은 edges[-1](= 고정된 마지막 점) 직전까지이므로 마지막 점을 빼고 합칩니다.
+    sums_x = np.add.reduceat(x[:-1], edges[:-1])
+    sums_y = np.add.reduceat(y[:-1], edges[:-1])
+    counts = np.diff(edges).astype(np.float64)
+    avg_x = np.append((sums_x / counts)[1:], x[-1])
+    avg_y = np.append((sums_y / counts)[1:], y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    if jit_enabled():
+        _lttb_loop(x, y, edges, avg_x, avg_y, out)
+        return out
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - avg_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[b + 1] = a
+    return out
+
+
+def encode_candles_binary(bars: OHLCV) -> bytes:
+    """
+    차트용 압축 바이너리 (리틀 엔디언):
+    magic "CXC1" | uint32 봉 수 n | int64 ts[n] | float32 open[n] | high[n] | low[n] | close[n] | volume[n]
+    JSON 대비 약 1/4 크기이며 브라우저에서 DataView/TypedArray로 복사 없이 읽을 수 있습니다 (헤더 8바이트로 정렬 유지).
+    """
+    n = len(bars)
+    parts = [CANDLE_BINARY_MAGIC, struct.pack("<I", n), bars.ts.astype("<i8").tobytes()]
+    parts += [bars.column(name).astype("<f4").tobytes() for name in OHLCV_COLUMNS]
+    return b"".join(parts)
@@ -0,0 +1,191 @@
+# file: backend/app/engine/evaluator.py
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .data import OHLCV, PRECISIONS, Precision, align_to, resample
+from .compiler import AnyNode, BlockNode, ConditionNode, Node, OperandNode
+from .indicators import compute_indicator
+
+logger = logging.getLogger(__name__)
+
+SUBTREE_CACHE_MAX_BYTES = int(os.getenv("ENGINE_SUBTREE_CACHE_MB", "256")) * 1024 * 1024
+
+
+class SubtreeCache:
+    """
+    (데이터 key, 서브트리 key) -> 중간 결과 배열(지표 값, 조건 마스크)을 보관하는 LRU 캐시.
+    메모리 사용량은 배열의 nbytes 합계로 제한합니다. 워커 프로세스마다 하나씩 존재합니다.
+    """
+    def __init__(self, max_bytes: int = SUBTREE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, data_key: str, node_key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            value = self._entries.get((data_key, node_key))
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((data_key, node_key))
+            self.hits += 1
+            return value
+
+    def put(self, data_key: str, node_key: str, value: np.ndarray) -> None:
+        if value.nbytes > self.max_bytes:
+            return
+        value.setflags(write=False)  # 캐시된 배열은 여러 실행이 공유하므로 읽기 전용으로 고정
+        with self._lock:
+            previous = self._entries.pop((data_key, node_key), None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[(data_key, node_key)] = value
+            self._bytes += value.nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+
+# 워커 프로세스 전역 캐시
+subtree_cache = SubtreeCache()
+
+
+class MarketFrame:
+    """
+    한 번의 백테스트 실행에 필요한 시세 데이터 묶음.
+    실행 타임프레임 봉을 기준으로 하며, 상위 타임프레임 봉은 필요할 때 리샘플링하여 보관합니다.
+    data_key는 캐시 key의 일부로 사용되므로 (거래소, 티커, 타임프레임, 구간)을 모두 포함해야 합니다.
+    float64 이외의 정밀도에서는 data_key에 정밀도 이름을 붙여 서로 다른 정밀도의 결과가 캐시에서 섞이지 않게 합니다.
+    """
+    def __init__(
+        self, data_key: str, timeframe: str, bars: OHLCV,
+        higher: Optional[Dict[str, OHLCV]] = None, precision: Precision = PRECISIONS["float64"],
+    ):
+        self.precision = precision
+        self.data_key = data_key if precision.name == "float64" else f"{data_key}:{precision.name}"
+        self.timeframe = timeframe
+        self.bars = bars.astype(precision.value_dtype)
+        self._frames: Dict[str, OHLCV] = {timeframe: self.bars}
+        if higher:
+            self._frames.update({tf: frame.astype(precision.value_dtype) for tf, frame in higher.items()})
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def frame(self, timeframe: str) -> OHLCV:
+        if timeframe not in self._frames:
+            self._frames[timeframe] = resample(self.bars, timeframe)
+        return self._frames[timeframe]
+
+
+class RuleEvaluator:
+    """
+    컴파일된 규칙 트리를 실행 타임프레임 기준의 배열로 평가합니다.
+    모든 노드 결과는 (data_key, node.key)로 캐시되므로, 같은 데이터에서 규칙 일부만 바뀐 경우
+    바뀐 서브트리와 그 조상만 다시 계산됩니다.
+    """
+    def __init__(self, market: MarketFrame, cache: Optional[SubtreeCache] = None):
+        self.market = market
+        self.cache = cache if cache is not None else subtree_cache
+        self.computed = 0  # 이번 평가에서 캐시 미스로 새로 계산한 노드 수
+
+    def evaluate(self, node: Node) -> np.ndarray:
+        if isinstance(node, OperandNode) and node.kind == "value":
+            return np.full(len(self.market), node.constant, dtype=self.market.precision.value_dtype)
+        cached = self.cache.get(self.market.data_key, node.key)
+        if cached is not None:
+            return self._unpack(node, cached)
+        result = self._compute(node)
+        self.computed += 1
+        self.cache.put(self.market.data_key, node.key, self._pack(node, result))
+        return result
+
+    def _pack(self, node: Node, result: np.ndarray) -> np.ndarray:
+        # 압축 모드에서는 조건/블록 마스크를 8배 작은 비트 배열로 캐시합니다.
+        if self.market.precision.pack_masks and not isinstance(node, OperandNode):
+            return np.packbits(result)
+        return result
+
+    def _unpack(self, node: Node, cached: np.ndarray) -> np.ndarray:
+        if self.market.precision.pack_masks and not isinstance(node, OperandNode):
+            return np.unpackbits(cached, count=len(self.market)).view(bool)
+        return cached
+
+    def _compute(self, node: Node) -> np.ndarray:
+        if isinstance(node, OperandNode):
+            return self._operand(node)
+        if isinstance(node, ConditionNode):
+            return self._condition(node)
+        if isinstance(node, BlockNode):
+            return self._block(node)
+        if isinstance(node, AnyNode):
+            return self._any(node)
+        raise TypeError(f"Unknown node type: {type(node).__name__}")
+
+    def _operand(self, node: OperandNode) -> np.ndarray:
+        source = self.market.frame(node.timeframe)
+        values = compute_indicator(node.indicator_key, node.params_dict, source)
+        return align_to(values, source.ts, node.timeframe, self.market.bars.ts, self.market.timeframe)
+
+    def _condition(self, node: ConditionNode) -> np.ndarray:
+        left = self.evaluate(node.left)
+        right = self.evaluate(node.right)
+        with np.errstate(invalid="ignore"):
+            if node.operator == ">":
+                return left > right
+            if node.operator == "<":
+                return left < right
+            if node.operator == ">=":
+                return left >= right
+            if node.operator == "<=":
+                return left <= right
+            if node.operator == "=":
+                return np.isclose(left, right)
+            diff = left - right
+            prev = np.concatenate(([np.nan], diff[:-1]))
+            if node.operator == "crosses_above":
+                return (prev <= 0) & (diff > 0)
+            if node.operator == "crosses_below":
+                return (prev >= 0) & (diff < 0)
+        raise ValueError(f"Unknown operator: {node.operator}")
+
+    def _block(self, node: BlockNode) -> np.ndarray:
+        own = self.evaluate(node.condition) if node.condition is not None else None
+        children = self.evaluate(node.children_any) if node.children_any is not None else None
+        if own is None and children is None:
+            return np.zeros(len(self.market), dtype=bool)
+        if own is None:
+            return children
+        if children is None:
+            return own
+        return (own & children) if node.logic == "AND" else (own | children)
+
+    def _any(self, node: AnyNode) -> np.ndarray:
+        mask = np.zeros(len(self.market), dtype=bool)
+        for block in node.blocks:
+            mask = mask | self.evaluate(block)
+        return mask
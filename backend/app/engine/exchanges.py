@@ -0,0 +1,104 @@
+# file: backend/app/engine/exchanges.py
+
+import os
+import zlib
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+from .data import MarketDataUnavailableError, ceil_to_bar, timeframe_ms
+
+logger = logging.getLogger(__name__)
+
+# --- 거래소 과거 시세 클라이언트 ---
+# 백필 작업은 이 인터페이스만 사용하므로 실제 거래소(CCXT async)와 오프라인 테스트용 가짜 거래소를 바꿔 끼울 수 있습니다.
+# 속도 제한은 클라이언트가 아니라 호출하는 쪽(backfill.py의 거래소별 토큰 버킷)이 지킵니다.
+FAKE_EXCHANGE = "fake"
+
+
+class ExchangeClient(ABC):
+    """OHLCV 조회용 비동기 거래소 클라이언트."""
+    name: str
+    max_limit: int = 1000  # 요청 한 번에 받을 수 있는 최대 봉 수
+    rate_per_second: float = 10.0  # 거래소가 허용하는 초당 요청 수
+    burst: int = 1  # 토큰 버킷 용량 (연속 요청 허용 수)
+
+    @abstractmethod
+    async def fetch_ohlcv(self, symbol: str, timeframe: str, since_ms: int, limit: int) -> List[List[float]]:
+        """since_ms부터 최대 limit개 봉을 CCXT 형식([ts, o, h, l, c, v] 목록)으로 반환합니다."""
+
+    async def close(self) -> None:
+        pass
+
+
+class CcxtExchangeClient(ExchangeClient):
+    """ccxt.async_support 기반 클라이언트. 속도 제한은 호출 측 토큰 버킷이 담당하므로 ccxt 자체 제한은 끕니다."""
+    def __init__(self, name: str):
+        try:
+            import ccxt.async_support as ccxt_async  # 선택 의존성: 워커 환경에만 설치됨
+        except ImportError:
+            raise MarketDataUnavailableError("ccxt is not installed; no exchange client is available.")
+        exchange_cls = getattr(ccxt_async, name, None)
+        if exchange_cls is None:
+            raise MarketDataUnavailableError(f"Unknown exchange: {name}")
+        self.name = name
+        self._client = exchange_cls({"enableRateLimit": False})
+        self.rate_per_second = 1000.0 / max(float(self._client.rateLimit), 1.0)
+        self.max_limit = int(os.getenv("ENGINE_CCXT_FETCH_LIMIT", "1000"))
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str, since_ms: int, limit: int) -> List[List[float]]:
+        return await self._client.fetch_ohlcv(symbol, timeframe=timeframe, since=since_ms, limit=limit)
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+class FakeExchange(ExchangeClient):
+    """
+    오프라인 테스트용 결정적 가짜 거래소. 같은 (심볼, 봉 시각)에는 항상 같은 가격을 반환합니다.
+    - listed_ms 이전에는 봉이 없고, outage_every > 0이면 그 주기마다 봉 하나를 비워 거래소 자체 결측을 흉내 냅니다.
+    - latency_s만큼 응답을 지연하며, 호출 횟수는 calls에 누적됩니다.
+    """
+    def __init__(self, name: str = FAKE_EXCHANGE, listed_ms: int = 0, outage_every: int = 0,
+                 latency_s: float = 0.0, max_limit: int = 1000, rate_per_second: float = 1000.0, burst: int = 10):
+        self.name = name
+        self.listed_ms = listed_ms
+        self.outage_every = outage_every
+        self.latency_s = latency_s
+        self.max_limit = max_limit
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.calls = 0
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str, since_ms: int, limit: int) -> List[List[float]]:
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        step = timeframe_ms(timeframe)
+        first = ceil_to_bar(max(since_ms, self.listed_ms), timeframe)
+        ts = first + np.arange(min(limit, self.max_limit), dtype=np.int64) * step
+        if self.outage_every > 0:
+            ts = ts[(ts // step) % self.outage_every != 0]
+        return self.bars(symbol, ts, step).tolist()
+
+    @staticmethod
+    def bars(symbol: str, ts: np.ndarray, step: int) -> np.ndarray:
+        """봉 시각만으로 계산되는 가격 (정현파 추세 + 시각 해시 잡음)."""
+        seed = zlib.crc32(symbol.encode("utf-8"))
+        hours = ts / 3_600_000.0
+        noise = ((ts // step * 2654435761 + seed) % 4294967296) / 4294967296.0 - 0.5
+        close = 100.0 * np.exp(0.2 * np.sin(hours / 500.0 + seed % 7) + 0.02 * np.sin(hours / 7.0) + 0.002 * noise)
+        open_ = close * (1.0 - 0.001 * noise)
+        high = np.maximum(open_, close) * 1.001
+        low = np.minimum(open_, close) * 0.999
+        volume = 10.0 + 5.0 * (noise + 0.5)
+        return np.column_stack((ts.astype(np.float64), open_, high, low, close, volume))
+
+
+def get_exchange_client(name: str) -> ExchangeClient:
+    if name == FAKE_EXCHANGE:
+        return FakeExchange()
+    return CcxtExchangeClient(name)
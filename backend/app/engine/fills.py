@@ -0,0 +1,139 @@
+# file: backend/app/engine/fills.py
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LIMIT_TTL_MAX_BARS = int(os.getenv("ENGINE_LIMIT_TTL_MAX_BARS", "500")) # 주문 하나가 대기할 수 있는 최대 봉 수 (주문당 행렬 행 길이)
+ORDER_BLOCK_SIGNALS = int(os.getenv("ENGINE_LIMIT_ORDER_BLOCK", "256")) # 한 번에 체결 가능 수량을 계산하는 신호 수
+
+
+# --- 지정가 주문 체결 모델 ---
+# 신호 봉 종가 기준으로 매수는 아래(close * (1 - offset)), 매도는 위(close * (1 + offset))에 지정가 주문을 걸고,
+# 다음 봉부터 ttl_bars개 봉 동안 대기합니다. 봉의 가격 범위가 지정가를 넘어서면(trade-through) 체결되고,
+# 지정가에 닿기만 한 경우(touch, 지정가 ± touch_band_rate 이내)에는 대기열 위치를 알 수 없으므로 확률적으로 체결됩니다.
+# 터치 체결 난수는 (시드, 방향, 신호 봉, 대기 봉) 해시로 만들므로, 어떤 주문들을 함께 계산하든 주문별 결과가 같습니다.
+# 한 봉에서 체결 가능한 수량은 해당 봉 거래량의 volume_participation_rate 비율로 제한되어 부분 체결이 발생합니다.
+
+
+@dataclass(frozen=True)
+class LimitOrderBook:
+    """
+    대기 주문 전체에 대한 봉별 체결 가능 수량 행렬 (주문 수 x ttl_bars).
+    bars[k, j]는 주문 k의 j번째 대기 봉 위치이며, capacity[k, j]가 0이면 그 봉에서는 체결되지 않습니다.
+    capacity가 inf이면 거래량 제한 없이 전량 체결 가능합니다.
+    """
+    signal_bars: np.ndarray  # 주문을 낸 신호 봉
+    limit_price: np.ndarray  # float64
+    bars: np.ndarray  # int64, (주문 수, ttl_bars)
+    capacity: np.ndarray  # float64, (주문 수, ttl_bars)
+    cumulative: np.ndarray  # capacity의 행별 누적합
+
+    @property
+    def expiry_bars(self) -> np.ndarray:
+        return self.bars[:, -1]
+
+
+def limit_order_book(
+    signal_bars: np.ndarray,
+    side: str,
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    offset_rate: float,
+    ttl_bars: int,
+    touch_probability: float,
+    touch_band_rate: float,
+    participation_rate: float,
+    seed: int,
+) -> LimitOrderBook:
+    """
+    신호 봉 목록에 대해 지정가와 대기 봉별 체결 가능 수량을 한 번에 계산합니다.
+    주문들을 (주문 수 x ttl_bars) 행렬로 펼쳐 비교하므로, 실제로 낼 주문만 넘겨야 메모리가 주문 수에 비례합니다.
+    데이터 끝을 넘는 대기 봉은 마지막 봉으로 고정하고 체결 가능 수량을 0으로 둡니다.
+    """
+    n = close.shape[0]
+    ttl_bars = max(1, min(int(ttl_bars), LIMIT_TTL_MAX_BARS))
+    signal_bars = signal_bars.astype(np.int64)
+    raw = signal_bars[:, None] + np.arange(1, ttl_bars + 1, dtype=np.int64)[None, :]
+    valid = raw <= n - 1
+    bars = np.minimum(raw, n - 1)
+    base = close[signal_bars].astype(np.float64)
+    if side == "buy":
+        limit_price = base * (1.0 - offset_rate)
+        extreme = low[bars].astype(np.float64)
+        through = extreme < limit_price[:, None] * (1.0 - touch_band_rate)
+        touch = (extreme <= limit_price[:, None] * (1.0 + touch_band_rate)) & ~through
+    elif side == "sell":
+        limit_price = base * (1.0 + offset_rate)
+        extreme = high[bars].astype(np.float64)
+        through = extreme > limit_price[:, None] * (1.0 + touch_band_rate)
+        touch = (extreme >= limit_price[:, None] * (1.0 - touch_band_rate)) & ~through
+    else:
+        raise ValueError(f"Unknown order side: {side}")
+    # 대기열 모델: 터치한 봉마다 독립적으로 touch_probability 확률로 체결
+    lucky = _touch_draws(seed, side, signal_bars, ttl_bars) < touch_probability
+    fillable = valid & (through | (touch & lucky))
+    if participation_rate > 0.0:
+        capacity = np.where(fillable, volume[bars].astype(np.float64) * participation_rate, 0.0)
+    else:
+        capacity = np.where(fillable, np.inf, 0.0)
+    return LimitOrderBook(signal_bars, limit_price, bars, capacity, np.cumsum(capacity, axis=1))
+
+
+class OrderBookBlocks:
+    """
+    신호 봉 목록을 ORDER_BLOCK_SIGNALS개씩 나누어, 상태 머신이 실제로 주문을 내는 블록만 limit_order_book으로 계산합니다.
+    포지션 보유/주문 대기 중이라 건너뛰는 신호 블록은 계산하지 않고, 한 번에 한 블록만 보관하므로
+    메모리는 신호 수와 무관하게 (ORDER_BLOCK_SIGNALS x ttl_bars)입니다. 주문 위치는 앞으로만 진행해야 합니다.
+    """
+
+    def __init__(self, signal_bars: np.ndarray, side: str, *book_args) -> None:
+        self.signal_bars = signal_bars
+        self.side = side
+        self.book_args = book_args
+        self._block = -1
+        self._book: Optional[LimitOrderBook] = None
+
+    def order(self, k: int) -> Tuple[LimitOrderBook, int]:
+        """주문 k(신호 목록 위치)가 들어 있는 블록과 블록 안의 행 번호."""
+        block, row = divmod(k, ORDER_BLOCK_SIGNALS)
+        if block != self._block:
+            start = block * ORDER_BLOCK_SIGNALS
+            self._book = limit_order_book(self.signal_bars[start:start + ORDER_BLOCK_SIGNALS], self.side, *self.book_args)
+            self._block = block
+        return self._book, row
+
+
+def _touch_draws(seed: int, side: str, signal_bars: np.ndarray, ttl_bars: int) -> np.ndarray:
+    """(주문 수 x ttl_bars) 균등 난수 [0, 1). (시드, 방향, 신호 봉, 대기 봉)마다 고정된 값(splitmix64 해시)입니다."""
+    mask = (1 << 64) - 1
+    base = ((int(seed) & mask) * 0x9E3779B97F4A7C15 + (1 if side == "sell" else 0)) & mask
+    x = (signal_bars.astype(np.uint64)[:, None] << np.uint64(20)) + np.arange(ttl_bars, dtype=np.uint64)[None, :]
+    x ^= np.uint64(base)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def fill_order(book: LimitOrderBook, k: int, quantity: float) -> Tuple[float, Optional[int]]:
+    """
+    주문 k로 quantity만큼 체결을 시도하여 (체결 수량, 마지막 체결 봉)을 반환합니다. 체결이 없으면 (0.0, None).
+    누적 체결 가능 수량에서 완료 시점을 searchsorted로 찾으므로 대기 봉 수와 무관하게 O(log ttl)입니다.
+    """
+    cumulative = book.cumulative[k]
+    total = float(cumulative[-1])
+    if total <= 0.0:
+        return 0.0, None
+    filled = min(quantity, total)
+    j = int(np.searchsorted(cumulative, filled, side="left"))
+    return filled, int(book.bars[k, min(j, cumulative.shape[0] - 1)])
@@ -0,0 +1,286 @@
+# file: backend/app/engine/indicators.py
+
+import math
+import logging
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .data import OHLCV
+from .jit import kernel
+
+logger = logging.getLogger(__name__)
+
+# 프론트엔드 지표 레지스트리(frontend/src/lib/indicators.ts)의 key와 파라미터 이름을 그대로 사용합니다.
+# 여러 출력을 가진 지표(MACD, BB, Stoch)는 values의 "output" 키로 사용할 출력을 선택합니다.
+
+
+def _nan_like(values: np.ndarray) -> np.ndarray:
+    """입력과 같은 부동소수점 dtype(float32 정밀도 모드 유지)의 NaN 배열."""
+    dtype = values.dtype if values.dtype.kind == "f" else np.float64
+    return np.full(values.shape[0], np.nan, dtype=dtype)
+
+
+def _first_valid(values: np.ndarray) -> int:
+    valid = np.flatnonzero(~np.isnan(values))
+    return int(valid[0]) if valid.size else values.shape[0]
+
+
+def _linear_recurrence(x: np.ndarray, decay: float, y0: float) -> np.ndarray:
+    """
+    y[t] = decay * y[t-1] + (1 - decay) * x[t] 점화식을 블록 단위 누적합으로 벡터화합니다.
+    블록 길이는 decay^-L 이 오버플로하지 않도록 제한하고, 블록 사이에서는 마지막 값을 이어받습니다.
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=x.dtype if x.dtype.kind == "f" else np.float64)  # 누적 계산은 float64, 저장은 입력 dtype
+    alpha = 1.0 - decay
+    if decay <= 0.0:
+        out[:] = x
+        return out
+    block = max(1, min(4096, int(200.0 / -math.log10(decay)))) if decay < 1.0 else 4096
+    powers = decay ** np.arange(block, dtype=np.float64)
+    inv_powers = 1.0 / powers
+    prev = y0
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        m = chunk.shape[0]
+        acc = np.cumsum(chunk * inv_powers[:m]) * powers[:m] * alpha
+        seg = acc + prev * powers[:m] * decay
+        out[start:start + m] = seg
+        prev = seg[-1]
+    return out
+
+
+def _smoothed(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """SMA로 시드를 잡은 지수 평활 (EMA: alpha=2/(n+1), Wilder RMA: alpha=1/n)."""
+    out = _nan_like(values)
+    first = _first_valid(values)
+    seed_end = first + period
+    if period < 1 or seed_end > values.shape[0]:
+        return out
+    seed = float(np.mean(values[first:seed_end]))
+    out[seed_end - 1] = seed
+    if seed_end < values.shape[0]:
+        out[seed_end:] = _linear_recurrence(values[seed_end:], 1.0 - alpha, seed)
+    return out
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    out = _nan_like(values)
+    n = values.shape[0]
+    if period < 1 or period > n:
+        return out
+    csum = np.cumsum(np.concatenate(([0.0], values)), dtype=np.float64)  # float32 입력도 누적합은 float64로
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    return _smoothed(values, period, 2.0 / (period + 1))
+
+
+def rma(values: np.ndarray, period: int) -> np.ndarray:
+    return _smoothed(values, period, 1.0 / period)
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    out = _nan_like(values)
+    n = values.shape[0]
+    if period < 1 or period > n:
+        return out
+    windows = sliding_window_view(values, period)
+    out[period - 1:] = windows.std(axis=1)
+    return out
+
+
+def rolling_max(values: np.ndarray, period: int) -> np.ndarray:
+    out = _nan_like(values)
+    if 1 <= period <= values.shape[0]:
+        out[period - 1:] = sliding_window_view(values, period).max(axis=1)
+    return out
+
+
+def rolling_min(values: np.ndarray, period: int) -> np.ndarray:
+    out = _nan_like(values)
+    if 1 <= period <= values.shape[0]:
+        out[period - 1:] = sliding_window_view(values, period).min(axis=1)
+    return out
+
+
+def true_range(data: OHLCV) -> np.ndarray:
+    prev_close = np.concatenate(([np.nan], data.close[:-1]))
+    tr = np.fmax(data.high - data.low, np.fmax(np.abs(data.high - prev_close), np.abs(data.low - prev_close)))
+    return tr
+
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    delta = np.diff(close, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    gains[0] = losses[0] = np.nan
+    avg_gain = rma(gains, period)
+    avg_loss = rma(losses, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out[(avg_loss == 0) & ~np.isnan(avg_gain)] = 100.0
+    return out
+
+
+def macd(close: np.ndarray, fast_period: int, slow_period: int, signal_period: int) -> Dict[str, np.ndarray]:
+    line = ema(close, fast_period) - ema(close, slow_period)
+    signal = ema(line, signal_period)
+    return {"macd": line, "signal": signal, "hist": line - signal}
+
+
+def stoch(data: OHLCV, k_period: int, d_period: int, slowing: int) -> Dict[str, np.ndarray]:
+    highest = rolling_max(data.high, k_period)
+    lowest = rolling_min(data.low, k_period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_k = 100.0 * (data.close - lowest) / (highest - lowest)
+    k = _nan_aware_sma(raw_k, slowing)
+    return {"k": k, "d": _nan_aware_sma(k, d_period)}
+
+
+def _nan_aware_sma(values: np.ndarray, period: int) -> np.ndarray:
+    """앞부분 NaN 구간을 건너뛰고 SMA를 계산합니다 (지표 위에 다시 평균을 낼 때 사용)."""
+    out = _nan_like(values)
+    first = _first_valid(values)
+    if first < values.shape[0]:
+        out[first:] = sma(values[first:], period)
+    return out
+
+
+def cci(data: OHLCV, period: int) -> np.ndarray:
+    typical = (data.high + data.low + data.close) / 3.0
+    mean = sma(typical, period)
+    out = _nan_like(typical)
+    if 1 <= period <= typical.shape[0]:
+        windows = sliding_window_view(typical, period)
+        mean_dev = np.abs(windows - mean[period - 1:, None]).mean(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[period - 1:] = (typical[period - 1:] - mean[period - 1:]) / (0.015 * mean_dev)
+    return out
+
+
+def bollinger(close: np.ndarray, period: int, std_dev: float) -> Dict[str, np.ndarray]:
+    middle = sma(close, period)
+    width = rolling_std(close, period) * std_dev
+    return {"middle": middle, "upper": middle + width, "lower": middle - width}
+
+
+def atr(data: OHLCV, period: int) -> np.ndarray:
+    tr = true_range(data)
+    tr[0] = data.high[0] - data.low[0] if tr.shape[0] else np.nan
+    return rma(tr, period)
+
+
+def obv(data: OHLCV) -> np.ndarray:
+    direction = np.sign(np.diff(data.close, prepend=data.close[:1]))
+    return np.cumsum(direction * data.volume, dtype=np.float64)
+
+
+def parabolic_sar(high: np.ndarray, low: np.ndarray, acceleration: float, maximum: float) -> np.ndarray:
+    """
+    Parabolic SAR. 추세 반전 여부가 이전 값에 의존하는 경로 의존적 계산이므로 봉 단위 루프로 계산합니다.
+    """
+    out = _nan_like(high)
+    if high.shape[0] < 2:
+        return out
+    is_long = bool(high[1] >= high[0])
+    state = (is_long, float(low[0]) if is_long else float(high[0]), float(high[0]) if is_long else float(low[0]), acceleration)
+    parabolic_sar_run(high, low, acceleration, maximum, 1, state, out)
+    return out
+
+
+@kernel
+def parabolic_sar_run(
+    high: np.ndarray, low: np.ndarray, acceleration: float, maximum: float,
+    begin: int, state: Tuple[bool, float, float, float], out: np.ndarray,
+) -> Tuple[bool, float, float, float]:
+    """
+    SAR 루프 본체. state=(is_long, sar, extreme, af)에서 시작해 [begin, n) 구간을 계산하여 out에 기록하고 마지막 상태를 반환합니다.
+    스트리밍 엔진은 이전 청크의 마지막 두 봉을 앞에 붙이고 이어서 호출합니다.
+    ENGINE_JIT가 켜져 있으면 Numba로 컴파일된 같은 함수가 실행됩니다.
+    """
+    is_long, sar, extreme, af = state
+    for i in range(begin, high.shape[0]):
+        # 봉 값을 파이썬 float(float64)로 꺼내 두어야 float32 입력에서도 비교/상태가 JIT 버전과 같은 정밀도로 계산됩니다.
+        hi, lo = float(high[i]), float(low[i])
+        sar = sar + af * (extreme - sar)
+        if is_long:
+            sar = min(sar, float(low[i - 1]), float(low[i - 2]) if i >= 2 else float(low[i - 1]))
+            if lo < sar:
+                is_long, sar, extreme, af = False, extreme, lo, acceleration
+            elif hi > extreme:
+                extreme, af = hi, min(af + acceleration, maximum)
+        else:
+            sar = max(sar, float(high[i - 1]), float(high[i - 2]) if i >= 2 else float(high[i - 1]))
+            if hi > sar:
+                is_long, sar, extreme, af = True, extreme, hi, acceleration
+            elif lo < extreme:
+                extreme, af = lo, min(af + acceleration, maximum)
+        out[i] = sar
+    return is_long, sar, extreme, af
+
+
+# --- 지표 레지스트리 ---
+# key -> (계산 함수, lookback 함수). 계산 함수는 (OHLCV, params) 를 받아 출력 이름별 배열을 반환합니다.
+IndicatorFn = Callable[[OHLCV, Dict[str, Any]], Dict[str, np.ndarray]]
+LookbackFn = Callable[[Dict[str, Any]], int]
+
+
+def _int(params: Dict[str, Any], key: str, default: int) -> int:
+    return max(1, int(params.get(key, default)))
+
+
+def _float(params: Dict[str, Any], key: str, default: float) -> float:
+    return float(params.get(key, default))
+
+
+INDICATORS: Dict[str, Tuple[IndicatorFn, LookbackFn, str]] = {
+    "Close": (lambda d, p: {"value": d.close}, lambda p: 0, "value"),
+    "Open": (lambda d, p: {"value": d.open}, lambda p: 0, "value"),
+    "High": (lambda d, p: {"value": d.high}, lambda p: 0, "value"),
+    "Low": (lambda d, p: {"value": d.low}, lambda p: 0, "value"),
+    "Volume": (lambda d, p: {"value": d.volume}, lambda p: 0, "value"),
+    "SMA": (lambda d, p: {"value": sma(d.close, _int(p, "period", 20))},
+            lambda p: _int(p, "period", 20) - 1, "value"),
+    "EMA": (lambda d, p: {"value": ema(d.close, _int(p, "period", 20))},
+            lambda p: _int(p, "period", 20) - 1, "value"),
+    "MACD": (lambda d, p: macd(d.close, _int(p, "fast_period", 12), _int(p, "slow_period", 26), _int(p, "signal_period", 9)),
+             lambda p: max(_int(p, "fast_period", 12), _int(p, "slow_period", 26)) + _int(p, "signal_period", 9) - 2, "macd"),
+    "ParabolicSAR": (lambda d, p: {"value": parabolic_sar(d.high, d.low, _float(p, "acceleration", 0.02), _float(p, "maximum", 0.2))},
+                     lambda p: 1, "value"),
+    "RSI": (lambda d, p: {"value": rsi(d.close, _int(p, "period", 14))},
+            lambda p: _int(p, "period", 14), "value"),
+    "Stoch": (lambda d, p: stoch(d, _int(p, "k_period", 14), _int(p, "d_period", 3), _int(p, "slowing", 3)),
+              lambda p: _int(p, "k_period", 14) + _int(p, "slowing", 3) + _int(p, "d_period", 3) - 3, "k"),
+    "CCI": (lambda d, p: {"value": cci(d, _int(p, "period", 20))},
+            lambda p: _int(p, "period", 20) - 1, "value"),
+    "BB": (lambda d, p: bollinger(d.close, _int(p, "period", 20), _float(p, "stdDev", 2.0)),
+           lambda p: _int(p, "period", 20) - 1, "middle"),
+    "ATR": (lambda d, p: {"value": atr(d, _int(p, "period", 14))},
+            lambda p: _int(p, "period", 14) - 1, "value"),
+    "OBV": (lambda d, p: {"value": obv(d)}, lambda p: 0, "value"),
+}
+
+
+def is_supported(indicator_key: str) -> bool:
+    return indicator_key in INDICATORS
+
+
+def indicator_lookback(indicator_key: str, params: Dict[str, Any]) -> int:
+    """첫 유효 값이 나오기까지 필요한 과거 봉 수."""
+    _, lookback_fn, _ = INDICATORS[indicator_key]
+    return int(lookback_fn(params))
+
+
+def compute_indicator(indicator_key: str, params: Dict[str, Any], data: OHLCV) -> np.ndarray:
+    """지표를 계산하여 선택된 출력 배열을 시세 데이터와 같은 dtype(float64 또는 float32)으로 반환합니다."""
+    fn, _, default_output = INDICATORS[indicator_key]
+    outputs = fn(data, params)
+    output = params.get("output", default_output)
+    if output not in outputs:
+        raise ValueError(f"Indicator {indicator_key} has no output '{output}'.")
+    return np.asarray(outputs[output], dtype=data.close.dtype)
@@ -0,0 +1,54 @@
+# file: backend/app/engine/jit.py
+
+import os
+import logging
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# --- 선택적 JIT 컴파일 ---
+# 포지션 상태 머신, 트레일링 스탑, Parabolic SAR처럼 이전 봉 결과에 의존하는 루프는 완전히 벡터화할 수 없습니다.
+# ENGINE_JIT=1 이고 numba가 설치되어 있으면 이 루프들을 Numba로 컴파일하여 실행하고,
+# 그렇지 않으면 같은 결과를 내는 NumPy/파이썬 구현을 사용합니다.
+ENGINE_JIT = os.getenv("ENGINE_JIT", "0") == "1"
+
+try:
+    import numba  # 선택 의존성: pip install numba
+except ImportError:
+    numba = None
+
+_enabled = ENGINE_JIT and numba is not None
+if ENGINE_JIT and numba is None:
+    logger.warning("ENGINE_JIT=1 but numba is not installed; using the NumPy fallback for path-dependent loops.")
+
+
+def jit_available() -> bool:
+    return numba is not None
+
+
+def jit_enabled() -> bool:
+    return _enabled
+
+
+def set_jit_enabled(enabled: bool) -> bool:
+    """JIT 사용 여부를 바꾸고 실제 적용된 값을 반환합니다 (numba가 없으면 항상 False). 벤치마크에서 사용합니다."""
+    global _enabled
+    _enabled = bool(enabled) and numba is not None
+    return _enabled
+
+
+def kernel(fn: Callable) -> Callable:
+    """
+    루프 함수를 JIT 커널로 등록합니다. 원본 파이썬 함수는 .py_func로 남겨 두며,
+    호출 시점의 플래그에 따라 컴파일된 버전(첫 호출 시 컴파일, 디스크 캐시) 또는 원본을 실행합니다.
+    """
+    compiled = numba.njit(cache=True, nogil=True)(fn) if numba is not None else fn
+
+    def dispatch(*args):
+        return compiled(*args) if _enabled else fn(*args)
+
+    dispatch.py_func = fn
+    dispatch.jit_func = compiled
+    dispatch.__name__ = fn.__name__
+    dispatch.__doc__ = fn.__doc__
+    return dispatch
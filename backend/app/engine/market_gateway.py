@@ -0,0 +1,355 @@
+# file: backend/app/engine/market_gateway.py
+
+import os
+import time
+import asyncio
+import logging
+import argparse
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .candle_stream import (
+    CANDLE_STREAM_MAXLEN, CANDLE_STREAM_TIMEFRAMES, Bar, CandleAggregator, CandleSubscriber, RedisCandlePublisher,
+    Trade, TradeFeed, _redis_client, open_trade_client, CcxtTradeFeed, run_aggregator,
+)
+
+logger = logging.getLogger(__name__)
+
+# --- 공유 시세 게이트웨이 ---
+# 봇마다 거래소 연결을 열면 봇 수백 개에서 거래소 연결 한도에 걸립니다. 게이트웨이 프로세스 하나가 거래소별 연결 하나와
+# (거래소, 심볼)별 체결 구독 하나만 유지하고, 받은 체결과 마감된 봉을 관심 있는 모든 소비자에게 나눠 줍니다.
+# - 같은 프로세스의 소비자: subscribe()가 돌려주는 Subscription 큐
+# - 다른 프로세스(Celery 라이브 봇): Redis 관심 등록(임대) -> 게이트웨이가 주기적으로 반영 -> Redis 스트림으로 발행
+# 구독은 참조 계수로 관리되어 마지막 소비자가 떠나면 거래소 구독을, 거래소의 마지막 구독이 끝나면 연결을 닫습니다.
+# candles 채널은 같은 체결 구독을 집계해서 만들므로 채널이 달라도 거래소 구독은 (거래소, 심볼)당 하나입니다.
+CHANNEL_TRADES = "trades"
+CHANNEL_CANDLES = "candles"
+CHANNELS = (CHANNEL_TRADES, CHANNEL_CANDLES)
+
+GATEWAY_QUEUE_SIZE = int(os.getenv("MARKET_GATEWAY_QUEUE_SIZE", "1000")) # 소비자 큐 크기. 가득 차면 가장 오래된 항목을 버림
+GATEWAY_RECONCILE_S = float(os.getenv("MARKET_GATEWAY_RECONCILE_S", "5")) # Redis 관심 목록 반영 주기
+GATEWAY_RETRY_S = float(os.getenv("MARKET_GATEWAY_RETRY_S", "5")) # 거래소 구독이 끊겼을 때 재연결 대기
+INTEREST_TTL_S = int(os.getenv("MARKET_GATEWAY_INTEREST_TTL_S", "180")) # 갱신하지 않은 관심 등록이 만료되는 시간
+TRADE_STREAM_PREFIX = "trades:"
+INTEREST_INDEX_KEY = "marketdata:interest"
+INTEREST_KEY_PREFIX = "marketdata:interest:"
+
+UpstreamKey = Tuple[str, str]  # (거래소, 심볼)
+FeedFactory = Callable[[str, str, Optional[Tuple[Any, bool]]], TradeFeed]
+
+
+def trade_stream_key(exchange: str, symbol: str) -> str:
+    return f"{TRADE_STREAM_PREFIX}{exchange}:{symbol}"
+
+
+def _check_channel(channel: str) -> None:
+    if channel not in CHANNELS:
+        raise ValueError(f"Unsupported market data channel: {channel}")
+
+
+# --- Redis 관심 등록 (프로세스 간 참조 계수) ---
+# 구독마다 정렬 집합 하나에 보유자(예: live_bot:42)를 만료 시각 점수로 넣습니다. 보유자 수가 참조 수이며,
+# 봇이 비정상 종료해 해제하지 못해도 INTEREST_TTL_S가 지나면 자동으로 빠집니다.
+
+def _interest_key(exchange: str, symbol: str, channel: str) -> str:
+    return f"{INTEREST_KEY_PREFIX}{exchange}|{symbol}|{channel}"
+
+
+def acquire_interest(client: Any, holder: str, exchange: str, symbol: str, channel: str, ttl_s: int = INTEREST_TTL_S) -> None:
+    """관심을 등록하거나 만료 시각을 연장합니다."""
+    _check_channel(channel)
+    key = _interest_key(exchange, symbol, channel)
+    pipe = client.pipeline()
+    pipe.zadd(key, {holder: time.time() + ttl_s})
+    pipe.sadd(INTEREST_INDEX_KEY, key)
+    pipe.execute()
+
+
+def release_interest(client: Any, holder: str, exchange: str, symbol: str, channel: str) -> None:
+    client.zrem(_interest_key(exchange, symbol, channel), holder)
+
+
+def active_interests(client: Any) -> Dict[Tuple[str, str, str], int]:
+    """만료된 등록을 정리하고 {(거래소, 심볼, 채널): 보유자 수}를 반환합니다."""
+    now = time.time()
+    result: Dict[Tuple[str, str, str], int] = {}
+    for raw in client.smembers(INTEREST_INDEX_KEY):
+        key = raw.decode() if isinstance(raw, bytes) else raw
+        client.zremrangebyscore(key, "-inf", now)
+        holders = client.zcard(key)
+        if not holders:
+            client.srem(INTEREST_INDEX_KEY, key)
+            continue
+        exchange, symbol, channel = key[len(INTEREST_KEY_PREFIX):].split("|", 2)
+        result[(exchange, symbol, channel)] = holders
+    return result
+
+
+class LeasedCandleSubscriber(CandleSubscriber):
+    """
+    게이트웨이에 관심을 등록하는 봉 마감 구독자 (Celery 라이브 봇 등 동기 소비자용).
+    wait()마다 임대를 연장하고 close()에서 해제합니다. 대기를 멈추면(봇 일시정지 등) 임대가 만료되어 거래소 구독도 정리됩니다.
+    """
+    def __init__(self, holder: str, exchange: str, symbol: str, timeframe: str, client: Any = None, last_id: str = "$"):
+        super().__init__(exchange, symbol, timeframe, client, last_id)
+        self.holder = holder
+        self.exchange = exchange
+        self.symbol = symbol
+        acquire_interest(self.client, holder, exchange, symbol, CHANNEL_CANDLES)
+
+    def wait(self, timeout_ms: int) -> List[Bar]:
+        acquire_interest(self.client, self.holder, self.exchange, self.symbol, CHANNEL_CANDLES)
+        return super().wait(timeout_ms)
+
+    def close(self) -> None:
+        release_interest(self.client, self.holder, self.exchange, self.symbol, CHANNEL_CANDLES)
+
+
+# --- 프로세스 내 팬아웃 ---
+
+class Subscription:
+    """
+    게이트웨이 구독 하나. trades 채널은 체결 묶음(List[Trade]), candles 채널은 (타임프레임, Bar)를 받습니다.
+    느린 소비자가 거래소 수신을 막지 않도록 큐가 가득 차면 가장 오래된 항목을 버리고 dropped로 집계합니다.
+    """
+    def __init__(self, gateway: "MarketDataGateway", exchange: str, symbol: str, channel: str, maxsize: int = GATEWAY_QUEUE_SIZE):
+        self.gateway = gateway
+        self.exchange = exchange
+        self.symbol = symbol
+        self.channel = channel
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+
+    async def get(self) -> Any:
+        return await self.queue.get()
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        while True:
+            yield await self.queue.get()
+
+    async def close(self) -> None:
+        await self.gateway.unsubscribe(self)
+
+
+class _Upstream:
+    """(거래소, 심볼) 체결 구독 하나와 그 소비자들."""
+    def __init__(self, exchange: str, symbol: str):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.subscribers: Dict[str, Set[Subscription]] = {channel: set() for channel in CHANNELS}
+        self.remote: Set[str] = set()  # Redis 관심이 있는 채널
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def refs(self) -> int:
+        return sum(len(subs) for subs in self.subscribers.values()) + len(self.remote)
+
+
+class _FanoutFeed(TradeFeed):
+    """받은 체결 묶음을 집계기에 넘기기 전에 trades 채널 소비자에게 나눠 주는 피드 래퍼."""
+    def __init__(self, inner: TradeFeed, deliver: Callable[[List[Trade]], None]):
+        self.inner = inner
+        self.realtime = inner.realtime
+        self.deliver = deliver
+
+    async def batches(self) -> AsyncIterator[List[Trade]]:
+        async for batch in self.inner.batches():
+            self.deliver(batch)
+            yield batch
+
+    def now_ms(self) -> int:
+        return self.inner.now_ms()
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+
+def _default_feed(exchange: str, symbol: str, client: Optional[Tuple[Any, bool]]) -> TradeFeed:
+    return CcxtTradeFeed(exchange, symbol, client=client)
+
+
+class MarketDataGateway:
+    """
+    거래소 시세 구독 다중화기. 하나의 이벤트 루프에서 실행하며 모든 메서드는 그 루프에서 호출해야 합니다.
+    redis_client를 주면 Redis 관심이 있는 채널을 발행합니다: 마감된 봉은 candles:{거래소}:{심볼}:{타임프레임}, 체결은 trades:{거래소}:{심볼}.
+    feed_factory(거래소, 심볼, 공유 연결)로 피드를 바꿔 끼울 수 있으며, 공유 연결은 거래소별로 하나만 엽니다.
+    """
+    def __init__(self, redis_client: Any = None, feed_factory: Optional[FeedFactory] = None,
+                 timeframes: Sequence[str] = CANDLE_STREAM_TIMEFRAMES, share_connections: bool = True):
+        self.redis = redis_client
+        self.feed_factory = feed_factory or _default_feed
+        self.timeframes = tuple(timeframes)
+        self.share_connections = share_connections
+        self._publisher = RedisCandlePublisher(redis_client) if redis_client is not None else None
+        self._upstreams: Dict[UpstreamKey, _Upstream] = {}
+        self._connections: Dict[str, Tuple[Any, bool]] = {}
+
+    # --- 참조 계수 ---
+
+    async def subscribe(self, exchange: str, symbol: str, channel: str, maxsize: int = GATEWAY_QUEUE_SIZE) -> Subscription:
+        _check_channel(channel)
+        subscription = Subscription(self, exchange, symbol, channel, maxsize)
+        upstream = self._upstream(exchange, symbol)
+        upstream.subscribers[channel].add(subscription)
+        self._ensure_running(upstream)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        upstream = self._upstreams.get((subscription.exchange, subscription.symbol))
+        if upstream is None:
+            return
+        upstream.subscribers[subscription.channel].discard(subscription)
+        await self._release_if_idle(upstream)
+
+    async def reconcile(self, interests: Dict[Tuple[str, str, str], int]) -> None:
+        """Redis 관심 목록({(거래소, 심볼, 채널): 보유자 수})에 맞춰 원격 구독을 시작/정리합니다."""
+        wanted: Dict[UpstreamKey, Set[str]] = {}
+        for (exchange, symbol, channel), holders in interests.items():
+            if holders > 0 and channel in CHANNELS:
+                wanted.setdefault((exchange, symbol), set()).add(channel)
+        for key in set(self._upstreams) | set(wanted):
+            channels = wanted.get(key, set())
+            upstream = self._upstreams.get(key)
+            if upstream is None:
+                upstream = self._upstream(*key)
+            if upstream.remote != channels:
+                logger.info(f"Remote interest for {key[0]}:{key[1]} changed: {sorted(upstream.remote)} -> {sorted(channels)}")
+            upstream.remote = channels
+            if upstream.refs:
+                self._ensure_running(upstream)
+            else:
+                await self._release_if_idle(upstream)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self._connections),
+            "upstreams": {
+                f"{up.exchange}:{up.symbol}": {
+                    "refs": up.refs, "remote": sorted(up.remote),
+                    **{channel: len(subs) for channel, subs in up.subscribers.items()},
+                }
+                for up in self._upstreams.values()
+            },
+        }
+
+    async def close(self) -> None:
+        for upstream in list(self._upstreams.values()):
+            upstream.subscribers = {channel: set() for channel in CHANNELS}
+            upstream.remote = set()
+            await self._release_if_idle(upstream)
+
+    def _upstream(self, exchange: str, symbol: str) -> _Upstream:
+        key = (exchange, symbol)
+        if key not in self._upstreams:
+            self._upstreams[key] = _Upstream(exchange, symbol)
+        return self._upstreams[key]
+
+    def _ensure_running(self, upstream: _Upstream) -> None:
+        if upstream.task is None or upstream.task.done():
+            logger.info(f"Subscribing to {upstream.exchange}:{upstream.symbol} trades.")
+            upstream.task = asyncio.create_task(self._run(upstream))
+
+    async def _release_if_idle(self, upstream: _Upstream) -> None:
+        if upstream.refs:
+            return
+        self._upstreams.pop((upstream.exchange, upstream.symbol), None)
+        if upstream.task is not None:
+            logger.info(f"No more subscribers for {upstream.exchange}:{upstream.symbol}; unsubscribing.")
+            upstream.task.cancel()
+            await asyncio.gather(upstream.task, return_exceptions=True)
+        if not any(up.exchange == upstream.exchange for up in self._upstreams.values()):
+            await self._close_connection(upstream.exchange)
+
+    # --- 거래소 연결 ---
+
+    def _connection(self, exchange: str) -> Optional[Tuple[Any, bool]]:
+        if not self.share_connections:
+            return None
+        if exchange not in self._connections:
+            self._connections[exchange] = open_trade_client(exchange)
+        return self._connections[exchange]
+
+    async def _close_connection(self, exchange: str) -> None:
+        connection = self._connections.pop(exchange, None)
+        if connection is not None:
+            try:
+                await connection[0].close()
+            except Exception as e:
+                logger.warning(f"Failed to close {exchange} market data connection: {e}")
+
+    async def _run(self, upstream: _Upstream) -> None:
+        """구독이 살아 있는 동안 체결을 받아 나눠 줍니다. 피드가 끊기면 GATEWAY_RETRY_S 후 다시 구독합니다."""
+        while upstream.refs:
+            aggregator = CandleAggregator(upstream.exchange, upstream.symbol, self.timeframes, self._on_bar_close(upstream))
+            try:
+                feed = self.feed_factory(upstream.exchange, upstream.symbol, self._connection(upstream.exchange))
+                await run_aggregator(_FanoutFeed(feed, self._on_trades(upstream)), aggregator)
+                if not feed.realtime:
+                    return  # 재생 피드는 끝나면 종료
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{upstream.exchange}:{upstream.symbol} trade feed failed: {e}; retrying in {GATEWAY_RETRY_S}s.", exc_info=True)
+            await asyncio.sleep(GATEWAY_RETRY_S)
+
+    # --- 팬아웃 ---
+
+    def _on_trades(self, upstream: _Upstream) -> Callable[[List[Trade]], None]:
+        def deliver(batch: List[Trade]) -> None:
+            for subscription in upstream.subscribers[CHANNEL_TRADES]:
+                subscription.put(batch)
+            if self.redis is not None and CHANNEL_TRADES in upstream.remote:
+                key = trade_stream_key(upstream.exchange, upstream.symbol)
+                try:
+                    pipe = self.redis.pipeline(transaction=False)
+                    for ts, price, amount in batch:
+                        pipe.xadd(key, {"ts": ts, "price": repr(price), "amount": repr(amount)}, maxlen=CANDLE_STREAM_MAXLEN, approximate=True)
+                    pipe.execute()
+                except Exception as e:
+                    logger.error(f"Failed to publish trades for {upstream.exchange}:{upstream.symbol}: {e}")
+        return deliver
+
+    def _on_bar_close(self, upstream: _Upstream) -> Callable[[str, str, str, Bar], None]:
+        def deliver(exchange: str, symbol: str, timeframe: str, bar: Bar) -> None:
+            for subscription in upstream.subscribers[CHANNEL_CANDLES]:
+                subscription.put((timeframe, bar))
+            if self._publisher is not None and CHANNEL_CANDLES in upstream.remote:
+                self._publisher(exchange, symbol, timeframe, bar)
+        return deliver
+
+
+async def run_gateway(gateway: MarketDataGateway, reconcile_s: float = GATEWAY_RECONCILE_S) -> None:
+    """Redis 관심 목록을 주기적으로 읽어 게이트웨이 구독에 반영합니다. Redis 오류는 기록하고 다음 주기에 다시 시도합니다."""
+    try:
+        while True:
+            try:
+                interests = await asyncio.to_thread(active_interests, gateway.redis)
+                await gateway.reconcile(interests)
+            except Exception as e:
+                logger.error(f"Market data gateway reconcile failed: {e}", exc_info=True)
+            await asyncio.sleep(reconcile_s)
+    finally:
+        await gateway.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """게이트웨이 프로세스 실행: python -m backend.app.engine.market_gateway"""
+    parser = argparse.ArgumentParser(description="Share exchange market data subscriptions across live bots.")
+    parser.add_argument("--timeframes", default=",".join(CANDLE_STREAM_TIMEFRAMES))
+    parser.add_argument("--reconcile-s", type=float, default=GATEWAY_RECONCILE_S)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    gateway = MarketDataGateway(_redis_client(), timeframes=[tf for tf in args.timeframes.split(",") if tf])
+    asyncio.run(run_gateway(gateway, args.reconcile_s))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# file: backend/app/engine/metrics.py
+
+import os
+import math
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .data import TIMEFRAME_MS
+from .simulator import EXIT_REASONS, SimulationResult
+
+logger = logging.getLogger(__name__)
+
+PNL_CURVE_MAX_POINTS = 500
+# 롤링 지표 창 길이(일). additional_parameters.rolling_window_days로 백테스트별 지정 가능
+ROLLING_WINDOW_DAYS = tuple(int(d) for d in os.getenv("ENGINE_ROLLING_WINDOW_DAYS", "30,90").split(",") if d.strip())
+TRADE_HISTOGRAM_BINS = 20  # trade_summary_json의 MAE/MFE/보유 기간 분포 구간 수
+_DAY_MS = 24 * 60 * 60_000
+_YEAR_MS = 365 * _DAY_MS
+
+
+def periods_per_year(timeframe: str) -> float:
+    return _YEAR_MS / TIMEFRAME_MS[timeframe]
+
+
+def iso_time(ts_ms: int) -> str:
+    return datetime.fromtimestamp(int(ts_ms) / 1000, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def max_drawdown_pct(equity: np.ndarray) -> float:
+    if equity.size == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(equity)
+    drawdowns = (peaks - equity) / peaks
+    return float(np.max(drawdowns) * 100.0)
+
+
+def sharpe_ratio(equity: np.ndarray, timeframe: str) -> float:
+    if equity.size < 2:
+        return 0.0
+    returns = np.diff(equity) / equity[:-1]
+    std = float(np.std(returns))
+    if std == 0.0:
+        return 0.0
+    return float(np.mean(returns) / std * np.sqrt(periods_per_year(timeframe)))
+
+
+def sample_index(n: int, max_points: int = PNL_CURVE_MAX_POINTS) -> np.ndarray:
+    """차트용 샘플 위치 (균등 간격, 마지막 점 포함)."""
+    if n > max_points:
+        return np.unique(np.concatenate((np.linspace(0, n - 1, max_points).astype(np.int64), [n - 1])))
+    return np.arange(n)
+
+
+def downsample_curve(ts: np.ndarray, values: np.ndarray, max_points: int = PNL_CURVE_MAX_POINTS) -> List[Dict[str, Any]]:
+    """차트용 곡선을 균등 간격으로 줄입니다. 마지막 점은 항상 포함합니다."""
+    if ts.shape[0] == 0:
+        return []
+    return [{"time": iso_time(ts[i]), "value": round(float(values[i]), 6)} for i in sample_index(ts.shape[0], max_points)]
+
+
+# --- 롤링 지표 ---
+# 모든 창 합계는 누적합의 차(csum[i] - csum[i - w])로, 창 최대값은 블록 prefix/suffix 최대값
+# (van Herk/Gil-Werman)으로 구하므로 창 길이와 무관하게 O(n)입니다. 창이 다 차지 않은 봉은 NaN입니다.
+
+def window_bars(days: int, timeframe: str) -> int:
+    return max(2, int(days * _DAY_MS // TIMEFRAME_MS[timeframe]))
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+
+def _window_max(values: np.ndarray, window: int) -> np.ndarray:
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[:n] = values
+    grid = padded.reshape(blocks, window)
+    prefix = np.maximum.accumulate(grid, axis=1).ravel()
+    suffix = np.maximum.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+    end = np.arange(window - 1, n)
+    out[window - 1:] = np.maximum(suffix[end - window + 1], prefix[end])
+    return out
+
+
+def rolling_metrics(
+    equity: np.ndarray, closed: np.ndarray, won: np.ndarray, window: int, timeframe: str,
+) -> Dict[str, np.ndarray]:
+    """
+    봉 i에서 끝나는 최근 window개 봉 기준의 롤링 지표 (길이 n 배열).
+    sharpe/volatility_pct: 봉별 수익률의 연율화 샤프 지수/변동성, drawdown_pct: 창 내 최고 자산 대비 하락률,
+    win_rate_pct: 창 안에서 청산된 거래의 승률. closed/won은 봉별 청산 거래 수/수익 거래 수입니다.
+    """
+    n = equity.shape[0]
+    returns = np.zeros(n, dtype=np.float64)
+    if n > 1:
+        returns[1:] = np.diff(equity) / equity[:-1]
+    mean = _window_sum(returns, window) / window
+    mean_sq = _window_sum(returns * returns, window) / window
+    mean[:window] = np.nan  # 첫 봉의 수익률(0)은 실제 값이 아니므로 window+1개 자산 값이 있어야 유효
+    std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+    annual = math.sqrt(periods_per_year(timeframe))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 1e-12, mean / std * annual, np.where(np.isnan(mean), np.nan, 0.0))
+        peak = _window_max(equity, window + 1)
+        trades = _window_sum(closed.astype(np.float64), window)
+        win_rate = np.where(trades > 0, _window_sum(won.astype(np.float64), window) / trades * 100.0, np.nan)
+    return {
+        "sharpe": sharpe,
+        "volatility_pct": std * annual * 100.0,
+        "drawdown_pct": (peak - equity) / peak * 100.0,
+        "win_rate_pct": win_rate,
+    }
+
+
+def json_value(value: float) -> Optional[float]:
+    """JSON에 저장할 지표 값 (NaN/inf는 None)."""
+    return round(float(value), 6) if np.isfinite(value) else None
+
+
+def rolling_summary(
+    ts: np.ndarray, equity: np.ndarray, sim: SimulationResult, start: int, timeframe: str,
+    window_days: Sequence[int] = ROLLING_WINDOW_DAYS,
+) -> Dict[str, Any]:
+    """pnl_curve_json과 같은 샘플 시각에서의 롤링 지표. {"time": [...], "windows": {"30d": {"bars", "sharpe", ...}}}"""
+    n = equity.shape[0]
+    idx = sample_index(n)
+    exit_bars = sim.exit_idx.astype(np.int64) - start
+    closed = np.bincount(exit_bars, minlength=n)[:n]
+    won = np.bincount(exit_bars, weights=(sim.pnl > 0).astype(np.float64), minlength=n)[:n]
+    windows: Dict[str, Any] = {}
+    for days in window_days:
+        bars = window_bars(days, timeframe)
+        series = rolling_metrics(equity, closed, won, bars, timeframe)
+        windows[f"{days}d"] = {"bars": bars, **{name: [json_value(v) for v in values[idx]] for name, values in series.items()}}
+    return {"time": [iso_time(ts[i]) for i in idx], "windows": windows}
+
+
+def histogram(values: np.ndarray, bins: int = TRADE_HISTOGRAM_BINS) -> Dict[str, List[float]]:
+    """UI 분포 차트용 히스토그램. edges는 bins + 1개의 구간 경계입니다."""
+    if values.shape[0] == 0:
+        return {"edges": [], "counts": []}
+    counts, edges = np.histogram(values, bins=bins)
+    return {"edges": [round(float(e), 6) for e in edges], "counts": counts.tolist()}
+
+
+def excursion_summary(sim: SimulationResult) -> Dict[str, Any]:
+    """거래별 MAE/MFE/보유 봉 수/청산 사유의 평균과 분포. 개별 TradeLog 없이 분포 차트를 그릴 수 있게 합니다."""
+    bars_held = (sim.exit_idx - sim.entry_idx).astype(np.int64)
+    total = sim.trade_count
+    return {
+        "avg_mae_pct": float(sim.mae_pct.mean()) if total else 0.0,
+        "avg_mfe_pct": float(sim.mfe_pct.mean()) if total else 0.0,
+        "avg_bars_held": float(bars_held.mean()) if total else 0.0,
+        "max_bars_held": int(bars_held.max()) if total else 0,
+        "exit_reasons": dict(zip(EXIT_REASONS, np.bincount(sim.exit_reason, minlength=len(EXIT_REASONS)).tolist())),
+        "mae_pct_histogram": histogram(sim.mae_pct),
+        "mfe_pct_histogram": histogram(sim.mfe_pct),
+        "bars_held_histogram": histogram(bars_held),
+    }
+
+
+def trade_summary(sim: SimulationResult, final_equity: float) -> Dict[str, Any]:
+    winning = int(np.count_nonzero(sim.pnl > 0))
+    total = sim.trade_count
+    return {
+        "total_trades": total,
+        "winning_trades": winning,
+        "losing_trades": total - winning,
+        "gross_profit": float(sim.pnl[sim.pnl > 0].sum()),
+        "gross_loss": float(sim.pnl[sim.pnl <= 0].sum()),
+        "total_commission": float(sim.entry_commission.sum() + sim.exit_commission.sum()),
+        "avg_pnl": float(sim.pnl.mean()) if total else 0.0,
+        "final_equity": final_equity,
+        **excursion_summary(sim),
+    }
+
+
+# --- 벤치마크(같은 티커 Buy & Hold) 대비 지표 ---
+
+@dataclass(frozen=True)
+class ReturnMoments:
+    """
+    전략/벤치마크 봉별 수익률의 1·2차 모멘트. 알파/베타/정보비율/상관계수는 모두 이 값에서 계산되므로,
+    스트리밍 모드에서는 청크별 모멘트를 merge()로 합쳐 전체 배열 없이 같은 결과를 얻습니다.
+    """
+    count: int = 0
+    mean_strategy: float = 0.0
+    mean_benchmark: float = 0.0
+    m2_strategy: float = 0.0
+    m2_benchmark: float = 0.0
+    co_moment: float = 0.0
+
+    @classmethod
+    def from_returns(cls, strategy: np.ndarray, benchmark: np.ndarray) -> "ReturnMoments":
+        count = int(strategy.shape[0])
+        if count == 0:
+            return cls()
+        ds = strategy - strategy.mean()
+        db = benchmark - benchmark.mean()
+        return cls(count, float(strategy.mean()), float(benchmark.mean()),
+                   float(ds @ ds), float(db @ db), float(ds @ db))
+
+    def merge(self, other: "ReturnMoments") -> "ReturnMoments":
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        total = self.count + other.count
+        ds = other.mean_strategy - self.mean_strategy
+        db = other.mean_benchmark - self.mean_benchmark
+        weight = self.count * other.count / total
+        return ReturnMoments(
+            total,
+            self.mean_strategy + ds * other.count / total,
+            self.mean_benchmark + db * other.count / total,
+            self.m2_strategy + other.m2_strategy + ds * ds * weight,
+            self.m2_benchmark + other.m2_benchmark + db * db * weight,
+            self.co_moment + other.co_moment + ds * db * weight,
+        )
+
+
+def bar_returns(values: np.ndarray) -> np.ndarray:
+    return np.diff(values) / values[:-1] if values.shape[0] > 1 else np.empty(0, dtype=np.float64)
+
+
+def relative_metrics(moments: ReturnMoments, timeframe: str) -> Dict[str, Optional[float]]:
+    """
+    벤치마크 대비 지표 (무위험 수익률 0 가정, 모분산 기준).
+    alpha_pct: 연율화한 Jensen 알파(%), beta: cov / var(벤치마크),
+    information_ratio: 초과 수익률 평균 / 추적 오차 (연율화), correlation: 피어슨 상관계수.
+    분산이 0이라 정의되지 않는 값은 None입니다.
+    """
+    if moments.count == 0:
+        return {"alpha_pct": None, "beta": None, "information_ratio": None, "correlation": None}
+    n = moments.count
+    var_s = moments.m2_strategy / n
+    var_b = moments.m2_benchmark / n
+    cov = moments.co_moment / n
+    ppy = periods_per_year(timeframe)
+    beta = cov / var_b if var_b > 0.0 else None
+    alpha = (moments.mean_strategy - beta * moments.mean_benchmark) * ppy * 100.0 if beta is not None else None
+    tracking_var = var_s + var_b - 2.0 * cov
+    tracking = math.sqrt(tracking_var) if tracking_var > 0.0 else 0.0
+    information_ratio = (moments.mean_strategy - moments.mean_benchmark) / tracking * math.sqrt(ppy) if tracking > 0.0 else None
+    correlation = cov / math.sqrt(var_s * var_b) if var_s > 0.0 and var_b > 0.0 else None
+    return {"alpha_pct": alpha, "beta": beta, "information_ratio": information_ratio, "correlation": correlation}
+
+
+def benchmark_summary(
+    ts: np.ndarray, close: np.ndarray, equity: np.ndarray, timeframe: str, initial_capital: float,
+) -> Dict[str, Any]:
+    """
+    실행 구간 첫 봉 종가에 전액 매수해 보유하는 Buy & Hold 곡선과 대비 지표.
+    전략 시뮬레이션에 쓰인 종가 배열을 그대로 사용하므로 추가 데이터 로드가 없습니다.
+    """
+    if close.shape[0] == 0:
+        return {"benchmark_return_pct": None, "benchmark_curve_json": [], **relative_metrics(ReturnMoments(), timeframe)}
+    prices = close.astype(np.float64)
+    benchmark = initial_capital * prices / prices[0]
+    moments = ReturnMoments.from_returns(bar_returns(equity), bar_returns(prices))
+    return {
+        "benchmark_return_pct": (float(benchmark[-1]) / initial_capital - 1.0) * 100.0,
+        "benchmark_curve_json": downsample_curve(ts, benchmark),
+        **relative_metrics(moments, timeframe),
+    }
+
+
+def summarize(
+    ts: np.ndarray, sim: SimulationResult, timeframe: str, start: int, initial_capital: float, close: np.ndarray,
+    rolling_window_days: Sequence[int] = ROLLING_WINDOW_DAYS,
+) -> Dict[str, Any]:
+    """
+    BacktestResult 컬럼 구성과 동일한 형태의 결과 요약을 만듭니다.
+    start 이전(지표 워밍업) 구간은 지표 계산에만 쓰였으므로 성과 계산에서 제외합니다.
+    close는 시뮬레이션에 사용한 종가 배열로, 같은 구간의 Buy & Hold 벤치마크 계산에 사용합니다.
+    """
+    equity = sim.equity[start:]
+    final_equity = float(equity[-1]) if equity.size else initial_capital
+    summary = trade_summary(sim, final_equity)
+    total = summary["total_trades"]
+    return {
+        "total_return_pct": (final_equity / initial_capital - 1.0) * 100.0,
+        "mdd_pct": max_drawdown_pct(equity),
+        "sharpe_ratio": sharpe_ratio(equity, timeframe),
+        "win_rate_pct": (summary["winning_trades"] / total * 100.0) if total else 0.0,
+        "pnl_curve_json": downsample_curve(ts[start:], equity),
+        "rolling_metrics_json": rolling_summary(ts[start:], equity, sim, start, timeframe, rolling_window_days),
+        "trade_summary_json": summary,
+        **benchmark_summary(ts[start:], close[start:], equity, timeframe, initial_capital),
+    }
+
+
+def trade_log_rows(ts: np.ndarray, sim: SimulationResult) -> List[Dict[str, Any]]:
+    """TradeLog 테이블에 저장할 매수/매도 행 목록 (거래당 2행). 거래 분석 값(MAE/MFE/보유 봉 수/청산 사유)은 매도 행에 기록합니다."""
+    return trade_log_rows_at(ts[sim.entry_idx], ts[sim.exit_idx], sim)
+
+
+def trade_log_rows_at(entry_ts: np.ndarray, exit_ts: np.ndarray, sim: SimulationResult) -> List[Dict[str, Any]]:
+    """trade_log_rows와 같으나 진입/청산 시각(epoch ms)을 직접 받습니다 (전체 ts 배열을 보관하지 않는 스트리밍 모드용)."""
+    rows: List[Dict[str, Any]] = []
+    for k in range(sim.trade_count):
+        cash_before = float(sim.balance_after[k] - sim.pnl[k])
+        rows.append({
+            "timestamp": datetime.fromtimestamp(int(entry_ts[k]) / 1000, tz=timezone.utc),
+            "side": "buy", "price": float(sim.entry_price[k]), "quantity": float(sim.quantity[k]),
+            "commission": float(sim.entry_commission[k]), "pnl": 0.0, "current_balance": cash_before,
+            "mae_pct": None, "mfe_pct": None, "bars_held": None, "exit_reason": None,
+        })
+        rows.append({
+            "timestamp": datetime.fromtimestamp(int(exit_ts[k]) / 1000, tz=timezone.utc),
+            "side": "sell", "price": float(sim.exit_price[k]), "quantity": float(sim.quantity[k]),
+            "commission": float(sim.exit_commission[k]), "pnl": float(sim.pnl[k]),
+            "current_balance": float(sim.balance_after[k]),
+            "mae_pct": float(sim.mae_pct[k]), "mfe_pct": float(sim.mfe_pct[k]),
+            "bars_held": int(sim.exit_idx[k] - sim.entry_idx[k]), "exit_reason": EXIT_REASONS[sim.exit_reason[k]],
+        })
+    return rows
@@ -0,0 +1,97 @@
+# file: backend/app/engine/prefetch.py
+
+import os
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .data import MarketDataUnavailableError, DataSource, get_data_source, timeframe_ms
+from .compiler import CompiledStrategy
+from .backtester import BacktestSpec
+from .sharding import shard_warmup_ms
+from .snapshots import SEGMENT_BARS
+
+logger = logging.getLogger(__name__)
+
+# --- 백테스트 등록 시 시세 선로딩 ---
+# API가 run_backtest_task를 큐에 넣을 때 필요한 시계열 힌트도 함께 보내면, 먼저 비는 워커가 그 구간을
+# 현재 데이터 소스 체인(디스크 캐시 -> candles 저장소 -> 거래소)으로 읽어 둡니다. 백테스트가 큐에서 기다리는 동안
+# 거래소 수집/DB 조회/디스크 캐시 적재가 진행되므로 실행 워커는 대부분 캐시 적중으로 시작합니다.
+PREFETCH_ENABLED = os.getenv("BACKTEST_PREFETCH", "1") == "1"
+PREFETCH_QUEUE = os.getenv("BACKTEST_PREFETCH_QUEUE", "") # 비우면 기본 큐 (유휴 워커가 처리)
+PREFETCH_EXPIRES_S = int(os.getenv("BACKTEST_PREFETCH_EXPIRES_S", "600")) # 이보다 오래 대기한 힌트는 버림
+PREFETCH_DEDUP_TTL_S = int(os.getenv("BACKTEST_PREFETCH_DEDUP_TTL_S", "300")) # 같은 힌트를 한 번만 처리하는 기간
+PREFETCH_KEY_PREFIX = "backtest:prefetch:"
+
+
+@dataclass(frozen=True)
+class PrefetchHint:
+    """
+    선로딩 힌트. [start_ms - lookback_ms, end_ms) 구간의 실행 타임프레임 봉을 읽어 둡니다.
+    상위 타임프레임(timeframes)은 실행 타임프레임 봉에서 리샘플링되므로 따로 읽지 않고 기록만 합니다.
+    """
+    exchange: str
+    ticker: str
+    timeframe: str
+    timeframes: Tuple[str, ...]
+    start_ms: int
+    end_ms: int
+    lookback_ms: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.exchange}:{self.ticker}:{self.timeframe}:{self.start_ms - self.lookback_ms}:{self.end_ms}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "exchange": self.exchange, "ticker": self.ticker, "timeframe": self.timeframe, "timeframes": list(self.timeframes),
+            "start_ms": self.start_ms, "end_ms": self.end_ms, "lookback_ms": self.lookback_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PrefetchHint":
+        return cls(
+            data["exchange"], data["ticker"], data["timeframe"], tuple(data["timeframes"]),
+            int(data["start_ms"]), int(data["end_ms"]), int(data["lookback_ms"]),
+        )
+
+
+def build_prefetch_hint(spec: BacktestSpec, compiled: CompiledStrategy) -> PrefetchHint:
+    # 스냅샷 생성(tasks._pin_data_snapshot)과 같은 구간: 지표 워밍업 + 구간 분할 실행의 겹침
+    return PrefetchHint(
+        exchange=spec.exchange, ticker=spec.ticker, timeframe=spec.timeframe, timeframes=compiled.timeframes,
+        start_ms=spec.start_ms, end_ms=spec.end_ms, lookback_ms=shard_warmup_ms(compiled),
+    )
+
+
+def claim_hint(hint: PrefetchHint) -> bool:
+    """같은 구간 힌트가 최근에 처리되었으면 False. Redis를 쓸 수 없으면 항상 처리합니다."""
+    try:
+        import redis  # celery[redis] 의존성으로 설치됨
+        client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"))
+        return bool(client.set(f"{PREFETCH_KEY_PREFIX}{hint.key}", 1, nx=True, ex=PREFETCH_DEDUP_TTL_S))
+    except Exception as e:
+        logger.warning(f"Prefetch dedup unavailable ({e}); warming {hint.key} anyway.")
+        return True
+
+
+def warm(hint: PrefetchHint, source: Optional[DataSource] = None, segment_bars: int = SEGMENT_BARS) -> Dict[str, Any]:
+    """
+    힌트 구간을 데이터 소스로 읽어 캐시/저장소를 채우고 요약을 반환합니다. 읽은 봉은 보관하지 않습니다.
+    스냅샷 세그먼트와 같은 격자 구간 전체를 하나씩 읽으므로 메모리는 세그먼트 하나 크기이며, 이후 스냅샷 생성의 조회와 구간이 일치합니다.
+    """
+    source = source or get_data_source()
+    started = time.perf_counter()
+    span = timeframe_ms(hint.timeframe) * max(1, segment_bars)
+    first = hint.start_ms - hint.lookback_ms
+    bars = 0
+    for segment_start in range(first // span * span, hint.end_ms, span):
+        try:
+            bars += len(source(hint.exchange, hint.ticker, hint.timeframe, segment_start, segment_start + span))
+        except MarketDataUnavailableError as e:
+            logger.warning(f"Prefetch of {hint.key} stopped: {e}")
+            break
+    summary = {"key": hint.key, "bars": bars, "elapsed_s": round(time.perf_counter() - started, 3)}
+    logger.info(f"Prefetched {bars} {hint.timeframe} candles for {hint.exchange}:{hint.ticker} in {summary['elapsed_s']}s.")
+    return summary
@@ -0,0 +1,121 @@
+# file: backend/app/engine/regimes.py
+
+import os
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .compiler import OperandNode, compile_operand
+from .evaluator import RuleEvaluator
+from .simulator import SimulationResult
+from .metrics import max_drawdown_pct
+
+logger = logging.getLogger(__name__)
+
+# --- 변동성/추세 국면 분류 ---
+# 변동성: ATR/종가(%)의 백테스트 구간 내 3분위 (low_vol / mid_vol / high_vol)
+# 추세: 이동평균이 REGIME_SLOPE_BARS 봉 동안 움직인 폭이 ATR의 REGIME_FLAT_ATR 배 미만이면 range, 아니면 방향에 따라 uptrend/downtrend
+# 지표는 실행 타임프레임의 RuleEvaluator로 평가하므로 전략이 같은 지표를 쓰거나 웜 워커가 미리 계산해 둔 경우 캐시를 그대로 사용합니다.
+REGIME_ATR_PERIOD = int(os.getenv("ENGINE_REGIME_ATR_PERIOD", "14"))
+REGIME_MA_PERIOD = int(os.getenv("ENGINE_REGIME_MA_PERIOD", "50"))
+REGIME_SLOPE_BARS = int(os.getenv("ENGINE_REGIME_SLOPE_BARS", "10"))
+REGIME_FLAT_ATR = float(os.getenv("ENGINE_REGIME_FLAT_ATR", "0.5"))
+
+VOLATILITY_LEVELS = ("low_vol", "mid_vol", "high_vol")
+TREND_LEVELS = ("downtrend", "range", "uptrend")
+UNLABELED = -1  # 지표 워밍업이 끝나지 않은 봉
+
+
+def _indicator(indicator_key: str, params: Dict[str, Any], timeframe: str) -> OperandNode:
+    return compile_operand({"type": "indicator", "value": {"indicatorKey": indicator_key, "values": params, "timeframe": timeframe}})
+
+
+def label_regimes(close: np.ndarray, atr: np.ndarray, ma: np.ndarray, slope_bars: int = REGIME_SLOPE_BARS) -> np.ndarray:
+    """
+    봉별 국면 코드 (변동성 단계 * 3 + 추세 단계, 0~8). ATR/이동평균이 아직 없는 봉은 UNLABELED입니다.
+    변동성 분위 경계는 라벨을 붙일 수 있는 봉들만으로 계산합니다.
+    """
+    n = close.shape[0]
+    labels = np.full(n, UNLABELED, dtype=np.int8)
+    atr_pct = atr.astype(np.float64) / close.astype(np.float64)
+    moved = np.full(n, np.nan)
+    if n > slope_bars:
+        moved[slope_bars:] = ma[slope_bars:].astype(np.float64) - ma[:-slope_bars].astype(np.float64)
+    valid = np.isfinite(atr_pct) & np.isfinite(moved)
+    if not valid.any():
+        return labels
+    low_cut, high_cut = np.quantile(atr_pct[valid], [1.0 / 3.0, 2.0 / 3.0])
+    volatility = np.searchsorted(np.array([low_cut, high_cut]), atr_pct, side="right")
+    flat = np.abs(moved) < REGIME_FLAT_ATR * atr.astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        trend = np.where(flat, 1, np.where(moved > 0, 2, 0))
+    labels[valid] = (volatility[valid] * len(TREND_LEVELS) + trend[valid]).astype(np.int8)
+    return labels
+
+
+def regime_report(labels: np.ndarray, close: np.ndarray, sim: SimulationResult, start: int) -> Dict[str, Any]:
+    """
+    국면별 성과 분해. labels/close/sim.equity는 같은 길이이며 start 이전은 제외합니다.
+    - bars/time_pct: 국면에 속한 봉 수와 비율
+    - return_pct/benchmark_return_pct: 해당 국면 봉들의 봉별 수익률만 복리로 이은 전략/Buy & Hold 수익률
+    - mdd_pct: 위 전략 수익률로 이은 곡선의 최대 낙폭
+    - trades/win_rate_pct/avg_pnl: 진입 봉의 국면 기준 거래 집계
+    """
+    equity = sim.equity[start:]
+    prices = close[start:].astype(np.float64)
+    bar_labels = labels[start:]
+    n = equity.shape[0]
+    count = len(VOLATILITY_LEVELS) * len(TREND_LEVELS)
+    if n < 2:
+        return {"regimes": {}, "unlabeled_bars": int(n)}
+
+    # 봉 i의 수익률은 봉 i의 국면에 귀속 (i-1 -> i 구간)
+    strategy_log = np.log(equity[1:] / equity[:-1])
+    benchmark_log = np.log(prices[1:] / prices[:-1])
+    return_labels = bar_labels[1:]
+    labeled = return_labels >= 0
+    bins = return_labels[labeled].astype(np.int64)
+    strategy_sum = np.bincount(bins, weights=strategy_log[labeled], minlength=count)
+    benchmark_sum = np.bincount(bins, weights=benchmark_log[labeled], minlength=count)
+    bar_counts = np.bincount(bar_labels[bar_labels >= 0].astype(np.int64), minlength=count)
+
+    entry_labels = bar_labels[(sim.entry_idx - start).astype(np.int64)] if sim.trade_count else np.empty(0, dtype=np.int8)
+    traded = entry_labels >= 0
+    trade_bins = entry_labels[traded].astype(np.int64)
+    trade_counts = np.bincount(trade_bins, minlength=count)
+    trade_wins = np.bincount(trade_bins, weights=(sim.pnl[traded] > 0).astype(np.float64), minlength=count)
+    trade_pnl = np.bincount(trade_bins, weights=sim.pnl[traded], minlength=count)
+
+    regimes: Dict[str, Any] = {}
+    for code in np.flatnonzero(bar_counts):
+        volatility, trend = divmod(int(code), len(TREND_LEVELS))
+        in_regime = strategy_log[return_labels == code]
+        trades = int(trade_counts[code])
+        regimes[f"{VOLATILITY_LEVELS[volatility]}_{TREND_LEVELS[trend]}"] = {
+            "volatility": VOLATILITY_LEVELS[volatility],
+            "trend": TREND_LEVELS[trend],
+            "bars": int(bar_counts[code]),
+            "time_pct": float(bar_counts[code]) / n * 100.0,
+            "return_pct": float(np.expm1(strategy_sum[code])) * 100.0,
+            "benchmark_return_pct": float(np.expm1(benchmark_sum[code])) * 100.0,
+            "mdd_pct": max_drawdown_pct(np.exp(np.concatenate(([0.0], np.cumsum(in_regime))))),
+            "trades": trades,
+            "win_rate_pct": float(trade_wins[code]) / trades * 100.0 if trades else 0.0,
+            "avg_pnl": float(trade_pnl[code]) / trades if trades else 0.0,
+        }
+    return {"regimes": regimes, "unlabeled_bars": int(np.count_nonzero(bar_labels < 0))}
+
+
+def evaluate_regime_report(evaluator: RuleEvaluator, sim: SimulationResult, start: int, end: Optional[int] = None) -> Dict[str, Any]:
+    """실행에 사용한 RuleEvaluator로 ATR/이동평균을 평가(캐시 재사용)하여 국면 보고서를 만듭니다."""
+    market = evaluator.market
+    end = len(market) if end is None else end
+    timeframe = market.timeframe
+    atr = evaluator.evaluate(_indicator("ATR", {"period": REGIME_ATR_PERIOD}, timeframe))[:end]
+    ma = evaluator.evaluate(_indicator("SMA", {"period": REGIME_MA_PERIOD}, timeframe))[:end]
+    close = market.bars.close[:end]
+    return {
+        "atr_period": REGIME_ATR_PERIOD, "ma_period": REGIME_MA_PERIOD, "slope_bars": REGIME_SLOPE_BARS,
+        **regime_report(label_regimes(close, atr, ma), close, sim, start),
+    }
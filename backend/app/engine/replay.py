@@ -0,0 +1,159 @@
+# file: backend/app/engine/replay.py
+
+import io
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .data import OHLCV
+from .simulator import SimulationResult
+from .metrics import PNL_CURVE_MAX_POINTS, downsample_curve, trade_log_rows_at
+
+logger = logging.getLogger(__name__)
+
+# 시뮬레이션/지표 결과에 영향을 주는 엔진 변경이 있을 때 올립니다. 같은 입력의 재실행 결과가 달라지면
+# 어느 버전 사이에서 바뀌었는지 지문(fingerprint)으로 확인할 수 있습니다.
+ENGINE_VERSION = "1.9.0"
+REPLAY_MAX_POINTS = int(os.getenv("BACKTEST_REPLAY_MAX_POINTS", "20000")) # 재생 API가 한 번에 반환하는 최대 곡선 점 수
+
+_TRADE_FIELDS = (
+    "entry_price", "exit_price", "quantity", "entry_commission", "exit_commission",
+    "pnl", "balance_after", "mae_pct", "mfe_pct",
+)
+
+
+class DataDigest:
+    """
+    실행에 사용한 봉(ts, OHLCV)의 SHA-256. 행 단위(row-major)로 해시하므로 청크로 나누어 update해도
+    전체를 한 번에 해시한 값과 같습니다 (스트리밍/분할 실행과 단일 실행의 데이터 버전이 일치).
+    """
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self.rows = 0
+
+    def update(self, bars: OHLCV) -> "DataDigest":
+        if len(bars):
+            rows = np.column_stack((bars.ts, bars.open, bars.high, bars.low, bars.close, bars.volume)).astype(np.float64)
+            self._hash.update(np.ascontiguousarray(rows).tobytes())
+            self.rows += len(bars)
+        return self
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def data_digest(bars: OHLCV) -> str:
+    return DataDigest().update(bars).hexdigest()
+
+
+def _sha256(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parameters_digest(parameters: Dict[str, Any]) -> str:
+    return _sha256(json.dumps(parameters, sort_keys=True, separators=(",", ":"), default=str))
+
+
+def output_digest(entry_ts: np.ndarray, exit_ts: np.ndarray, sim: SimulationResult, final_equity: float) -> str:
+    """
+    실행 결과의 요약 해시 (거래 시각, 손익, 최종 자산). 실행 방식(단일/분할/스트리밍)과 무관하게 같은 거래면 같은 값이며,
+    부동소수점 합산 순서 차이는 소수 6자리 반올림으로 흡수합니다.
+    """
+    digest = hashlib.sha256()
+    digest.update(np.asarray(entry_ts, dtype=np.int64).tobytes())
+    digest.update(np.asarray(exit_ts, dtype=np.int64).tobytes())
+    digest.update(np.round(sim.pnl, 6).tobytes())
+    digest.update(np.round(np.asarray([final_equity], dtype=np.float64), 6).tobytes())
+    return digest.hexdigest()
+
+
+def build_fingerprint(run: Any, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    BacktestRun/StreamingRun의 재현 지문.
+    input_key(데이터 + 규칙 + 파라미터)가 같은 실행은 엔진 버전이 같다면 output_digest도 같아야 합니다.
+    """
+    params_hash = parameters_digest(parameters)
+    entry_ts, exit_ts = _trade_times(run)
+    final_equity = float(run.summary["trade_summary_json"]["final_equity"])
+    return {
+        "engine_version": ENGINE_VERSION,
+        "data_digest": run.data_digest,
+        "rules_key": run.rules_key,
+        "parameters_digest": params_hash,
+        "input_key": _sha256(f"{run.data_digest}:{run.rules_key}:{params_hash}"),
+        "output_digest": output_digest(entry_ts, exit_ts, run.simulation, final_equity),
+    }
+
+
+def _trade_times(run: Any):
+    if hasattr(run, "entry_ts"):  # StreamingRun
+        return run.entry_ts, run.exit_ts
+    return run.ts[run.simulation.entry_idx], run.ts[run.simulation.exit_idx]
+
+
+def _curve_arrays(run: Any):
+    """재생용 자산 곡선. 단일/분할 실행은 봉별 전체 곡선, 스트리밍 실행은 저장된 샘플 곡선입니다."""
+    if hasattr(run, "entry_ts"):
+        curve = run.summary["pnl_curve_json"]
+        ts = np.asarray([int(datetime.fromisoformat(p["time"].replace("Z", "+00:00")).timestamp() * 1000) for p in curve], dtype=np.int64)
+        return ts, np.asarray([p["value"] for p in curve], dtype=np.float64), None, None
+    start = run.start_index
+    return run.ts[start:], run.simulation.equity[start:], run.entries[start:], run.exits[start:]
+
+
+def encode_artifact(run: Any, fingerprint: Dict[str, Any]) -> bytes:
+    """
+    신호 마스크(비트 압축), 자산 곡선, 거래 배열을 압축 npz 바이트로 만듭니다.
+    API와 워커가 다른 호스트여도 읽을 수 있도록 파일이 아닌 DB(BacktestResult.replay_artifact)에 저장합니다.
+    스트리밍 실행은 봉별 신호를 보관하지 않으므로 곡선 샘플과 거래만 저장합니다.
+    """
+    ts, equity, entries, exits = _curve_arrays(run)
+    entry_ts, exit_ts = _trade_times(run)
+    sim = run.simulation
+    arrays = {
+        "ts": ts, "equity": equity,
+        "entry_ts": np.asarray(entry_ts, dtype=np.int64), "exit_ts": np.asarray(exit_ts, dtype=np.int64),
+        "bars_held": (sim.exit_idx - sim.entry_idx).astype(np.int64), "exit_reason": sim.exit_reason,
+        "fingerprint": np.asarray(json.dumps(fingerprint, sort_keys=True)),
+        **{field: getattr(sim, field) for field in _TRADE_FIELDS},
+    }
+    if entries is not None:
+        arrays["entries"] = np.packbits(entries)
+        arrays["exits"] = np.packbits(exits)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def load_replay(payload: bytes, max_points: int = PNL_CURVE_MAX_POINTS) -> Dict[str, Any]:
+    """재생 산출물(encode_artifact의 npz 바이트)에서 곡선/거래/신호 개수를 읽어 반환합니다. 엔진 계산은 하지 않습니다."""
+    with np.load(io.BytesIO(payload), allow_pickle=False) as artifact:
+        ts, equity = artifact["ts"], artifact["equity"]
+        n_trades = artifact["entry_ts"].shape[0]
+        empty = np.empty(0, dtype=np.float64)
+        entry_idx = np.zeros(n_trades, dtype=np.int64)
+        sim = SimulationResult(
+            equity=empty, position=empty, entry_idx=entry_idx, exit_idx=entry_idx + artifact["bars_held"],
+            **{field: artifact[field] for field in _TRADE_FIELDS},
+            exit_reason=artifact["exit_reason"],
+        )
+        signals: Optional[Dict[str, int]] = None
+        if "entries" in artifact.files:
+            count = ts.shape[0]
+            signals = {
+                "entries": int(np.unpackbits(artifact["entries"], count=count).sum()),
+                "exits": int(np.unpackbits(artifact["exits"], count=count).sum()),
+            }
+        trades: List[Dict[str, Any]] = trade_log_rows_at(artifact["entry_ts"], artifact["exit_ts"], sim)
+        return {
+            "fingerprint": json.loads(str(artifact["fingerprint"])),
+            "bars": int(ts.shape[0]),
+            "equity_curve": downsample_curve(ts, equity, max(2, min(max_points, REPLAY_MAX_POINTS))),
+            "signal_counts": signals,
+            "trades": trades,
+        }
@@ -0,0 +1,198 @@
+# file: backend/app/engine/sharding.py
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .data import TIMEFRAME_MS, get_precision, timeframe_ms
+from .compiler import CompiledStrategy, OperandNode
+from .evaluator import MarketFrame, RuleEvaluator
+from .backtester import BacktestRun, BacktestSpec, load_market, run_compiled
+from .simulator import simulate
+from .metrics import summarize
+from .regimes import evaluate_regime_report
+from .replay import data_digest
+from .snapshots import load_ohlcv_at
+
+logger = logging.getLogger(__name__)
+
+# --- 시간 구간 분할(sharded) 실행 설정 ---
+# 긴 백테스트를 N개 시간 구간으로 나누어 각 워커가 신호 마스크를 계산하고(map),
+# 마지막에 포지션 상태 머신과 성과 지표를 한 번에 이어 붙입니다(reduce).
+SHARD_COUNT = int(os.getenv("BACKTEST_SHARD_COUNT", "8"))
+SHARD_MIN_BARS = int(os.getenv("BACKTEST_SHARD_MIN_BARS", "500000")) # auto 모드에서 분할을 시작하는 봉 수
+
+# 유한한 과거 창(window)만 참조하는 지표. 이 지표들로만 구성된 전략은 워밍업 구간만 겹치게 로드하면
+# 구간별 계산 결과가 단일 실행과 정확히 같습니다. EMA/RSI/ATR/MACD/OBV/ParabolicSAR 처럼
+# 전체 과거에 의존하는 지표가 포함되면 분할하지 않고 단일 워커로 실행합니다.
+WINDOW_STATELESS_INDICATORS = frozenset({"Close", "Open", "High", "Low", "Volume", "SMA", "BB", "Stoch", "CCI"})
+
+
+def is_window_stateless(compiled: CompiledStrategy) -> bool:
+    return all(
+        node.indicator_key in WINDOW_STATELESS_INDICATORS
+        for node in compiled.iter_nodes()
+        if isinstance(node, OperandNode) and node.kind == "indicator"
+    )
+
+
+def shard_warmup_ms(compiled: CompiledStrategy) -> int:
+    """
+    구간 사이 겹침 길이. 지표 lookback에 더해, 구간 시작에서 잘려 부분 집계된 상위 타임프레임 봉이
+    유효 구간에 들어오지 않도록 가장 큰 타임프레임 두 봉만큼 여유를 둡니다.
+    """
+    largest = TIMEFRAME_MS[compiled.timeframes[-1]] if compiled.timeframes else 0
+    return compiled.warmup_ms + 2 * largest
+
+
+def should_shard(compiled: CompiledStrategy, spec: BacktestSpec, mode: str = "auto") -> bool:
+    if mode not in ("auto", "sharded") or not is_window_stateless(compiled):
+        if mode == "sharded":
+            logger.info(f"Strategy {compiled.key[:10]} uses path-dependent indicators; falling back to single-worker execution.")
+        return False
+    if mode == "sharded":
+        return True
+    estimated_bars = (spec.end_ms - spec.start_ms) // timeframe_ms(spec.timeframe)
+    return estimated_bars >= SHARD_MIN_BARS
+
+
+def plan_shards(spec: BacktestSpec, count: int = SHARD_COUNT) -> List[Tuple[int, int]]:
+    """[start_ms, end_ms)를 실행 타임프레임 경계에 맞춘 count개의 연속 구간으로 나눕니다."""
+    step = timeframe_ms(spec.timeframe)
+    total_bars = max(1, -(-(spec.end_ms - spec.start_ms) // step))
+    count = max(1, min(count, total_bars))
+    edges = spec.start_ms + (np.linspace(0, total_bars, count + 1).astype(np.int64) * step)
+    edges[-1] = spec.end_ms
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(count) if edges[i] < edges[i + 1]]
+
+
+# --- 구간 신호 직렬화 ---
+# 마스크는 값이 바뀌는 봉의 시각(transition)만 전달합니다. 희소한 교차 신호와
+# "종가 > SMA" 처럼 길게 유지되는 조건 모두 작게 표현되며, 봉 누락이 있어도 시각 기준으로 복원됩니다.
+
+def _encode_mask(ts: np.ndarray, mask: np.ndarray) -> Dict[str, Any]:
+    if mask.size == 0:
+        return {"initial": False, "transitions": []}
+    flips = np.flatnonzero(mask[1:] != mask[:-1]) + 1
+    return {"initial": bool(mask[0]), "transitions": ts[flips].tolist()}
+
+
+def _decode_mask(encoded: Dict[str, Any], ts: np.ndarray) -> np.ndarray:
+    transitions = np.asarray(encoded["transitions"], dtype=np.int64)
+    flips = np.searchsorted(transitions, ts, side="right")
+    return (flips % 2 == 1) ^ bool(encoded["initial"])
+
+
+@dataclass(frozen=True)
+class ShardSignals:
+    start_ms: int
+    end_ms: int
+    bars: int
+    entries: Dict[str, Any]
+    exits: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"start_ms": self.start_ms, "end_ms": self.end_ms, "bars": self.bars, "entries": self.entries, "exits": self.exits}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ShardSignals":
+        return cls(data["start_ms"], data["end_ms"], data["bars"], data["entries"], data["exits"])
+
+
+def compute_shard_signals(compiled: CompiledStrategy, spec: BacktestSpec, chunk_start: int, chunk_end: int) -> ShardSignals:
+    """map 단계: 워밍업을 겹쳐 로드한 구간에서 진입/청산 마스크를 계산하고 구간 내부 봉만 남깁니다."""
+    bars = load_ohlcv_at(spec.data_version, spec.exchange, spec.ticker, spec.timeframe, chunk_start - shard_warmup_ms(compiled), chunk_end)
+    # 워밍업 길이가 전략마다 다르므로 구간 경계가 아니라 실제 로드한 봉(첫 봉 시각, 봉 수, 데이터 버전)으로 캐시 key를 만듭니다.
+    market = MarketFrame(spec.data_key(bars), spec.timeframe, bars, precision=get_precision(spec.precision))
+    evaluator = RuleEvaluator(market)
+    lo = int(np.searchsorted(bars.ts, chunk_start, side="left"))
+    ts = bars.ts[lo:]
+    return ShardSignals(
+        start_ms=chunk_start, end_ms=chunk_end, bars=int(ts.shape[0]),
+        entries=_encode_mask(ts, evaluator.evaluate(compiled.buy)[lo:]),
+        exits=_encode_mask(ts, evaluator.evaluate(compiled.sell)[lo:]),
+    )
+
+
+def stitch_shards(compiled: CompiledStrategy, spec: BacktestSpec, shards: List[ShardSignals]) -> BacktestRun:
+    """
+    reduce 단계: 구간별 마스크를 시간순으로 이어 붙이고, 포지션 상태 머신/시뮬레이션/지표를 한 번에 계산합니다.
+    봉은 단일 워커 실행과 같은 load_market(지표 워밍업 포함)으로 로드하고 start_index/index_dtype도 그대로 넘기므로,
+    거래 인덱스와 국면 보고서(워밍업 구간의 ATR/이동평균 포함)가 단일 실행과 같습니다.
+    신호 지표는 계산하지 않으며, 지정가 주문 모드에서만 고가/저가/거래량 열을 함께 사용합니다.
+    """
+    market, start_index, end_index = load_market(spec, compiled)
+    bars = market.bars
+    ts = bars.ts[:end_index]
+    entries = np.zeros(end_index, dtype=bool)
+    exits = np.zeros(end_index, dtype=bool)
+    for shard in sorted(shards, key=lambda s: s.start_ms):
+        lo = int(np.searchsorted(ts, shard.start_ms, side="left"))
+        hi = int(np.searchsorted(ts, shard.end_ms, side="left"))
+        if hi - lo != shard.bars:
+            logger.warning(f"Shard [{shard.start_ms}, {shard.end_ms}) saw {shard.bars} bars but reduce loaded {hi - lo}; data changed between phases.")
+        entries[lo:hi] = _decode_mask(shard.entries, ts[lo:hi])
+        exits[lo:hi] = _decode_mask(shard.exits, ts[lo:hi])
+
+    close = bars.close[:end_index]
+    sim = simulate(
+        close, entries, exits, spec.simulation, start=start_index, index_dtype=market.precision.index_dtype,
+        high=bars.high[:end_index], low=bars.low[:end_index], volume=bars.volume[:end_index],
+    )
+    summary = summarize(ts, sim, spec.timeframe, start_index, spec.simulation.initial_capital, close, spec.rolling_window_days)
+    summary["trade_summary_json"]["shards"] = len(shards)
+    # 국면 분류용 ATR/이동평균은 신호 지표가 아니므로 reduce 단계에서 워밍업을 포함한 전체 봉으로 계산합니다.
+    summary["regime_report_json"] = evaluate_regime_report(RuleEvaluator(market), sim, start_index, end_index)
+    return BacktestRun(
+        timeframe=spec.timeframe, ts=ts, entries=entries, exits=exits,
+        start_index=start_index, simulation=sim, summary=summary, nodes_computed=0,
+        rules_key=compiled.key, data_digest=data_digest(bars.slice(start_index, end_index)),
+    )
+
+
+def verify_sharded(compiled: CompiledStrategy, spec: BacktestSpec, shards: List[ShardSignals]) -> Dict[str, Any]:
+    """
+    분할 실행 결과를 단일 워커 실행과 비교합니다. 신호 마스크, 거래 인덱스(dtype 포함), 주요 지표와 국면 보고서가 일치해야 합니다.
+    """
+    sharded = stitch_shards(compiled, spec, shards)
+    market, start_index, end_index = load_market(spec, compiled)
+    single = run_compiled(compiled, market, spec.simulation, start_index, end_index=end_index, rolling_window_days=spec.rolling_window_days)
+    single_entries = single.entries[start_index:]
+    single_exits = single.exits[start_index:]
+    sharded_entries = sharded.entries[sharded.start_index:]
+    sharded_exits = sharded.exits[sharded.start_index:]
+    same_length = single_entries.shape[0] == sharded_entries.shape[0]
+    entry_mismatches = int(np.count_nonzero(single_entries != sharded_entries)) if same_length else -1
+    exit_mismatches = int(np.count_nonzero(single_exits != sharded_exits)) if same_length else -1
+    same_trades = all(
+        a.dtype == b.dtype and np.array_equal(a, b)
+        for a, b in (
+            (single.simulation.entry_idx, sharded.simulation.entry_idx),
+            (single.simulation.exit_idx, sharded.simulation.exit_idx),
+        )
+    )
+    same_regimes = single.summary["regime_report_json"] == sharded.summary["regime_report_json"]
+    metric_diffs = {
+        key: abs(float(single.summary[key]) - float(sharded.summary[key]))
+        for key in ("total_return_pct", "mdd_pct", "sharpe_ratio", "win_rate_pct")
+    }
+    matches = (
+        entry_mismatches == 0 and exit_mismatches == 0 and same_trades and same_regimes
+        and all(diff <= 1e-9 for diff in metric_diffs.values())
+    )
+    if not matches:
+        logger.error(
+            f"Sharded execution mismatch for strategy {compiled.key[:10]}: entries={entry_mismatches}, exits={exit_mismatches}, "
+            f"trades={'same' if same_trades else 'different'}, regimes={'same' if same_regimes else 'different'}, metrics={metric_diffs}"
+        )
+    return {
+        "matches": matches,
+        "entry_mismatches": entry_mismatches,
+        "exit_mismatches": exit_mismatches,
+        "trade_indices_match": same_trades,
+        "regime_report_match": same_regimes,
+        "metric_diffs": metric_diffs,
+    }
@@ -0,0 +1,241 @@
+# file: backend/app/engine/shm_broker.py
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .data import OHLCV, OHLCV_COLUMNS, load_ohlcv
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl  # 호스트 내 프로세스 간 색인 잠금
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # pragma: no cover - Windows 개발 환경에서는 브로커를 사용하지 않음
+    fcntl = None
+    shared_memory = None
+
+# --- 호스트 단위 공유 메모리 시세 브로커 ---
+# 같은 호스트의 prefork 워커들이 인기 시계열을 각자 로드하지 않도록, 처음 요청한 프로세스가 시계열을
+# multiprocessing.shared_memory 세그먼트(ts int64 + OHLCV float64 열 6개를 이어 붙인 배열)에 올리고
+# 나머지 프로세스는 이름으로 붙어(attach) 같은 물리 메모리를 읽습니다.
+# 세그먼트 목록/참조 프로세스/최근 사용 시각은 색인 파일(JSON)에 기록하며, 색인 잠금(flock) 안에서만 읽고 씁니다.
+# 참조 중인 프로세스가 없는 세그먼트는 총 용량이 SHM_BUDGET_BYTES를 넘으면 오래 쓰지 않은 순서(LRU)로 해제합니다.
+SHM_BROKER_ENABLED = os.getenv("ENGINE_SHM_BROKER", "1") == "1" and shared_memory is not None
+SHM_BUDGET_BYTES = int(float(os.getenv("ENGINE_SHM_BUDGET_MB", "1024")) * 1024 * 1024)
+SHM_MAX_STALENESS_MS = int(float(os.getenv("ENGINE_SHM_MAX_STALENESS_S", "900")) * 1000) # 이 정도 늦게 끝나는 세그먼트는 그대로 공유
+SHM_INDEX_DIR = os.getenv("ENGINE_SHM_INDEX_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+
+_COLUMNS = ("ts",) + OHLCV_COLUMNS
+_NAME_PREFIX = "cortex_ohlcv_"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _attach_segment(name: str, create: bool = False, size: int = 0):
+    """
+    세그먼트를 만들거나 붙습니다. Python 3.12 이하의 resource_tracker는 붙은 프로세스가 종료될 때 세그먼트를
+    unlink하므로 추적을 해제하고, 해제는 브로커의 LRU 정리에서만 수행합니다.
+    """
+    segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+    try:
+        resource_tracker.unregister(segment._name, "shared_memory")
+    except Exception:
+        pass
+    return segment
+
+
+def _unlink_segment(name: str) -> None:
+    # unlink()가 resource_tracker 등록 해제까지 수행하므로 여기서는 추적을 유지한 채로 붙습니다.
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+class SharedSeriesBroker:
+    """
+    호스트 단위 공유 메모리 시계열 브로커. attach()로 받은 OHLCV는 세그먼트를 직접 가리키는 읽기 전용 배열이며,
+    사용이 끝나면 release()로 참조를 반납합니다 (프로세스 종료 시 남은 참조는 자동 반납, 비정상 종료한 프로세스의
+    참조는 정리 시 pid 생존 여부로 제거).
+    """
+    def __init__(self, index_dir: str = SHM_INDEX_DIR, budget_bytes: int = SHM_BUDGET_BYTES,
+                 max_staleness_ms: int = SHM_MAX_STALENESS_MS, loader: Callable[..., OHLCV] = load_ohlcv):
+        self.index_path = os.path.join(index_dir, "cortex_ohlcv_index.json")
+        self.lock_path = f"{self.index_path}.lock"
+        self.budget_bytes = budget_bytes
+        self.max_staleness_ms = max_staleness_ms
+        self.loader = loader
+        self._segments: Dict[str, Any] = {}  # 이 프로세스가 붙어 있는 세그먼트 (이름 -> SharedMemory)
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        atexit.register(self.release_all)
+
+    def attach(self, exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> Tuple[str, OHLCV, int]:
+        """
+        [start_ms, end_ms) 시계열을 공유 메모리에서 가져옵니다. 반환값은 (세그먼트 이름, OHLCV, 적재 종료 시각)입니다.
+        같은 시계열이 이미 더 넓은 구간으로 올라가 있으면 (끝이 max_staleness_ms 이내로 늦은 경우 포함) 그대로 붙고,
+        없으면 이 프로세스가 한 번만 로드하여 올립니다. 로드는 색인 잠금 안에서 수행하므로 동시에 요청한 다른 프로세스는 기다렸다가 붙습니다.
+        """
+        key = f"{exchange}:{ticker}:{timeframe}"
+        with self._lock, self._index() as index:
+            entry = index["series"].get(key)
+            if entry is not None and entry["start_ms"] <= start_ms and entry["end_ms"] >= end_ms - self.max_staleness_ms:
+                self.hits += 1
+            else:
+                self.misses += 1
+                bars = self.loader(exchange, ticker, timeframe, start_ms, end_ms)
+                entry = self._publish(index, key, bars, start_ms, end_ms)
+            entry["last_used"] = time.time()
+            holders = entry.setdefault("holders", {})
+            holders[str(os.getpid())] = holders.get(str(os.getpid()), 0) + 1
+            self._evict(index)
+            name, rows, loaded_until = entry["name"], entry["rows"], entry["end_ms"]
+        return name, self._view(name, rows), loaded_until
+
+    def release(self, name: str) -> None:
+        with self._lock, self._index() as index:
+            self._release_locked(index, name)
+
+    def release_all(self) -> None:
+        with self._lock:
+            if not self._refs:
+                return
+            with self._index() as index:
+                for name in list(self._refs):
+                    while name in self._refs:
+                        self._release_locked(index, name)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        with self._lock:
+            attached_bytes = sum(segment.size for segment in self._segments.values())
+        return {
+            "entries": len(self._segments),
+            "bytes": attached_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+    # --- 내부 구현 ---
+
+    @contextmanager
+    def _index(self) -> Iterator[Dict[str, Any]]:
+        with open(self.lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.index_path, "r", encoding="utf-8") as f:
+                        index = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    index = {"series": {}, "retired": []}
+                yield index
+                tmp_path = f"{self.index_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(index, f)
+                os.replace(tmp_path, self.index_path)
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _publish(self, index: Dict[str, Any], key: str, bars: OHLCV, start_ms: int, end_ms: int) -> Dict[str, Any]:
+        rows = len(bars)
+        previous = index["series"].get(key)
+        # 옛 버전 세그먼트가 아직 참조 중일 수 있으므로 버전마다 새 이름을 씁니다.
+        name = f"{_NAME_PREFIX}{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}_{os.urandom(4).hex()}"
+        segment = _attach_segment(name, create=True, size=max(1, rows * len(_COLUMNS) * 8))
+        table = np.ndarray((len(_COLUMNS), rows), dtype=np.float64, buffer=segment.buf)
+        table[0].view(np.int64)[:] = bars.ts
+        for row, column in enumerate(OHLCV_COLUMNS, start=1):
+            table[row] = bars.column(column)
+        del table
+        segment.close()
+        if previous:
+            # 다른 프로세스가 아직 붙어 있을 수 있으므로 바로 해제하지 않고 참조가 없어지면 정리합니다.
+            index["retired"].append(previous)
+        entry = {
+            "name": name, "rows": rows, "bytes": rows * len(_COLUMNS) * 8,
+            "start_ms": int(start_ms), "end_ms": int(end_ms), "last_used": time.time(), "holders": {},
+        }
+        index["series"][key] = entry
+        logger.info(f"Published {rows} {key} candles to shared memory segment {name}.")
+        return entry
+
+    def _view(self, name: str, rows: int) -> OHLCV:
+        segment = self._segments.get(name)
+        if segment is None:
+            segment = self._segments[name] = _attach_segment(name)
+        self._refs[name] = self._refs.get(name, 0) + 1
+        table = np.ndarray((len(_COLUMNS), rows), dtype=np.float64, buffer=segment.buf)
+        table.setflags(write=False)
+        return OHLCV(table[0].view(np.int64), *table[1:])
+
+    def _release_locked(self, index: Dict[str, Any], name: str) -> None:
+        count = self._refs.get(name, 0)
+        if count <= 0:
+            return
+        pid = str(os.getpid())
+        for entry in list(index["series"].values()) + index["retired"]:
+            if entry["name"] == name and entry["holders"].get(pid):
+                entry["holders"][pid] -= 1
+                if entry["holders"][pid] <= 0:
+                    entry["holders"].pop(pid)
+                break
+        if count == 1:
+            # 이 프로세스의 마지막 참조: 매핑만 닫습니다. 반환했던 배열이 아직 살아 있으면 배열이 사라질 때 GC가 닫습니다.
+            self._refs.pop(name)
+            segment = self._segments.pop(name)
+            try:
+                segment.close()
+            except BufferError:
+                pass
+        else:
+            self._refs[name] = count - 1
+        self._evict(index)
+
+    def _evict(self, index: Dict[str, Any]) -> None:
+        """종료된 프로세스의 참조를 지우고, 참조 없는 옛 버전과 예산을 넘는 LRU 세그먼트를 해제합니다."""
+        entries = list(index["series"].values()) + index["retired"]
+        for entry in entries:
+            entry["holders"] = {pid: count for pid, count in entry.get("holders", {}).items() if _pid_alive(int(pid))}
+        for entry in [e for e in index["retired"] if not e["holders"]]:
+            _unlink_segment(entry["name"])
+            index["retired"].remove(entry)
+        total = sum(entry["bytes"] for entry in index["series"].values()) + sum(entry["bytes"] for entry in index["retired"])
+        idle = sorted(
+            ((key, entry) for key, entry in index["series"].items() if not entry["holders"]),
+            key=lambda item: item[1]["last_used"],
+        )
+        for key, entry in idle:
+            if total <= self.budget_bytes:
+                break
+            _unlink_segment(entry["name"])
+            index["series"].pop(key)
+            total -= entry["bytes"]
+            logger.info(f"Evicted shared memory segment {entry['name']} ({key}).")
+        if total > self.budget_bytes:
+            logger.warning(f"Shared market data uses {total} bytes, over the {self.budget_bytes}-byte budget (all segments in use).")
+
+
+shared_series_broker: Optional[SharedSeriesBroker] = SharedSeriesBroker() if SHM_BROKER_ENABLED else None
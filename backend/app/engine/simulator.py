@@ -0,0 +1,357 @@
+# file: backend/app/engine/simulator.py
+
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .jit import jit_enabled, kernel
+from .fills import OrderBookBlocks, fill_order
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    initial_capital: float = 10000.0
+    commission_rate: float = 0.0005  # 체결 금액 대비 수수료 비율
+    slippage_rate: float = 0.0  # 종가 대비 불리한 방향의 체결 가격 오차 비율
+    trailing_stop_rate: float = 0.0  # 진입 후 최고 종가 대비 하락률이 이 값 이상이면 청산 (0이면 사용 안 함)
+    # 주문 방식: "market"(신호 봉 종가 체결) | "limit"(다음 봉부터 지정가 대기, fills.py 참고)
+    order_type: str = "market"
+    limit_offset_rate: float = 0.001  # 신호 봉 종가 대비 지정가 간격
+    limit_ttl_bars: int = 5  # 지정가 주문 대기 봉 수 (만료 시 매수는 취소, 매도 잔량은 시장가 청산)
+    touch_fill_probability: float = 0.5  # 지정가에 닿기만 한 봉의 체결 확률
+    touch_band_rate: float = 0.0002  # 지정가 ± 이 비율 이내의 고가/저가를 "닿음"으로 간주
+    volume_participation_rate: float = 0.1  # 봉 거래량 대비 최대 체결 비율 (0이면 제한 없음)
+    fill_seed: int = 0  # 확률적 체결 난수 시드 (같은 입력이면 같은 결과)
+
+
+# 청산 사유 코드 (SimulationResult.exit_reason 값은 EXIT_REASONS의 인덱스)
+EXIT_SIGNAL = 0
+EXIT_TRAILING_STOP = 1
+EXIT_END_OF_DATA = 2
+EXIT_REASONS = ("signal", "trailing_stop", "end_of_data")
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """
+    Long-only 시뮬레이션 결과. 거래는 진입/청산 봉 인덱스 배열로 표현합니다.
+    마지막까지 보유 중인 포지션은 마지막 봉 종가에 청산한 것으로 처리합니다.
+    """
+    equity: np.ndarray  # 봉별 평가 자산 (float64)
+    position: np.ndarray  # 봉별 보유 수량 (float64, 0이면 미보유)
+    entry_idx: np.ndarray  # int64 (압축 정밀도 모드에서는 int32)
+    exit_idx: np.ndarray
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    quantity: np.ndarray
+    entry_commission: np.ndarray
+    exit_commission: np.ndarray
+    pnl: np.ndarray  # 거래별 실현 손익 (수수료 포함)
+    balance_after: np.ndarray  # 거래 청산 후 현금 잔고
+    mae_pct: np.ndarray  # 보유 구간 최저 종가의 진입가 대비 변화율 (Maximum Adverse Excursion, %)
+    mfe_pct: np.ndarray  # 보유 구간 최고 종가의 진입가 대비 변화율 (Maximum Favorable Excursion, %)
+    exit_reason: np.ndarray  # int8, EXIT_REASONS 인덱스
+
+    @property
+    def trade_count(self) -> int:
+        return int(self.entry_idx.shape[0])
+
+
+def match_signals(
+    entries: np.ndarray,
+    exits: np.ndarray,
+    start: int = 0,
+    index_dtype=np.int64,
+    close: Optional[np.ndarray] = None,
+    trailing_stop_rate: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    진입/청산 마스크로부터 포지션 상태 머신을 실행하여 (진입 봉, 청산 봉) 쌍을 찾습니다.
+    봉 단위가 아닌 신호가 발생한 봉들만 순회하므로 신호가 희소할수록 빠릅니다.
+    같은 봉에서 진입과 청산 신호가 동시에 나오면 현재 상태에 맞는 쪽이 우선합니다.
+    trailing_stop_rate > 0 이면 보유 중 종가가 진입 이후 최고 종가 대비 해당 비율 이상 하락한 봉에서도 청산합니다.
+    ENGINE_JIT가 켜져 있으면 같은 규칙의 봉 단위 루프(_state_machine_loop)를 컴파일하여 실행합니다.
+    """
+    n = entries.shape[0]
+    if trailing_stop_rate > 0.0 and close is None:
+        raise ValueError("close prices are required for a trailing stop.")
+    if jit_enabled():
+        entry_out = np.empty(n, dtype=np.int64)
+        exit_out = np.empty(n, dtype=np.int64)
+        prices = close if close is not None else np.zeros(n, dtype=np.float64)
+        count = _state_machine_loop.jit_func(entries, exits, prices, start, float(trailing_stop_rate), entry_out, exit_out)
+        return entry_out[:count].astype(index_dtype), exit_out[:count].astype(index_dtype)
+
+    entry_list = []
+    exit_list = []
+    if trailing_stop_rate > 0.0:
+        entry_events = np.flatnonzero(entries[start:]) + start
+        exit_events = np.flatnonzero(exits)
+        pos = start
+        while True:
+            k = int(np.searchsorted(entry_events, pos, side="left"))
+            if k == entry_events.shape[0]:
+                break
+            entry = int(entry_events[k])
+            j = int(np.searchsorted(exit_events, entry, side="right"))
+            signal_exit = int(exit_events[j]) if j < exit_events.shape[0] else n
+            exit_ = min(_first_trailing_stop(close, entry, signal_exit, trailing_stop_rate), n - 1)
+            entry_list.append(entry)
+            exit_list.append(exit_)
+            pos = exit_ + 1
+        return np.asarray(entry_list, dtype=index_dtype), np.asarray(exit_list, dtype=index_dtype)
+
+    events = np.flatnonzero(entries[start:] | exits[start:]) + start
+    in_position = False
+    for i in events:
+        if not in_position and entries[i]:
+            entry_list.append(i)
+            in_position = True
+        elif in_position and exits[i]:
+            exit_list.append(i)
+            in_position = False
+    if in_position:
+        exit_list.append(n - 1)
+    return np.asarray(entry_list, dtype=index_dtype), np.asarray(exit_list, dtype=index_dtype)
+
+
+def _first_trailing_stop(close: np.ndarray, entry: int, limit: int, rate: float) -> int:
+    """
+    entry 다음 봉부터 limit 직전까지 트레일링 스탑이 걸리는 첫 봉을 찾습니다 (없으면 limit).
+    짧은 보유가 대부분이므로 작은 구간부터 두 배씩 늘려 가며 누적 최대값으로 검사합니다.
+    """
+    peak = close[entry]
+    pos = entry + 1
+    window = 256
+    while pos < limit:
+        seg = close[pos:min(limit, pos + window)]
+        peaks = np.maximum.accumulate(np.concatenate(([peak], seg)))
+        hit = np.flatnonzero(seg <= peaks[:-1].astype(np.float64) * (1.0 - rate))
+        if hit.size:
+            return pos + int(hit[0])
+        peak = peaks[-1]
+        pos += seg.shape[0]
+        window *= 2
+    return limit
+
+
+@kernel
+def _state_machine_loop(entries, exits, close, start, trailing_stop_rate, entry_out, exit_out):
+    """match_signals와 같은 규칙의 봉 단위 루프 (Numba 컴파일 대상). 기록한 거래 수를 반환합니다."""
+    n = entries.shape[0]
+    count = 0
+    in_position = False
+    peak = 0.0
+    for i in range(start, n):
+        if not in_position:
+            if entries[i]:
+                entry_out[count] = i
+                in_position = True
+                peak = close[i]
+        else:
+            if trailing_stop_rate > 0.0:
+                if close[i] > peak:
+                    peak = close[i]
+                elif close[i] <= peak * (1.0 - trailing_stop_rate):
+                    exit_out[count] = i
+                    count += 1
+                    in_position = False
+                    continue
+            if exits[i]:
+                exit_out[count] = i
+                count += 1
+                in_position = False
+    if in_position:
+        exit_out[count] = n - 1
+        count += 1
+    return count
+
+
+def simulate(
+    close: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    config: SimulationConfig,
+    start: int = 0,
+    index_dtype=np.int64,
+    high: Optional[np.ndarray] = None,
+    low: Optional[np.ndarray] = None,
+    volume: Optional[np.ndarray] = None,
+) -> SimulationResult:
+    """
+    봉 종가 시장가 체결 기준의 Long-only 전량 매수/매도 시뮬레이션.
+    start 이전 봉은 지표 워밍업 구간으로, 신호를 무시하고 평가 자산은 초기 자본으로 고정합니다.
+    close가 float32(압축 정밀도 모드)여도 체결가/평가 자산/손익은 float64로 계산합니다.
+    config.order_type이 "limit"이면 high/low/volume이 필요하며 simulate_limit으로 처리합니다.
+    """
+    if config.order_type == "limit":
+        if high is None or low is None or volume is None:
+            raise ValueError("high, low and volume are required for limit-order simulation.")
+        return simulate_limit(close, high, low, volume, entries, exits, config, start, index_dtype)
+    if config.order_type != "market":
+        raise ValueError(f"Unknown order type: {config.order_type}")
+    n = close.shape[0]
+    entry_idx, exit_idx = match_signals(entries, exits, start, index_dtype, close, config.trailing_stop_rate)
+    # 진입과 청산이 같은 봉(마지막 봉 진입 후 강제 청산)인 거래는 의미가 없으므로 제외
+    keep = exit_idx > entry_idx
+    entry_idx, exit_idx = entry_idx[keep], exit_idx[keep]
+
+    entry_price = close[entry_idx].astype(np.float64) * (1.0 + config.slippage_rate)
+    exit_price = close[exit_idx].astype(np.float64) * (1.0 - config.slippage_rate)
+    fee_rate = config.commission_rate
+
+    # 전량 재투자이므로 거래별 자본 증감률의 누적곱으로 각 거래 직전 현금을 구합니다.
+    # 진입: cash -> qty = cash / (price * (1 + fee)),  청산: qty * exit * (1 - fee)
+    growth = (exit_price * (1.0 - fee_rate)) / (entry_price * (1.0 + fee_rate))
+    balance_after = config.initial_capital * np.cumprod(growth)
+    cash_before = np.concatenate(([config.initial_capital], balance_after[:-1]))
+    quantity = cash_before / (entry_price * (1.0 + fee_rate))
+    entry_commission = quantity * entry_price * fee_rate
+    exit_commission = quantity * exit_price * fee_rate
+    pnl = balance_after - cash_before
+
+    # 봉별 보유 수량 / 평가 자산
+    trade_of_bar = np.searchsorted(entry_idx, np.arange(n), side="right") - 1
+    holding = trade_of_bar >= 0
+    holding[holding] = np.arange(n)[holding] < exit_idx[trade_of_bar[holding]]
+    position = np.zeros(n, dtype=np.float64)
+    position[holding] = quantity[trade_of_bar[holding]]
+
+    closed_before = np.searchsorted(exit_idx, np.arange(n), side="right") - 1
+    cash = np.where(closed_before >= 0, balance_after[np.maximum(closed_before, 0)] if balance_after.size else config.initial_capital, config.initial_capital)
+    prices = close.astype(np.float64)
+    equity = np.where(holding, position * prices, cash)
+    low, high, peak_before_exit = trade_extremes(prices, entry_idx, exit_idx)
+
+    # 청산 사유: 시뮬레이션 루프와 같은 우선순위(트레일링 스탑 > 청산 신호 > 마지막 봉 강제 청산)로 판정
+    exit_reason = np.full(entry_idx.shape[0], EXIT_END_OF_DATA, dtype=np.int8)
+    exit_reason[exits[exit_idx]] = EXIT_SIGNAL
+    if config.trailing_stop_rate > 0.0:
+        exit_reason[prices[exit_idx] <= peak_before_exit * (1.0 - config.trailing_stop_rate)] = EXIT_TRAILING_STOP
+
+    return SimulationResult(
+        equity=equity.astype(np.float64), position=position,
+        entry_idx=entry_idx, exit_idx=exit_idx,
+        entry_price=entry_price, exit_price=exit_price, quantity=quantity,
+        entry_commission=entry_commission, exit_commission=exit_commission,
+        pnl=pnl, balance_after=balance_after,
+        mae_pct=(low / entry_price - 1.0) * 100.0, mfe_pct=(high / entry_price - 1.0) * 100.0,
+        exit_reason=exit_reason,
+    )
+
+
+def trade_extremes(prices: np.ndarray, entry_idx: np.ndarray, exit_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    거래별 보유 구간 [진입 봉, 청산 봉]의 최저/최고 종가와 청산 직전 봉까지의 최고 종가.
+    모든 거래 구간을 하나의 reduceat 호출로 줄이므로 거래 수만큼의 파이썬 루프가 없습니다.
+    거래 구간은 겹치지 않고 청산 봉 > 진입 봉이어야 합니다.
+    """
+    if entry_idx.shape[0] == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty, empty
+    padded = np.append(prices, prices[-1])  # 마지막 봉 청산 거래의 구간 끝(n)을 위한 자리
+    spans = np.column_stack((entry_idx, exit_idx + 1)).ravel().astype(np.int64)
+    low = np.minimum.reduceat(padded, spans)[::2]
+    high = np.maximum.reduceat(padded, spans)[::2]
+    peak_before_exit = np.maximum.reduceat(padded, np.column_stack((entry_idx, exit_idx)).ravel().astype(np.int64))[::2]
+    return low, high, peak_before_exit
+
+
+def simulate_limit(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    config: SimulationConfig,
+    start: int = 0,
+    index_dtype=np.int64,
+) -> SimulationResult:
+    """
+    지정가 주문 기반 Long-only 시뮬레이션.
+    포지션 상태 머신은 주문 단위로만 순회하며, 체결 가능 수량은 주문을 내는 신호 블록만 계산합니다(OrderBookBlocks).
+    주문 대기 중에 나온 같은 방향 신호는 무시합니다.
+    - 매수: 현금 전액 기준 수량을 주문하고, 만료까지 체결된 만큼만 보유합니다 (남은 현금은 그대로 보유).
+      포지션은 마지막 체결 봉에서 열린 것으로 봅니다.
+    - 매도: 보유 수량 전체를 주문하고, 만료 봉까지 체결되지 않은 잔량은 만료 봉 종가(슬리피지 적용)에 시장가로 청산합니다.
+    - 청산 신호가 더 없으면 마지막 봉 종가에 청산합니다.
+    """
+    if config.trailing_stop_rate > 0.0:
+        raise ValueError("Trailing stops are not supported with limit orders.")
+    n = close.shape[0]
+    prices = close.astype(np.float64)
+    fee = config.commission_rate
+    book_args = (close, high, low, volume, config.limit_offset_rate, config.limit_ttl_bars,
+                 config.touch_fill_probability, config.touch_band_rate, config.volume_participation_rate, config.fill_seed)
+    entry_signals = np.flatnonzero(entries[start:]) + start
+    exit_signals = np.flatnonzero(exits[start:]) + start
+    buys = OrderBookBlocks(entry_signals, "buy", *book_args)
+    sells = OrderBookBlocks(exit_signals, "sell", *book_args)
+
+    cash = config.initial_capital
+    trades = []  # (진입 봉, 청산 봉, 진입가, 청산가, 수량, 진입 후 남은 현금, 청산 후 잔고, 청산 사유)
+    pos = start
+    while True:
+        k = int(np.searchsorted(entry_signals, pos, side="left"))
+        if k == entry_signals.shape[0]:
+            break
+        buy, row = buys.order(k)
+        entry_price = float(buy.limit_price[row])
+        quantity, entry_bar = fill_order(buy, row, cash / (entry_price * (1.0 + fee)))
+        if entry_bar is None or entry_bar >= n - 1:
+            pos = int(buy.expiry_bars[row]) + 1  # 미체결 만료 (또는 청산할 봉이 없음)
+            continue
+        leftover = cash - quantity * entry_price * (1.0 + fee)
+        j = int(np.searchsorted(exit_signals, entry_bar, side="right"))
+        if j == exit_signals.shape[0]:
+            exit_bar, exit_price, reason = n - 1, float(prices[-1]) * (1.0 - config.slippage_rate), EXIT_END_OF_DATA
+        else:
+            sell, row = sells.order(j)
+            filled, last_fill = fill_order(sell, row, quantity)
+            rest = quantity - filled
+            if last_fill is not None and rest <= quantity * 1e-12:
+                exit_bar, exit_price = last_fill, float(sell.limit_price[row])
+            else:
+                exit_bar = int(sell.expiry_bars[row])
+                market_price = float(prices[exit_bar]) * (1.0 - config.slippage_rate)
+                exit_price = (filled * float(sell.limit_price[row]) + rest * market_price) / quantity
+            reason = EXIT_SIGNAL
+        cash = leftover + quantity * exit_price * (1.0 - fee)
+        trades.append((entry_bar, exit_bar, entry_price, exit_price, quantity, leftover, cash, reason))
+        pos = exit_bar + 1
+
+    cols = list(zip(*trades)) if trades else [()] * 8
+    entry_idx = np.asarray(cols[0], dtype=index_dtype)
+    exit_idx = np.asarray(cols[1], dtype=index_dtype)
+    entry_price = np.asarray(cols[2], dtype=np.float64)
+    exit_price = np.asarray(cols[3], dtype=np.float64)
+    quantity = np.asarray(cols[4], dtype=np.float64)
+    leftover = np.asarray(cols[5], dtype=np.float64)
+    balance_after = np.asarray(cols[6], dtype=np.float64)
+    cash_before = np.concatenate(([config.initial_capital], balance_after[:-1]))
+
+    trade_of_bar = np.searchsorted(entry_idx, np.arange(n), side="right") - 1
+    holding = trade_of_bar >= 0
+    holding[holding] = np.arange(n)[holding] < exit_idx[trade_of_bar[holding]]
+    position = np.zeros(n, dtype=np.float64)
+    position[holding] = quantity[trade_of_bar[holding]]
+    closed_before = np.searchsorted(exit_idx, np.arange(n), side="right") - 1
+    cash_by_bar = np.where(closed_before >= 0, balance_after[np.maximum(closed_before, 0)] if balance_after.size else config.initial_capital, config.initial_capital)
+    holding_value = leftover[np.maximum(trade_of_bar, 0)] + position * prices if leftover.size else cash_by_bar
+    equity = np.where(holding, holding_value, cash_by_bar)
+    low_close, high_close, _ = trade_extremes(prices, entry_idx, exit_idx)
+
+    return SimulationResult(
+        equity=equity.astype(np.float64), position=position,
+        entry_idx=entry_idx, exit_idx=exit_idx,
+        entry_price=entry_price, exit_price=exit_price, quantity=quantity,
+        entry_commission=quantity * entry_price * fee, exit_commission=quantity * exit_price * fee,
+        pnl=balance_after - cash_before, balance_after=balance_after,
+        mae_pct=(low_close / entry_price - 1.0) * 100.0, mfe_pct=(high_close / entry_price - 1.0) * 100.0,
+        exit_reason=np.asarray(cols[7], dtype=np.int8),
+    )
@@ -0,0 +1,325 @@
+# file: backend/app/engine/snapshots.py
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .data import OHLCV, OHLCV_COLUMNS, DataSource, MarketDataUnavailableError, load_ohlcv, timeframe_ms
+
+logger = logging.getLogger(__name__)
+
+# --- 불변 시세 스냅샷 ---
+# 과거 봉이 정정되면(백필/검증 수정) 같은 백테스트를 다시 실행해도 결과가 조용히 달라집니다.
+# 백테스트는 처음 실행할 때 사용할 봉을 스냅샷으로 고정하고, 이후 재실행/구간 계산/reduce는 모두 같은 스냅샷을 읽습니다.
+# - 세그먼트: 실행 타임프레임 SEGMENT_BARS 봉 길이의 고정 격자 구간. 내용(행 우선 float64 배열)의 SHA-256이 이름이며
+#   한 번 저장하면 바뀌지 않습니다. 봉이 정정되지 않은 구간은 여러 스냅샷이 같은 세그먼트를 공유합니다.
+# - 스냅샷: (거래소, 심볼, 타임프레임, 구간)과 세그먼트 목록. 목록의 해시가 버전 id이며 Backtest.data_version에 기록됩니다.
+# 모든 워커가 같은 스냅샷을 읽어야 하므로 세그먼트는 DB(data_segments)에 두고, 워커는 읽은 세그먼트를 메모리 LRU에 보관합니다.
+SNAPSHOTS_ENABLED = os.getenv("ENGINE_DATA_SNAPSHOTS", "1") == "1"
+SEGMENT_BARS = int(os.getenv("ENGINE_SNAPSHOT_SEGMENT_BARS", "65536")) # 세그먼트 하나의 최대 봉 수 (1분봉 약 45일, 3MB)
+SNAPSHOT_CACHE_BYTES = int(float(os.getenv("ENGINE_SNAPSHOT_CACHE_MB", "256")) * 1024 * 1024)
+SNAPSHOT_GC_GRACE_S = int(os.getenv("ENGINE_SNAPSHOT_GC_GRACE_S", "86400")) # 참조가 없어도 이 시간 안에 쓰인 스냅샷/세그먼트는 유지
+
+_ROW_BYTES = (1 + len(OHLCV_COLUMNS)) * 8
+
+
+def encode_segment(bars: OHLCV) -> bytes:
+    """봉을 행 우선 float64 (ts, o, h, l, c, v) 배열로 직렬화합니다. replay.DataDigest와 같은 바이트 배치입니다."""
+    rows = np.column_stack((bars.ts,) + tuple(bars.column(name) for name in OHLCV_COLUMNS)).astype(np.float64)
+    return np.ascontiguousarray(rows).tobytes()
+
+
+def decode_segment(payload: bytes) -> OHLCV:
+    rows = np.frombuffer(payload, dtype=np.float64).reshape(-1, 1 + len(OHLCV_COLUMNS))
+    return OHLCV(rows[:, 0].astype(np.int64), *(np.ascontiguousarray(rows[:, i]) for i in range(1, rows.shape[1])))
+
+
+def _concat(parts: List[OHLCV]) -> OHLCV:
+    if len(parts) == 1:
+        return parts[0]
+    return OHLCV(*(np.concatenate([getattr(p, name) for p in parts]) for name in ("ts",) + OHLCV_COLUMNS))
+
+
+class SnapshotStore:
+    """
+    시세 스냅샷 생성/조회/정리. connect는 DBAPI(psycopg2) 연결을 반환하는 함수입니다 (CandleStore와 동일).
+    세그먼트와 스냅샷 목록은 불변이므로 프로세스 안에서 만료 없이 캐시합니다 (세그먼트는 용량 기준 LRU).
+    """
+    def __init__(self, connect: Callable[[], Any], segment_bars: int = SEGMENT_BARS, cache_bytes: int = SNAPSHOT_CACHE_BYTES):
+        self.connect = connect
+        self.segment_bars = max(1, segment_bars)
+        self.cache_bytes = cache_bytes
+        self._segments: "OrderedDict[str, OHLCV]" = OrderedDict()
+        self._segment_bytes = 0
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int, source: DataSource) -> str:
+        """
+        source(현재 데이터 소스)에서 [start_ms, end_ms)를 덮는 격자 세그먼트를 하나씩 읽어 스냅샷을 만들고 버전 id를 반환합니다.
+        세그먼트는 요청 경계와 관계없이 격자 전체를 담으므로 구간이 다른 백테스트도 같은 세그먼트를 공유합니다.
+        세그먼트는 만드는 즉시 보내고 해시만 남기므로 메모리는 세그먼트 하나 크기입니다 (스트리밍 실행과 같은 상한).
+        이미 있는 세그먼트는 다시 보내지 않으며, 같은 내용의 스냅샷이 있으면 그 버전을 그대로 반환합니다.
+        """
+        span = timeframe_ms(timeframe) * self.segment_bars
+        segments: List[Dict[str, Any]] = []
+        in_range = uploaded = uploaded_bytes = 0
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            for segment_start in range(start_ms // span * span, end_ms, span):
+                segment_end = segment_start + span
+                bars = source(exchange, symbol, timeframe, segment_start, segment_end)
+                if len(bars) == 0:
+                    continue
+                in_range += int(np.count_nonzero((bars.ts >= start_ms) & (bars.ts < end_ms)))
+                payload = encode_segment(bars)
+                digest = hashlib.sha256(payload).hexdigest()
+                segments.append({"hash": digest, "start_ms": segment_start, "end_ms": segment_end, "rows": len(bars)})
+                if self._upload(cursor, digest, segment_start, segment_end, len(bars), payload):
+                    uploaded += 1
+                    uploaded_bytes += len(payload)
+            if not in_range:
+                raise MarketDataUnavailableError(f"No {timeframe} candles for {exchange}:{symbol} in [{start_ms}, {end_ms}) to snapshot.")
+
+            manifest = {
+                "exchange": exchange, "symbol": symbol, "timeframe": timeframe,
+                "start_ms": int(start_ms), "end_ms": int(end_ms), "segments": segments,
+            }
+            version = hashlib.sha256(json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+            cursor.execute(
+                "INSERT INTO data_snapshots (version, exchange, symbol, timeframe, start_ms, end_ms, rows) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+                "ON CONFLICT (version) DO UPDATE SET last_used_at = now() RETURNING (xmax = 0)",
+                (version, exchange, symbol, timeframe, int(start_ms), int(end_ms), in_range),
+            )
+            if cursor.fetchone()[0]:
+                cursor.executemany(
+                    "INSERT INTO data_snapshot_segments (version, position, segment_hash) VALUES (%s, %s, %s)",
+                    [(version, position, s["hash"]) for position, s in enumerate(segments)],
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        with self._lock:
+            self._manifests[version] = manifest
+        logger.info(
+            f"Data snapshot {version[:12]} for {exchange}:{symbol} {timeframe}: {len(segments)} segment(s), "
+            f"{uploaded} new ({uploaded_bytes} bytes)."
+        )
+        return version
+
+    def pin(self, version: str) -> Dict[str, Any]:
+        """기존 스냅샷을 다시 사용하도록 표시하고 그 목록을 반환합니다. 없는 버전이면 ValueError."""
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE data_snapshots SET last_used_at = now() WHERE version = %s", (version,))
+            found = cursor.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        if not found:
+            raise ValueError(f"Unknown data snapshot: {version}")
+        return self._manifest(version)
+
+    def load(self, version: str, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int,
+             hot: Optional[OHLCV] = None) -> OHLCV:
+        """
+        스냅샷 version에서 [start_ms, end_ms) 구간의 봉을 읽습니다. 다른 시계열을 요청하면 MarketDataUnavailableError.
+        hot(워커에 미리 로드된 시계열)을 주면 내용 해시가 세그먼트와 같은 구간은 DB 대신 hot에서 가져옵니다.
+        """
+        segments = self._overlapping(version, exchange, symbol, timeframe, start_ms, end_ms)
+        parts: Dict[str, OHLCV] = {}
+        if hot is not None:
+            for segment in segments:
+                part = self._hot_segment(segment, hot)
+                if part is not None:
+                    parts[segment["hash"]] = part
+        missing = [s["hash"] for s in segments if s["hash"] not in parts]
+        parts.update(zip(missing, self._fetch_segments(missing)))
+        bars = _concat([parts[s["hash"]] for s in segments]) if segments else OHLCV.empty()
+        lo, hi = np.searchsorted(bars.ts, [start_ms, end_ms], side="left")
+        if hi <= lo:
+            raise MarketDataUnavailableError(f"No {timeframe} candles for {exchange}:{symbol} in [{start_ms}, {end_ms}) in snapshot {version[:12]}.")
+        return bars.slice(int(lo), int(hi))
+
+    def matches(self, version: str, bars: OHLCV, start_ms: int, end_ms: int) -> bool:
+        """
+        bars의 [start_ms, end_ms) 구간이 스냅샷에서 읽을 봉과 같으면 True (미리 로드된 시계열 재사용 판정).
+        겹치는 세그먼트가 모두 같은 내용으로 들어 있고, 그 밖에 bars에만 있는 봉이 없어야 합니다.
+        """
+        manifest = self._manifest(version)
+        segments = self._overlapping(version, manifest["exchange"], manifest["symbol"], manifest["timeframe"], start_ms, end_ms)
+        in_range = 0
+        for segment in segments:
+            part = self._hot_segment(segment, bars)
+            if part is None:
+                return False
+            in_range += int(np.count_nonzero((part.ts >= start_ms) & (part.ts < end_ms)))
+        lo, hi = np.searchsorted(bars.ts, [start_ms, end_ms], side="left")
+        return bool(segments) and in_range == int(hi - lo)
+
+    def collect_garbage(self, grace_s: int = SNAPSHOT_GC_GRACE_S) -> Dict[str, int]:
+        """
+        어떤 백테스트도 참조하지 않는 스냅샷과, 어떤 스냅샷에도 속하지 않는 세그먼트를 삭제합니다.
+        최근 grace_s 안에 만들거나 다시 사용한 항목은 (아직 Backtest에 기록되기 전일 수 있으므로) 남깁니다.
+        """
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM data_snapshots s WHERE s.last_used_at < now() - make_interval(secs => %s) "
+                "AND NOT EXISTS (SELECT 1 FROM backtests b WHERE b.data_version = s.version)",
+                (grace_s,),
+            )
+            snapshots = cursor.rowcount
+            cursor.execute(
+                "DELETE FROM data_segments g WHERE g.last_used_at < now() - make_interval(secs => %s) "
+                "AND NOT EXISTS (SELECT 1 FROM data_snapshot_segments l WHERE l.segment_hash = g.hash)",
+                (grace_s,),
+            )
+            segments = cursor.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        logger.info(f"Data snapshot GC removed {snapshots} snapshot(s) and {segments} segment(s).")
+        return {"snapshots": snapshots, "segments": segments}
+
+    # --- 내부 구현 ---
+
+    @staticmethod
+    def _upload(cursor: Any, digest: str, start_ms: int, end_ms: int, rows: int, payload: bytes) -> bool:
+        """세그먼트를 저장하고 새로 보냈으면 True. 이미 있으면 사용 시각만 갱신합니다 (정리 작업이 그 사이에 지우지 않도록)."""
+        cursor.execute("UPDATE data_segments SET last_used_at = now() WHERE hash = %s", (digest,))
+        if cursor.rowcount:
+            return False
+        cursor.execute(
+            "INSERT INTO data_segments (hash, rows, start_ms, end_ms, payload) VALUES (%s, %s, %s, %s, %s) "
+            "ON CONFLICT (hash) DO UPDATE SET last_used_at = now()",
+            (digest, rows, int(start_ms), int(end_ms), payload),
+        )
+        return True
+
+    def _overlapping(self, version: str, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> List[Dict[str, Any]]:
+        manifest = self._manifest(version)
+        if (manifest["exchange"], manifest["symbol"], manifest["timeframe"]) != (exchange, symbol, timeframe):
+            raise MarketDataUnavailableError(
+                f"Data snapshot {version[:12]} holds {manifest['exchange']}:{manifest['symbol']} {manifest['timeframe']}, "
+                f"not {exchange}:{symbol} {timeframe}."
+            )
+        return [s for s in manifest["segments"] if s["end_ms"] > start_ms and s["start_ms"] < end_ms]
+
+    @staticmethod
+    def _hot_segment(segment: Dict[str, Any], hot: OHLCV) -> Optional[OHLCV]:
+        """hot에서 세그먼트 격자 구간을 잘라 내용 해시가 같으면 반환합니다 (봉 수가 다르면 해시 없이 None)."""
+        lo, hi = np.searchsorted(hot.ts, [segment["start_ms"], segment["end_ms"]], side="left")
+        if hi - lo != segment["rows"]:
+            return None
+        part = hot.slice(int(lo), int(hi))
+        return part if hashlib.sha256(encode_segment(part)).hexdigest() == segment["hash"] else None
+
+    def _manifest(self, version: str) -> Dict[str, Any]:
+        with self._lock:
+            manifest = self._manifests.get(version)
+        if manifest is not None:
+            return manifest
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT exchange, symbol, timeframe, start_ms, end_ms FROM data_snapshots WHERE version = %s", (version,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"Unknown data snapshot: {version}")
+            cursor.execute(
+                "SELECT g.hash, g.start_ms, g.end_ms, g.rows FROM data_snapshot_segments l "
+                "JOIN data_segments g ON g.hash = l.segment_hash WHERE l.version = %s ORDER BY l.position",
+                (version,),
+            )
+            segments = [{"hash": h, "start_ms": int(s), "end_ms": int(e), "rows": int(n)} for h, s, e, n in cursor.fetchall()]
+            conn.commit()
+        finally:
+            conn.close()
+        exchange, symbol, timeframe, start_ms, end_ms = row
+        manifest = {
+            "exchange": exchange, "symbol": symbol, "timeframe": timeframe,
+            "start_ms": int(start_ms), "end_ms": int(end_ms), "segments": segments,
+        }
+        with self._lock:
+            self._manifests[version] = manifest
+        return manifest
+
+    def _fetch_segments(self, hashes: List[str]) -> List[OHLCV]:
+        with self._lock:
+            found = {h: self._segments[h] for h in hashes if h in self._segments}
+            for h in found:
+                self._segments.move_to_end(h)
+        missing = [h for h in hashes if h not in found]
+        if missing:
+            conn = self.connect()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT hash, payload FROM data_segments WHERE hash = ANY(%s)", (missing,))
+                rows = cursor.fetchall()
+                conn.commit()
+            finally:
+                conn.close()
+            for digest, payload in rows:
+                payload = bytes(payload)
+                if hashlib.sha256(payload).hexdigest() != digest:
+                    raise MarketDataUnavailableError(f"Data segment {digest[:12]} failed its checksum.")
+                found[digest] = decode_segment(payload)
+                self._remember(digest, found[digest])
+        if len(found) != len(set(hashes)):
+            raise MarketDataUnavailableError(f"{len(set(hashes)) - len(found)} data segment(s) are missing from the store.")
+        return [found[h] for h in hashes]
+
+    def _remember(self, digest: str, bars: OHLCV) -> None:
+        size = len(bars) * _ROW_BYTES
+        if size > self.cache_bytes:
+            return
+        with self._lock:
+            if digest in self._segments:
+                self._segments.move_to_end(digest)
+                return
+            self._segments[digest] = bars
+            self._segment_bytes += size
+            while self._segment_bytes > self.cache_bytes:
+                _, evicted = self._segments.popitem(last=False)
+                self._segment_bytes -= len(evicted) * _ROW_BYTES
+
+
+_snapshot_store: Optional[SnapshotStore] = None
+
+
+def set_snapshot_store(store: SnapshotStore) -> None:
+    global _snapshot_store
+    _snapshot_store = store
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    return _snapshot_store
+
+
+def load_ohlcv_at(data_version: Optional[str], exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int,
+                  hot: Optional[OHLCV] = None) -> OHLCV:
+    """data_version이 있으면 그 스냅샷에서(hot과 내용이 같은 세그먼트는 hot에서), 없으면 현재 데이터 소스에서 [start_ms, end_ms) 봉을 로드합니다."""
+    if data_version is None:
+        return load_ohlcv(exchange, ticker, timeframe, start_ms, end_ms)
+    if _snapshot_store is None:
+        raise MarketDataUnavailableError(f"Backtest is pinned to data snapshot {data_version[:12]} but no snapshot store is configured.")
+    return _snapshot_store.load(data_version, exchange, ticker, timeframe, start_ms, end_ms, hot)
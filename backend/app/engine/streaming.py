@@ -0,0 +1,619 @@
+# file: backend/app/engine/streaming.py
+
+import os
+import math
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data import OHLCV, MarketDataUnavailableError, bar_close_ms, get_precision, resample, timeframe_ms
+from .compiler import CompiledStrategy, ConditionNode, Node, OperandNode
+from .evaluator import MarketFrame, RuleEvaluator
+from .indicators import (
+    INDICATORS, _first_valid, _linear_recurrence, _smoothed, indicator_lookback, parabolic_sar_run,
+)
+from .simulator import EXIT_END_OF_DATA, EXIT_SIGNAL, SimulationConfig, SimulationResult
+from .metrics import (
+    PNL_CURVE_MAX_POINTS, ROLLING_WINDOW_DAYS, ReturnMoments, iso_time, periods_per_year, relative_metrics,
+    json_value, rolling_metrics, trade_log_rows_at, trade_summary, window_bars,
+)
+from .backtester import BacktestSpec
+from .replay import DataDigest
+from .snapshots import load_ohlcv_at
+
+logger = logging.getLogger(__name__)
+
+# --- 스트리밍(청크) 실행 모드 ---
+# 수년치 1분봉처럼 전체 이력을 메모리에 올릴 수 없는 경우, 고정 크기 청크 단위로 데이터를 읽으며
+# 지표 상태/포지션/성과 통계를 청크 경계 너머로 이어 갑니다.
+# 최대 메모리는 O(청크 크기 + 최대 lookback + 가장 긴 롤링 지표 창)이며 전체 이력 길이와 무관합니다.
+STREAM_CHUNK_BARS = int(os.getenv("ENGINE_STREAM_CHUNK_BARS", "100000"))
+STREAM_MIN_BARS = int(os.getenv("ENGINE_STREAM_MIN_BARS", "2000000")) # auto 모드에서 스트리밍으로 전환하는 봉 수
+
+
+def _concat(a: OHLCV, b: OHLCV) -> OHLCV:
+    if len(a) == 0:
+        return b
+    return OHLCV(*(np.concatenate((a.column(name), b.column(name))) for name in ("ts", "open", "high", "low", "close", "volume")))
+
+
+def _copy_from(data: OHLCV, start: int) -> OHLCV:
+    # 청크 사이에 보관하는 꼬리는 복사합니다. 뷰로 두면 이어 붙인 (꼬리 + 청크) 배열 전체가 다음 청크까지 남습니다.
+    return OHLCV(*(data.column(name)[start:].copy() for name in ("ts", "open", "high", "low", "close", "volume")))
+
+
+def _tail(data: OHLCV, bars: int) -> OHLCV:
+    return _copy_from(data, max(0, len(data) - bars)) if bars > 0 else OHLCV.empty()
+
+
+# --- 지표 상태 ---
+# 각 스트림은 새 봉 묶음을 받아 해당 봉들의 출력(출력 이름 -> 배열)만 반환하고, 다음 호출에 필요한 상태를 보관합니다.
+
+class _WindowStream:
+    """유한 창 지표: 직전 lookback 봉을 앞에 붙여 다시 계산하면 전체 이력 계산과 같은 값이 나옵니다."""
+    def __init__(self, indicator_key: str, params: Dict[str, Any]):
+        self.indicator_key = indicator_key
+        self.params = params
+        self.lookback = indicator_lookback(indicator_key, params)
+        self._tail = OHLCV.empty()
+
+    def update(self, bars: OHLCV) -> Dict[str, np.ndarray]:
+        data = _concat(self._tail, bars)
+        self._tail = _tail(data, self.lookback)
+        fn, _, _ = INDICATORS[self.indicator_key]
+        return {name: np.asarray(values, dtype=np.float64)[len(data) - len(bars):] for name, values in fn(data, self.params).items()}
+
+
+class _SmoothedState:
+    """SMA 시드 지수 평활의 이어 계산. 시드가 잡히기 전까지는 입력을 모아 두었다가 한 번에 계산합니다."""
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self._pending = np.empty(0, dtype=np.float64)
+        self._last: Optional[float] = None
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        if self._last is not None:
+            out = _linear_recurrence(values, 1.0 - self.alpha, self._last)
+        else:
+            buffered = np.concatenate((self._pending, values))
+            out = _smoothed(buffered, self.period, self.alpha)[buffered.shape[0] - values.shape[0]:]
+            if _first_valid(buffered) + self.period <= buffered.shape[0]:
+                self._pending = np.empty(0, dtype=np.float64)
+            else:
+                self._pending = buffered
+                return out
+        if out.shape[0]:
+            self._last = float(out[-1])
+        return out
+
+
+class _PrevClose:
+    """직전 봉 종가가 필요한 지표(RSI, ATR, OBV)의 공통 상태."""
+    def __init__(self):
+        self.prev: Optional[float] = None
+
+    def shifted(self, close: np.ndarray) -> np.ndarray:
+        prev = np.concatenate(([np.nan if self.prev is None else self.prev], close[:-1]))
+        if close.shape[0]:
+            self.prev = float(close[-1])
+        return prev
+
+
+class _EMAStream:
+    def __init__(self, params: Dict[str, Any]):
+        period = max(1, int(params.get("period", 20)))
+        self._ema = _SmoothedState(period, 2.0 / (period + 1))
+
+    def update(self, bars: OHLCV) -> Dict[str, np.ndarray]:
+        return {"value": self._ema.update(bars.close)}
+
+
+class _MACDStream:
+    def __init__(self, params: Dict[str, Any]):
+        fast = max(1, int(params.get("fast_period", 12)))
+        slow = max(1, int(params.get("slow_period", 26)))
+        signal = max(1, int(params.get("signal_period", 9)))
+        self._fast = _SmoothedState(fast, 2.0 / (fast + 1))
+        self._slow = _SmoothedState(slow, 2.0 / (slow + 1))
+        self._signal = _SmoothedState(signal, 2.0 / (signal + 1))
+
+    def update(self, bars: OHLCV) -> Dict[str, np.ndarray]:
+        line = self._fast.update(bars.close) - self._slow.update(bars.close)
+        signal = self._signal.update(line)
+        return {"macd": line, "signal": signal, "hist": line - signal}
+
+
+class _RSIStream:
+    def __init__(self, params: Dict[str, Any]):
+        period = max(1, int(params.get("period", 14)))
+        self._prev = _PrevClose()
+        self._gain = _SmoothedState(period, 1.0 / period)
+        self._loss = _SmoothedState(period, 1.0 / period)
+
+    def update(self, bars: OHLCV) -> Dict[str, np.ndarray]:
+        delta = bars.close - self._prev.shifted(bars.close)
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+        gains[np.isnan(delta)] = np.nan
+        losses[np.isnan(delta)] = np.nan
+        avg_gain = self._gain.update(gains)
+        avg_loss = self._loss.update(losses)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        out[(avg_loss == 0) & ~np.isnan(avg_gain)] = 100.0
+        return {"value": out}
+
+
+class _ATRStream:
+    def __init__(self, params: Dict[str, Any]):
+        period = max(1, int(params.get("period", 14)))
+        self._prev = _PrevClose()
+        self._rma = _SmoothedState(period, 1.0 / period)
+
+    def update(self, bars: OHLCV) -> Dict[str, np.ndarray]:
+        first_bar = self._prev.prev is None
+        prev_close = self._prev.shifted(bars.close)
+        tr = np.fmax(bars.high - bars.low, np.fmax(np.abs(bars.high - prev_close), np.abs(bars.low - prev_close)))
+        if first_bar and tr.shape[0]:
+            tr[0] = bars.high[0] - bars.low[0]
+        return {"value": self._rma.update(tr)}
+
+
+class _OBVStream:
+    def __init__(self, params: Dict[str, Any]):
+        self._prev = _PrevClose()
+        self._total = 0.0
+
+    def update(self, bars: OHLCV) -> Dict[str, np.ndarray]:
+        prev_close = self._prev.shifted(bars.close)
+        direction = np.nan_to_num(np.sign(bars.close - prev_close))  # 첫 봉은 방향 0
+        out = self._total + np.cumsum(direction * bars.volume)
+        if out.shape[0]:
+            self._total = float(out[-1])
+        return {"value": out}
+
+
+class _ParabolicSARStream:
+    def __init__(self, params: Dict[str, Any]):
+        self.acceleration = float(params.get("acceleration", 0.02))
+        self.maximum = float(params.get("maximum", 0.2))
+        self._tail = OHLCV.empty()
+        self._state: Optional[Tuple[bool, float, float, float]] = None
+
+    def update(self, bars: OHLCV) -> Dict[str, np.ndarray]:
+        data = _concat(self._tail, bars)
+        out = np.full(len(data), np.nan, dtype=np.float64)
+        if self._state is None and len(data) >= 2:
+            is_long = bool(data.high[1] >= data.high[0])
+            self._state = (is_long, float(data.low[0]) if is_long else float(data.high[0]),
+                           float(data.high[0]) if is_long else float(data.low[0]), self.acceleration)
+            begin = 1
+        else:
+            begin = len(self._tail)
+        if self._state is not None:
+            self._state = parabolic_sar_run(data.high, data.low, self.acceleration, self.maximum, begin, self._state, out)
+        # 아직 두 봉이 모이지 않았으면 전부 보관, 이후에는 루프가 참조하는 직전 두 봉만 보관
+        self._tail = data if self._state is None else _tail(data, 2)
+        return {"value": out[len(data) - len(bars):]}
+
+
+# 전체 이력에 의존하는 지표는 상태를 이어받는 전용 스트림을 사용하고, 나머지는 _WindowStream으로 처리합니다.
+STATEFUL_STREAMS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "EMA": _EMAStream,
+    "MACD": _MACDStream,
+    "RSI": _RSIStream,
+    "ATR": _ATRStream,
+    "OBV": _OBVStream,
+    "ParabolicSAR": _ParabolicSARStream,
+}
+
+
+class _OperandStream:
+    """지표 스트림 + 상위 타임프레임 값을 실행 봉에 맞추기 위한 직전 마감 봉 값."""
+    def __init__(self, node: OperandNode):
+        params = node.params_dict
+        factory = STATEFUL_STREAMS.get(node.indicator_key)
+        self.node = node
+        self.stream = factory(params) if factory else _WindowStream(node.indicator_key, params)
+        self.output = params.get("output", INDICATORS[node.indicator_key][2])
+        self._last_close: Optional[int] = None
+        self._last_value = np.nan
+
+    def update(self, source: OHLCV, exec_ts: np.ndarray, exec_tf: str) -> np.ndarray:
+        outputs = self.stream.update(source)
+        if self.output not in outputs:
+            raise ValueError(f"Indicator {self.node.indicator_key} has no output '{self.output}'.")
+        values = outputs[self.output]
+        if self.node.timeframe == exec_tf:
+            return values
+        source_close = bar_close_ms(source.ts, self.node.timeframe)
+        if self._last_close is not None:
+            source_close = np.concatenate(([self._last_close], source_close))
+            values = np.concatenate(([self._last_value], values))
+        idx = np.searchsorted(source_close, bar_close_ms(exec_ts, exec_tf), side="right") - 1
+        out = np.full(exec_ts.shape[0], np.nan, dtype=np.float64)
+        valid = idx >= 0
+        out[valid] = values[idx[valid]]
+        if source_close.shape[0]:
+            self._last_close, self._last_value = int(source_close[-1]), float(values[-1])
+        return out
+
+
+class _FrameStream:
+    """
+    실행 봉을 상위 타임프레임으로 이어서 집계합니다. 마지막 실행 봉 마감 시점까지 마감된 상위 봉만 내보내고,
+    아직 진행 중인 상위 봉에 속한 실행 봉은 다음 청크로 넘깁니다.
+    """
+    def __init__(self, timeframe: str, exec_tf: str):
+        self.timeframe = timeframe
+        self.exec_tf = exec_tf
+        self._carry = OHLCV.empty()
+
+    def update(self, bars: OHLCV) -> OHLCV:
+        if self.timeframe == self.exec_tf:
+            return bars
+        data = _concat(self._carry, bars)
+        if len(data) == 0:
+            return data
+        higher = resample(data, self.timeframe)
+        last_close = int(bar_close_ms(data.ts[-1:], self.exec_tf)[0])
+        complete = int(np.searchsorted(bar_close_ms(higher.ts, self.timeframe), last_close, side="right"))
+        if complete < len(higher):
+            self._carry = _copy_from(data, int(np.searchsorted(data.ts, higher.ts[complete], side="left")))
+        else:
+            self._carry = OHLCV.empty()
+        return higher.slice(0, complete)
+
+
+class StreamingEvaluator(RuleEvaluator):
+    """
+    RuleEvaluator의 청크 단위 버전. 노드 결과는 청크 안에서만 메모이즈하고(서브트리 캐시는 사용하지 않음),
+    지표 상태와 교차 조건의 직전 차이 값은 청크 사이에 이어받습니다.
+    """
+    def __init__(self, compiled: CompiledStrategy, timeframe: str):
+        self.compiled = compiled
+        self.timeframe = timeframe
+        self.market = MarketFrame("stream", timeframe, OHLCV.empty())
+        self.computed = 0
+        self._memo: Dict[str, np.ndarray] = {}
+        self._frames: Dict[str, OHLCV] = {}
+        self._frame_streams: Dict[str, _FrameStream] = {}
+        self._operands: Dict[str, _OperandStream] = {}
+        self._last_diff: Dict[str, float] = {}
+        for node in compiled.iter_nodes():
+            if isinstance(node, OperandNode) and node.kind == "indicator" and node.key not in self._operands:
+                self._operands[node.key] = _OperandStream(node)
+                self._frame_streams.setdefault(node.timeframe, _FrameStream(node.timeframe, timeframe))
+
+    def update(self, bars: OHLCV) -> Tuple[np.ndarray, np.ndarray]:
+        """청크 하나를 평가하여 (진입 마스크, 청산 마스크)를 반환합니다."""
+        self.market = MarketFrame("stream", self.timeframe, bars)
+        self._memo = {}
+        # 상위 봉 마감 판단은 청크마다 한 번만 하여 같은 타임프레임의 지표들이 같은 봉을 받도록 합니다.
+        self._frames = {tf: stream.update(bars) for tf, stream in self._frame_streams.items()}
+        return self.evaluate(self.compiled.buy), self.evaluate(self.compiled.sell)
+
+    def evaluate(self, node: Node) -> np.ndarray:
+        if isinstance(node, OperandNode) and node.kind == "value":
+            return np.full(len(self.market), node.constant, dtype=np.float64)
+        result = self._memo.get(node.key)
+        if result is None:
+            result = self._compute(node)
+            self._memo[node.key] = result
+            self.computed += 1
+        return result
+
+    def _operand(self, node: OperandNode) -> np.ndarray:
+        return self._operands[node.key].update(self._frames[node.timeframe], self.market.bars.ts, self.timeframe)
+
+    def _condition(self, node: ConditionNode) -> np.ndarray:
+        if node.operator not in ("crosses_above", "crosses_below"):
+            return super()._condition(node)
+        diff = self.evaluate(node.left) - self.evaluate(node.right)
+        prev = np.concatenate(([self._last_diff.get(node.key, np.nan)], diff[:-1]))
+        if diff.shape[0]:
+            self._last_diff[node.key] = float(diff[-1])
+        with np.errstate(invalid="ignore"):
+            if node.operator == "crosses_above":
+                return (prev <= 0) & (diff > 0)
+            return (prev >= 0) & (diff < 0)
+
+
+# --- 포지션/성과 상태 ---
+
+class StreamingSimulator:
+    """
+    simulate()와 같은 체결 규칙(종가 체결, 전량 재투자, 마지막 봉 강제 청산)을 청크 단위로 수행합니다.
+    봉별 평가 자산은 보관하지 않고 MDD/샤프 지수/곡선 샘플과 Buy & Hold 벤치마크 대비 수익률 모멘트만 누적합니다.
+    마지막 봉의 평가 자산은 강제 청산 여부에 따라 달라지므로, 각 청크의 마지막 봉은 다음 청크(또는 finish)까지 보류합니다.
+    롤링 지표는 가장 긴 창 길이만큼의 자산/청산 기록만 이어 붙여 계산하므로 전체 실행과 같은 값을 냅니다.
+    """
+    def __init__(
+        self, config: SimulationConfig, timeframe: str, expected_bars: int, max_points: int = PNL_CURVE_MAX_POINTS,
+        rolling_window_days: Sequence[int] = ROLLING_WINDOW_DAYS,
+    ):
+        self.config = config
+        self.timeframe = timeframe
+        self.cash = config.initial_capital
+        self.quantity = 0.0
+        self.bars = 0
+        self._stride = max(1, math.ceil(expected_bars / max_points))
+        # (진입 idx, 청산 idx, 진입 ts, 청산 ts, 진입가, 청산가, 수량, 진입 수수료, 청산 수수료, 손익, 청산 후 잔고, 최저 종가, 최고 종가, 청산 사유)
+        self._trades: List[Tuple] = []
+        self._open: Optional[Tuple[int, int, float, float, float, float]] = None  # (idx, ts, price, qty, commission, cash_before)
+        self._open_low = np.inf  # 보유 중인 거래의 지금까지 최저/최고 종가 (MAE/MFE)
+        self._open_high = -np.inf
+        self._pending: Optional[Tuple[int, int, float]] = None  # (idx, ts, close) 보류 중인 마지막 봉
+        # 누적 통계
+        self._peak = -np.inf
+        self._max_dd = 0.0
+        self._prev_equity: Optional[float] = None
+        self._ret_count = 0
+        self._ret_mean = 0.0
+        self._ret_m2 = 0.0
+        self._curve: List[Dict[str, Any]] = []
+        self._last_equity = config.initial_capital
+        # 벤치마크(첫 봉 종가에 매수 후 보유)
+        self._first_close: Optional[float] = None
+        self._prev_close: Optional[float] = None
+        self._last_close: Optional[float] = None
+        self._moments = ReturnMoments()
+        self._benchmark_curve: List[Dict[str, Any]] = []
+        # 롤링 지표 (창 길이 + 1 봉만큼의 꼬리를 보관)
+        self._windows = [(f"{days}d", window_bars(days, timeframe)) for days in rolling_window_days]
+        self._tail_bars = max((bars for _, bars in self._windows), default=0) + 1
+        self._tail_equity = np.empty(0, dtype=np.float64)
+        self._tail_closed = np.empty(0, dtype=np.float64)
+        self._tail_won = np.empty(0, dtype=np.float64)
+        self._trades_counted = 0
+        self._rolling = {label: {"bars": bars, "sharpe": [], "volatility_pct": [], "drawdown_pct": [], "win_rate_pct": []}
+                         for label, bars in self._windows}
+        self._rolling_last: Dict[str, Dict[str, Optional[float]]] = {}
+
+    def update(self, ts: np.ndarray, close: np.ndarray, entries: np.ndarray, exits: np.ndarray) -> None:
+        n = close.shape[0]
+        if n == 0:
+            return
+        if self._pending is not None:
+            idx, pending_ts, pending_close = self._pending
+            self._record(np.asarray([pending_ts]), np.asarray([self._equity_at(pending_close)]), idx, np.asarray([pending_close]))
+        fee = self.config.commission_rate
+        base = self.bars
+        quantity = np.zeros(n, dtype=np.float64)
+        cash = np.empty(n, dtype=np.float64)
+        cursor = 0
+        for i in np.flatnonzero(entries | exits):
+            if self._open is None and entries[i]:
+                quantity[cursor:i] = self.quantity
+                cash[cursor:i] = self.cash
+                price = float(close[i]) * (1.0 + self.config.slippage_rate)
+                self.quantity = self.cash / (price * (1.0 + fee))
+                self._open = (base + int(i), int(ts[i]), price, self.quantity, self.quantity * price * fee, self.cash)
+                self._open_low, self._open_high = np.inf, -np.inf
+                cursor = int(i)
+            elif self._open is not None and exits[i]:
+                quantity[cursor:i] = self.quantity
+                cash[cursor:i] = self.cash
+                self._track_excursion(close[cursor:i + 1])
+                self._close(base + int(i), int(ts[i]), float(close[i]), EXIT_SIGNAL)
+                cursor = int(i)
+        quantity[cursor:] = self.quantity
+        cash[cursor:] = self.cash
+        if self._open is not None:
+            self._track_excursion(close[cursor:])
+        equity = np.where(quantity > 0, quantity * close, cash)
+        self._record(ts[:-1], equity[:-1], base, close[:-1])
+        self._pending = (base + n - 1, int(ts[-1]), float(close[-1]))
+        self.bars += n
+
+    def _track_excursion(self, segment: np.ndarray) -> None:
+        if segment.shape[0]:
+            self._open_low = min(self._open_low, float(segment.min()))
+            self._open_high = max(self._open_high, float(segment.max()))
+
+    def _close(self, idx: int, ts: int, close: float, reason: int) -> None:
+        entry_idx, entry_ts, entry_price, quantity, entry_commission, cash_before = self._open
+        exit_price = close * (1.0 - self.config.slippage_rate)
+        balance = quantity * exit_price * (1.0 - self.config.commission_rate)
+        self._trades.append((entry_idx, idx, entry_ts, ts, entry_price, exit_price, quantity, entry_commission,
+                             quantity * exit_price * self.config.commission_rate, balance - cash_before, balance,
+                             self._open_low, self._open_high, reason))
+        self.cash = balance
+        self.quantity = 0.0
+        self._open = None
+
+    def _equity_at(self, close: float) -> float:
+        return self.quantity * close if self._open is not None else self.cash
+
+    def _record(self, ts: np.ndarray, equity: np.ndarray, first_idx: int, close: np.ndarray) -> None:
+        if equity.shape[0] == 0:
+            return
+        prices = close.astype(np.float64)
+        if self._first_close is None:
+            self._first_close = float(prices[0])
+        peaks = np.maximum.accumulate(np.concatenate(([self._peak], equity)))[1:]
+        self._peak = float(peaks[-1])
+        self._max_dd = max(self._max_dd, float(np.max((peaks - equity) / peaks)))
+        # 수익률 평균/분산은 Welford 병합으로 누적 (np.std와 같은 모분산)
+        prev = np.concatenate(([self._prev_equity], equity[:-1])) if self._prev_equity is not None else equity[:-1]
+        returns = (equity[-prev.shape[0]:] - prev) / prev if prev.shape[0] else np.empty(0)
+        if returns.shape[0]:
+            count = returns.shape[0]
+            mean = float(returns.mean())
+            m2 = float(((returns - mean) ** 2).sum())
+            delta = mean - self._ret_mean
+            total = self._ret_count + count
+            self._ret_mean += delta * count / total
+            self._ret_m2 += m2 + delta * delta * self._ret_count * count / total
+            self._ret_count = total
+        prev_close = np.concatenate(([self._prev_close], prices[:-1])) if self._prev_close is not None else prices[:-1]
+        benchmark_returns = (prices[-prev_close.shape[0]:] - prev_close) / prev_close if prev_close.shape[0] else np.empty(0)
+        self._moments = self._moments.merge(ReturnMoments.from_returns(returns, benchmark_returns))
+        self._prev_equity = float(equity[-1])
+        self._last_equity = float(equity[-1])
+        self._prev_close = self._last_close = float(prices[-1])
+        sample = np.flatnonzero((np.arange(first_idx, first_idx + equity.shape[0]) % self._stride) == 0)
+        self._curve.extend({"time": iso_time(ts[i]), "value": round(float(equity[i]), 6)} for i in sample)
+        self._benchmark_curve.extend({"time": iso_time(ts[i]), "value": round(self._benchmark_at(prices[i]), 6)} for i in sample)
+        self._record_rolling(equity, first_idx, sample)
+
+    def _record_rolling(self, equity: np.ndarray, first_idx: int, sample: np.ndarray) -> None:
+        n = equity.shape[0]
+        closed = np.zeros(n, dtype=np.float64)
+        won = np.zeros(n, dtype=np.float64)
+        # 거래는 청산 순서로 쌓이므로 이번 구간까지 청산된 거래만 이어서 집계합니다.
+        while self._trades_counted < len(self._trades) and self._trades[self._trades_counted][1] < first_idx + n:
+            trade = self._trades[self._trades_counted]
+            closed[trade[1] - first_idx] += 1
+            won[trade[1] - first_idx] += trade[9] > 0
+            self._trades_counted += 1
+        equity = np.concatenate((self._tail_equity, equity))
+        closed = np.concatenate((self._tail_closed, closed))
+        won = np.concatenate((self._tail_won, won))
+        for label, bars in self._windows:
+            series = rolling_metrics(equity, closed, won, bars, self.timeframe)
+            last = {}
+            for name, values in series.items():
+                values = values[-n:]
+                self._rolling[label][name].extend(json_value(values[i]) for i in sample)
+                last[name] = json_value(values[-1])
+            self._rolling_last[label] = last
+        self._tail_equity = equity[-self._tail_bars:].copy()
+        self._tail_closed = closed[-self._tail_bars:].copy()
+        self._tail_won = won[-self._tail_bars:].copy()
+
+    def _benchmark_at(self, close: float) -> float:
+        return self.config.initial_capital * float(close) / self._first_close
+
+    def finish(self) -> None:
+        """마지막 봉 처리: 보유 중이면 마지막 봉 종가에 청산하고(같은 봉 진입이면 거래 취소), 보류 중인 평가 자산을 기록합니다."""
+        if self._pending is None:
+            return
+        idx, ts, close = self._pending
+        if self._open is not None:
+            if self._open[0] == idx:
+                self.cash, self.quantity, self._open = self._open[5], 0.0, None
+            else:
+                self._close(idx, ts, close, EXIT_END_OF_DATA)
+        self._record(np.asarray([ts]), np.asarray([self._equity_at(close)]), idx, np.asarray([close]))
+        if not self._curve or self._curve[-1]["time"] != iso_time(ts):
+            self._curve.append({"time": iso_time(ts), "value": round(self._last_equity, 6)})
+            self._benchmark_curve.append({"time": iso_time(ts), "value": round(self._benchmark_at(self._last_close), 6)})
+            for label, last in self._rolling_last.items():
+                for name, value in last.items():
+                    self._rolling[label][name].append(value)
+        self._pending = None
+
+    def result(self) -> Tuple[SimulationResult, np.ndarray, np.ndarray]:
+        """거래 목록을 SimulationResult(봉별 배열 없음)와 진입/청산 시각 배열로 반환합니다."""
+        cols = list(zip(*self._trades)) if self._trades else [()] * 14
+        as_int = lambda values: np.asarray(values, dtype=np.int64)
+        as_float = lambda values: np.asarray(values, dtype=np.float64)
+        empty = np.empty(0, dtype=np.float64)
+        sim = SimulationResult(
+            equity=empty, position=empty,
+            entry_idx=as_int(cols[0]), exit_idx=as_int(cols[1]),
+            entry_price=as_float(cols[4]), exit_price=as_float(cols[5]), quantity=as_float(cols[6]),
+            entry_commission=as_float(cols[7]), exit_commission=as_float(cols[8]),
+            pnl=as_float(cols[9]), balance_after=as_float(cols[10]),
+            mae_pct=(as_float(cols[11]) / as_float(cols[4]) - 1.0) * 100.0,
+            mfe_pct=(as_float(cols[12]) / as_float(cols[4]) - 1.0) * 100.0,
+            exit_reason=np.asarray(cols[13], dtype=np.int8),
+        )
+        return sim, as_int(cols[2]), as_int(cols[3])
+
+    def summary(self) -> Dict[str, Any]:
+        sim, _, _ = self.result()
+        summary = trade_summary(sim, self._last_equity)
+        total = summary["total_trades"]
+        std = math.sqrt(self._ret_m2 / self._ret_count) if self._ret_count else 0.0
+        return {
+            "total_return_pct": (self._last_equity / self.config.initial_capital - 1.0) * 100.0,
+            "mdd_pct": self._max_dd * 100.0,
+            "sharpe_ratio": (self._ret_mean / std * math.sqrt(periods_per_year(self.timeframe))) if std > 0.0 else 0.0,
+            "win_rate_pct": (summary["winning_trades"] / total * 100.0) if total else 0.0,
+            "pnl_curve_json": self._curve,
+            "rolling_metrics_json": {"time": [point["time"] for point in self._curve], "windows": self._rolling},
+            "trade_summary_json": summary,
+            "benchmark_return_pct": (self._benchmark_at(self._last_close) / self.config.initial_capital - 1.0) * 100.0
+            if self._first_close is not None else None,
+            "benchmark_curve_json": self._benchmark_curve,
+            **relative_metrics(self._moments, self.timeframe),
+            "regime_report_json": None,  # 국면 분위 경계는 전체 구간 분포가 필요하므로 스트리밍 모드에서는 계산하지 않음
+        }
+
+
+@dataclass
+class StreamingRun:
+    """스트리밍 실행 결과. BacktestRun과 같이 summary/trade_logs()를 제공합니다."""
+    timeframe: str
+    summary: Dict[str, Any]
+    simulation: SimulationResult
+    entry_ts: np.ndarray
+    exit_ts: np.ndarray
+    bars_processed: int
+    chunks: int
+    rules_key: str = ""
+    data_digest: str = ""
+
+    def trade_logs(self) -> List[Dict[str, Any]]:
+        return trade_log_rows_at(self.entry_ts, self.exit_ts, self.simulation)
+
+
+def iter_chunks(spec: BacktestSpec, start_ms: int, chunk_bars: int = STREAM_CHUNK_BARS) -> Iterator[OHLCV]:
+    """[start_ms, spec.end_ms) 구간을 chunk_bars 봉 단위 시간 구간으로 나누어 차례로 로드합니다. 데이터가 없는 구간은 건너뜁니다."""
+    step = chunk_bars * timeframe_ms(spec.timeframe)
+    for chunk_start in range(start_ms, spec.end_ms, step):
+        try:
+            yield load_ohlcv_at(spec.data_version, spec.exchange, spec.ticker, spec.timeframe, chunk_start, min(chunk_start + step, spec.end_ms))
+        except MarketDataUnavailableError:
+            continue
+
+
+def should_stream(spec: BacktestSpec, mode: str = "auto") -> bool:
+    if mode == "streaming":
+        return True
+    # 트레일링 스탑과 지정가 주문은 봉 단위 상태가 필요하므로 StreamingSimulator가 지원하지 않습니다.
+    if mode != "auto" or spec.simulation.trailing_stop_rate > 0.0 or spec.simulation.order_type != "market":
+        return False
+    return (spec.end_ms - spec.start_ms) // timeframe_ms(spec.timeframe) >= STREAM_MIN_BARS
+
+
+def run_streaming(compiled: CompiledStrategy, spec: BacktestSpec, chunk_bars: int = STREAM_CHUNK_BARS) -> StreamingRun:
+    """
+    지표 워밍업 구간부터 청크 단위로 데이터를 읽어 백테스트를 실행합니다.
+    워밍업 구간(spec.start_ms 이전)의 봉은 지표 상태만 갱신하고 시뮬레이션에는 넣지 않습니다.
+    """
+    if spec.simulation.trailing_stop_rate > 0.0:
+        raise ValueError("Trailing stops are not supported in streaming mode.")
+    if spec.simulation.order_type != "market":
+        raise ValueError("Limit orders are not supported in streaming mode.")
+    evaluator = StreamingEvaluator(compiled, spec.timeframe)
+    expected_bars = max(1, (spec.end_ms - spec.start_ms) // timeframe_ms(spec.timeframe))
+    simulator = StreamingSimulator(spec.simulation, spec.timeframe, expected_bars, rolling_window_days=spec.rolling_window_days)
+    value_dtype = get_precision(spec.precision).value_dtype
+    digest = DataDigest()
+    chunks = 0
+    for bars in iter_chunks(spec, spec.start_ms - compiled.warmup_ms, chunk_bars):
+        chunks += 1
+        bars = bars.astype(value_dtype)
+        entries, exits = evaluator.update(bars)
+        start = int(np.searchsorted(bars.ts, spec.start_ms, side="left"))
+        if start < len(bars):
+            simulator.update(bars.ts[start:], bars.close[start:], entries[start:], exits[start:])
+            digest.update(bars.slice(start))
+    if simulator.bars == 0:
+        raise MarketDataUnavailableError(
+            f"No {spec.timeframe} candles for {spec.exchange}:{spec.ticker} in [{spec.start_ms}, {spec.end_ms})."
+        )
+    simulator.finish()
+    sim, entry_ts, exit_ts = simulator.result()
+    logger.info(f"Strategy {compiled.key[:10]} streamed {simulator.bars} bar(s) in {chunks} chunk(s): {sim.trade_count} trade(s).")
+    return StreamingRun(
+        timeframe=spec.timeframe, summary=simulator.summary(), simulation=sim,
+        entry_ts=entry_ts, exit_ts=exit_ts, bars_processed=simulator.bars, chunks=chunks,
+        rules_key=compiled.key, data_digest=digest.hexdigest(),
+    )
@@ -0,0 +1,134 @@
+# file: backend/app/engine/stress.py
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data import OHLCV, InvalidMarketError, MarketDataUnavailableError, get_precision, load_ohlcv, to_epoch_ms
+from .compiler import CompiledStrategy
+from .evaluator import MarketFrame
+from .simulator import SimulationConfig
+from .backtester import run_compiled
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StressWindow:
+    key: str
+    label: str
+    start_ms: int
+    end_ms: int
+
+
+def _window(key: str, label: str, start: str, end: str) -> StressWindow:
+    parse = lambda value: to_epoch_ms(datetime.fromisoformat(value).replace(tzinfo=timezone.utc))
+    return StressWindow(key, label, parse(start), parse(end))
+
+
+# 과거 급락/급변 구간 (UTC). 순서대로 결과 표에 표시됩니다.
+STRESS_WINDOWS: "OrderedDict[str, StressWindow]" = OrderedDict((w.key, w) for w in (
+    _window("dec_2018_capitulation", "2018.11 해시 전쟁 투매", "2018-11-14", "2018-12-16"),
+    _window("mar_2020_covid_crash", "2020.03 코로나 폭락", "2020-02-19", "2020-03-24"),
+    _window("may_2021_crash", "2021.05 중국 규제 폭락", "2021-05-10", "2021-05-24"),
+    _window("may_2022_luna", "2022.05 LUNA/UST 붕괴", "2022-05-05", "2022-05-19"),
+    _window("nov_2022_ftx", "2022.11 FTX 파산", "2022-11-05", "2022-11-22"),
+))
+
+STRESS_SERIES_CACHE_MAX = int(os.getenv("BACKTEST_STRESS_SERIES_CACHE_MAX", "64")) # (티커, 타임프레임, 구간) 항목 수
+
+
+class StressSeriesCache:
+    """
+    스트레스 구간 시세를 프로세스 메모리에 보관합니다. 구간은 과거 고정 기간이므로 만료하지 않고,
+    더 긴 워밍업이 필요한 전략이 오면 그때만 다시 로드합니다.
+    data_key가 (구간, 로드 시작 시각)으로 고정되므로 여러 전략의 스트레스 실행이 지표 캐시를 공유합니다.
+    """
+    def __init__(self, max_entries: int = STRESS_SERIES_CACHE_MAX):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str, str], Tuple[int, str, OHLCV]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, exchange: str, ticker: str, timeframe: str, window: StressWindow, warmup_ms: int) -> Tuple[str, OHLCV]:
+        key = (exchange, ticker, timeframe, window.key)
+        load_start_ms = window.start_ms - warmup_ms
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= load_start_ms:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+        bars = load_ohlcv(exchange, ticker, timeframe, load_start_ms, window.end_ms)
+        data_key = f"stress:{exchange}:{ticker}:{timeframe}:{window.key}:{load_start_ms}"
+        with self._lock:
+            self._entries[key] = (load_start_ms, data_key, bars)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data_key, bars
+
+
+stress_series_cache = StressSeriesCache()
+
+
+def run_stress_pack(
+    compiled: CompiledStrategy,
+    exchange: str,
+    ticker: str,
+    timeframe: str,
+    simulation: SimulationConfig,
+    window_keys: Optional[Sequence[str]] = None,
+    precision: str = "float64",
+    cancel: Optional[threading.Event] = None,
+) -> List[Dict[str, Any]]:
+    """
+    한 전략을 여러 스트레스 구간에 대해 한 번에 실행하고 구간별 수익률/낙폭 요약 행을 반환합니다.
+    구간마다 독립된 백테스트(구간 시작 시 현금 100%)이며, 시세와 규칙 마스크는 캐시를 통해 재사용합니다.
+    데이터가 없거나 거래소 조회가 실패한 구간은 status="no_data" 행으로 표시하고, 거래소가 심볼 자체를 거부하면
+    InvalidMarketError를 그대로 올립니다. cancel이 설정되면 다음 구간으로 넘어가기 전에 중단합니다.
+    """
+    keys = list(window_keys) if window_keys else list(STRESS_WINDOWS)
+    unknown = [key for key in keys if key not in STRESS_WINDOWS]
+    if unknown:
+        raise ValueError(f"Unknown stress window(s): {', '.join(unknown)}")
+
+    rows: List[Dict[str, Any]] = []
+    for key in keys:
+        if cancel is not None and cancel.is_set():
+            logger.info(f"Stress pack for strategy {compiled.key[:10]} on {exchange}:{ticker} canceled after {len(rows)} window(s).")
+            break
+        window = STRESS_WINDOWS[key]
+        row: Dict[str, Any] = {
+            "window": window.key, "label": window.label,
+            "start": datetime.fromtimestamp(window.start_ms / 1000, tz=timezone.utc),
+            "end": datetime.fromtimestamp(window.end_ms / 1000, tz=timezone.utc),
+        }
+        try:
+            data_key, bars = stress_series_cache.get(exchange, ticker, timeframe, window, compiled.warmup_ms)
+        except InvalidMarketError:
+            raise
+        except MarketDataUnavailableError as e:
+            logger.warning(f"Stress window {window.key} for {exchange}:{ticker} {timeframe} has no data: {e}")
+            rows.append({**row, "status": "no_data"})
+            continue
+        start_index = int(np.searchsorted(bars.ts, window.start_ms, side="left"))
+        if start_index >= len(bars) - 1:
+            rows.append({**row, "status": "no_data"})
+            continue
+        market = MarketFrame(data_key, timeframe, bars, precision=get_precision(precision))
+        run = run_compiled(compiled, market, simulation, start_index, rolling_window_days=())
+        summary = run.summary
+        rows.append({
+            **row, "status": "ok", "bars": len(bars) - start_index,
+            "total_return_pct": summary["total_return_pct"],
+            "mdd_pct": summary["mdd_pct"],
+            "benchmark_return_pct": summary["benchmark_return_pct"],
+            "total_trades": summary["trade_summary_json"]["total_trades"],
+        })
+    logger.info(f"Stress pack for strategy {compiled.key[:10]} on {exchange}:{ticker} {timeframe}: {len(rows)} window(s).")
+    return rows
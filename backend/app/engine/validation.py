@@ -0,0 +1,159 @@
+# file: backend/app/engine/validation.py
+
+import os
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from .data import OHLCV, OHLCV_COLUMNS, DataSource
+
+logger = logging.getLogger(__name__)
+
+# --- 시세 데이터 품질 검증 ---
+# 거래소에서 받은 봉을 저장소/백테스트에 넘기기 전에 열 단위 배열 연산으로 한 번에 검사합니다 (행 단위 파이썬 루프 없음).
+# - 복구(repair): 시각 역전은 정렬, 중복 시각은 마지막 수신 봉 유지, OHLC 불일치는 high/low를 네 가격의 최대/최소로 교정
+# - 격리(quarantine): 결측값(NaN/inf), 0 이하 가격, 음수 거래량, N·ATR을 넘는 가격 스파이크는 제외하고 사유 비트와 함께 반환
+# 거래량 0 봉은 거래가 없던 구간일 수 있으므로 집계만 하고 유지합니다.
+VALIDATION_ENABLED = os.getenv("ENGINE_VALIDATE_CANDLES", "1") == "1"
+SPIKE_ATR_MULTIPLE = float(os.getenv("ENGINE_SPIKE_ATR_MULTIPLE", "15")) # 주변 ATR의 몇 배를 넘는 움직임을 스파이크로 볼지
+SPIKE_ATR_WINDOW = int(os.getenv("ENGINE_SPIKE_ATR_WINDOW", "14"))
+
+# 격리 사유 (비트 플래그, candle_quarantine.reasons에 저장)
+REASON_NON_FINITE = 1
+REASON_NON_POSITIVE_PRICE = 2
+REASON_NEGATIVE_VOLUME = 4
+REASON_SPIKE = 8
+REASON_NAMES = {
+    REASON_NON_FINITE: "non_finite",
+    REASON_NON_POSITIVE_PRICE: "non_positive_price",
+    REASON_NEGATIVE_VOLUME: "negative_volume",
+    REASON_SPIKE: "spike",
+}
+
+_PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+@dataclass
+class ValidationReport:
+    """검증 결과. bars는 복구를 마친 정상 봉, quarantined/reasons는 격리된 봉과 봉별 사유 비트입니다."""
+    bars: OHLCV
+    quarantined: OHLCV
+    reasons: np.ndarray
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def clean(self) -> bool:
+        return not any(self.counts.values())
+
+    def summary(self) -> str:
+        return ", ".join(f"{name}={count}" for name, count in self.counts.items() if count)
+
+
+def _take(bars: OHLCV, index: np.ndarray) -> OHLCV:
+    return OHLCV(*(getattr(bars, name)[index] for name in ("ts",) + OHLCV_COLUMNS))
+
+
+def _neighbour_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    i번째 값 = 앞뒤 window개 이웃(자기 자신 제외)의 평균. 배치 경계에서도 이웃이 있는 쪽만으로 계산되므로
+    구간 첫 봉도 판정할 수 있고, 같은 봉은 요청 구간이 달라져도 거의 같은 기준으로 판정됩니다.
+    """
+    n = values.shape[0]
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    idx = np.arange(n)
+    lo = np.maximum(idx - window, 0)
+    hi = np.minimum(idx + window + 1, n)
+    return (csum[hi] - csum[lo] - values) / (hi - lo - 1)
+
+
+def find_spikes(bars: OHLCV, multiple: float = SPIKE_ATR_MULTIPLE, window: int = SPIKE_ATR_WINDOW) -> np.ndarray:
+    """
+    주변(앞뒤 window개) 봉의 ATR 대비 multiple배를 넘는 스파이크 봉 마스크. 두 가지를 봅니다.
+    - 꼬리 스파이크: 몸통(open/close) 밖으로 뻗은 꼬리가 기준을 넘는 봉
+    - 종가 스파이크: 직전 종가에서 기준 이상 튀었다가 다음 봉에서 다시 기준 이상 되돌아온 봉
+    급락 후 그 가격이 유지되는 실제 추세 전환은 되돌림이 없으므로 스파이크로 보지 않습니다.
+    """
+    n = len(bars)
+    if n < 2:
+        return np.zeros(n, dtype=bool)
+    high, low, close = bars.high, bars.low, bars.close
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    true_range = np.maximum(high, prev_close) - np.minimum(low, prev_close)
+    limit = multiple * _neighbour_mean(true_range, window)
+    body_top = np.maximum(bars.open, close)
+    body_bottom = np.minimum(bars.open, close)
+    with np.errstate(invalid="ignore"):
+        wick = ((high - body_top) > limit) | ((body_bottom - low) > limit)
+        jump = np.zeros(n, dtype=bool)
+        move_in = close[1:-1] - close[:-2]
+        move_out = close[2:] - close[1:-1]
+        jump[1:-1] = (np.abs(move_in) > limit[1:-1]) & (np.abs(move_out) > limit[1:-1]) & (move_in * move_out < 0)
+    return wick | jump
+
+
+def validate_candles(bars: OHLCV, multiple: float = SPIKE_ATR_MULTIPLE, window: int = SPIKE_ATR_WINDOW) -> ValidationReport:
+    """봉 배열을 검사해 복구 가능한 문제는 고치고 나머지는 격리한 결과를 반환합니다. 입력 배열은 수정하지 않습니다."""
+    counts = {"unsorted": 0, "duplicates": 0, "ohlc_repaired": 0, "zero_volume": 0}
+    counts.update({name: 0 for name in REASON_NAMES.values()})
+    if len(bars) == 0:
+        return ValidationReport(bars, bars, np.empty(0, dtype=np.int32), counts)
+
+    ts = bars.ts
+    steps = np.diff(ts)
+    if not np.all(steps > 0):
+        counts["unsorted"] = int(np.count_nonzero(steps < 0))
+        # 같은 시각이 여러 번 오면 나중에 받은 봉(거래소 정정본)을 유지
+        order = np.argsort(ts, kind="stable")
+        sorted_ts = ts[order]
+        last = np.append(sorted_ts[1:] != sorted_ts[:-1], True)
+        counts["duplicates"] = int(last.shape[0] - np.count_nonzero(last))
+        bars = _take(bars, order[last])
+    else:
+        bars = OHLCV(bars.ts, *(getattr(bars, name).copy() for name in OHLCV_COLUMNS))
+
+    reasons = np.zeros(len(bars), dtype=np.int32)
+    prices = np.vstack([getattr(bars, name) for name in _PRICE_COLUMNS])
+    reasons[~np.isfinite(prices).all(axis=0) | ~np.isfinite(bars.volume)] |= REASON_NON_FINITE
+    with np.errstate(invalid="ignore"):
+        reasons[(prices <= 0).any(axis=0)] |= REASON_NON_POSITIVE_PRICE
+        reasons[bars.volume < 0] |= REASON_NEGATIVE_VOLUME
+        counts["zero_volume"] = int(np.count_nonzero(bars.volume == 0))
+
+        # high/low가 몸통을 감싸지 않으면 네 가격의 최대/최소로 교정
+        top, bottom = prices.max(axis=0), prices.min(axis=0)
+        inconsistent = (bars.high != top) | (bars.low != bottom)
+        inconsistent &= reasons == 0
+        counts["ohlc_repaired"] = int(np.count_nonzero(inconsistent))
+        bars.high[inconsistent] = top[inconsistent]
+        bars.low[inconsistent] = bottom[inconsistent]
+
+    # 스파이크는 이미 격리 대상이 아닌 봉들끼리 비교 (격리된 봉이 ATR을 오염시키지 않도록)
+    usable = np.flatnonzero(reasons == 0)
+    reasons[usable[find_spikes(_take(bars, usable), multiple, window)]] |= REASON_SPIKE
+
+    for bit, name in REASON_NAMES.items():
+        counts[name] = int(np.count_nonzero(reasons & bit))
+    bad = reasons != 0
+    if not bad.any():
+        return ValidationReport(bars, OHLCV.empty(), np.empty(0, dtype=np.int32), counts)
+    return ValidationReport(_take(bars, ~bad), _take(bars, bad), reasons[bad], counts)
+
+
+def validating(source: DataSource, on_report: Optional[Callable[[str, str, str, ValidationReport], None]] = None) -> DataSource:
+    """
+    source가 반환한 봉을 검증해 정상 봉만 돌려주는 데이터 소스. 문제가 있으면 경고를 남기고
+    on_report(거래소, 심볼, 타임프레임, 결과)를 호출합니다 (예: 격리 봉 기록).
+    """
+    def validated_source(exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> OHLCV:
+        report = validate_candles(source(exchange, ticker, timeframe, start_ms, end_ms))
+        if not report.clean:
+            logger.warning(f"Candle validation for {exchange}:{ticker} {timeframe}: {report.summary()}")
+            if on_report is not None:
+                try:
+                    on_report(exchange, ticker, timeframe, report)
+                except Exception as e:
+                    logger.error(f"Failed to record candle validation for {exchange}:{ticker} {timeframe}: {e}", exc_info=True)
+        return report.bars
+    return validated_source
@@ -0,0 +1,213 @@
+# file: backend/app/engine/warm_pool.py
+
+import os
+import json
+import socket
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .data import OHLCV, TIMEFRAME_MS, load_ohlcv
+from .compiler import CompiledStrategy, compile_operand, compile_strategy
+from .evaluator import MarketFrame, RuleEvaluator, subtree_cache
+from .shm_broker import shared_series_broker
+
+logger = logging.getLogger(__name__)
+
+# --- 웜(warm) 워커 설정 ---
+# BACKTEST_HOT_SERIES: "거래소:티커:타임프레임" 목록 (쉼표 구분). 웜 워커가 시작 시 미리 로드합니다.
+# 웜 워커는 BACKTEST_WORKER_WARM=1 환경 변수와 함께 WARM_QUEUE를 구독하도록 실행합니다.
+#   e.g. BACKTEST_WORKER_WARM=1 celery -A backend.app.celery_app worker -Q backtests_warm
+HOT_SERIES_SPEC = os.getenv("BACKTEST_HOT_SERIES", "binance:BTC/USDT:1h,binance:ETH/USDT:1h")
+HOT_SERIES_DAYS = int(os.getenv("BACKTEST_HOT_SERIES_DAYS", "730"))
+WARM_QUEUE = os.getenv("BACKTEST_WARM_QUEUE", "backtests_warm")
+WORKER_IS_WARM = os.getenv("BACKTEST_WORKER_WARM", "0") == "1"
+PLAN_CACHE_SIZE = int(os.getenv("BACKTEST_PLAN_CACHE_SIZE", "256"))
+STATS_KEY_PREFIX = "backtest:worker_cache:"
+STATS_TTL_S = 3600
+
+# 워커 시작 시 미리 계산해 둘 자주 쓰이는 지표 (프론트엔드 기본 파라미터 기준)
+WARM_INDICATORS: List[Tuple[str, Dict[str, Any]]] = [
+    ("SMA", {"period": 20}), ("SMA", {"period": 50}), ("SMA", {"period": 200}),
+    ("EMA", {"period": 20}), ("EMA", {"period": 50}),
+    ("RSI", {"period": 14}),
+    ("MACD", {"fast_period": 12, "slow_period": 26, "signal_period": 9}),
+    ("BB", {"period": 20, "stdDev": 2}),
+    ("ATR", {"period": 14}),
+]
+
+
+def _parse_series(spec: str) -> List[Tuple[str, str, str]]:
+    series = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        exchange, ticker, timeframe = item.rsplit(":", 2)
+        if timeframe in TIMEFRAME_MS:
+            series.append((exchange, ticker, timeframe))
+        else:
+            logger.warning(f"Ignoring hot series with unsupported timeframe: {item}")
+    return series
+
+
+HOT_SERIES: List[Tuple[str, str, str]] = _parse_series(HOT_SERIES_SPEC)
+
+
+def is_hot_series(exchange: str, ticker: str, timeframe: str) -> bool:
+    return (exchange, ticker, timeframe) in HOT_SERIES
+
+
+class SeriesStore:
+    """
+    워커 프로세스 메모리에 미리 로드해 둔 전체 시계열.
+    요청 구간(워밍업 포함)을 모두 포함하는 경우에만 적중으로 처리하고, 전체 시계열 기준의 data_key를 돌려주어
+    서로 다른 기간의 백테스트가 같은 지표/마스크 캐시를 공유할 수 있게 합니다.
+    """
+    def __init__(self):
+        self._series: Dict[Tuple[str, str, str], Tuple[str, OHLCV, int]] = {}
+        self._segments: Dict[Tuple[str, str, str], str] = {}  # 공유 메모리 브로커 세그먼트 이름
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def preload(self, exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> Tuple[str, OHLCV]:
+        """
+        시계열을 로드해 둡니다. 공유 메모리 브로커가 켜져 있으면 같은 호스트의 다른 워커가 이미 올린 세그먼트에 붙으므로
+        워커마다 따로 로드하거나 메모리에 복사하지 않습니다.
+        """
+        segment = None
+        if shared_series_broker is not None:
+            segment, bars, end_ms = shared_series_broker.attach(exchange, ticker, timeframe, start_ms, end_ms)
+        else:
+            bars = load_ohlcv(exchange, ticker, timeframe, start_ms, end_ms)
+        data_key = f"series:{exchange}:{ticker}:{timeframe}:{int(bars.ts[0])}:{len(bars)}"
+        with self._lock:
+            previous = self._segments.pop((exchange, ticker, timeframe), None)
+            self._series[(exchange, ticker, timeframe)] = (data_key, bars, end_ms)
+            if segment is not None:
+                self._segments[(exchange, ticker, timeframe)] = segment
+        if previous is not None:
+            shared_series_broker.release(previous)
+        where = f"shared memory segment {segment}" if segment else "worker memory"
+        logger.info(f"Preloaded {len(bars)} {timeframe} candles for {exchange}:{ticker} into {where}.")
+        return data_key, bars
+
+    def lookup(self, exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> Optional[Tuple[str, OHLCV]]:
+        with self._lock:
+            entry = self._series.get((exchange, ticker, timeframe))
+            if entry is not None:
+                data_key, bars, loaded_until = entry
+                if bars.ts[0] <= start_ms and end_ms <= loaded_until:
+                    self.hits += 1
+                    return data_key, bars
+            self.misses += 1
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "series": len(self._series),
+            "bars": sum(len(bars) for _, bars, _ in self._series.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+
+class PlanCache:
+    """규칙 JSON 해시 -> 컴파일된 전략 LRU 캐시."""
+    def __init__(self, max_entries: int = PLAN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._plans: "OrderedDict[str, CompiledStrategy]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _rules_key(rules: Any) -> str:
+        raw = rules if isinstance(rules, (str, bytes)) else json.dumps(rules, sort_keys=True, default=str)
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()
+
+    def get_or_compile(self, rules: Any) -> CompiledStrategy:
+        key = self._rules_key(rules)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+        plan = compile_strategy(rules)
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+        return plan
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._plans),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+
+# 워커 프로세스 전역 인스턴스
+series_store = SeriesStore()
+plan_cache = PlanCache()
+
+
+def warm_worker(now_ms: int) -> None:
+    """
+    Celery 워커 프로세스 시작 시 호출됩니다.
+    인기 시계열을 메모리에 로드하고, 자주 쓰이는 지표를 미리 계산하여 subtree_cache를 채웁니다.
+    """
+    start_ms = now_ms - HOT_SERIES_DAYS * TIMEFRAME_MS["1d"]
+    for exchange, ticker, timeframe in HOT_SERIES:
+        try:
+            data_key, bars = series_store.preload(exchange, ticker, timeframe, start_ms, now_ms)
+        except Exception as e:
+            logger.warning(f"Failed to preload {exchange}:{ticker}:{timeframe} for warm worker: {e}")
+            continue
+        evaluator = RuleEvaluator(MarketFrame(data_key, timeframe, bars), subtree_cache)
+        for indicator_key, params in WARM_INDICATORS:
+            operand = compile_operand({
+                "type": "indicator",
+                "value": {"indicatorKey": indicator_key, "values": params, "timeframe": timeframe},
+            })
+            evaluator.evaluate(operand)
+        logger.info(f"Warmed {evaluator.computed} indicator array(s) for {exchange}:{ticker}:{timeframe}.")
+
+
+def worker_cache_stats() -> Dict[str, Any]:
+    return {
+        "hostname": socket.gethostname(),
+        "pid": os.getpid(),
+        "warm": WORKER_IS_WARM,
+        "series": series_store.stats(),
+        "plans": plan_cache.stats(),
+        "subtrees": subtree_cache.stats(),
+        "shared": shared_series_broker.stats() if shared_series_broker is not None else None,
+    }
+
+
+def _redis_client():
+    import redis  # celery[redis] 의존성으로 설치됨
+    return redis.Redis.from_url(os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"))
+
+
+def publish_worker_cache_stats() -> None:
+    """현재 워커 프로세스의 캐시 적중률을 Redis에 기록합니다 (관리자 API에서 조회)."""
+    stats = worker_cache_stats()
+    key = f"{STATS_KEY_PREFIX}{stats['hostname']}:{stats['pid']}"
+    _redis_client().setex(key, STATS_TTL_S, json.dumps(stats))
+
+
+def read_worker_cache_stats() -> List[Dict[str, Any]]:
+    client = _redis_client()
+    keys = sorted(client.scan_iter(match=f"{STATS_KEY_PREFIX}*"))
+    return [json.loads(raw) for raw in client.mget(keys) if raw] if keys else []
@@ -1,10 +1,10 @@
 # file: backend/app/models.py
 
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Float, JSON,
+    Column, Integer, BigInteger, String, Boolean, DateTime, Float, JSON, LargeBinary,
     ForeignKey, UniqueConstraint, CheckConstraint
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -114,6 +114,7 @@ class Backtest(Base):
     strategy_id = Column(Integer, ForeignKey("strategies.id"), nullable=False)
     status = Column(String(50), nullable=False, default='pending')
     parameters = Column(JSON, nullable=False)
+    data_version = Column(String(64), ForeignKey("data_snapshots.version"), nullable=True, index=True) # 실행에 고정된 시세 스냅샷
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -135,7 +136,21 @@ class BacktestResult(Base):
     sharpe_ratio = Column(Float, nullable=True)
     win_rate_pct = Column(Float, nullable=True)
     pnl_curve_json = Column(JSON, nullable=True)
+    rolling_metrics_json = Column(JSON, nullable=True) # pnl_curve_json과 같은 시각의 롤링 샤프/변동성/낙폭/승률
+    regime_report_json = Column(JSON, nullable=True) # 변동성/추세 국면별 수익률/낙폭/거래 분해
     trade_summary_json = Column(JSON, nullable=True)
+    # 같은 티커 Buy & Hold 벤치마크 대비 지표 (커뮤니티 피드 정렬에 사용)
+    benchmark_return_pct = Column(Float, nullable=True)
+    alpha_pct = Column(Float, nullable=True)
+    beta = Column(Float, nullable=True)
+    information_ratio = Column(Float, nullable=True, index=True)
+    correlation = Column(Float, nullable=True)
+    benchmark_curve_json = Column(JSON, nullable=True)
+    # 재현 지문: 같은 input_key(데이터 + 규칙 + 파라미터)의 재실행은 output_digest가 같아야 합니다.
+    input_key = Column(String(64), nullable=True, index=True)
+    fingerprint_json = Column(JSON, nullable=True)
+    # 신호/자산 곡선/거래 npz 바이트 (재계산 없는 재생용). API와 워커가 다른 호스트여도 읽을 수 있도록 DB에 두며, 조회 시에만 로드합니다.
+    replay_artifact = deferred(Column(LargeBinary, nullable=True))
     executed_at = Column(DateTime(timezone=True), nullable=True)
 
     backtest = relationship("Backtest", back_populates="result")
@@ -161,6 +176,11 @@ class TradeLog(Base):
     commission = Column(Float, nullable=True)
     pnl = Column(Float, nullable=True)
     current_balance = Column(Float, nullable=True)
+    # 백테스트 매도 행의 거래 분석 값 (자동매매/매수 행은 NULL)
+    mae_pct = Column(Float, nullable=True)
+    mfe_pct = Column(Float, nullable=True)
+    bars_held = Column(Integer, nullable=True)
+    exit_reason = Column(String(20), nullable=True) # 'signal' | 'trailing_stop' | 'end_of_data'
 
     backtest = relationship("Backtest", back_populates="trade_logs")
     live_bot = relationship("LiveBot", back_populates="trade_logs")
@@ -192,6 +212,7 @@ class LiveBot(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     strategy_id = Column(Integer, ForeignKey("strategies.id"), nullable=False)
     api_key_id = Column(Integer, ForeignKey("api_keys.id"), nullable=False)
+    ticker = Column(String(32), nullable=True) # 거래 페어 (봉 마감 스트림 구독 키)
     status = Column(String(50), default='active', nullable=False)
     started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     stopped_at = Column(DateTime(timezone=True), nullable=True)
@@ -300,4 +321,87 @@ class PasswordResetToken(Base):
     is_used = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    user = relationship("User", back_populates="password_reset_tokens")
\ No newline at end of file
+    user = relationship("User", back_populates="password_reset_tokens")
+
+# ==============================================================================
+# 5. 시세 데이터 모델
+# ==============================================================================
+
+class Candle(Base):
+    """
+    거래소 OHLCV 봉. TimescaleDB 하이퍼테이블(ts 기준 청크)이며 오래된 청크는 압축 정책으로 압축됩니다.
+    대량 적재는 ORM이 아닌 engine/candle_store.py의 COPY 로더를 사용합니다.
+    """
+    __tablename__ = "candles"
+
+    exchange = Column(String(32), primary_key=True)
+    symbol = Column(String(32), primary_key=True)
+    timeframe = Column(String(8), primary_key=True)
+    ts = Column(DateTime(timezone=True), primary_key=True) # 봉 시작 시각 (UTC)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
+
+
+class CandleQuarantine(Base):
+    """
+    품질 검증(engine/validation.py)에서 격리되어 candles에 적재되지 않은 봉.
+    reasons는 격리 사유 비트 플래그(REASON_*)이며, 같은 봉이 다시 격리되면 값과 감지 시각을 갱신합니다.
+    """
+    __tablename__ = "candle_quarantine"
+
+    exchange = Column(String(32), primary_key=True)
+    symbol = Column(String(32), primary_key=True)
+    timeframe = Column(String(8), primary_key=True)
+    ts = Column(DateTime(timezone=True), primary_key=True)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
+    reasons = Column(Integer, nullable=False)
+    detected_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class DataSegment(Base):
+    """
+    불변 시세 세그먼트 (engine/snapshots.py). hash는 payload(행 우선 float64 ts/OHLCV 배열)의 SHA-256이며
+    같은 내용은 한 번만 저장되어 여러 스냅샷이 공유합니다.
+    """
+    __tablename__ = "data_segments"
+
+    hash = Column(String(64), primary_key=True)
+    rows = Column(Integer, nullable=False)
+    start_ms = Column(BigInteger, nullable=False)
+    end_ms = Column(BigInteger, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class DataSnapshot(Base):
+    """백테스트에 고정되는 시세 스냅샷. version은 (시계열, 구간, 세그먼트 목록)의 해시입니다."""
+    __tablename__ = "data_snapshots"
+
+    version = Column(String(64), primary_key=True)
+    exchange = Column(String(32), nullable=False)
+    symbol = Column(String(32), nullable=False)
+    timeframe = Column(String(8), nullable=False)
+    start_ms = Column(BigInteger, nullable=False)
+    end_ms = Column(BigInteger, nullable=False)
+    rows = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    segments = relationship("DataSnapshotSegment", cascade="all, delete-orphan", order_by="DataSnapshotSegment.position")
+
+
+class DataSnapshotSegment(Base):
+    """스냅샷을 구성하는 세그먼트 순서."""
+    __tablename__ = "data_snapshot_segments"
+
+    version = Column(String(64), ForeignKey("data_snapshots.version", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    segment_hash = Column(String(64), ForeignKey("data_segments.hash"), nullable=False, index=True)
@@ -105,4 +105,45 @@ async def get_all_live_bots_admin(
         db, skip, limit, status_filter, strategy_id_filter, user_id_filter, sort_by
     )
     logger.info(f"Admin {current_admin_user.email} (ID: {current_admin_user.id}) retrieved {len(live_bots)} live bots (all users).")
-    return live_bots
\ No newline at end of file
+    return live_bots
+
+
+@router.get("/backtest_workers/cache_stats", response_model=List[schemas.BacktestWorkerCacheStats], summary="Get per-worker backtest cache hit ratios (Admin only)")
+async def get_backtest_worker_cache_stats(
+    current_admin_user: models.User = Depends(security.get_current_admin_user)
+):
+    """
+    백테스트 워커 프로세스별 캐시 적중률을 조회합니다. 웜 워커의 사전 로드 효과를 확인하는 데 사용합니다.
+    """
+    try:
+        stats = admin_service.get_backtest_worker_cache_stats()
+        logger.info(f"Admin {current_admin_user.email} (ID: {current_admin_user.id}) retrieved backtest worker cache stats.")
+        return stats
+    except Exception as e:
+        logger.error(f"An unexpected error occurred while fetching backtest worker cache stats: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="백테스트 워커 캐시 정보를 불러오는 중 서버 오류가 발생했습니다."
+        )
+
+
+@router.post("/market_data/backfill", response_model=schemas.MarketDataBackfillQueued, status_code=status.HTTP_202_ACCEPTED, summary="Queue a historical candle backfill (Admin only)")
+async def queue_market_data_backfill(
+    backfill_request: schemas.MarketDataBackfillRequest,
+    current_admin_user: models.User = Depends(security.get_current_admin_user)
+):
+    """
+    지정한 (거래소, 심볼, 타임프레임) 구간의 결측 봉을 거래소에서 채우는 데이터 수집 작업을 등록합니다.
+    """
+    try:
+        queued = admin_service.enqueue_candle_backfill(backfill_request)
+        logger.info(f"Admin {current_admin_user.email} (ID: {current_admin_user.id}) queued candle backfill task {queued.task_id}.")
+        return queued
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"An unexpected error occurred while queueing candle backfill: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="시세 백필 작업을 등록하는 중 서버 오류가 발생했습니다."
+        )
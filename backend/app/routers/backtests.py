@@ -45,6 +45,38 @@ async def create_backtest(
         )
 
 
+@router.post("/preview", response_model=schemas.BacktestPreview, summary="Run a fast synchronous preview backtest")
+async def preview_backtest(
+    preview_request: schemas.BacktestPreviewRequest,
+    current_user: models.User = Depends(security.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    최근 시세 구간(실행 타임프레임 기준 최대 5,000봉)으로 전략을 즉시 시뮬레이션합니다.
+    Celery 큐를 거치지 않고 동기적으로 실행되며, Backtest/TradeLog 기록을 생성하지 않는 근사 결과입니다.
+    """
+    compiled = backtest_service.prepare_preview(db, current_user, preview_request)
+    preview = await backtest_service.run_preview(compiled, preview_request)
+    logger.info(f"User {current_user.email} previewed strategy {preview_request.strategy_id} on {preview_request.ticker} ({preview.bars_used} bars, {preview.elapsed_ms:.1f}ms).")
+    return preview
+
+
+@router.post("/stress-test", response_model=schemas.StressTestReport, summary="Run a strategy across curated historical stress windows")
+async def stress_test_backtest(
+    stress_request: schemas.StressTestRequest,
+    current_user: models.User = Depends(security.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    전략을 과거 급락 구간(2020.03, 2021.05, 2022.11 등) 묶음에 대해 한 번에 실행하고 구간별 수익률/최대 낙폭 표를 반환합니다.
+    미리보기와 같이 동기적으로 실행되며 Backtest/TradeLog 기록을 생성하지 않습니다.
+    """
+    compiled = backtest_service.prepare_stress_test(db, current_user, stress_request)
+    report = await backtest_service.run_stress_test(compiled, stress_request)
+    logger.info(f"User {current_user.email} stress-tested strategy {stress_request.strategy_id} on {stress_request.ticker} ({len(report.results)} windows, {report.elapsed_ms:.1f}ms).")
+    return report
+
+
 @router.get("/", response_model=List[schemas.Backtest], summary="Get list of user's backtest records")
 async def get_backtests(
     current_user: models.User = Depends(security.get_current_active_user),
@@ -115,6 +147,25 @@ async def get_backtest_trade_logs(
     return trade_logs
 
 
+@router.get("/{backtest_id}/replay", response_model=schemas.BacktestReplay, summary="Replay a completed backtest from its stored artifact")
+async def replay_backtest(
+    backtest_id: int,
+    max_points: int = Query(2000, ge=2, description="Maximum number of equity curve points"),
+    current_user: models.User = Depends(security.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    완료된 백테스트의 재생 산출물(신호/자산 곡선/거래)을 재계산 없이 반환합니다. 재현 지문도 함께 반환됩니다.
+    """
+    backtest = backtest_service.get_backtest_by_id(db, backtest_id)
+    if not backtest:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="백테스트 기록을 찾을 수 없습니다.")
+    if backtest.user_id != current_user.id:
+        logger.warning(f"User {current_user.email} (ID: {current_user.id}) attempted to replay backtest {backtest_id} not owned by them.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="이 백테스트 기록에 접근할 권한이 없습니다.")
+    return backtest_service.get_replay(backtest, max_points)
+
+
 @router.post("/{backtest_id}/cancel", status_code=status.HTTP_202_ACCEPTED, summary="Request to cancel a running backtest job")
 async def cancel_backtest(
     backtest_id: int,
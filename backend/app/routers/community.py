@@ -49,7 +49,7 @@ async def get_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search_query: Optional[str] = Query(None, description="Search by post title or content"),
-    sort_by: Optional[str] = Query(None, description="Sort order (e.g., 'created_at_desc', 'likes_count_desc')"),
+    sort_by: Optional[str] = Query(None, description="Sort order (e.g., 'created_at_desc', 'likes_count_desc', 'information_ratio_desc', 'alpha_desc')"),
     author_id: Optional[int] = Query(None, description="Filter by author ID"),
     # is_public 필터는 GET /community/posts 자체가 is_public=True를 기본으로 가정하고,
     # 비공개 조회는 별도 엔드포인트나 관리자 권한을 통해 처리될 수 있습니다.
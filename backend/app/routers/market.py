@@ -0,0 +1,52 @@
+# file: backend/app/routers/market.py
+
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Response
+import logging
+from datetime import datetime
+from typing import Literal, Optional
+
+from .. import schemas, models, security
+from ..engine.data import MarketDataUnavailableError
+from ..services.market_data_service import market_data_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/market", tags=["Market Data"])
+
+
+@router.get("/candles", response_model=schemas.MarketCandles, summary="Get chart candles downsampled with LTTB")
+async def get_market_candles(
+    symbol: str = Query(..., description="Trading pair, e.g., 'BTC/USDT'"),
+    exchange: str = Query("binance"),
+    timeframe: str = Query("1h"),
+    start: Optional[datetime] = Query(None, description="Range start (default: max_points bars before end)"),
+    end: Optional[datetime] = Query(None, description="Range end, exclusive (default: now)"),
+    max_points: int = Query(1000, ge=10, le=5000, description="Maximum number of points returned"),
+    format: Literal["json", "binary"] = Query("json", description="'binary' returns the compact CXC1 encoding"),
+    current_user: models.User = Depends(security.get_current_active_user)
+):
+    """
+    차트용 시세를 반환합니다. 구간 길이와 무관하게 최대 max_points개 점이며, 넘치면 서버에서 LTTB로 다운샘플링합니다.
+    format=binary이면 application/octet-stream으로 "CXC1" 바이너리(int64 시각 + float32 OHLCV 열)를 반환하고,
+    메타데이터는 X-Candle-* 응답 헤더로 전달합니다.
+    """
+    try:
+        meta, bars = await market_data_service.get_candles(exchange, symbol, timeframe, start, end, max_points)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except MarketDataUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    logger.info(f"User {current_user.email} fetched {len(bars)}/{meta.total_bars} {meta.source_timeframe} candles for {exchange}:{symbol}.")
+
+    if format == "binary":
+        return Response(
+            content=market_data_service.to_binary(bars),
+            media_type="application/octet-stream",
+            headers={
+                "X-Candle-Timeframe": meta.timeframe,
+                "X-Candle-Source-Timeframe": meta.source_timeframe,
+                "X-Candle-Total-Bars": str(meta.total_bars),
+                "X-Candle-Downsampled": str(meta.downsampled).lower(),
+            },
+        )
+    return market_data_service.to_schema(meta, bars)
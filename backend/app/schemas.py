@@ -1,6 +1,7 @@
 # file: backend/app/schemas.py
 
-from pydantic import BaseModel, EmailStr, Field, ConfigDict # 👈 ConfigDict 임포트
+import json
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator # 👈 ConfigDict 임포트
 from datetime import datetime
 from typing import List, Dict, Any, Literal, Union, Optional
 
@@ -78,6 +79,39 @@ class DashboardSummary(BaseModel): # 👈 관리자 대시보드 스키마
 
     model_config = ConfigDict(from_attributes=True)
 
+class CacheCounters(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    hit_ratio: float = 0.0
+    entries: Optional[int] = None
+    series: Optional[int] = None
+    bars: Optional[int] = None
+    bytes: Optional[int] = None
+
+class BacktestWorkerCacheStats(BaseModel): # 👈 관리자용 백테스트 워커 캐시 현황
+    hostname: str
+    pid: int
+    warm: bool
+    series: CacheCounters
+    plans: CacheCounters
+    subtrees: CacheCounters
+    shared: Optional[CacheCounters] = None # 호스트 공유 메모리 시세 브로커 (이 프로세스가 붙은 세그먼트)
+
+class MarketDataBackfillRequest(BaseModel): # 👈 관리자용 과거 시세 백필(데이터 수집) 요청
+    exchange: str = Field(..., description="Exchange id, e.g., 'binance' ('fake' for the offline test exchange)")
+    symbol: str = Field(..., description="Trading pair, e.g., 'BTC/USDT'")
+    timeframe: Literal["1m", "5m", "15m", "30m", "1h", "4h", "1d", "1w"] = "1m"
+    start_date: datetime
+    end_date: datetime
+
+class MarketDataBackfillQueued(BaseModel):
+    task_id: str
+    exchange: str
+    symbol: str
+    timeframe: str
+    start_date: datetime
+    end_date: datetime
+
 class SocialCallbackRequest(BaseModel):
     code: str
     state: str | None = None
@@ -150,6 +184,14 @@ class Strategy(StrategyBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("rules", mode="before")
+    @classmethod
+    def _parse_stored_rules(cls, value: Any) -> Any:
+        # strategies.rules 컬럼은 JSON 문자열로 저장되므로 응답을 만들 때 파싱합니다. (ORM 속성은 바꾸지 않음)
+        if isinstance(value, (str, bytes)):
+            return json.loads(value)
+        return value
+
 
 # --- API Key Schemas (Dependency for LiveBot) ---
 # 👈 순서 변경: LiveBot 위에 배치하여 참조 문제 해결
@@ -190,6 +232,10 @@ class TradeLogEntry(BaseModel):
     commission: Optional[float] = None
     pnl: Optional[float] = None
     current_balance: Optional[float] = None
+    mae_pct: Optional[float] = None
+    mfe_pct: Optional[float] = None
+    bars_held: Optional[int] = None
+    exit_reason: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -199,17 +245,89 @@ class BacktestResultSummary(BaseModel):
     sharpe_ratio: Optional[float] = None
     win_rate_pct: Optional[float] = None
     pnl_curve_json: Optional[List[Dict[str, Any]]] = None # 👈 Dict 대신 List[Dict]로 수정
+    rolling_metrics_json: Optional[Dict[str, Any]] = None
+    regime_report_json: Optional[Dict[str, Any]] = None
     trade_summary_json: Optional[Dict[str, Any]] = None
+    benchmark_return_pct: Optional[float] = None
+    alpha_pct: Optional[float] = None
+    beta: Optional[float] = None
+    information_ratio: Optional[float] = None
+    correlation: Optional[float] = None
+    benchmark_curve_json: Optional[List[Dict[str, Any]]] = None
+    fingerprint_json: Optional[Dict[str, Any]] = None
     executed_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+class BacktestPreviewRequest(BaseModel):
+    strategy_id: int
+    ticker: str = Field(..., description="Trading pair ticker, e.g., 'BTC/USDT'")
+    rules: Optional[Dict[Literal["buy", "sell"], List[SignalBlockData]]] = Field(
+        None, description="Unsaved rules to preview instead of the stored strategy rules"
+    )
+    max_bars: int = Field(5000, ge=100, le=5000, description="Number of most recent execution-timeframe bars to simulate")
+    initial_capital: float = Field(10000.0, ge=1.0, description="Initial capital for backtest")
+    additional_parameters: Dict[str, Any] = Field(default_factory=dict)
+
+class BacktestPreview(BaseModel): # 👈 DB에 저장되지 않는 근사 미리보기 결과
+    is_approximate: bool = True
+    timeframe: str
+    bars_used: int
+    period_start: datetime
+    period_end: datetime
+    total_return_pct: float
+    mdd_pct: float
+    sharpe_ratio: float
+    win_rate_pct: float
+    total_trades: int
+    pnl_curve_json: List[Dict[str, Any]] = Field(default_factory=list)
+    benchmark_return_pct: Optional[float] = None
+    alpha_pct: Optional[float] = None
+    information_ratio: Optional[float] = None
+    elapsed_ms: float
+
+class BacktestReplay(BaseModel): # 👈 저장된 재생 산출물에서 그대로 읽은 결과 (엔진 재계산 없음)
+    backtest_id: int
+    fingerprint: Dict[str, Any]
+    bars: int
+    equity_curve: List[Dict[str, Any]]
+    signal_counts: Optional[Dict[str, int]] = None
+    trades: List[TradeLogEntry]
+
+class StressTestRequest(BaseModel):
+    strategy_id: int
+    ticker: str = Field(..., description="Trading pair ticker, e.g., 'BTC/USDT'")
+    rules: Optional[Dict[Literal["buy", "sell"], List[SignalBlockData]]] = Field(
+        None, description="Unsaved rules to test instead of the stored strategy rules"
+    )
+    windows: Optional[List[str]] = Field(None, description="Stress window keys to run (default: all curated windows)")
+    initial_capital: float = Field(10000.0, ge=1.0, description="Initial capital for each window")
+    additional_parameters: Dict[str, Any] = Field(default_factory=dict)
+
+class StressWindowResult(BaseModel):
+    window: str
+    label: str
+    start: datetime
+    end: datetime
+    status: Literal["ok", "no_data"]
+    bars: Optional[int] = None
+    total_return_pct: Optional[float] = None
+    mdd_pct: Optional[float] = None
+    benchmark_return_pct: Optional[float] = None
+    total_trades: Optional[int] = None
+
+class StressTestReport(BaseModel): # 👈 DB에 저장되지 않는 스트레스 구간 요약 표
+    timeframe: str
+    results: List[StressWindowResult]
+    elapsed_ms: float
+
 class Backtest(BaseModel):
     id: int
     user_id: int
     strategy_id: int
     status: str
     parameters: Dict[str, Any]
+    data_version: Optional[str] = None # 실행에 고정된 시세 스냅샷 버전 (additional_parameters.data_version으로 재사용 가능)
     created_at: datetime
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -236,6 +354,7 @@ class LiveBot(BaseModel):
     user_id: int
     strategy_id: int
     api_key_id: int
+    ticker: Optional[str] = None
     status: str
     started_at: datetime
     stopped_at: Optional[datetime] = None
@@ -353,4 +472,20 @@ class UserDashboardSummary(BaseModel):
     latest_backtests: List[Backtest] = Field(default_factory=list)
     latest_live_bots: List[LiveBot] = Field(default_factory=list)
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+# --- Market Data Schemas ---
+class MarketCandles(BaseModel): # 👈 차트용 시세 (LTTB 다운샘플링, 열 단위 배열)
+    exchange: str
+    symbol: str
+    timeframe: str
+    source_timeframe: str = Field(..., description="Timeframe actually loaded (coarser than requested for very long ranges)")
+    start: datetime
+    end: datetime
+    total_bars: int
+    downsampled: bool
+    time: List[int] = Field(default_factory=list, description="Bar open times in epoch milliseconds")
+    open: List[float] = Field(default_factory=list)
+    high: List[float] = Field(default_factory=list)
+    low: List[float] = Field(default_factory=list)
+    close: List[float] = Field(default_factory=list)
+    volume: List[float] = Field(default_factory=list)
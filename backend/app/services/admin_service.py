@@ -6,6 +6,9 @@ import logging
 from typing import List, Optional, Dict, Any
 
 from .. import models, schemas
+from ..engine.warm_pool import read_worker_cache_stats
+from ..engine.data import to_epoch_ms
+from ..tasks import backfill_candles_task
 
 logger = logging.getLogger(__name__)
 
@@ -164,5 +167,26 @@ class AdminService:
         logger.info(f"Admin fetched {len(live_bots)} live bot records (all users).")
         return live_bots
 
+    def get_backtest_worker_cache_stats(self) -> List[schemas.BacktestWorkerCacheStats]:
+        """
+        각 백테스트 워커 프로세스가 Redis에 기록한 캐시 적중률(시계열 / 컴파일된 전략 / 규칙 서브트리)을 조회합니다.
+        """
+        stats = [schemas.BacktestWorkerCacheStats.model_validate(entry) for entry in read_worker_cache_stats()]
+        logger.info(f"Admin fetched cache stats for {len(stats)} backtest worker process(es).")
+        return stats
+
+    def enqueue_candle_backfill(self, request: schemas.MarketDataBackfillRequest) -> schemas.MarketDataBackfillQueued:
+        """
+        과거 시세 백필 태스크를 Celery 큐에 등록합니다. 결측 탐지/요청 계획/적재는 워커에서 수행됩니다.
+        """
+        if request.start_date >= request.end_date:
+            raise ValueError("start_date must be before end_date.")
+        task = backfill_candles_task.delay(
+            request.exchange, request.symbol, request.timeframe,
+            to_epoch_ms(request.start_date), to_epoch_ms(request.end_date),
+        )
+        logger.info(f"Queued candle backfill {request.exchange}:{request.symbol} {request.timeframe} as task {task.id}.")
+        return schemas.MarketDataBackfillQueued(task_id=task.id, **request.model_dump())
+
 # 서비스 인스턴스 생성
 admin_service = AdminService()
\ No newline at end of file
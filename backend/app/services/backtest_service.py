@@ -4,16 +4,47 @@ from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
 from typing import List, Dict, Any, Optional, Literal
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import math
+import os
+import threading
+import time
 
 from .. import models, schemas
 from ..services.plan_service import plan_service
 from ..services.strategy_service import strategy_service # 👈 전략 서비스 임포트
 from ..celery_app import celery_app # 👈 Celery 앱 인스턴스 임포트
-from ..tasks import run_backtest_task # 👈 Celery 태스크 임포트
+from ..tasks import prefetch_market_data_task, run_backtest_task # 👈 Celery 태스크 임포트
+from ..engine.backtester import DEFAULT_EXCHANGE, DEFAULT_TIMEFRAME, BacktestSpec, run_compiled
+from ..engine.compiler import CompiledStrategy, StrategyCompileError, compile_strategy
+from ..engine.data import OHLCV, TIMEFRAME_ORDER, InvalidMarketError, MarketDataUnavailableError, recent_bars_cache, timeframe_ms
+from ..engine.evaluator import MarketFrame
+from ..engine.simulator import SimulationConfig
+from ..engine.replay import load_replay
+from ..engine.stress import run_stress_pack
+from ..engine.warm_pool import WARM_QUEUE, is_hot_series
+from ..engine.prefetch import PREFETCH_ENABLED, PREFETCH_EXPIRES_S, PREFETCH_QUEUE, build_prefetch_hint
 import logging
 
 logger = logging.getLogger(__name__)
 
+# --- 미리보기(preview) 백테스트 설정 ---
+# 미리보기는 Celery를 거치지 않고 API 프로세스의 전용 스레드 풀에서 동기적으로 실행됩니다.
+PREVIEW_LATENCY_BUDGET_S = float(os.getenv("BACKTEST_PREVIEW_BUDGET_MS", "200")) / 1000.0 # 엔진 계산 단계의 지연 허용 시간
+PREVIEW_LOAD_TIMEOUT_S = float(os.getenv("BACKTEST_PREVIEW_LOAD_TIMEOUT_MS", "10000")) / 1000.0 # 시세 로드 단계 (캐시 미스 시 거래소 조회)
+PREVIEW_MAX_WINDOW_BARS = int(os.getenv("BACKTEST_PREVIEW_MAX_WINDOW_BARS", "20000")) # 워밍업 포함 최대 로드 봉 수
+preview_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BACKTEST_PREVIEW_WORKERS", "4")),
+    thread_name_prefix="backtest-preview",
+)
+# 스트레스 테스트는 구간별 시세 로드가 길 수 있으므로 미리보기와 스레드 풀을 나누고 전체 실행 시간을 제한합니다.
+STRESS_TIMEOUT_S = float(os.getenv("BACKTEST_STRESS_TIMEOUT_S", "60"))
+stress_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BACKTEST_STRESS_WORKERS", "2")),
+    thread_name_prefix="backtest-stress",
+)
+
 class BacktestService:
     """
     백테스팅 작업의 생성, 조회, 상태 관리 및 취소를 담당하는 서비스.
@@ -60,10 +91,16 @@ class BacktestService:
             
         try:
             # schemas.StrategyCreate는 규칙 자체를 Dict 형태로 받으므로, 그대로 전달
-            self.strategy_service.verify_strategy_rules_against_plan(user, strategy.rules, db) # 👈 public 함수 호출
+            self.strategy_service.verify_strategy_rules_against_plan(user, self.strategy_service.parse_stored_rules(strategy.rules), db) # 👈 public 함수 호출
+            compiled = compile_strategy(strategy.rules) # 엔진에서 실행 가능한 규칙인지 확인 (선로딩 힌트/웜 큐 선택에도 사용)
+            BacktestSpec.from_parameters(backtest_create.model_dump(mode='json', exclude_unset=True), compiled) # 엔진 파라미터 범위 확인 (limit_ttl_bars 등)
 
         except HTTPException as e: # 전략 서비스에서 발생한 HTTPException (타임프레임 제한 등)
             raise HTTPException(status_code=e.status_code, detail=f"전략 규칙 유효성 검사 실패: {e.detail}")
+        except StrategyCompileError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"전략 규칙을 해석할 수 없습니다: {e}")
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"백테스트 파라미터가 올바르지 않습니다: {e}")
         except Exception as e:
             logger.error(f"Unexpected error during strategy rule validation for user {user.email}: {e}", exc_info=True)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="전략 규칙 유효성 검사 중 오류가 발생했습니다.")
@@ -81,11 +118,20 @@ class BacktestService:
         db.refresh(db_backtest)
         logger.info(f"Backtest record created for user {user.email}, Strategy ID: {db_backtest.strategy_id} (Backtest ID: {db_backtest.id}).")
 
-        # 4. Celery 태스크 전송
+        # 4. 시세 선로딩 힌트 전송 (백테스트 태스크보다 먼저 보내 유휴 워커가 큐 대기 중에 데이터를 읽어 두도록 함)
+        self._publish_prefetch_hint(db_backtest, compiled)
+
+        # 5. Celery 태스크 전송
         try:
             # run_backtest_task.delay()는 Celery 큐에 작업을 비동기로 추가합니다.
             # db_backtest.id는 모델의 PK (integer)이므로, Celery task ID로 사용하기 위해 문자열로 변환
-            task_result = run_backtest_task.delay(db_backtest.id) # 👈 Celery 태스크 전송
+            # 인기 시계열을 미리 로드해 둔 웜 워커 큐로 보내면 데이터 로드 단계를 건너뛸 수 있습니다.
+            extra = backtest_create.additional_parameters
+            timeframe = extra.get("timeframe") or compiled.lowest_timeframe() or DEFAULT_TIMEFRAME
+            if is_hot_series(extra.get("exchange", DEFAULT_EXCHANGE), backtest_create.ticker, timeframe):
+                task_result = run_backtest_task.apply_async(args=[db_backtest.id], queue=WARM_QUEUE) # 👈 웜 워커로 전송
+            else:
+                task_result = run_backtest_task.delay(db_backtest.id) # 👈 Celery 태스크 전송
             # TODO: Backtest 모델에 celery_task_id 필드를 추가하여 task_result.id를 저장하는 것이 좋습니다.
             logger.info(f"Celery task dispatched for Backtest ID: {db_backtest.id}. Celery Task ID: {task_result.id}")
             # db_backtest.celery_task_id = task_result.id # 모델 필드가 있다면 여기에 저장
@@ -98,6 +144,233 @@ class BacktestService:
 
         return db_backtest
 
+    def _publish_prefetch_hint(self, backtest: models.Backtest, compiled: CompiledStrategy) -> None:
+        """선로딩 힌트를 보냅니다. 스냅샷을 지정한 재실행은 봉이 이미 스냅샷에 있으므로 보내지 않습니다. 실패해도 등록은 계속합니다."""
+        if not PREFETCH_ENABLED:
+            return
+        try:
+            spec = BacktestSpec.from_parameters(backtest.parameters, compiled)
+            if spec.data_version:
+                return
+            options = {"expires": PREFETCH_EXPIRES_S}
+            if PREFETCH_QUEUE:
+                options["queue"] = PREFETCH_QUEUE
+            prefetch_market_data_task.apply_async(args=[build_prefetch_hint(spec, compiled).to_dict()], **options)
+        except Exception as e:
+            logger.warning(f"Failed to publish prefetch hint for Backtest ID {backtest.id}: {e}")
+
+    def prepare_preview(
+        self,
+        db: Session,
+        user: models.User,
+        preview_request: schemas.BacktestPreviewRequest
+    ) -> CompiledStrategy:
+        """
+        미리보기 요청의 전략 소유권과 플랜 제한을 확인하고 규칙을 컴파일합니다.
+        미리보기는 DB에 기록을 남기지 않으므로 일일 백테스트 횟수에 포함하지 않습니다.
+        """
+        return self._compile_for_user(
+            db, user, preview_request.strategy_id, preview_request.rules, preview_request.additional_parameters
+        )
+
+    def prepare_stress_test(
+        self,
+        db: Session,
+        user: models.User,
+        stress_request: schemas.StressTestRequest
+    ) -> CompiledStrategy:
+        """스트레스 테스트 요청의 전략 소유권과 플랜 제한을 확인하고 규칙을 컴파일합니다. 일일 백테스트 횟수에는 포함하지 않습니다."""
+        return self._compile_for_user(
+            db, user, stress_request.strategy_id, stress_request.rules, stress_request.additional_parameters
+        )
+
+    def _compile_for_user(
+        self,
+        db: Session,
+        user: models.User,
+        strategy_id: int,
+        rules_override: Optional[Dict[str, Any]],
+        additional_parameters: Dict[str, Any]
+    ) -> CompiledStrategy:
+        """동기 실행 경로(미리보기/스트레스 테스트) 공통: 전략 소유권, 플랜 규칙/타임프레임 제한을 확인하고 규칙을 컴파일합니다."""
+        strategy = self.strategy_service.get_strategy_by_id(db, strategy_id)
+        if not strategy:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="선택한 전략을 찾을 수 없습니다.")
+        if strategy.author_id != user.id:
+            logger.warning(f"User {user.email} (ID: {user.id}) attempted to run strategy {strategy.id} not owned by them.")
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="이 전략을 사용할 권한이 없습니다.")
+
+        rules = rules_override if rules_override is not None else self.strategy_service.parse_stored_rules(strategy.rules)
+        try:
+            self.strategy_service.verify_strategy_rules_against_plan(user, rules, db)
+        except HTTPException as e:
+            raise HTTPException(status_code=e.status_code, detail=f"전략 규칙 유효성 검사 실패: {e.detail}")
+
+        try:
+            compiled = compile_strategy(rules)
+        except StrategyCompileError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"전략 규칙을 해석할 수 없습니다: {e}")
+
+        timeframe = additional_parameters.get("timeframe")
+        if timeframe is not None and timeframe not in self.plan_service.get_user_allowed_timeframes(user, db):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"선택한 타임프레임 '{timeframe}'은 현재 플랜에서 지원되지 않습니다. 플랜을 업그레이드해주세요."
+            )
+        return compiled
+
+    @staticmethod
+    def _preview_timeframe(compiled: CompiledStrategy, extra: Dict[str, Any]) -> str:
+        timeframe = extra.get("timeframe") or compiled.lowest_timeframe() or DEFAULT_TIMEFRAME
+        if timeframe not in TIMEFRAME_ORDER:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"지원하지 않는 타임프레임입니다: {timeframe}")
+        return timeframe
+
+    def _load_preview_bars(
+        self,
+        compiled: CompiledStrategy,
+        preview_request: schemas.BacktestPreviewRequest,
+        timeframe: str
+    ) -> OHLCV:
+        """최근 max_bars개 봉(+지표 워밍업)을 최근 봉 캐시에서 가져옵니다. 캐시 미스면 거래소까지 조회합니다."""
+        warmup_bars = math.ceil(compiled.warmup_ms / timeframe_ms(timeframe))
+        window = min(preview_request.max_bars + warmup_bars, PREVIEW_MAX_WINDOW_BARS)
+        exchange = preview_request.additional_parameters.get("exchange", DEFAULT_EXCHANGE)
+        return recent_bars_cache.get(exchange, preview_request.ticker, timeframe, window)
+
+    def _simulate_preview(
+        self,
+        compiled: CompiledStrategy,
+        preview_request: schemas.BacktestPreviewRequest,
+        timeframe: str,
+        bars: OHLCV
+    ) -> schemas.BacktestPreview:
+        """로드된 봉으로 엔진을 실행합니다. preview_executor 스레드에서 호출됩니다."""
+        started = time.perf_counter()
+        extra = preview_request.additional_parameters
+        exchange = extra.get("exchange", DEFAULT_EXCHANGE)
+        start_index = max(0, len(bars) - preview_request.max_bars)
+
+        market = MarketFrame(f"preview:{exchange}:{preview_request.ticker}:{timeframe}:{int(bars.ts[-1])}:{len(bars)}", timeframe, bars)
+        simulation = SimulationConfig(
+            initial_capital=preview_request.initial_capital,
+            commission_rate=float(extra.get("commission_rate", SimulationConfig.commission_rate)),
+            slippage_rate=float(extra.get("slippage_rate", SimulationConfig.slippage_rate)),
+        )
+        run = run_compiled(compiled, market, simulation, start_index)
+        summary = run.summary
+        return schemas.BacktestPreview(
+            timeframe=timeframe,
+            bars_used=len(bars) - start_index,
+            period_start=datetime.fromtimestamp(int(bars.ts[start_index]) / 1000, tz=timezone.utc),
+            period_end=datetime.fromtimestamp(int(bars.ts[-1]) / 1000, tz=timezone.utc),
+            total_return_pct=summary["total_return_pct"],
+            mdd_pct=summary["mdd_pct"],
+            sharpe_ratio=summary["sharpe_ratio"],
+            win_rate_pct=summary["win_rate_pct"],
+            total_trades=summary["trade_summary_json"]["total_trades"],
+            pnl_curve_json=summary["pnl_curve_json"],
+            benchmark_return_pct=summary["benchmark_return_pct"],
+            alpha_pct=summary["alpha_pct"],
+            information_ratio=summary["information_ratio"],
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
+    async def run_preview(
+        self,
+        compiled: CompiledStrategy,
+        preview_request: schemas.BacktestPreviewRequest
+    ) -> schemas.BacktestPreview:
+        """
+        미리보기를 시세 로드와 엔진 계산 두 단계로 실행합니다.
+        지연 허용 시간(PREVIEW_LATENCY_BUDGET_S)은 계산 단계에만 적용하고, 로드 단계는 PREVIEW_LOAD_TIMEOUT_S까지 기다립니다.
+        로드 시간을 초과하면 504를 반환하지만 로드 스레드는 계속 실행되어 최근 봉 캐시를 채우므로 재시도는 빠르게 응답합니다.
+        """
+        loop = asyncio.get_running_loop()
+        timeframe = self._preview_timeframe(compiled, preview_request.additional_parameters)
+        try:
+            bars = await asyncio.wait_for(
+                loop.run_in_executor(preview_executor, self._load_preview_bars, compiled, preview_request, timeframe),
+                timeout=PREVIEW_LOAD_TIMEOUT_S,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Loading preview bars for {preview_request.ticker} {timeframe} exceeded {PREVIEW_LOAD_TIMEOUT_S:.0f}s.")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="미리보기에 필요한 시세 데이터를 불러오는 중입니다. 잠시 후 다시 시도해주세요."
+            )
+        except InvalidMarketError as e:
+            logger.warning(f"Exchange rejected backtest preview market: {e}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"거래소에서 '{preview_request.ticker}' 시세를 조회할 수 없습니다.")
+        except MarketDataUnavailableError as e:
+            logger.warning(f"Market data unavailable for backtest preview: {e}")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="미리보기에 필요한 시세 데이터를 불러올 수 없습니다.")
+
+        future = loop.run_in_executor(preview_executor, self._simulate_preview, compiled, preview_request, timeframe, bars)
+        try:
+            return await asyncio.wait_for(future, timeout=PREVIEW_LATENCY_BUDGET_S)
+        except asyncio.TimeoutError:
+            logger.warning(f"Backtest preview for {preview_request.ticker} exceeded latency budget ({PREVIEW_LATENCY_BUDGET_S * 1000:.0f}ms).")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="미리보기 계산이 허용 시간을 초과했습니다. 잠시 후 다시 시도하거나 전체 백테스트를 실행해주세요."
+            )
+
+    def _run_stress_test(
+        self,
+        compiled: CompiledStrategy,
+        stress_request: schemas.StressTestRequest,
+        cancel: Optional[threading.Event] = None
+    ) -> schemas.StressTestReport:
+        started = time.perf_counter()
+        extra = stress_request.additional_parameters
+        timeframe = extra.get("timeframe") or compiled.lowest_timeframe() or DEFAULT_TIMEFRAME
+        if timeframe not in TIMEFRAME_ORDER:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"지원하지 않는 타임프레임입니다: {timeframe}")
+        simulation = SimulationConfig(
+            initial_capital=stress_request.initial_capital,
+            commission_rate=float(extra.get("commission_rate", SimulationConfig.commission_rate)),
+            slippage_rate=float(extra.get("slippage_rate", SimulationConfig.slippage_rate)),
+        )
+        try:
+            rows = run_stress_pack(
+                compiled, extra.get("exchange", DEFAULT_EXCHANGE), stress_request.ticker, timeframe,
+                simulation, stress_request.windows, cancel=cancel,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except InvalidMarketError as e:
+            logger.warning(f"Exchange rejected stress test market: {e}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"거래소에서 '{stress_request.ticker}' 시세를 조회할 수 없습니다.")
+        return schemas.StressTestReport(
+            timeframe=timeframe,
+            results=[schemas.StressWindowResult(**row) for row in rows],
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
+    async def run_stress_test(
+        self,
+        compiled: CompiledStrategy,
+        stress_request: schemas.StressTestRequest
+    ) -> schemas.StressTestReport:
+        """
+        스트레스 구간 묶음을 전용 스레드 풀(stress_executor)에서 한 번의 엔진 호출로 실행합니다.
+        구간 시세는 첫 요청 때 한 번 로드되어 프로세스 메모리에 남으므로 이후 요청은 데이터 로드 없이 실행됩니다.
+        STRESS_TIMEOUT_S를 넘기면 504를 반환하고, 실행 중인 스레드는 진행 중인 구간까지만 마치고 멈춥니다.
+        """
+        loop = asyncio.get_running_loop()
+        cancel = threading.Event()
+        future = loop.run_in_executor(stress_executor, self._run_stress_test, compiled, stress_request, cancel)
+        try:
+            return await asyncio.wait_for(future, timeout=STRESS_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            cancel.set()
+            logger.warning(f"Stress test for {stress_request.ticker} exceeded {STRESS_TIMEOUT_S:.0f}s.")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="스트레스 테스트에 필요한 시세를 불러오는 데 시간이 오래 걸리고 있습니다. 잠시 후 다시 시도해주세요."
+            )
+
     def get_backtests(
         self,
         db: Session,
@@ -149,6 +422,14 @@ class BacktestService:
         logger.info(f"Fetched {len(trade_logs)} trade logs for Backtest ID: {backtest_id}.")
         return trade_logs
 
+    def get_replay(self, backtest: models.Backtest, max_points: int) -> schemas.BacktestReplay:
+        """저장된 재생 산출물에서 곡선과 거래를 그대로 읽어 반환합니다 (엔진 재계산 없음)."""
+        result = backtest.result
+        if result is None or not result.replay_artifact:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="이 백테스트의 재생 데이터가 없습니다.")
+        replay = load_replay(result.replay_artifact, max_points)
+        return schemas.BacktestReplay(backtest_id=backtest.id, **replay)
+
     def cancel_backtest_job(self, db: Session, backtest_id: int, user_id: int) -> bool:
         """
         진행 중인 백테스팅 작업을 취소합니다.
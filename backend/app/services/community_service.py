@@ -60,7 +60,7 @@ class CommunityService:
         skip: int = 0,
         limit: int = 100,
         search_query: Optional[str] = None,
-        sort_by: Optional[str] = None, # 'created_at_desc', 'likes_count_desc'
+        sort_by: Optional[str] = None, # 'created_at_desc', 'likes_count_desc', 'information_ratio_desc', 'alpha_desc'
         author_id: Optional[int] = None,
         current_user: Optional[models.User] = None, # 비인증 사용자도 조회 가능해야 하므로 Optional
         include_private: bool = False # 관리자용 또는 본인 비공개 조회용
@@ -106,6 +106,12 @@ class CommunityService:
         elif sort_by == "comments_count_desc":
             logger.warning("Sorting by comments_count_desc may be inefficient without pre-calculated field.")
             query = query.order_by(models.CommunityPost.comments.count().desc()) # ORM Count 사용
+        elif sort_by in ("information_ratio_desc", "alpha_desc"):
+            # 백테스트 저장 시 함께 계산된 벤치마크 대비 지표로 정렬 (재계산 없음). 결과가 없는 게시물은 뒤로 보냅니다.
+            metric = models.BacktestResult.information_ratio if sort_by == "information_ratio_desc" else models.BacktestResult.alpha_pct
+            query = query.outerjoin(
+                models.BacktestResult, models.BacktestResult.backtest_id == models.CommunityPost.backtest_id
+            ).order_by(metric.desc().nullslast(), models.CommunityPost.created_at.desc())
         else: # created_at_desc 기본 정렬
             query = query.order_by(models.CommunityPost.created_at.desc())
 
@@ -70,7 +70,7 @@ class LiveBotService:
             api_key_id=live_bot_create.api_key_id,
             status='initializing', # 초기화 중 상태
             initial_capital=live_bot_create.initial_capital,
-            # ticker 등 추가 필드가 있다면 여기에 추가
+            ticker=live_bot_create.ticker,
         )
         db.add(db_live_bot)
         db.flush() # ID를 얻기 위해
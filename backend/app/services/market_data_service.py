@@ -0,0 +1,94 @@
+# file: backend/app/services/market_data_service.py
+
+from typing import Optional, Tuple
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import logging
+import os
+
+from .. import schemas
+from ..engine.data import OHLCV, OHLCV_COLUMNS, TIMEFRAME_ORDER, load_ohlcv, timeframe_ms, to_epoch_ms
+from ..engine.downsample import encode_candles_binary, lttb_indices
+
+logger = logging.getLogger(__name__)
+
+# --- 차트 시세 조회 설정 ---
+# 요청 구간이 아주 길면 요청 타임프레임 그대로 로드하지 않고, 봉 수가 max_points * CHART_SOURCE_FACTOR 이하가 되는
+# 가장 작은 상위 타임프레임(연속 집계 뷰)을 읽은 뒤 LTTB로 줄입니다. 응답 크기와 로드량이 모두 구간 길이와 무관하게 제한됩니다.
+CHART_SOURCE_FACTOR = int(os.getenv("MARKET_CHART_SOURCE_FACTOR", "8"))
+CHART_MAX_POINTS = int(os.getenv("MARKET_CHART_MAX_POINTS", "5000"))
+chart_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("MARKET_CHART_WORKERS", "2")),
+    thread_name_prefix="market-chart",
+)
+
+
+class MarketDataService:
+    """
+    차트용 시세 조회. 엔진 데이터 소스(디스크 캐시 -> candles 저장소 -> 거래소)에서 봉을 읽고 서버에서 다운샘플링합니다.
+    """
+
+    def source_timeframe(self, timeframe: str, start_ms: int, end_ms: int, max_points: int) -> str:
+        limit = max_points * CHART_SOURCE_FACTOR
+        for candidate in TIMEFRAME_ORDER[TIMEFRAME_ORDER.index(timeframe):]:
+            if (end_ms - start_ms) // timeframe_ms(candidate) <= limit:
+                return candidate
+        return TIMEFRAME_ORDER[-1]
+
+    def _load_chart(
+        self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int, max_points: int
+    ) -> Tuple[str, int, OHLCV]:
+        """(실제 로드한 타임프레임, 전체 봉 수, 다운샘플링된 봉). chart_executor 스레드에서 호출됩니다."""
+        source_tf = self.source_timeframe(timeframe, start_ms, end_ms, max_points)
+        bars = load_ohlcv(exchange, symbol, source_tf, start_ms, end_ms)
+        idx = lttb_indices(bars.ts, bars.close, max_points)
+        if idx.shape[0] == len(bars):
+            return source_tf, len(bars), bars
+        return source_tf, len(bars), OHLCV(*(getattr(bars, name)[idx] for name in ("ts",) + OHLCV_COLUMNS))
+
+    async def get_candles(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        max_points: int,
+    ) -> Tuple[schemas.MarketCandles, OHLCV]:
+        """
+        구간 [start, end)의 봉을 최대 max_points개로 줄여 반환합니다. start가 없으면 end 이전 max_points개 봉 구간입니다.
+        잘못된 구간/타임프레임은 ValueError, 데이터가 없으면 MarketDataUnavailableError를 그대로 전달합니다.
+        """
+        if timeframe not in TIMEFRAME_ORDER:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        max_points = min(max_points, CHART_MAX_POINTS)
+        end_ms = to_epoch_ms(end) if end else to_epoch_ms(datetime.now(timezone.utc))
+        start_ms = to_epoch_ms(start) if start else end_ms - max_points * timeframe_ms(timeframe)
+        if start_ms >= end_ms:
+            raise ValueError("start must be before end.")
+
+        loop = asyncio.get_running_loop()
+        source_tf, total, bars = await loop.run_in_executor(
+            chart_executor, self._load_chart, exchange, symbol, timeframe, start_ms, end_ms, max_points
+        )
+        to_datetime = lambda ms: datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+        meta = schemas.MarketCandles(
+            exchange=exchange, symbol=symbol, timeframe=timeframe, source_timeframe=source_tf,
+            start=to_datetime(start_ms), end=to_datetime(end_ms),
+            total_bars=total, downsampled=len(bars) < total,
+        )
+        return meta, bars
+
+    def to_schema(self, meta: schemas.MarketCandles, bars: OHLCV) -> schemas.MarketCandles:
+        return meta.model_copy(update={
+            "time": bars.ts.tolist(),
+            **{name: bars.column(name).tolist() for name in OHLCV_COLUMNS},
+        })
+
+    def to_binary(self, bars: OHLCV) -> bytes:
+        return encode_candles_binary(bars)
+
+
+# 서비스 인스턴스 생성
+market_data_service = MarketDataService()
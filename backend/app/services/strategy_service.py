@@ -8,6 +8,7 @@ from typing import List, Dict, Any, Optional, Literal
 
 from .. import models, schemas
 from .plan_service import plan_service
+from ..engine.compiler import compile_strategy, changed_subtrees, StrategyCompileError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,33 @@ class StrategyService:
                         pass
         return loaded_rules
 
+    def parse_stored_rules(self, rules: Any) -> Dict[Literal["buy", "sell"], List[schemas.SignalBlockData]]:
+        """
+        strategies.rules 컬럼 값(JSON 문자열 또는 dict)을 SignalBlockData 목록으로 변환합니다.
+        ORM 속성에 다시 대입하면 커밋 시 원본 규칙이 덮어써지므로, 반환값만 사용합니다.
+        """
+        if isinstance(rules, (str, bytes)):
+            rules = json.loads(rules)
+        if not isinstance(rules, dict):
+            return {"buy": [], "sell": []}
+        return self._load_rules_from_json_data(rules)
+
+    def _log_rule_tree_changes(self, db_strategy: models.Strategy, new_rules: Dict[str, Any]) -> None:
+        """
+        수정 전후 규칙 트리를 컴파일하여 실행 가능 여부를 검증하고, 바뀐 서브트리 수를 기록합니다.
+        백테스트 워커의 캐시는 서브트리 해시를 key로 사용하므로, 여기서 바뀐 서브트리만 재실행 시 다시 계산됩니다.
+        """
+        try:
+            current = compile_strategy(new_rules)
+        except StrategyCompileError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"전략 규칙을 해석할 수 없습니다: {e}")
+        try:
+            previous = compile_strategy(db_strategy.rules)
+        except StrategyCompileError:
+            return
+        changed = changed_subtrees(previous, current)
+        total = sum(1 for _ in current.iter_nodes())
+        logger.info(f"Strategy {db_strategy.id} rule tree updated: {len(changed)} of {total} subtree(s) changed.")
 
     def verify_strategy_rules_against_plan(
         self,
@@ -105,11 +133,6 @@ class StrategyService:
         db.flush()
         db.refresh(db_strategy)
 
-        if db_strategy.rules and isinstance(db_strategy.rules, dict):
-            db_strategy.rules = self._load_rules_from_json_data(db_strategy.rules)
-        else:
-            db_strategy.rules = {"buy": [], "sell": []}
-            
         logger.info(f"User {user.email} (ID: {user.id}) created new strategy: {db_strategy.name} (ID: {db_strategy.id}).")
         return db_strategy
 
@@ -151,12 +174,6 @@ class StrategyService:
             query = query.order_by(models.Strategy.created_at.desc())
 
         strategies = query.offset(skip).limit(limit).all()
-        
-        for strategy in strategies:
-            if strategy.rules and isinstance(strategy.rules, dict):
-                strategy.rules = self._load_rules_from_json_data(strategy.rules)
-            else:
-                strategy.rules = {"buy": [], "sell": []}
 
         logger.info(f"User ID {user_id} fetched {len(strategies)} strategies.")
         return strategies
@@ -165,12 +182,7 @@ class StrategyService:
         strategy = db.query(models.Strategy).options(
             joinedload(models.Strategy.author)
         ).filter(models.Strategy.id == strategy_id).first()
-
-        if strategy and strategy.rules and isinstance(strategy.rules, dict):
-            strategy.rules = self._load_rules_from_json_data(strategy.rules)
-        elif strategy:
-            strategy.rules = {"buy": [], "sell": []}
-            
+        # rules는 저장된 JSON 문자열 그대로 둡니다. 응답 변환은 schemas.Strategy가 담당합니다.
         return strategy
 
     def update_strategy(
@@ -191,7 +203,7 @@ class StrategyService:
 
         if "rules" in update_data and update_data["rules"]:
             try:
-                self.verify_strategy_rules_against_plan(user, update_data["rules"], db)
+                self.verify_strategy_rules_against_plan(user, strategy_update.rules, db)
             except HTTPException as e:
                 logger.error(f"Strategy rule validation failed during update for user {user.email}: {e.detail}")
                 raise
@@ -200,9 +212,10 @@ class StrategyService:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="전략 규칙 유효성 검사 중 예상치 못한 오류가 발생했습니다.")
             
             serialized_rules = {
-                "buy": [rule.model_dump(mode='json') for rule in update_data["rules"].get("buy", [])],
-                "sell": [rule.model_dump(mode='json') for rule in update_data["rules"].get("sell", [])]
+                "buy": [rule.model_dump(mode='json') for rule in strategy_update.rules.get("buy", [])],
+                "sell": [rule.model_dump(mode='json') for rule in strategy_update.rules.get("sell", [])]
             }
+            self._log_rule_tree_changes(db_strategy, serialized_rules)
             db_strategy.rules = json.dumps(serialized_rules)
 
         if "name" in update_data and update_data["name"]:
@@ -216,11 +229,6 @@ class StrategyService:
         db.commit()
         db.refresh(db_strategy)
 
-        if db_strategy.rules and isinstance(db_strategy.rules, dict):
-            db_strategy.rules = self._load_rules_from_json_data(db_strategy.rules)
-        else:
-            db_strategy.rules = {"buy": [], "sell": []}
-            
         logger.info(f"User {user.email} (ID: {user.id}) updated strategy: {db_strategy.name} (ID: {db_strategy.id}).")
         return db_strategy
 
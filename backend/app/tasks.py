@@ -1,22 +1,103 @@
 # file: backend/app/tasks.py (UPDATED)
 
-from celery import Celery
+from celery import Celery, chord, group
+from celery.signals import worker_process_init, worker_ready
 from sqlalchemy.orm import Session
 # from fastapi import HTTPException # 👈 HTTPException은 라우터에서만 사용, 여기서는 불필요
 import logging
 from datetime import datetime, timezone
+import sys
 import time
 
-from .celery_app import celery_app # 👈 celery_app을 별도 파일에서 임포트
+from .celery_app import celery_app, BACKFILL_SCHEDULE, BACKFILL_LOOKBACK_MS # 👈 celery_app을 별도 파일에서 임포트
 # 👈 database 모듈에서 SessionLocal과 engine_celery를 모두 임포트
 from .database import SessionLocal, engine_celery 
 from . import models # 모델 임포트
 from .security import decrypt_data # 👈 API 키 복호화를 위해 임포트
+from .engine.backtester import BacktestSpec, run_backtest
+from .engine.compiler import StrategyCompileError
+from .engine.candle_store import CANDLE_STORE_ENABLED, CandleStore
+from .engine.data import MarketDataUnavailableError, get_data_source, set_data_source
+from .engine.disk_cache import DISK_CACHE_ENABLED, disk_candle_cache
+from .engine.validation import VALIDATION_ENABLED, validating
+from .engine.backfill import backfill
+from .engine.exchanges import get_exchange_client
+from .engine.replay import build_fingerprint, encode_artifact
+from .engine.snapshots import SNAPSHOTS_ENABLED, SnapshotStore, set_snapshot_store
+from .engine.prefetch import PrefetchHint, claim_hint, warm
+from .engine.candle_stream import BASE_TIMEFRAME
+from .engine.market_gateway import LeasedCandleSubscriber
+from .engine.streaming import run_streaming, should_stream
+from .engine.sharding import (
+    ShardSignals, compute_shard_signals, plan_shards, shard_warmup_ms, should_shard, stitch_shards, verify_sharded,
+)
+from .engine.warm_pool import WORKER_IS_WARM, plan_cache, warm_worker, publish_worker_cache_stats
 # TODO: 실제 트레이딩 클라이언트 (CCXT) 임포트 필요 (pip install ccxt)
 # import ccxt
 
 logger = logging.getLogger(__name__)
 
+
+# --- 시세 데이터 소스 ---
+# candles 하이퍼테이블을 먼저 조회하고, 비어 있는 구간만 거래소에서 가져와 적재합니다 (ENGINE_DATA_SOURCE=exchange이면 거래소 직접 조회).
+# 그 앞단의 워커 로컬 디스크 캐시(memmap)가 이미 받은 구간은 DB를 거치지 않고 읽습니다.
+candle_store = CandleStore(engine_celery.raw_connection)
+if VALIDATION_ENABLED:
+    # 거래소에서 받은 봉은 저장/사용 전에 검증하고, 격리된 봉은 저장소가 있으면 candle_quarantine에 기록
+    set_data_source(validating(get_data_source(), candle_store.quarantine if CANDLE_STORE_ENABLED else None))
+if CANDLE_STORE_ENABLED:
+    set_data_source(candle_store.read_through(get_data_source()))
+if DISK_CACHE_ENABLED:
+    set_data_source(disk_candle_cache.wrap(get_data_source()))
+
+# 백테스트는 처음 실행할 때 사용한 봉을 불변 스냅샷으로 고정하고 (Backtest.data_version) 재실행/구간 계산은 스냅샷을 읽습니다.
+snapshot_store = SnapshotStore(engine_celery.raw_connection)
+set_snapshot_store(snapshot_store)
+
+
+# --- 웜 백테스트 워커 초기화 ---
+# prefork 풀에서는 자식 프로세스마다 worker_process_init이 호출되므로 각 프로세스가 자신의 캐시를 채웁니다.
+# eventlet/gevent/solo 풀은 자식 프로세스가 없으므로 worker_ready 시점에 한 번만 채웁니다.
+_worker_warmed = False
+
+def _warm_backtest_worker() -> None:
+    global _worker_warmed
+    if not WORKER_IS_WARM or _worker_warmed:
+        return
+    _worker_warmed = True
+    try:
+        warm_worker(int(time.time() * 1000))
+    except Exception as e:
+        logger.error(f"Failed to warm backtest worker: {e}", exc_info=True)
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs):
+    _warm_backtest_worker()
+
+@worker_ready.connect
+def _on_worker_ready(**kwargs):
+    if any(pool in " ".join(sys.argv) for pool in ("eventlet", "gevent", "solo", "threads")):
+        _warm_backtest_worker()
+
+
+@celery_app.task(ignore_result=True)
+def prefetch_market_data_task(hint: dict):
+    """
+    백테스트 등록 시 보낸 선로딩 힌트를 처리합니다. 먼저 비는 워커가 구간을 데이터 소스 체인으로 읽어 두어
+    백테스트의 큐 대기 시간과 시세 I/O가 겹치도록 합니다. 같은 구간 힌트는 한 번만 처리합니다.
+    """
+    prefetch_hint = PrefetchHint.from_dict(hint)
+    if not claim_hint(prefetch_hint):
+        logger.info(f"Prefetch for {prefetch_hint.key} already handled; skipping.")
+        return None
+    try:
+        return warm(prefetch_hint)
+    except Exception as e:
+        # 선로딩은 최적화일 뿐이므로 실패해도 재시도하지 않음 (백테스트가 직접 로드)
+        logger.warning(f"Prefetch for {prefetch_hint.key} failed: {e}")
+        return None
+
+
 @celery_app.task(bind=True, default_retry_delay=300, max_retries=3)
 def run_backtest_task(self, backtest_id: int):
     """
@@ -45,39 +126,30 @@ def run_backtest_task(self, backtest_id: int):
         db.refresh(backtest)
         logger.info(f"Backtest ID {backtest_id} started. Status: running.")
 
-        # --- 실제 백테스팅 시뮬레이션 로직 (Placeholder) ---
-        simulation_successful = True 
+        # --- 백테스팅 엔진 실행 ---
+        # 규칙 서브트리별 중간 결과는 워커 프로세스의 subtree_cache에 남으므로,
+        # 전략 일부를 수정한 뒤 다시 실행하면 바뀐 서브트리만 새로 계산됩니다.
+        try:
+            compiled = plan_cache.get_or_compile(backtest.strategy.rules)
+            parameters = _pin_data_snapshot(db, backtest, compiled)
+            spec = BacktestSpec.from_parameters(parameters, compiled)
+            extra = parameters.get("additional_parameters") or {}
+            mode = extra.get("execution_mode", "auto")
+            if should_shard(compiled, spec, mode):
+                _dispatch_sharded_backtest(backtest, spec, parameters)
+                return # 결과 저장은 reduce 태스크에서 수행
+            if should_stream(spec, mode):
+                # 전체 이력을 메모리에 올리지 않고 청크 단위로 실행 (메모리 O(청크 + lookback))
+                run = run_streaming(compiled, spec)
+            else:
+                run = run_backtest(compiled, parameters)
+            simulation_successful = True
+        except (StrategyCompileError, MarketDataUnavailableError, ValueError) as e:
+            logger.error(f"Backtest ID {backtest_id} could not be simulated: {e}")
+            simulation_successful = False
         
         if simulation_successful:
-            result_summary_data = {
-                "total_return_pct": 15.5, "mdd_pct": 8.2, "sharpe_ratio": 1.2, "win_rate_pct": 60.0,
-                "pnl_curve_json": [{"time": "2023-01-01T00:00:00Z", "value": 10000}, {"time": "2023-12-31T00:00:00Z", "value": 11550}],
-                "trade_summary_json": {"total_trades": 100, "winning_trades": 60}
-            }
-            trade_logs_data = [
-                {"timestamp": "2023-01-15T10:00:00Z", "side": "buy", "price": 20000, "quantity": 0.5, "commission": 0.1, "pnl": 0.0, "current_balance": 10000},
-                {"timestamp": "2023-01-20T10:00:00Z", "side": "sell", "price": 21000, "quantity": 0.5, "commission": 0.1, "pnl": 500.0, "current_balance": 10500}
-            ]
-            
-            backtest_result = models.BacktestResult(
-                backtest_id=backtest.id, total_return_pct=result_summary_data["total_return_pct"],
-                mdd_pct=result_summary_data["mdd_pct"], sharpe_ratio=result_summary_data["sharpe_ratio"],
-                win_rate_pct=result_summary_data["win_rate_pct"], pnl_curve_json=result_summary_data["pnl_curve_json"],
-                trade_summary_json=result_summary_data["trade_summary_json"], executed_at=datetime.now(timezone.utc)
-            )
-            db.add(backtest_result)
-
-            for log_data in trade_logs_data:
-                trade_log = models.TradeLog(
-                    backtest_id=backtest.id, timestamp=datetime.fromisoformat(log_data["timestamp"]),
-                    side=log_data["side"], price=log_data["price"], quantity=log_data["quantity"],
-                    commission=log_data["commission"], pnl=log_data["pnl"], current_balance=log_data["current_balance"]
-                )
-                db.add(trade_log)
-
-            backtest.status = 'completed'
-            backtest.completed_at = datetime.now(timezone.utc)
-            logger.info(f"Backtest ID {backtest_id} completed successfully.")
+            _store_backtest_result(db, backtest, run)
         else:
             backtest.status = 'failed'
             backtest.completed_at = datetime.now(timezone.utc)
@@ -101,11 +173,265 @@ def run_backtest_task(self, backtest_id: int):
     finally:
         if db:
             db.close()
+        try:
+            publish_worker_cache_stats() # 워커별 캐시 적중률 기록 (관리자 API에서 조회)
+        except Exception as e:
+            logger.warning(f"Failed to publish backtest worker cache stats: {e}")
+
+
+def _run_parameters(backtest: models.Backtest) -> dict:
+    """엔진에 넘길 parameters. 고정된 스냅샷이 있으면 additional_parameters.data_version에 담습니다 (원본은 바꾸지 않음)."""
+    if not backtest.data_version:
+        return backtest.parameters
+    extra = dict(backtest.parameters.get("additional_parameters") or {})
+    extra["data_version"] = backtest.data_version
+    return {**backtest.parameters, "additional_parameters": extra}
+
+
+def _pin_data_snapshot(db: Session, backtest: models.Backtest, compiled) -> dict:
+    """
+    백테스트의 시세 스냅샷을 고정하고 실행용 parameters를 반환합니다.
+    이미 고정된 버전(재시도/재실행)이나 additional_parameters.data_version으로 지정한 버전은 그대로 사용하고,
+    없으면 워밍업/구간 겹침을 포함한 전체 구간으로 새 스냅샷을 만듭니다. 없는 버전을 지정하면 ValueError.
+    """
+    extra = backtest.parameters.get("additional_parameters") or {}
+    version = backtest.data_version or extra.get("data_version")
+    if version:
+        snapshot_store.pin(version)
+    elif SNAPSHOTS_ENABLED:
+        spec = BacktestSpec.from_parameters(backtest.parameters, compiled)
+        version = snapshot_store.create(
+            spec.exchange, spec.ticker, spec.timeframe, spec.start_ms - shard_warmup_ms(compiled), spec.end_ms, get_data_source(),
+        )
+    else:
+        return backtest.parameters
+    if backtest.data_version != version:
+        backtest.data_version = version
+        db.add(backtest)
+        db.commit()
+        db.refresh(backtest)
+    return _run_parameters(backtest)
+
+
+def _store_backtest_result(db: Session, backtest: models.Backtest, run) -> None:
+    """
+    엔진 실행 결과(BacktestRun)를 BacktestResult/TradeLog로 저장하고 상태를 completed로 바꿉니다. 커밋은 호출자가 합니다.
+    재현 지문을 계산해 같은 입력의 이전 실행과 비교하고, 재생 산출물(npz 바이트)을 함께 저장합니다.
+    """
+    result_summary_data = run.summary
+    trade_logs_data = run.trade_logs()
+    fingerprint = build_fingerprint(run, backtest.parameters)
+    fingerprint["data_version"] = backtest.data_version
+    fingerprint["verification"] = _verify_fingerprint(db, fingerprint)
+    artifact = encode_artifact(run, fingerprint)
+    logger.info(f"Replay artifact for Backtest ID {backtest.id}: {len(artifact)} bytes.")
+
+    backtest_result = models.BacktestResult(
+        backtest_id=backtest.id, total_return_pct=result_summary_data["total_return_pct"],
+        mdd_pct=result_summary_data["mdd_pct"], sharpe_ratio=result_summary_data["sharpe_ratio"],
+        win_rate_pct=result_summary_data["win_rate_pct"], pnl_curve_json=result_summary_data["pnl_curve_json"],
+        rolling_metrics_json=result_summary_data["rolling_metrics_json"], trade_summary_json=result_summary_data["trade_summary_json"],
+        regime_report_json=result_summary_data["regime_report_json"],
+        input_key=fingerprint["input_key"], fingerprint_json=fingerprint, replay_artifact=artifact,
+        benchmark_return_pct=result_summary_data["benchmark_return_pct"], alpha_pct=result_summary_data["alpha_pct"],
+        beta=result_summary_data["beta"], information_ratio=result_summary_data["information_ratio"],
+        correlation=result_summary_data["correlation"], benchmark_curve_json=result_summary_data["benchmark_curve_json"],
+        executed_at=datetime.now(timezone.utc)
+    )
+    db.add(backtest_result)
+
+    db.bulk_insert_mappings(models.TradeLog, [
+        {"backtest_id": backtest.id, **log_data} for log_data in trade_logs_data
+    ])
+
+    backtest.status = 'completed'
+    backtest.completed_at = datetime.now(timezone.utc)
+    logger.info(f"Backtest ID {backtest.id} completed successfully.")
+
+
+def _mark_backtest_failed(backtest_id: int) -> None:
+    db = SessionLocal(bind=engine_celery)
+    try:
+        backtest = db.query(models.Backtest).filter(models.Backtest.id == backtest_id).first()
+        if backtest and backtest.status not in ['completed', 'failed', 'canceled']:
+            backtest.status = 'failed'
+            backtest.completed_at = datetime.now(timezone.utc)
+            db.add(backtest)
+            db.commit()
+            logger.info(f"Backtest ID {backtest_id} marked as failed.")
+    finally:
+        db.close()
+
+
+# --- 시간 구간 분할 실행 ---
+# 긴 백테스트는 구간별 신호 계산(map)을 여러 워커에 나누고, 포지션 상태 머신과 지표는 reduce 태스크에서 이어 붙입니다.
+# additional_parameters.execution_mode: "auto"(기본, 봉 수 기준) | "sharded" | "streaming" | "single"
+# additional_parameters.verify_sharding=true 이면 reduce 단계에서 단일 워커 결과와 비교하여 trade_summary_json에 기록합니다.
+
+def _verify_fingerprint(db: Session, fingerprint: dict):
+    """같은 input_key로 이전에 완료된 실행이 있으면 결과 해시를 비교합니다. 다르면 엔진 회귀로 기록합니다."""
+    previous = db.query(models.BacktestResult).filter(
+        models.BacktestResult.input_key == fingerprint["input_key"]
+    ).order_by(models.BacktestResult.executed_at.desc()).first()
+    if previous is None or not previous.fingerprint_json:
+        return None
+    matches = previous.fingerprint_json.get("output_digest") == fingerprint["output_digest"]
+    check = {
+        "previous_backtest_id": previous.backtest_id,
+        "previous_engine_version": previous.fingerprint_json.get("engine_version"),
+        "matches": matches,
+    }
+    if not matches:
+        logger.error(
+            f"Replay mismatch for input {fingerprint['input_key'][:12]}: backtest {previous.backtest_id} "
+            f"(engine {check['previous_engine_version']}) produced different results than engine {fingerprint['engine_version']}."
+        )
+    return check
+
+
+def _dispatch_sharded_backtest(backtest: models.Backtest, spec: BacktestSpec, parameters: dict) -> None:
+    shards = plan_shards(spec)
+    header = group(
+        compute_backtest_shard_task.s(backtest.strategy.rules, parameters, start_ms, end_ms)
+        for start_ms, end_ms in shards
+    )
+    callback = reduce_sharded_backtest_task.s(backtest.id).on_error(fail_backtest_task.si(backtest.id))
+    chord(header)(callback)
+    logger.info(f"Backtest ID {backtest.id} split into {len(shards)} time shard(s).")
+
+
+@celery_app.task(bind=True)
+def compute_backtest_shard_task(self, rules, parameters: dict, start_ms: int, end_ms: int) -> dict:
+    """map 단계: 한 시간 구간의 진입/청산 신호를 계산하여 압축된 형태로 반환합니다."""
+    compiled = plan_cache.get_or_compile(rules)
+    spec = BacktestSpec.from_parameters(parameters, compiled)
+    return compute_shard_signals(compiled, spec, start_ms, end_ms).to_dict()
+
+
+@celery_app.task(bind=True)
+def reduce_sharded_backtest_task(self, shard_results: list, backtest_id: int):
+    """reduce 단계: 구간 신호를 이어 붙여 시뮬레이션/지표를 계산하고 결과를 저장합니다."""
+    db: Session = None
+    try:
+        db = SessionLocal(bind=engine_celery)
+        backtest = db.query(models.Backtest).filter(models.Backtest.id == backtest_id).first()
+        if not backtest:
+            logger.error(f"Backtest record with ID {backtest_id} not found for shard reduce.")
+            return
+        if backtest.status in ['completed', 'failed', 'canceled']:
+            logger.info(f"Backtest ID {backtest_id} already in final status ({backtest.status}). Skipping shard reduce.")
+            return
+
+        compiled = plan_cache.get_or_compile(backtest.strategy.rules)
+        spec = BacktestSpec.from_parameters(_run_parameters(backtest), compiled)
+        shards = [ShardSignals.from_dict(result) for result in shard_results]
+        run = stitch_shards(compiled, spec, shards)
+
+        extra = backtest.parameters.get("additional_parameters") or {}
+        if extra.get("verify_sharding"):
+            run.summary["trade_summary_json"]["sharding_check"] = verify_sharded(compiled, spec, shards)
+
+        _store_backtest_result(db, backtest, run)
+        db.add(backtest)
+        db.commit()
+    except Exception as exc:
+        logger.error(f"Backtest ID {backtest_id} failed during shard reduce: {exc}", exc_info=True)
+        if db:
+            db.rollback()
+        _mark_backtest_failed(backtest_id)
+    finally:
+        if db:
+            db.close()
+
+
+@celery_app.task
+def fail_backtest_task(backtest_id: int):
+    """구간 계산 중 하나라도 실패하면 chord 콜백 대신 호출되어 백테스트를 실패 처리합니다."""
+    logger.error(f"A time shard of backtest ID {backtest_id} failed.")
+    _mark_backtest_failed(backtest_id)
+
+
+# --- 데이터 수집 (과거 시세 백필) ---
+
+@celery_app.task(bind=True, default_retry_delay=60, max_retries=3)
+def backfill_candles_task(self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> dict:
+    """candles 저장소의 결측 구간을 찾아 거래소에서 가져와 적재합니다. 결과 요약(결측/요청/적재 봉 수)을 반환합니다."""
+    try:
+        return backfill(get_exchange_client(exchange), candle_store, symbol, timeframe, start_ms, end_ms, disk_candle_cache)
+    except MarketDataUnavailableError as e:
+        logger.error(f"Backfill {exchange}:{symbol} {timeframe} cannot run: {e}")
+        raise
+    except Exception as exc:
+        logger.error(f"Backfill {exchange}:{symbol} {timeframe} failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc)
+
+
+@celery_app.task
+def backfill_recent_candles_task():
+    """주기 수집: BACKFILL_SCHEDULE의 각 시리즈에 대해 최근 BACKFILL_LOOKBACK_S 구간의 백필 태스크를 등록합니다."""
+    now_ms = int(time.time() * 1000)
+    for exchange, symbol, timeframe in BACKFILL_SCHEDULE:
+        backfill_candles_task.delay(exchange, symbol, timeframe, now_ms - BACKFILL_LOOKBACK_MS, now_ms)
+
+
+@celery_app.task
+def collect_data_snapshots_task():
+    """어떤 백테스트도 참조하지 않는 시세 스냅샷과 세그먼트를 정리합니다 (Celery Beat 주기 실행)."""
+    return snapshot_store.collect_garbage()
+
+
+def _subscribe_bar_closes(bot: models.LiveBot, exchange: str):
+    """봇이 따라갈 봉 마감 스트림 구독자. 티커가 없거나 Redis에 연결할 수 없으면 None (고정 주기 폴링으로 대체)."""
+    if not bot.ticker:
+        return None
+    try:
+        timeframe = plan_cache.get_or_compile(bot.strategy.rules).lowest_timeframe() or BASE_TIMEFRAME
+    except StrategyCompileError as e:
+        logger.warning(f"LiveBot ID {bot.id}: strategy could not be compiled ({e}); following {BASE_TIMEFRAME} bars.")
+        timeframe = BASE_TIMEFRAME
+    try:
+        # 거래소 연결은 market_gateway 프로세스가 공유하며, 봇은 관심 등록(참조 계수)만 합니다
+        subscriber = LeasedCandleSubscriber(f"live_bot:{bot.id}", exchange, bot.ticker, timeframe)
+    except Exception as e:
+        logger.warning(f"LiveBot ID {bot.id}: bar-close stream unavailable ({e}); falling back to polling.")
+        return None
+    logger.info(f"LiveBot ID {bot.id}: following {subscriber.key}.")
+    return subscriber
+
+
+def _release_bar_closes(bot_id: int, subscriber) -> None:
+    """게이트웨이 관심 등록을 해제합니다. 실패해도 임대가 만료되면 정리되므로 기록만 합니다."""
+    try:
+        subscriber.close()
+    except Exception as e:
+        logger.warning(f"LiveBot ID {bot_id}: failed to release market data subscription ({e}).")
+
+
+def _wait_for_bar_close(bot_id: int, subscriber):
+    """
+    다음 봉 마감까지 대기하고 (구독자, 트레이딩 단계를 실행할지)를 반환합니다.
+    60초 안에 마감이 없으면 False로 돌아가 봇 상태(일시정지/정지)만 다시 확인합니다.
+    구독자가 없거나 스트림이 실패하면 고정 주기 폴링이므로 60초 대기 후 True입니다.
+    """
+    if subscriber is None:
+        time.sleep(60)
+        return None, True
+    try:
+        bars = subscriber.wait(60_000)
+        for bar in bars:
+            logger.info(f"LiveBot ID {bot_id}: bar {bar.ts} closed on {subscriber.key} (close={bar.close}).")
+        return subscriber, bool(bars)
+    except Exception as e:
+        logger.warning(f"LiveBot ID {bot_id}: bar-close stream failed ({e}); falling back to polling.")
+        _release_bar_closes(bot_id, subscriber)
+        time.sleep(60)
+        return None, True
 
 
 @celery_app.task(bind=True, default_retry_delay=30, max_retries=5)
 def run_live_bot_task(self, bot_id: int):
     db: Session = None
+    candles = None
     try:
         # 👈 Celery 태스크 내에서는 Celery 전용 엔진을 바인딩하여 세션 생성
         db = SessionLocal(bind=engine_celery) 
@@ -144,8 +470,12 @@ def run_live_bot_task(self, bot_id: int):
         logger.info(f"LiveBot ID {bot_id}: API key decrypted and exchange client initialized for {api_key_record.exchange}.")
 
 
+        # 봉 마감 스트림 구독 (candle_stream 집계 프로세스가 발행). 전략의 가장 낮은 타임프레임 봉이 마감될 때마다 한 번 실행
+        candles = _subscribe_bar_closes(bot, api_key_record.exchange)
+
         # --- 봇 메인 실행 루프 ---
         logger.info(f"LiveBot ID {bot_id}: Starting main trading loop.")
+        bar_closed = True # 시작 직후 한 번 실행하고, 이후에는 봉이 마감됐을 때만 실행
         while True:
             try:
                 # 최신 봇 상태를 DB에서 다시 로드
@@ -171,15 +501,16 @@ def run_live_bot_task(self, bot_id: int):
                 logger.error(f"LiveBot ID {bot_id} is in 'error' status. Exiting loop.")
                 break
 
-            # TODO: 여기에 실제 트레이딩 로직 구현
-            logger.info(f"LiveBot ID {bot_id}: Executing trading logic for strategy {bot.strategy_id}...")
-            
-            bot.last_run_at = datetime.now(timezone.utc)
-            db.add(bot)
-            db.commit()
-            db.refresh(bot)
+            if bar_closed:
+                # TODO: 여기에 실제 트레이딩 로직 구현
+                logger.info(f"LiveBot ID {bot_id}: Executing trading logic for strategy {bot.strategy_id}...")
+
+                bot.last_run_at = datetime.now(timezone.utc)
+                db.add(bot)
+                db.commit()
+                db.refresh(bot)
 
-            time.sleep(60)
+            candles, bar_closed = _wait_for_bar_close(bot_id, candles)
 
         bot.status = 'stopped'
         bot.stopped_at = datetime.now(timezone.utc)
@@ -200,5 +531,7 @@ def run_live_bot_task(self, bot_id: int):
                 db.commit()
                 logger.info(f"LiveBot ID {bot_id} marked as error after unexpected exception.")
     finally:
+        if candles is not None:
+            _release_bar_closes(bot_id, candles)
         if db:
             db.close()
\ No newline at end of file
@@ -0,0 +1,87 @@
+# file: backend/benchmarks/common.py
+
+"""
+엔진 벤치마크 공용 도구: 외부 거래소 없이 재현 가능한 합성 시세 데이터 소스와 기준 전략.
+
+시세는 봉 시각(ts)만으로 결정되는 함수로 생성하므로, 구간을 어떻게 나누어 요청하더라도 같은 봉은 항상 같은 값입니다.
+(전체 로드/청크 로드/샤드 로드 결과를 그대로 비교할 수 있습니다.)
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+import numpy as np
+
+from backend.app.engine.data import OHLCV, set_data_source, timeframe_ms
+
+BENCH_START_MS = int(datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _noise(ts: np.ndarray, salt: int) -> np.ndarray:
+    """ts 기반 결정적 의사 난수 [-0.5, 0.5)."""
+    x = (ts // 60_000 + salt * 0x9E3779B1).astype(np.uint64)
+    x ^= x >> np.uint64(33)
+    x *= np.uint64(0xFF51AFD7ED558CCD)
+    x ^= x >> np.uint64(33)
+    return (x % np.uint64(1_000_000)).astype(np.float64) / 1_000_000 - 0.5
+
+
+def synthetic_source(exchange: str, ticker: str, timeframe: str, start_ms: int, end_ms: int) -> OHLCV:
+    step = timeframe_ms(timeframe)
+    first = -(-start_ms // step) * step
+    ts = np.arange(first, end_ms, step, dtype=np.int64)
+    t = (ts - BENCH_START_MS) / 3_600_000.0
+    close = 100.0 * np.exp(0.15 * np.sin(t / 500.0) + 0.03 * np.sin(t / 37.0) + 0.004 * np.sin(t * 1.7) + 0.002 * _noise(ts, 1))
+    spread = close * (0.001 + 0.001 * (_noise(ts, 2) + 0.5))
+    return OHLCV(
+        ts=ts, open=close * (1.0 + 0.0005 * _noise(ts, 3)),
+        high=close + spread, low=close - spread, close=close,
+        volume=10.0 + 5.0 * _noise(ts, 4),
+    )
+
+
+def install() -> None:
+    set_data_source(synthetic_source)
+
+
+def _indicator(key: str, timeframe: str = "1m", **values: Any) -> Dict[str, Any]:
+    return {"type": "indicator", "name": key, "value": {"indicatorKey": key, "values": values, "timeframe": timeframe}}
+
+
+def _value(number: float) -> Dict[str, Any]:
+    return {"type": "value", "name": str(number), "value": number}
+
+
+def _block(left: Dict[str, Any], operator: str, right: Dict[str, Any], children=(), logic: str = "AND") -> Dict[str, Any]:
+    return {"id": "bench", "type": "signal", "conditionA": left, "operator": operator, "conditionB": right,
+            "children": list(children), "logicOperator": logic}
+
+
+# 기준 전략: 모든 지원 지표와 다중 타임프레임, 교차 연산자를 포함합니다.
+BENCH_RULES: Dict[str, Any] = {
+    "buy": [
+        _block(_indicator("SMA", period=20), "crossesAbove", _indicator("SMA", period=50), [
+            _block(_indicator("RSI", period=14), "<", _value(70)),
+            _block(_indicator("MACD", "1h"), ">", _value(0)),
+        ]),
+        _block(_indicator("EMA", "4h", period=5), "crossesAbove", _indicator("Close")),
+    ],
+    "sell": [
+        _block(_indicator("SMA", period=20), "crossesBelow", _indicator("SMA", period=50)),
+        _block(_indicator("BB", "1h", output="upper"), "<", _indicator("Close")),
+        _block(_indicator("Stoch"), ">", _value(97)),
+        _block(_indicator("CCI", "15m"), ">", _value(250)),
+        _block(_indicator("ParabolicSAR", "5m"), "crossesAbove", _indicator("Close")),
+        _block(_indicator("ATR"), ">", _value(5)),
+        _block(_indicator("OBV", "1d"), ">", _value(1e12)),
+    ],
+}
+
+
+def bench_parameters(days: int, timeframe: str = "1m", ticker: str = "BENCH/USDT") -> Dict[str, Any]:
+    end_ms = BENCH_START_MS + days * timeframe_ms("1d")
+    iso = lambda ms: datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
+    return {
+        "ticker": ticker, "start_date": iso(BENCH_START_MS), "end_date": iso(end_ms),
+        "initial_capital": 10000.0, "additional_parameters": {"exchange": "bench", "timeframe": timeframe},
+    }
@@ -0,0 +1,84 @@
+# file: backend/benchmarks/jit_loops.py
+
+"""
+경로 의존 루프 JIT 벤치마크.
+
+Parabolic SAR, 포지션 상태 머신(트레일링 스탑 포함)을 NumPy/파이썬 구현과 Numba 컴파일 버전으로 실행하여
+실행 시간을 비교하고 결과가 완전히 같은지 확인합니다. numba가 없으면 NumPy 구현만 측정합니다.
+
+    python -m backend.benchmarks.jit_loops [--days 365] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from backend.app.engine import jit
+from backend.app.engine.data import load_ohlcv
+from backend.app.engine.indicators import parabolic_sar, sma
+from backend.app.engine.simulator import match_signals
+
+from . import common
+
+
+def _best(fn: Callable, repeat: int) -> Tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, tuple):
+        return all(_same(x, y) for x, y in zip(a, b))
+    return a.dtype == b.dtype and np.array_equal(a, b, equal_nan=a.dtype.kind == "f")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    common.install()
+    params = common.bench_parameters(args.days)
+    bars = load_ohlcv("bench", params["ticker"], "1m", common.BENCH_START_MS, common.BENCH_START_MS + args.days * 86_400_000)
+    fast, slow = sma(bars.close, 20), sma(bars.close, 50)
+    with np.errstate(invalid="ignore"):
+        entries, exits = fast > slow, fast < slow
+        # 짧은 보유가 많은 경우(잦은 신호)와 긴 보유(트레일링 스탑 위주)를 모두 측정
+        sparse_exits = exits & (np.arange(len(bars)) % 5000 == 0)
+
+    cases: List[Tuple[str, Callable]] = [
+        ("parabolic_sar", lambda: parabolic_sar(bars.high, bars.low, 0.02, 0.2)),
+        ("parabolic_sar f32", lambda: parabolic_sar(bars.high.astype(np.float32), bars.low.astype(np.float32), 0.02, 0.2)),
+        ("state machine", lambda: match_signals(entries, exits, 50)),
+        ("state machine + trailing", lambda: match_signals(entries, exits, 50, np.int64, bars.close, 0.01)),
+        ("long holds + trailing", lambda: match_signals(entries, sparse_exits, 50, np.int64, bars.close, 0.03)),
+    ]
+
+    print(f"{len(bars)} bars, numba {'available' if jit.jit_available() else 'not installed'}")
+    print(f"{'loop':>26} {'numpy s':>9} {'jit s':>9} {'speedup':>8} {'identical':>10}")
+    identical = True
+    for name, fn in cases:
+        jit.set_jit_enabled(False)
+        base_s, expected = _best(fn, args.repeat)
+        if not jit.set_jit_enabled(True):
+            print(f"{name:>26} {base_s:>9.4f} {'-':>9} {'-':>8} {'-':>10}")
+            continue
+        fn()  # 첫 호출 컴파일(또는 디스크 캐시 로드)은 측정에서 제외
+        jit_s, result = _best(fn, args.repeat)
+        same = _same(expected, result)
+        identical = identical and same
+        print(f"{name:>26} {base_s:>9.4f} {jit_s:>9.4f} {base_s / jit_s:>7.1f}x {str(same):>10}")
+    jit.set_jit_enabled(jit.ENGINE_JIT)
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
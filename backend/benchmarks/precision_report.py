@@ -0,0 +1,121 @@
+# file: backend/benchmarks/precision_report.py
+
+"""
+정밀도 모드(float64 / float32) 정확도-속도 보고서.
+
+벤치마크 전략 모음을 두 정밀도로 실행하여 실행 시간, 최대 메모리, 캐시 사용량과
+신호 마스크 불일치율, 거래 수, 성과 지표 오차를 비교합니다. 허용 오차를 넘으면 종료 코드 1을 반환합니다.
+
+    python -m backend.benchmarks.precision_report [--days 180] [--repeat 3] [--markdown report.md]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import numpy as np
+
+from backend.app.engine.backtester import run_backtest
+from backend.app.engine.compiler import compile_strategy
+from backend.app.engine.evaluator import SubtreeCache
+
+from . import common
+
+# 허용 오차: 마스크 불일치는 전체 봉 대비 비율, 최종 자산은 float64 결과 대비 상대 오차,
+# 나머지 지표는 절대 오차(퍼센트 포인트 / 샤프 지수 값)
+MAX_MASK_MISMATCH = 1e-3
+MAX_EQUITY_REL_ERROR = 1e-2
+MAX_METRIC_ABS_ERROR = {"mdd_pct": 0.5, "win_rate_pct": 0.5, "sharpe_ratio": 0.05}
+
+SUITE: Dict[str, Dict[str, Any]] = {
+    "all_indicators": common.BENCH_RULES,
+    "sma_cross": {
+        "buy": [common._block(common._indicator("SMA", period=20), "crossesAbove", common._indicator("SMA", period=100))],
+        "sell": [common._block(common._indicator("SMA", period=20), "crossesBelow", common._indicator("SMA", period=100))],
+    },
+    "rsi_reversion": {
+        "buy": [common._block(common._indicator("RSI", period=14), "<", common._value(30))],
+        "sell": [common._block(common._indicator("RSI", period=14), ">", common._value(70))],
+    },
+    "bb_breakout_mtf": {
+        "buy": [common._block(common._indicator("Close"), ">", common._indicator("BB", "1h", output="upper"), [
+            common._block(common._indicator("EMA", "4h", period=50), "<", common._indicator("Close")),
+        ])],
+        "sell": [common._block(common._indicator("Close"), "<", common._indicator("BB", "1h", output="middle"))],
+    },
+}
+
+
+def _run(rules: Any, parameters: Dict[str, Any], repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        cache = SubtreeCache()
+        started = time.perf_counter()
+        run = run_backtest(rules, parameters, cache)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    run_backtest(rules, parameters, SubtreeCache(max_bytes=0))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return run, best, peak / 1024 / 1024, cache.stats()["bytes"] / 1024 / 1024
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--markdown", help="보고서를 Markdown 표로 저장할 경로")
+    args = parser.parse_args()
+
+    common.install()
+    header = ["strategy", "bars", "f64 s", "f32 s", "speedup", "f64 peak MB", "f32 peak MB", "f64 cache MB", "f32 cache MB",
+              "mask mismatch", "trades f64/f32", "equity rel.err", "mdd err", "sharpe err", "status"]
+    rows: List[List[str]] = []
+    failed = False
+    for name, rules in SUITE.items():
+        compiled = compile_strategy(rules)
+        base = common.bench_parameters(args.days)
+        compact = common.bench_parameters(args.days)
+        compact["additional_parameters"] = {**compact["additional_parameters"], "precision": "float32"}
+
+        ref, ref_s, ref_peak, ref_cache = _run(compiled, base, args.repeat)
+        low, low_s, low_peak, low_cache = _run(compiled, compact, args.repeat)
+
+        bars = ref.entries.shape[0] - ref.start_index
+        mismatch = (np.count_nonzero(ref.entries != low.entries) + np.count_nonzero(ref.exits != low.exits)) / (2 * max(1, bars))
+        errors = {key: abs(ref.summary[key] - low.summary[key]) for key in MAX_METRIC_ABS_ERROR}
+        # 거래가 많을수록 체결가 반올림 오차가 복리로 누적되므로 최종 자산은 상대 오차로 비교
+        ref_equity = ref.summary["trade_summary_json"]["final_equity"]
+        equity_error = abs(ref_equity - low.summary["trade_summary_json"]["final_equity"]) / ref_equity
+        ok = (
+            mismatch <= MAX_MASK_MISMATCH and equity_error <= MAX_EQUITY_REL_ERROR
+            and all(errors[key] <= limit for key, limit in MAX_METRIC_ABS_ERROR.items())
+        )
+        failed = failed or not ok
+        rows.append([
+            name, str(bars), f"{ref_s:.3f}", f"{low_s:.3f}", f"x{ref_s / low_s:.2f}",
+            f"{ref_peak:.1f}", f"{low_peak:.1f}", f"{ref_cache:.1f}", f"{low_cache:.1f}",
+            f"{mismatch:.2e}", f"{ref.simulation.trade_count}/{low.simulation.trade_count}",
+            f"{equity_error:.2e}", f"{errors['mdd_pct']:.2e}", f"{errors['sharpe_ratio']:.2e}",
+            "ok" if ok else "FAIL",
+        ])
+
+    widths = [max(len(header[i]), *(len(row[i]) for row in rows)) for i in range(len(header))]
+    print("  ".join(h.rjust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print("  ".join(cell.rjust(w) for cell, w in zip(row, widths)))
+
+    if args.markdown:
+        with open(args.markdown, "w", encoding="utf-8") as f:
+            f.write(f"# float32 정밀도 모드 정확도-속도 보고서 ({args.days}일, 1m)\n\n")
+            f.write("| " + " | ".join(header) + " |\n")
+            f.write("|" + "---|" * len(header) + "\n")
+            for row in rows:
+                f.write("| " + " | ".join(row) + " |\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# file: backend/benchmarks/streaming_memory.py
+
+"""
+스트리밍 엔진 메모리 벤치마크.
+
+이력 길이를 늘려 가며 전체 로드 모드와 스트리밍 모드의 최대 메모리(tracemalloc peak)와, 이전 크기 대비
+하루 늘어날 때마다의 최대 메모리 증가량(MB/day)을 비교합니다.
+스트리밍 모드는 청크 + 지표 워밍업 + 가장 긴 롤링 지표 창만큼의 봉을 보관하므로, 이력이 그 길이(flat_from)를
+넘어서면 최대 메모리가 더 늘지 않아야 합니다. 그보다 짧은 크기는 창이 채워지는 구간이라 증가량 판정에서 제외하며,
+flat_from 이후 크기의 스트리밍 증가량이 허용치를 넘으면 종료 코드 1을 반환합니다.
+
+    python -m backend.benchmarks.streaming_memory [--days 150 240 365] [--chunk-bars 50000]
+"""
+
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+
+from backend.app.engine.backtester import BacktestSpec, run_backtest
+from backend.app.engine.compiler import compile_strategy
+from backend.app.engine.data import timeframe_ms
+from backend.app.engine.evaluator import SubtreeCache
+from backend.app.engine.streaming import run_streaming
+
+from . import common
+
+# flat_from 이후 스트리밍 최대 메모리의 허용 증가량. 거래 목록/곡선 샘플처럼 이력에 비례하는 작은 결과만 늘어납니다.
+MAX_STREAM_GROWTH_MB_PER_DAY = 0.02
+
+
+def _measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1024 / 1024, elapsed
+
+
+def _flat_from_days(spec: BacktestSpec, warmup_ms: int, chunk_bars: int) -> int:
+    """
+    스트리밍 모드의 최대 메모리가 더 늘지 않는 이력 길이(일). 보관하는 꼬리(워밍업 + 가장 긴 롤링 창)가 다 채워진 뒤
+    꽉 찬 청크 하나를 더 처리해야 최대치에 도달하므로, 꼬리 길이를 청크 단위로 올림한 뒤 청크 하나를 더합니다.
+    """
+    bar_ms = timeframe_ms(spec.timeframe)
+    tail_bars = (warmup_ms + max(spec.rolling_window_days, default=0) * timeframe_ms("1d")) // bar_ms
+    flat_bars = (math.ceil(tail_bars / chunk_bars) + 1) * chunk_bars
+    return math.ceil((flat_bars * bar_ms - warmup_ms) / timeframe_ms("1d"))
+
+
+def _fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def _growth(previous, current, index: int) -> str:
+    if previous is None or current[index] is None:
+        return "-"
+    return f"{(current[index] - previous[index]) / (current[0] - previous[0]):.3f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[150, 240, 365])
+    parser.add_argument("--chunk-bars", type=int, default=50_000)
+    parser.add_argument("--skip-full", action="store_true", help="전체 로드 모드 측정 생략 (매우 긴 이력용)")
+    parser.add_argument("--max-growth", type=float, default=MAX_STREAM_GROWTH_MB_PER_DAY,
+                        help="flat_from 이후 스트리밍 최대 메모리의 허용 증가량 (MB/day)")
+    args = parser.parse_args()
+
+    common.install()
+    compiled = compile_strategy(common.BENCH_RULES)
+    days_list = sorted(set(args.days))
+    flat_from = _flat_from_days(BacktestSpec.from_parameters(common.bench_parameters(days_list[0]), compiled), compiled.warmup_ms, args.chunk_bars)
+    print(f"streaming retains chunk ({args.chunk_bars} bars) + warmup + rolling window: flat from {flat_from} days")
+    print(f"{'days':>6} {'bars':>10} {'full MB':>9} {'full MB/d':>10} {'full s':>7} "
+          f"{'stream MB':>10} {'stream MB/d':>12} {'stream s':>9} {'return rel.err':>14} {'status':>7}")
+    previous = None
+    flat_growth = []
+    for days in days_list:
+        parameters = common.bench_parameters(days)
+        spec = BacktestSpec.from_parameters(parameters, compiled)
+        streamed, stream_mb, stream_s = _measure(lambda: run_streaming(compiled, spec, args.chunk_bars))
+        full_mb = full_s = diff = None
+        if not args.skip_full:
+            # 캐시를 비활성화하여 실행 자체가 필요로 하는 메모리만 측정
+            full, full_mb, full_s = _measure(lambda: run_backtest(compiled, parameters, SubtreeCache(max_bytes=0)))
+            # 같은 거래 목록이어도 수천 번의 복리 계산에서 부동소수점 오차가 누적되므로 상대 오차로 비교
+            expected = full.summary["total_return_pct"]
+            diff = abs(expected - streamed.summary["total_return_pct"]) / max(1.0, abs(expected))
+        current = (days, full_mb, stream_mb)
+
+        status = "ramp"
+        if previous is not None and previous[0] >= flat_from:
+            growth = (stream_mb - previous[2]) / (days - previous[0])
+            flat_growth.append(growth)
+            status = "ok" if growth <= args.max_growth else "FAIL"
+        elif days >= flat_from:
+            status = "base"
+        print(
+            f"{days:>6} {streamed.bars_processed:>10} {_fmt(full_mb, '.1f'):>9} {_growth(previous, current, 1):>10} "
+            f"{_fmt(full_s, '.2f'):>7} {stream_mb:>10.1f} {_growth(previous, current, 2):>12} {stream_s:>9.2f} "
+            f"{_fmt(diff, '.2e'):>14} {status:>7}"
+        )
+        previous = current
+
+    if not flat_growth:
+        print(f"\nNeed at least two sizes >= {flat_from} days to check that streaming memory stays flat.")
+        return 1
+    worst = max(flat_growth)
+    print(f"\nstreaming peak growth beyond {flat_from} days: {worst:.3f} MB/day (limit {args.max_growth} MB/day)")
+    return 0 if worst <= args.max_growth else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Add rolling metric series to backtest_results
+
+Revision ID: 3e8f4a6c1d27
+Revises: b7c3e91d2f40
+Create Date: 2026-10-19 11:03:48.517326
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8f4a6c1d27'
+down_revision: Union[str, Sequence[str], None] = 'b7c3e91d2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('backtest_results', sa.Column('rolling_metrics_json', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('backtest_results', 'rolling_metrics_json')
@@ -0,0 +1,42 @@
+"""Add candle quarantine table
+
+Revision ID: 5d1e7a9c3b28
+Revises: a3c8f15e7d92
+Create Date: 2026-10-19 17:48:05.226731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e7a9c3b28'
+down_revision: Union[str, Sequence[str], None] = 'a3c8f15e7d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'candle_quarantine',
+        sa.Column('exchange', sa.String(length=32), nullable=False),
+        sa.Column('symbol', sa.String(length=32), nullable=False),
+        sa.Column('timeframe', sa.String(length=8), nullable=False),
+        sa.Column('ts', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.Float(), nullable=False),
+        sa.Column('high', sa.Float(), nullable=False),
+        sa.Column('low', sa.Float(), nullable=False),
+        sa.Column('close', sa.Float(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.Column('reasons', sa.Integer(), nullable=False),
+        sa.Column('detected_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('exchange', 'symbol', 'timeframe', 'ts'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('candle_quarantine')
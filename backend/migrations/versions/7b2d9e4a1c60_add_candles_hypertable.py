@@ -0,0 +1,55 @@
+"""Add candles hypertable with compression policy
+
+Revision ID: 7b2d9e4a1c60
+Revises: e6a0d4f9b351
+Create Date: 2026-10-19 15:02:17.418530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d9e4a1c60'
+down_revision: Union[str, Sequence[str], None] = 'e6a0d4f9b351'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 청크 하나가 1분봉 기준 심볼당 약 1만 행이 되도록 7일 단위로 분할합니다.
+# 최근 30일은 백필/수정 upsert가 잦으므로 압축하지 않고, 그 이전 청크는 (거래소, 심볼, 타임프레임)별로 압축합니다.
+CHUNK_INTERVAL = "7 days"
+COMPRESS_AFTER = "30 days"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+    op.create_table(
+        'candles',
+        sa.Column('exchange', sa.String(length=32), nullable=False),
+        sa.Column('symbol', sa.String(length=32), nullable=False),
+        sa.Column('timeframe', sa.String(length=8), nullable=False),
+        sa.Column('ts', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.Float(), nullable=False),
+        sa.Column('high', sa.Float(), nullable=False),
+        sa.Column('low', sa.Float(), nullable=False),
+        sa.Column('close', sa.Float(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('exchange', 'symbol', 'timeframe', 'ts'),
+    )
+    op.execute(f"SELECT create_hypertable('candles', 'ts', chunk_time_interval => INTERVAL '{CHUNK_INTERVAL}')")
+    op.execute(
+        "ALTER TABLE candles SET ("
+        "timescaledb.compress, "
+        "timescaledb.compress_segmentby = 'exchange, symbol, timeframe', "
+        "timescaledb.compress_orderby = 'ts DESC')"
+    )
+    op.execute(f"SELECT add_compression_policy('candles', INTERVAL '{COMPRESS_AFTER}')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("SELECT remove_compression_policy('candles', if_exists => true)")
+    op.drop_table('candles')
@@ -0,0 +1,34 @@
+"""Add MAE/MFE, bars held and exit reason to trade_logs
+
+Revision ID: 9d1a5c7e3b82
+Revises: 3e8f4a6c1d27
+Create Date: 2026-10-19 11:47:05.932614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d1a5c7e3b82'
+down_revision: Union[str, Sequence[str], None] = '3e8f4a6c1d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('trade_logs', sa.Column('mae_pct', sa.Float(), nullable=True))
+    op.add_column('trade_logs', sa.Column('mfe_pct', sa.Float(), nullable=True))
+    op.add_column('trade_logs', sa.Column('bars_held', sa.Integer(), nullable=True))
+    op.add_column('trade_logs', sa.Column('exit_reason', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('trade_logs', 'exit_reason')
+    op.drop_column('trade_logs', 'bars_held')
+    op.drop_column('trade_logs', 'mfe_pct')
+    op.drop_column('trade_logs', 'mae_pct')
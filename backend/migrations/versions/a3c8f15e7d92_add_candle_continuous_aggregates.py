@@ -0,0 +1,60 @@
+"""Add continuous aggregates for higher timeframe candles
+
+Revision ID: a3c8f15e7d92
+Revises: 7b2d9e4a1c60
+Create Date: 2026-10-19 16:21:44.093817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8f15e7d92'
+down_revision: Union[str, Sequence[str], None] = '7b2d9e4a1c60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (뷰, 원본, 버킷, 갱신 시작 오프셋, 갱신 종료 오프셋, 갱신 주기)
+# 5m은 candles의 1분봉에서, 그보다 큰 타임프레임은 바로 아래 집계 뷰에서 계층적으로 집계합니다 (1w는 1d에서).
+# 종료 오프셋을 버킷 하나로 두어 진행 중인 버킷은 실시간 집계(materialized_only = false)로 조회됩니다.
+# time_bucket의 주 단위 기본 기준점은 월요일(2000-01-03)이므로 엔진의 주봉 경계와 같습니다.
+AGGREGATES = (
+    ("candles_5m", "candles", "5 minutes", "1 day", "5 minutes", "5 minutes"),
+    ("candles_15m", "candles_5m", "15 minutes", "1 day", "15 minutes", "15 minutes"),
+    ("candles_30m", "candles_15m", "30 minutes", "2 days", "30 minutes", "30 minutes"),
+    ("candles_1h", "candles_30m", "1 hour", "3 days", "1 hour", "1 hour"),
+    ("candles_4h", "candles_1h", "4 hours", "7 days", "4 hours", "1 hour"),
+    ("candles_1d", "candles_1h", "1 day", "14 days", "1 day", "1 hour"),
+    ("candles_1w", "candles_1d", "7 days", "35 days", "7 days", "1 day"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for view, source, bucket, start_offset, end_offset, schedule in AGGREGATES:
+        base_filter = "WHERE timeframe = '1m' " if source == "candles" else ""
+        op.execute(
+            f"CREATE MATERIALIZED VIEW {view} "
+            f"WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS "
+            f"SELECT exchange, symbol, time_bucket(INTERVAL '{bucket}', ts) AS ts, "
+            f"first(open, ts) AS open, max(high) AS high, min(low) AS low, "
+            f"last(close, ts) AS close, sum(volume) AS volume "
+            f"FROM {source} {base_filter}"
+            f"GROUP BY exchange, symbol, time_bucket(INTERVAL '{bucket}', ts) "
+            f"WITH NO DATA"
+        )
+        op.execute(f"CREATE INDEX ix_{view}_exchange_symbol_ts ON {view} (exchange, symbol, ts)")
+        op.execute(
+            f"SELECT add_continuous_aggregate_policy('{view}', "
+            f"start_offset => INTERVAL '{start_offset}', end_offset => INTERVAL '{end_offset}', "
+            f"schedule_interval => INTERVAL '{schedule}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for view, *_ in reversed(AGGREGATES):
+        op.execute(f"SELECT remove_continuous_aggregate_policy('{view}', if_exists => true)")
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view}")
@@ -0,0 +1,40 @@
+"""Add buy & hold benchmark metrics to backtest_results
+
+Revision ID: b7c3e91d2f40
+Revises: 5a0622ae4794
+Create Date: 2026-10-19 10:12:31.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c3e91d2f40'
+down_revision: Union[str, Sequence[str], None] = '5a0622ae4794'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('backtest_results', sa.Column('benchmark_return_pct', sa.Float(), nullable=True))
+    op.add_column('backtest_results', sa.Column('alpha_pct', sa.Float(), nullable=True))
+    op.add_column('backtest_results', sa.Column('beta', sa.Float(), nullable=True))
+    op.add_column('backtest_results', sa.Column('information_ratio', sa.Float(), nullable=True))
+    op.add_column('backtest_results', sa.Column('correlation', sa.Float(), nullable=True))
+    op.add_column('backtest_results', sa.Column('benchmark_curve_json', sa.JSON(), nullable=True))
+    op.create_index(op.f('ix_backtest_results_information_ratio'), 'backtest_results', ['information_ratio'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_backtest_results_information_ratio'), table_name='backtest_results')
+    op.drop_column('backtest_results', 'benchmark_curve_json')
+    op.drop_column('backtest_results', 'correlation')
+    op.drop_column('backtest_results', 'information_ratio')
+    op.drop_column('backtest_results', 'beta')
+    op.drop_column('backtest_results', 'alpha_pct')
+    op.drop_column('backtest_results', 'benchmark_return_pct')
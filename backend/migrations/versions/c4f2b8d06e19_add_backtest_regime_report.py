@@ -0,0 +1,28 @@
+"""Add volatility/trend regime report to backtest_results
+
+Revision ID: c4f2b8d06e19
+Revises: 9d1a5c7e3b82
+Create Date: 2026-10-19 13:21:17.048392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f2b8d06e19'
+down_revision: Union[str, Sequence[str], None] = '9d1a5c7e3b82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('backtest_results', sa.Column('regime_report_json', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('backtest_results', 'regime_report_json')
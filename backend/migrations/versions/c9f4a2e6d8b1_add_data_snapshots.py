@@ -0,0 +1,70 @@
+"""Add immutable data snapshots and pin backtests to them
+
+Revision ID: c9f4a2e6d8b1
+Revises: 5d1e7a9c3b28
+Create Date: 2026-10-19 18:37:52.640194
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f4a2e6d8b1'
+down_revision: Union[str, Sequence[str], None] = '5d1e7a9c3b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'data_segments',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('rows', sa.Integer(), nullable=False),
+        sa.Column('start_ms', sa.BigInteger(), nullable=False),
+        sa.Column('end_ms', sa.BigInteger(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('hash'),
+    )
+    op.create_table(
+        'data_snapshots',
+        sa.Column('version', sa.String(length=64), nullable=False),
+        sa.Column('exchange', sa.String(length=32), nullable=False),
+        sa.Column('symbol', sa.String(length=32), nullable=False),
+        sa.Column('timeframe', sa.String(length=8), nullable=False),
+        sa.Column('start_ms', sa.BigInteger(), nullable=False),
+        sa.Column('end_ms', sa.BigInteger(), nullable=False),
+        sa.Column('rows', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('version'),
+    )
+    op.create_table(
+        'data_snapshot_segments',
+        sa.Column('version', sa.String(length=64), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('segment_hash', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['version'], ['data_snapshots.version'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['segment_hash'], ['data_segments.hash']),
+        sa.PrimaryKeyConstraint('version', 'position'),
+    )
+    op.create_index(op.f('ix_data_snapshot_segments_segment_hash'), 'data_snapshot_segments', ['segment_hash'], unique=False)
+    op.add_column('backtests', sa.Column('data_version', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_backtests_data_version'), 'backtests', ['data_version'], unique=False)
+    op.create_foreign_key('fk_backtests_data_version', 'backtests', 'data_snapshots', ['data_version'], ['version'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_backtests_data_version', 'backtests', type_='foreignkey')
+    op.drop_index(op.f('ix_backtests_data_version'), table_name='backtests')
+    op.drop_column('backtests', 'data_version')
+    op.drop_index(op.f('ix_data_snapshot_segments_segment_hash'), table_name='data_snapshot_segments')
+    op.drop_table('data_snapshot_segments')
+    op.drop_table('data_snapshots')
+    op.drop_table('data_segments')
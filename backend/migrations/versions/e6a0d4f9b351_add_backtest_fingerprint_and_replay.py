@@ -0,0 +1,34 @@
+"""Add run fingerprint and replay artifact path to backtest_results
+
+Revision ID: e6a0d4f9b351
+Revises: c4f2b8d06e19
+Create Date: 2026-10-19 14:08:52.661204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a0d4f9b351'
+down_revision: Union[str, Sequence[str], None] = 'c4f2b8d06e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('backtest_results', sa.Column('input_key', sa.String(length=64), nullable=True))
+    op.add_column('backtest_results', sa.Column('fingerprint_json', sa.JSON(), nullable=True))
+    op.add_column('backtest_results', sa.Column('replay_artifact_path', sa.String(length=512), nullable=True))
+    op.create_index(op.f('ix_backtest_results_input_key'), 'backtest_results', ['input_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_backtest_results_input_key'), table_name='backtest_results')
+    op.drop_column('backtest_results', 'replay_artifact_path')
+    op.drop_column('backtest_results', 'fingerprint_json')
+    op.drop_column('backtest_results', 'input_key')
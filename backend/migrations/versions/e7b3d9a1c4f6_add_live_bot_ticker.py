@@ -0,0 +1,28 @@
+"""Add ticker to live bots
+
+Revision ID: e7b3d9a1c4f6
+Revises: c9f4a2e6d8b1
+Create Date: 2026-10-19 19:42:18.305117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3d9a1c4f6'
+down_revision: Union[str, Sequence[str], None] = 'c9f4a2e6d8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('live_bots', sa.Column('ticker', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('live_bots', 'ticker')
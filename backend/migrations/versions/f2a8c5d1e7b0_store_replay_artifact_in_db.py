@@ -0,0 +1,30 @@
+"""Store replay artifacts in backtest_results instead of a worker-local path
+
+Revision ID: f2a8c5d1e7b0
+Revises: e7b3d9a1c4f6
+Create Date: 2026-10-19 21:16:40.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c5d1e7b0'
+down_revision: Union[str, Sequence[str], None] = 'e7b3d9a1c4f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('backtest_results', sa.Column('replay_artifact', sa.LargeBinary(), nullable=True))
+    op.drop_column('backtest_results', 'replay_artifact_path')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('backtest_results', sa.Column('replay_artifact_path', sa.String(length=512), nullable=True))
+    op.drop_column('backtest_results', 'replay_artifact')
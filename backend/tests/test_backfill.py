@@ -0,0 +1,99 @@
+# file: backend/tests/test_backfill.py
+
+"""결측 구간 탐지와 백필: FakeExchange로 빈 구간만 요청해 채우고, 거래소 자체 결측은 unfilled로 남는지 확인합니다."""
+
+import numpy as np
+import pytest
+
+from backend.app.engine.backfill import backfill, plan_requests
+from backend.app.engine.candle_store import CandleStore
+from backend.app.engine.data import OHLCV, find_gaps, timeframe_ms
+from backend.app.engine.exchanges import FakeExchange
+
+MINUTE = timeframe_ms("1m")
+START_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+class MemoryCandleStore(CandleStore):
+    """candles 테이블 대신 dict에 봉을 보관하는 저장소 (백필이 쓰는 메서드만 구현)."""
+    def __init__(self):
+        super().__init__(connect=lambda: None)
+        self.rows = {}
+        self.quarantined = 0
+        self.refreshed = []
+
+    def ingest(self, exchange, symbol, timeframe, bars, upsert=True):
+        for row in zip(bars.ts.tolist(), bars.open, bars.high, bars.low, bars.close, bars.volume):
+            self.rows[(exchange, symbol, timeframe, row[0])] = row
+        return len(bars)
+
+    def quarantine(self, exchange, symbol, timeframe, report):
+        self.quarantined += len(report.quarantined)
+        return len(report.quarantined)
+
+    def load_timestamps(self, exchange, symbol, timeframe, start_ms, end_ms):
+        ts = sorted(key[3] for key in self.rows if key[:3] == (exchange, symbol, timeframe) and start_ms <= key[3] < end_ms)
+        return np.asarray(ts, dtype=np.int64)
+
+    def refresh_aggregates(self, start_ms, end_ms):
+        self.refreshed.append((start_ms, end_ms))
+
+
+def _seed(store, client, symbol, ts):
+    ts = np.asarray(ts, dtype=np.int64)
+    store.ingest(client.name, symbol, "1m", OHLCV.from_rows(FakeExchange.bars(symbol, ts, MINUTE).tolist()))
+
+
+def test_find_gaps_reports_leading_inner_and_trailing_holes():
+    ts = START_MS + MINUTE * np.array([2, 3, 4, 8, 9])
+    assert find_gaps(ts, START_MS, START_MS + 12 * MINUTE, "1m") == [
+        (START_MS, START_MS + 2 * MINUTE),
+        (START_MS + 5 * MINUTE, START_MS + 8 * MINUTE),
+        (START_MS + 10 * MINUTE, START_MS + 12 * MINUTE),
+    ]
+    assert find_gaps(ts, START_MS + 2 * MINUTE, START_MS + 5 * MINUTE, "1m") == []
+    assert find_gaps(np.empty(0), START_MS + 1, START_MS + 3 * MINUTE, "1m") == [(START_MS + MINUTE, START_MS + 3 * MINUTE)]
+
+
+def test_plan_merges_nearby_gaps_only_when_it_saves_requests():
+    gaps = [(START_MS, START_MS + 3 * MINUTE), (START_MS + 5 * MINUTE, START_MS + 7 * MINUTE)]
+    assert plan_requests(gaps, "1m", max_limit=10) == [(START_MS, 7)]
+    assert plan_requests(gaps, "1m", max_limit=2) == [(START_MS, 2), (START_MS + 2 * MINUTE, 1), (START_MS + 5 * MINUTE, 2)]
+
+
+def test_backfill_fills_only_missing_bars():
+    client = FakeExchange(max_limit=100)
+    store = MemoryCandleStore()
+    end_ms = START_MS + 1_000 * MINUTE
+    present = np.setdiff1d(np.arange(1_000), np.r_[0:40, 300:310, 500:750, 990:1000])
+    _seed(store, client, "GAP/USDT", START_MS + present * MINUTE)
+
+    summary = backfill(client, store, "GAP/USDT", "1m", START_MS, end_ms)
+    assert summary["gaps"] == 4
+    assert summary["missing_bars"] == 1_000 - len(present)
+    assert summary["stored_bars"] == summary["missing_bars"]
+    assert summary["unfilled_bars"] == 0
+    assert summary["requests"] == len(plan_requests(
+        find_gaps(START_MS + present * MINUTE, START_MS, end_ms, "1m"), "1m", client.max_limit,
+    ))
+    ts = store.load_timestamps(client.name, "GAP/USDT", "1m", START_MS, end_ms)
+    np.testing.assert_array_equal(ts, START_MS + np.arange(1_000) * MINUTE)
+    row = store.rows[(client.name, "GAP/USDT", "1m", START_MS + 600 * MINUTE)]
+    np.testing.assert_allclose(row[1:], FakeExchange.bars("GAP/USDT", np.array([START_MS + 600 * MINUTE]), MINUTE)[0, 1:])
+    assert store.refreshed
+
+    calls = client.calls
+    again = backfill(client, store, "GAP/USDT", "1m", START_MS, end_ms)
+    assert again["requests"] == 0 and client.calls == calls
+
+
+def test_exchange_outages_stay_unfilled():
+    client = FakeExchange(outage_every=7)
+    store = MemoryCandleStore()
+    end_ms = START_MS + 700 * MINUTE
+    summary = backfill(client, store, "OUT/USDT", "1m", START_MS, end_ms)
+    expected_missing = int(np.count_nonzero(((START_MS // MINUTE) + np.arange(700)) % 7 == 0))
+    assert summary["missing_bars"] == 700
+    assert summary["unfilled_bars"] == expected_missing
+    gaps = find_gaps(store.load_timestamps(client.name, "OUT/USDT", "1m", START_MS, end_ms), START_MS, end_ms, "1m")
+    assert sum((end - start) // MINUTE for start, end in gaps) == expected_missing
@@ -0,0 +1,75 @@
+# file: backend/tests/test_candle_stream.py
+
+"""체결 -> 봉 집계: 재생 피드로 집계한 봉이 같은 체결을 일괄 집계(resample)한 결과와 같은지 확인합니다."""
+
+import asyncio
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from backend.app.engine.candle_stream import CLOSE_GRACE_MS, CandleAggregator, ReplayTradeFeed, run_aggregator
+from backend.app.engine.data import OHLCV, resample, timeframe_ms
+
+START_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+HOURS = 3
+TIMEFRAMES = ("1m", "5m", "15m", "1h")
+
+
+def _trades(seed: int = 5) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    ts = np.sort(rng.integers(START_MS, START_MS + HOURS * 3_600_000, 20_000))
+    # 체결이 없는 분(봉이 생기지 않아야 함)을 만듭니다
+    minute = (ts - START_MS) // 60_000
+    ts = ts[(minute % 17 != 3) & ((minute < 40) | (minute >= 46))]
+    price = 100.0 + np.cumsum(rng.normal(0.0, 0.05, ts.shape[0]))
+    amount = rng.uniform(0.01, 2.0, ts.shape[0])
+    return np.column_stack((ts, price, amount))
+
+
+def _reference_minutes(trades: np.ndarray) -> OHLCV:
+    ts = trades[:, 0].astype(np.int64)
+    bucket = ts - ts % 60_000
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    ends = np.concatenate((starts[1:], [len(ts)])) - 1
+    price, amount = trades[:, 1], trades[:, 2]
+    return OHLCV(
+        ts=bucket[starts], open=price[starts], high=np.maximum.reduceat(price, starts),
+        low=np.minimum.reduceat(price, starts), close=price[ends], volume=np.add.reduceat(amount, starts),
+    )
+
+
+def _aggregate(trades: np.ndarray, batch_size: int):
+    closed = defaultdict(list)
+    aggregator = CandleAggregator("replay", "TEST/USDT", TIMEFRAMES, on_close=lambda ex, sym, tf, bar: closed[tf].append(bar))
+    feed = ReplayTradeFeed(trades, batch_size=batch_size, end_ms=START_MS + HOURS * 3_600_000 + CLOSE_GRACE_MS)
+    asyncio.run(run_aggregator(feed, aggregator))
+    return aggregator, closed
+
+
+@pytest.mark.parametrize("batch_size", [1, 257, 100_000])
+def test_replayed_bars_match_batch_resample(batch_size):
+    trades = _trades()
+    aggregator, closed = _aggregate(trades, batch_size)
+    minutes = _reference_minutes(trades)
+    assert aggregator.trades == len(trades) and aggregator.late_trades == 0
+    for timeframe in TIMEFRAMES:
+        expected = minutes if timeframe == "1m" else resample(minutes, timeframe)
+        bars = closed[timeframe]
+        np.testing.assert_array_equal([bar.ts for bar in bars], expected.ts)
+        np.testing.assert_array_equal([bar.end for bar in bars], expected.ts + timeframe_ms(timeframe))
+        for name in ("open", "high", "low", "close"):
+            np.testing.assert_array_equal([getattr(bar, name) for bar in bars], expected.column(name))
+        np.testing.assert_allclose([bar.volume for bar in bars], expected.volume, rtol=1e-12)
+    assert sum(bar.trades for bar in closed["1h"]) == len(trades)
+
+
+def test_late_trades_for_closed_minutes_are_dropped():
+    closed = defaultdict(list)
+    aggregator = CandleAggregator("replay", "TEST/USDT", ("1m",), on_close=lambda ex, sym, tf, bar: closed[tf].append(bar))
+    aggregator.add_trade(START_MS + 10_000, 100.0, 1.0)
+    aggregator.add_trade(START_MS + 61_000, 101.0, 1.0)  # 다음 분 -> 첫 1분봉 마감
+    aggregator.add_trade(START_MS + 30_000, 99.0, 5.0)  # 이미 마감된 분의 늦은 체결
+    aggregator.advance(START_MS + 120_000 + CLOSE_GRACE_MS)
+    assert aggregator.late_trades == 1
+    assert [(bar.ts, bar.low, bar.volume) for bar in closed["1m"]] == [(START_MS, 100.0, 1.0), (START_MS + 60_000, 101.0, 1.0)]
@@ -0,0 +1,62 @@
+# file: backend/tests/test_compiler.py
+
+"""규칙 컴파일러: 서브트리 해시가 블록 id/위치와 무관하고, 수정한 노드와 조상만 다시 계산 대상이 되는지 확인합니다."""
+
+import copy
+import json
+
+import pytest
+
+from backend.app.engine.compiler import StrategyCompileError, changed_subtrees, compile_strategy
+from backend.benchmarks import common
+
+
+def test_key_ignores_block_ids_and_input_form():
+    renamed = copy.deepcopy(common.BENCH_RULES)
+    for index, block in enumerate(renamed["buy"] + renamed["sell"]):
+        block["id"] = f"renamed-{index}"
+    original = compile_strategy(common.BENCH_RULES)
+    assert compile_strategy(renamed).key == original.key
+    assert compile_strategy(json.dumps(common.BENCH_RULES)).key == original.key
+
+
+def test_operator_aliases_share_a_key():
+    aliased = copy.deepcopy(common.BENCH_RULES)
+    aliased["buy"][0]["operator"] = "상향 돌파"
+    assert compile_strategy(aliased).key == compile_strategy(common.BENCH_RULES).key
+
+
+def test_changed_subtrees_are_the_edited_node_and_its_ancestors():
+    previous = compile_strategy(common.BENCH_RULES)
+    edited = copy.deepcopy(common.BENCH_RULES)
+    edited["buy"][0]["children"][0]["conditionB"] = common._value(65)  # RSI < 70 -> RSI < 65
+    current = compile_strategy(edited)
+
+    rsi_block = current.buy.blocks[0].children_any.blocks[0]
+    expected = {
+        rsi_block.condition.right.key, rsi_block.condition.key, rsi_block.key,
+        current.buy.blocks[0].children_any.key, current.buy.blocks[0].key, current.buy.key,
+    }
+    assert changed_subtrees(previous, current) == expected
+    assert current.sell.key == previous.sell.key
+    assert changed_subtrees(previous, previous) == set()
+
+
+def test_identical_subtrees_share_keys_across_sides():
+    compiled = compile_strategy(common.BENCH_RULES)
+    buy_cross = compiled.buy.blocks[0].condition
+    sell_cross = compiled.sell.blocks[0].condition
+    assert buy_cross.left.key == sell_cross.left.key
+    assert buy_cross.right.key == sell_cross.right.key
+    assert buy_cross.key != sell_cross.key  # crosses_above vs crosses_below
+
+
+@pytest.mark.parametrize("rules", [
+    {"buy": [], "sell": []},
+    {"buy": [common._block(common._indicator("NOPE"), ">", common._value(1))], "sell": []},
+    {"buy": [common._block(common._indicator("SMA", "2m", period=5), ">", common._value(1))], "sell": []},
+    {"buy": [common._block(common._indicator("SMA", period=5), "~", common._value(1))], "sell": []},
+])
+def test_invalid_rules_are_rejected(rules):
+    with pytest.raises(StrategyCompileError):
+        compile_strategy(rules)
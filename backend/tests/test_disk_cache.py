@@ -0,0 +1,44 @@
+# file: backend/tests/test_disk_cache.py
+
+"""디스크 캐시: 다시 기록해도 이미 반환된 memmap 슬라이스의 값이 바뀌지 않는지 확인합니다."""
+
+import numpy as np
+
+from backend.app.engine.data import OHLCV
+from backend.app.engine.disk_cache import DiskCandleCache
+from backend.benchmarks import common
+
+HOUR_MS = 3_600_000
+START_MS = common.BENCH_START_MS
+END_MS = START_MS + 500 * HOUR_MS
+
+
+def _scaled_source(factor):
+    def source(exchange, ticker, timeframe, start_ms, end_ms):
+        bars = common.synthetic_source(exchange, ticker, timeframe, start_ms, end_ms)
+        return OHLCV(bars.ts, *(bars.column(name) * factor for name in ("open", "high", "low", "close", "volume")))
+    return source
+
+
+def test_rewrite_does_not_change_loaded_views(tmp_path):
+    cache = DiskCandleCache(str(tmp_path))
+    first = cache.load(_scaled_source(1.0), "binance", "BTC/USDT", "1h", START_MS, END_MS)
+    before = np.array(first.close)
+    assert len(first) == 500
+
+    cache.invalidate("binance", "BTC/USDT", "1h", START_MS, END_MS)
+    second = cache.load(_scaled_source(2.0), "binance", "BTC/USDT", "1h", START_MS, END_MS)
+
+    np.testing.assert_array_equal(first.close, before)
+    np.testing.assert_allclose(second.close, before * 2.0)
+
+
+def test_cached_range_is_served_without_source(tmp_path):
+    cache = DiskCandleCache(str(tmp_path))
+    cache.load(_scaled_source(1.0), "binance", "ETH/USDT", "1h", START_MS, END_MS)
+
+    def unavailable(*args):
+        raise AssertionError("source should not be called for a cached range")
+
+    again = cache.load(unavailable, "binance", "ETH/USDT", "1h", START_MS + 10 * HOUR_MS, END_MS)
+    assert len(again) == 490
@@ -0,0 +1,53 @@
+# file: backend/tests/test_downsample.py
+
+"""LTTB 다운샘플링을 교과서식 순수 파이썬 구현과 비교합니다."""
+
+import math
+
+import numpy as np
+import pytest
+
+from backend.app.engine.downsample import _bucket_edges, _lttb_loop, lttb_indices
+
+
+def naive_lttb(x, y, n_out):
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    selected = [0]
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+@pytest.mark.parametrize("n, n_out", [(10, 4), (11, 5), (1000, 50), (1001, 999), (5000, 3)])
+def test_lttb_matches_reference(n, n_out):
+    rng = np.random.default_rng(n * 31 + n_out)
+    x = np.arange(n, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=n))
+    expected = naive_lttb(x.tolist(), y.tolist(), n_out)
+    assert lttb_indices(x, y, n_out).tolist() == expected
+
+    edges = _bucket_edges(n, n_out)
+    counts = np.diff(edges).astype(np.float64)
+    avg_x = np.append((np.add.reduceat(x[:-1], edges[:-1]) / counts)[1:], x[-1])
+    avg_y = np.append((np.add.reduceat(y[:-1], edges[:-1]) / counts)[1:], y[-1])
+    out = np.empty(n_out, dtype=np.int64)
+    _lttb_loop(x, y, edges, avg_x, avg_y, out)
+    assert out.tolist() == expected
+
+
+def test_lttb_returns_all_points_when_not_downsampling():
+    x = np.arange(5, dtype=np.float64)
+    assert lttb_indices(x, x, 5).tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,60 @@
+# file: backend/tests/test_fills.py
+
+"""지정가 체결 모델: 블록 단위 계산이 전체 계산과 같은지, 대기 봉 수 상한이 적용되는지 확인합니다."""
+
+import numpy as np
+import pytest
+
+from backend.app.engine import fills
+from backend.app.engine.backtester import BacktestSpec
+from backend.app.engine.compiler import compile_strategy
+from backend.app.engine.simulator import SimulationConfig, simulate_limit
+
+RULES = {"buy": [{
+    "id": "b1", "type": "signal", "operator": ">", "logicOperator": "AND", "children": [],
+    "conditionA": {"type": "indicator", "name": "SMA", "value": {"indicatorKey": "SMA", "values": {"length": 20}, "timeframe": "1h"}},
+    "conditionB": {"type": "value", "name": "0", "value": 0.0},
+}], "sell": []}
+
+
+def _market(n: int = 20_000, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, n)))
+    high = close * (1.0 + np.abs(rng.normal(0.0, 0.001, n)))
+    low = close * (1.0 - np.abs(rng.normal(0.0, 0.001, n)))
+    volume = rng.uniform(1.0, 10.0, n)
+    sma = np.convolve(close, np.ones(30) / 30, "same")
+    return close, high, low, volume, close > sma, close < sma * 0.999
+
+
+def test_order_book_rows_do_not_depend_on_batching():
+    close, high, low, volume, entries, _ = _market()
+    signals = np.flatnonzero(entries)[:300]
+    args = (close, high, low, volume, 0.001, 20, 0.5, 0.0002, 0.1, 11)
+    whole = fills.limit_order_book(signals, "buy", *args)
+    for k in (0, 137, 299):
+        single = fills.limit_order_book(signals[k:k + 1], "buy", *args)
+        np.testing.assert_array_equal(single.capacity[0], whole.capacity[k])
+
+
+def test_simulate_limit_is_independent_of_block_size(monkeypatch):
+    close, high, low, volume, entries, exits = _market()
+    config = SimulationConfig(order_type="limit", limit_ttl_bars=40, fill_seed=3)
+    monkeypatch.setattr(fills, "ORDER_BLOCK_SIGNALS", 1)
+    small = simulate_limit(close, high, low, volume, entries, exits, config, start=50)
+    monkeypatch.setattr(fills, "ORDER_BLOCK_SIGNALS", 100_000)
+    whole = simulate_limit(close, high, low, volume, entries, exits, config, start=50)
+    assert small.trade_count > 0
+    np.testing.assert_array_equal(small.entry_idx, whole.entry_idx)
+    np.testing.assert_array_equal(small.exit_idx, whole.exit_idx)
+    np.testing.assert_allclose(small.equity, whole.equity)
+
+
+@pytest.mark.parametrize("ttl", [0, fills.LIMIT_TTL_MAX_BARS + 1])
+def test_spec_rejects_out_of_range_limit_ttl(ttl):
+    parameters = {
+        "ticker": "BTC/USDT", "start_date": "2024-01-01T00:00:00Z", "end_date": "2024-02-01T00:00:00Z",
+        "additional_parameters": {"order_type": "limit", "limit_ttl_bars": ttl},
+    }
+    with pytest.raises(ValueError):
+        BacktestSpec.from_parameters(parameters, compile_strategy(RULES))
@@ -0,0 +1,38 @@
+# file: backend/tests/test_live_bot_loop.py
+
+"""라이브 봇 대기: 봉 마감이 없으면 트레이딩 단계를 건너뛰는지 확인합니다."""
+
+from backend.app import tasks
+from backend.app.engine.candle_stream import Bar
+
+
+class StubSubscriber:
+    key = "candles:test:BTC/USDT:1h"
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.closed = False
+
+    def wait(self, timeout_ms):
+        return self.batches.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+def test_wait_reports_bar_close_only_when_bars_arrive():
+    bar = Bar(3_600_000, 7_200_000, 1.0, 2.0, 0.5, 1.5, 10.0, 3)
+    subscriber = StubSubscriber([[], [bar]])
+    assert tasks._wait_for_bar_close(1, subscriber) == (subscriber, False)
+    assert tasks._wait_for_bar_close(1, subscriber) == (subscriber, True)
+
+
+def test_stream_failure_falls_back_to_polling(monkeypatch):
+    class Broken(StubSubscriber):
+        def wait(self, timeout_ms):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(tasks.time, "sleep", lambda seconds: None)
+    subscriber = Broken([])
+    assert tasks._wait_for_bar_close(1, subscriber) == (None, True)
+    assert subscriber.closed
@@ -0,0 +1,57 @@
+# file: backend/tests/test_preview.py
+
+"""미리보기: 지연 허용 시간은 계산 단계에만 적용되고, 시세 조회 오류는 4xx/503으로 응답하는지 확인합니다."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app import schemas
+from backend.app.engine import data
+from backend.app.engine.compiler import compile_strategy
+from backend.app.services import backtest_service as service_module
+from backend.benchmarks import common
+
+RULES = {"buy": [{
+    "id": "b1", "type": "signal", "operator": ">", "logicOperator": "AND", "children": [],
+    "conditionA": {"type": "indicator", "name": "SMA", "value": {"indicatorKey": "SMA", "values": {"length": 20}, "timeframe": "1h"}},
+    "conditionB": {"type": "value", "name": "0", "value": 0.0},
+}], "sell": []}
+
+
+@pytest.fixture
+def source():
+    previous = data.get_data_source()
+    yield data.set_data_source
+    data.set_data_source(previous)
+
+
+def _preview(ticker: str) -> schemas.BacktestPreview:
+    request = schemas.BacktestPreviewRequest(strategy_id=1, ticker=ticker, max_bars=500)
+    return asyncio.run(service_module.backtest_service.run_preview(compile_strategy(RULES), request))
+
+
+def test_cold_load_is_not_limited_by_compute_budget(source):
+    def slow_source(*args):
+        time.sleep(service_module.PREVIEW_LATENCY_BUDGET_S * 2)
+        return common.synthetic_source(*args)
+
+    source(slow_source)
+    preview = _preview("COLD/USDT")
+    assert preview.bars_used == 500
+
+
+@pytest.mark.parametrize("error, status_code", [
+    (data.InvalidMarketError("bad symbol"), 400),
+    (data.MarketDataUnavailableError("network down"), 503),
+])
+def test_exchange_errors_map_to_http_status(source, error, status_code):
+    def failing_source(*args):
+        raise error
+
+    source(failing_source)
+    with pytest.raises(HTTPException) as excinfo:
+        _preview(f"ERR{status_code}/USDT")
+    assert excinfo.value.status_code == status_code
@@ -0,0 +1,56 @@
+# file: backend/tests/test_replay.py
+
+"""재생 산출물: 워커가 저장한 결과를 파일 시스템 없이 DB만으로 다른 세션(API)에서 다시 읽을 수 있는지 확인합니다."""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app import models, tasks
+from backend.app.database import Base
+from backend.app.engine import data
+from backend.app.engine.backtester import run_backtest
+from backend.app.services.backtest_service import backtest_service
+from backend.benchmarks import common
+
+
+@pytest.fixture
+def sessions():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    previous = data.get_data_source()
+    data.set_data_source(common.synthetic_source)
+    yield factory
+    data.set_data_source(previous)
+
+
+def test_replay_is_read_back_from_database(sessions, tmp_path, monkeypatch):
+    parameters = common.bench_parameters(3)
+    run = run_backtest(common.BENCH_RULES, parameters)
+
+    monkeypatch.chdir(tmp_path)  # 워커 작업 디렉터리에 파일이 남지 않아야 합니다
+    worker = sessions()
+    user = models.User(email="replay@example.com", role="user")
+    worker.add(user)
+    worker.flush()
+    strategy = models.Strategy(author_id=user.id, name="bench", rules=json.dumps(common.BENCH_RULES))
+    worker.add(strategy)
+    worker.flush()
+    backtest = models.Backtest(user_id=user.id, strategy_id=strategy.id, parameters=parameters, status="running")
+    worker.add(backtest)
+    worker.flush()
+    tasks._store_backtest_result(worker, backtest, run)
+    worker.commit()
+    backtest_id = backtest.id
+    worker.close()
+    assert list(tmp_path.iterdir()) == []
+
+    api = sessions()
+    replay = backtest_service.get_replay(api.get(models.Backtest, backtest_id), max_points=500)
+    api.close()
+    assert replay.bars == len(run.ts) - run.start_index
+    assert len(replay.trades) == len(run.trade_logs())
+    assert replay.fingerprint["output_digest"] == tasks.build_fingerprint(run, parameters)["output_digest"]
@@ -0,0 +1,51 @@
+# file: backend/tests/test_sharding.py
+
+"""분할 실행: 구간별 신호를 이어 붙인 결과(거래 인덱스, 지표, 국면 보고서)가 단일 워커 실행과 같은지 확인합니다."""
+
+import numpy as np
+import pytest
+
+from backend.app.engine import data
+from backend.app.engine.backtester import BacktestSpec, run_backtest
+from backend.app.engine.compiler import compile_strategy
+from backend.app.engine.replay import build_fingerprint
+from backend.app.engine.sharding import compute_shard_signals, is_window_stateless, plan_shards, stitch_shards, verify_sharded
+from backend.benchmarks import common
+
+RULES = {
+    "buy": [common._block(common._indicator("SMA", period=20), "crossesAbove", common._indicator("SMA", period=50), [
+        common._block(common._indicator("BB", "1h", output="lower"), "<", common._indicator("Close")),
+    ])],
+    "sell": [common._block(common._indicator("SMA", period=20), "crossesBelow", common._indicator("SMA", period=50))],
+}
+
+
+@pytest.fixture(autouse=True)
+def synthetic_source():
+    previous = data.get_data_source()
+    data.set_data_source(common.synthetic_source)
+    yield
+    data.set_data_source(previous)
+
+
+@pytest.mark.parametrize("precision", ["float64", "float32"])
+def test_sharded_run_equals_single_run(precision):
+    parameters = common.bench_parameters(4, ticker=f"SHARD{precision}/USDT")
+    parameters["additional_parameters"]["precision"] = precision
+    compiled = compile_strategy(RULES)
+    assert is_window_stateless(compiled)
+    spec = BacktestSpec.from_parameters(parameters, compiled)
+    shards = [compute_shard_signals(compiled, spec, start, end) for start, end in plan_shards(spec, 5)]
+
+    sharded = stitch_shards(compiled, spec, shards)
+    single = run_backtest(compiled, parameters)
+    assert single.simulation.trade_count > 0
+    assert sharded.start_index == single.start_index
+    assert sharded.simulation.entry_idx.dtype == single.simulation.entry_idx.dtype
+    np.testing.assert_array_equal(sharded.simulation.entry_idx, single.simulation.entry_idx)
+    np.testing.assert_array_equal(sharded.simulation.exit_idx, single.simulation.exit_idx)
+    assert sharded.summary["regime_report_json"] == single.summary["regime_report_json"]
+    assert build_fingerprint(sharded, parameters) == build_fingerprint(single, parameters)
+
+    check = verify_sharded(compiled, spec, shards)
+    assert check["matches"], check
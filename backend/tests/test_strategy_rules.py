@@ -0,0 +1,73 @@
+# file: backend/tests/test_strategy_rules.py
+
+"""전략 규칙 저장/조회 회귀 테스트: 조회가 저장된 규칙을 덮어쓰지 않고, 빈 규칙은 실행 전에 거부되는지 확인합니다."""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app import models, schemas
+from backend.app.database import Base
+from backend.app.engine.compiler import StrategyCompileError, compile_strategy
+from backend.app.services.strategy_service import strategy_service
+
+RULES = {
+    "buy": [{
+        "id": "b1", "type": "signal", "operator": "<", "logicOperator": "AND", "children": [],
+        "conditionA": {"type": "indicator", "name": "RSI", "value": {"indicatorKey": "RSI", "values": {"length": 14}, "timeframe": "1h"}},
+        "conditionB": {"type": "value", "name": "30", "value": 30.0},
+    }],
+    "sell": [],
+}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    user = models.User(email="rules@example.com", role="user")
+    session.add(user)
+    session.flush()
+    session.add(models.Strategy(id=1, author_id=user.id, name="rsi", rules=json.dumps(RULES)))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _stored_rules(db) -> dict:
+    db.expire_all()
+    return json.loads(db.query(models.Strategy.rules).filter(models.Strategy.id == 1).scalar())
+
+
+def test_get_strategy_by_id_does_not_overwrite_stored_rules(db):
+    strategy = strategy_service.get_strategy_by_id(db, 1)
+    db.flush()
+    db.commit()
+    assert _stored_rules(db) == RULES
+    assert compile_strategy(strategy.rules).timeframes == ("1h",)
+
+
+def test_get_strategies_does_not_overwrite_stored_rules(db):
+    strategy_service.get_strategies(db, user_id=1)
+    db.commit()
+    assert _stored_rules(db) == RULES
+
+
+def test_strategy_response_parses_stored_rules(db):
+    response = schemas.Strategy.model_validate(strategy_service.get_strategy_by_id(db, 1))
+    assert response.rules["buy"][0].conditionA.value.indicatorKey == "RSI"
+    assert response.rules["sell"] == []
+
+
+def test_parse_stored_rules_returns_signal_blocks(db):
+    parsed = strategy_service.parse_stored_rules(strategy_service.get_strategy_by_id(db, 1).rules)
+    assert [block.id for block in parsed["buy"]] == ["b1"]
+
+
+@pytest.mark.parametrize("rules", [{"buy": [], "sell": []}, json.dumps({"buy": [], "sell": RULES["buy"]}), {}])
+def test_compile_rejects_rules_without_buy_blocks(rules):
+    with pytest.raises(StrategyCompileError):
+        compile_strategy(rules)
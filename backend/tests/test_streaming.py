@@ -0,0 +1,40 @@
+# file: backend/tests/test_streaming.py
+
+"""스트리밍 실행: 청크 단위로 읽은 결과(거래, 최종 자산, 데이터 해시)가 전체 로드 실행과 같은지 확인합니다."""
+
+import numpy as np
+import pytest
+
+from backend.app.engine import data
+from backend.app.engine.backtester import BacktestSpec, run_backtest
+from backend.app.engine.compiler import compile_strategy
+from backend.app.engine.replay import build_fingerprint
+from backend.app.engine.streaming import run_streaming
+from backend.benchmarks import common
+
+
+@pytest.fixture(autouse=True)
+def synthetic_source():
+    previous = data.get_data_source()
+    data.set_data_source(common.synthetic_source)
+    yield
+    data.set_data_source(previous)
+
+
+@pytest.mark.parametrize("chunk_bars", [997, 5_000])
+def test_streaming_run_equals_full_run(chunk_bars):
+    parameters = common.bench_parameters(5, ticker=f"STREAM{chunk_bars}/USDT")
+    compiled = compile_strategy(common.BENCH_RULES)
+    spec = BacktestSpec.from_parameters(parameters, compiled)
+
+    full = run_backtest(compiled, parameters)
+    streamed = run_streaming(compiled, spec, chunk_bars)
+    assert streamed.chunks > 1
+    assert full.simulation.trade_count > 0
+    np.testing.assert_array_equal(streamed.entry_ts, full.ts[full.simulation.entry_idx])
+    np.testing.assert_array_equal(streamed.exit_ts, full.ts[full.simulation.exit_idx])
+    np.testing.assert_allclose(streamed.simulation.pnl, full.simulation.pnl, rtol=1e-9)
+    assert streamed.bars_processed == len(full.ts) - full.start_index
+    assert build_fingerprint(streamed, parameters) == build_fingerprint(full, parameters)
+    for key in ("total_return_pct", "mdd_pct", "win_rate_pct"):
+        assert streamed.summary[key] == pytest.approx(full.summary[key], rel=1e-9, abs=1e-9)
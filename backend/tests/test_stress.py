@@ -0,0 +1,74 @@
+# file: backend/tests/test_stress.py
+
+"""스트레스 테스트: 구간별 거래소 오류 처리, 취소, 전체 실행 시간 제한을 확인합니다."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app import schemas
+from backend.app.engine import data, stress
+from backend.app.engine.compiler import compile_strategy
+from backend.app.engine.simulator import SimulationConfig
+from backend.app.services import backtest_service as service_module
+from backend.benchmarks import common
+
+RULES = {"buy": [{
+    "id": "b1", "type": "signal", "operator": ">", "logicOperator": "AND", "children": [],
+    "conditionA": {"type": "indicator", "name": "SMA", "value": {"indicatorKey": "SMA", "values": {"length": 20}, "timeframe": "1h"}},
+    "conditionB": {"type": "value", "name": "0", "value": 0.0},
+}], "sell": []}
+WINDOWS = ["mar_2020_covid_crash", "may_2021_crash"]
+
+
+@pytest.fixture
+def source():
+    previous = data.get_data_source()
+    yield data.set_data_source
+    data.set_data_source(previous)
+
+
+def test_failed_window_is_reported_as_no_data(source):
+    failing_start = stress.STRESS_WINDOWS["may_2021_crash"].start_ms
+
+    def flaky_source(exchange, ticker, timeframe, start_ms, end_ms):
+        if start_ms < failing_start < end_ms:
+            raise data.MarketDataUnavailableError("exchange timeout")
+        return common.synthetic_source(exchange, ticker, timeframe, start_ms, end_ms)
+
+    source(flaky_source)
+    rows = stress.run_stress_pack(compile_strategy(RULES), "binance", "FLAKY/USDT", "1h", SimulationConfig(), WINDOWS)
+    assert [row["status"] for row in rows] == ["ok", "no_data"]
+
+
+def test_invalid_market_is_raised(source):
+    def rejecting_source(*args):
+        raise data.InvalidMarketError("bad symbol")
+
+    source(rejecting_source)
+    with pytest.raises(data.InvalidMarketError):
+        stress.run_stress_pack(compile_strategy(RULES), "binance", "NOPE/USDT", "1h", SimulationConfig(), WINDOWS)
+
+
+def test_canceled_pack_stops_before_next_window(source):
+    source(common.synthetic_source)
+    cancel = threading.Event()
+    cancel.set()
+    rows = stress.run_stress_pack(compile_strategy(RULES), "binance", "CANCEL/USDT", "1h", SimulationConfig(), WINDOWS, cancel=cancel)
+    assert rows == []
+
+
+def test_stress_test_times_out_with_504(source, monkeypatch):
+    def slow_source(*args):
+        time.sleep(0.3)
+        return common.synthetic_source(*args)
+
+    source(slow_source)
+    monkeypatch.setattr(service_module, "STRESS_TIMEOUT_S", 0.05)
+    request = schemas.StressTestRequest(strategy_id=1, ticker="SLOW/USDT", windows=WINDOWS)
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(service_module.backtest_service.run_stress_test(compile_strategy(RULES), request))
+    assert excinfo.value.status_code == 504